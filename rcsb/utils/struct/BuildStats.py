@@ -0,0 +1,105 @@
+##
+#  File:  BuildStats.py
+#  Date:  16-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Per-phase wall time, CPU time, traced memory and record counts for provider cache reloads and rebuilds.
+
+"""
+
+import datetime
+import logging
+import time
+import tracemalloc
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+
+logger = logging.getLogger(__name__)
+
+
+class BuildStats(object):
+    """Record the phases (e.g., fetch, parse, assignments, hierarchy, export, load) of a provider reload.
+
+    Phases are sequential: beginPhase() closes any open phase.  With traceMemory, Python allocations are
+    traced (tracemalloc) while phases are timed and each phase records the peak traced memory reached during
+    the phase and the net change in traced memory (tracing is several times slower and is disabled by default).
+    """
+
+    def __init__(self, name, traceMemory=False):
+        self.__name = name
+        self.__traceMemory = traceMemory
+        self.__ownsTrace = False
+        self.__started = datetime.datetime.now().isoformat()
+        self.__phaseL = []
+        self.__currentT = None
+
+    def beginPhase(self, phaseName):
+        """Start timing the input phase (closing the preceding phase if it is still open)."""
+        if self.__currentT:
+            self.endPhase()
+        memStart = None
+        if self.__traceMemory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.__ownsTrace = True
+            tracemalloc.reset_peak()
+            memStart = tracemalloc.get_traced_memory()[0]
+        self.__currentT = (phaseName, time.perf_counter(), time.process_time(), memStart)
+
+    def endPhase(self, records=None):
+        """Stop timing the open phase.
+
+        Args:
+            records (int, optional): number of records produced (or read) in the phase. Defaults to None.
+
+        Returns:
+            dict: {"phase": ..., "wallSeconds": ..., "cpuSeconds": ..., "records": ..., "peakMemoryBytes": ..., "memoryDeltaBytes": ...}
+                  or None if no phase is open
+        """
+        if not self.__currentT:
+            return None
+        phaseName, wallStart, cpuStart, memStart = self.__currentT
+        pD = {"phase": phaseName, "wallSeconds": time.perf_counter() - wallStart, "cpuSeconds": time.process_time() - cpuStart, "records": records}
+        if memStart is not None and tracemalloc.is_tracing():
+            memCurrent, memPeak = tracemalloc.get_traced_memory()
+            pD["peakMemoryBytes"] = memPeak
+            pD["memoryDeltaBytes"] = memCurrent - memStart
+        self.__phaseL.append(pD)
+        self.__currentT = None
+        logger.debug("%s phase %r", self.__name, pD)
+        return pD
+
+    def finish(self):
+        """Close any open phase and stop memory tracing (if started here)."""
+        self.endPhase()
+        if self.__ownsTrace:
+            tracemalloc.stop()
+            self.__ownsTrace = False
+
+    def getStats(self):
+        """Return the recorded phases and totals.
+
+        Returns:
+            dict: {"name": ..., "started": ..., "wallSeconds": ..., "cpuSeconds": ..., "phases": [{"phase": ..., "wallSeconds": ...,
+                  "cpuSeconds": ..., "records": ..., "peakMemoryBytes": ..., "memoryDeltaBytes": ...}, ...]} where the memory
+                  statistics are only recorded with traceMemory
+        """
+        return {
+            "name": self.__name,
+            "started": self.__started,
+            "wallSeconds": sum([pD["wallSeconds"] for pD in self.__phaseL]),
+            "cpuSeconds": sum([pD["cpuSeconds"] for pD in self.__phaseL]),
+            "phases": [dict(pD) for pD in self.__phaseL],
+        }
+
+    def writeReport(self, filePath):
+        """Write the recorded phases and totals (cf. getStats()) to the input JSON file path."""
+        try:
+            mU = MarshalUtil()
+            return mU.doExport(filePath, self.getStats(), fmt="json", indent=3)
+        except Exception as e:
+            logger.error("Failing writing build report %r with %s", filePath, str(e))
+        return False
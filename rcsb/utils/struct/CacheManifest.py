@@ -0,0 +1,116 @@
+##
+#  File:  CacheManifest.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Small JSON manifests written next to provider cache files (version, creation time, record counts, size
+  and content checksum) supporting version and integrity checks without loading the cache itself.
+
+"""
+
+import datetime
+import hashlib
+import logging
+import os
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+
+logger = logging.getLogger(__name__)
+
+
+def getCacheManifestPath(dataPath):
+    """Return the manifest path for the input cache file path (e.g., cath_domains-py3.pic -> cath_domains-py3-manifest.json)."""
+    return os.path.splitext(dataPath)[0] + "-manifest.json"
+
+
+def getFileChecksum(filePath, blockSize=1048576):
+    """Return the SHA-256 hex digest of the input file."""
+    hashObj = hashlib.sha256()
+    with open(filePath, "rb") as ifh:
+        for block in iter(lambda: ifh.read(blockSize), b""):
+            hashObj.update(block)
+    return hashObj.hexdigest()
+
+
+def writeCacheManifest(dataPath, name, countD, version=None, created=None):
+    """Write the manifest of the input cache file.
+
+    Args:
+        dataPath (str): cache file path
+        name (str): provider or resource name
+        countD (dict): record counts {"names": ..., "assignments": ..., ...}
+        version (str, optional): source release version. Defaults to None.
+        created (str, optional): cache creation time. Defaults to the manifest creation time.
+
+    Returns:
+        bool: True for success or False otherwise
+    """
+    try:
+        tS = datetime.datetime.now().isoformat()
+        mD = {
+            "name": name,
+            "version": version,
+            "created": created if created else tS,
+            "manifestCreated": tS,
+            "dataFile": os.path.basename(dataPath),
+            "dataBytes": os.path.getsize(dataPath),
+            "sha256": getFileChecksum(dataPath),
+            "counts": countD,
+        }
+        mU = MarshalUtil()
+        return mU.doExport(getCacheManifestPath(dataPath), mD, fmt="json", indent=3)
+    except Exception as e:
+        logger.error("Failing writing manifest for %r with %s", dataPath, str(e))
+    return False
+
+
+def readCacheManifest(dataPath):
+    """Return the manifest of the input cache file path.
+
+    Returns:
+        dict: {"name": ..., "version": ..., "created": ..., "manifestCreated": ..., "dataFile": ..., "dataBytes": ..., "sha256": ..., "counts": {...}}
+              or None if there is no manifest
+    """
+    manifestPath = getCacheManifestPath(dataPath)
+    try:
+        mU = MarshalUtil()
+        if mU.exists(manifestPath):
+            return mU.doImport(manifestPath, fmt="json")
+    except Exception as e:
+        logger.error("Failing reading manifest %r with %s", manifestPath, str(e))
+    return None
+
+
+def checkCacheManifest(dataPath, minCountD=None, verifyChecksum=False):
+    """Check the input cache file against its manifest.
+
+    Args:
+        dataPath (str): cache file path
+        minCountD (dict, optional): record counts that must be exceeded {"names": ..., ...}. Defaults to None.
+        verifyChecksum (bool, optional): verify the content checksum (reads the cache file). Defaults to False.
+
+    Returns:
+        bool: True if the manifest exists, the record counts exceed the input minimums and the cache file
+              size (and optionally the content checksum) matches the manifest or False otherwise
+    """
+    mD = readCacheManifest(dataPath)
+    if not mD:
+        return False
+    try:
+        countD = mD.get("counts", {})
+        if minCountD and not all([countD.get(ky, 0) > minCount for ky, minCount in minCountD.items()]):
+            logger.info("Cache %r counts %r below minimums %r", dataPath, countD, minCountD)
+            return False
+        if not os.access(dataPath, os.R_OK) or os.path.getsize(dataPath) != mD["dataBytes"]:
+            logger.info("Cache %r missing or size differs from manifest", dataPath)
+            return False
+        if verifyChecksum and getFileChecksum(dataPath) != mD["sha256"]:
+            logger.info("Cache %r checksum differs from manifest", dataPath)
+            return False
+        return True
+    except Exception as e:
+        logger.error("Failing checking manifest for %r with %s", dataPath, str(e))
+    return False
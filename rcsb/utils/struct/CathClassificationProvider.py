@@ -6,6 +6,31 @@
 #   15-Jul-2021 jdw Update the constructor to common provider API conventions
 #   18-Jul-2023 dwp Resolve duplication issues with CATH residue range list
 #   28-Jan-2026 dwp Switch to HTTPS
+#   16-Oct-2026     Add streaming (bounded-memory) build mode for the CATH domain assignment index
+#   16-Oct-2026     Use order-preserving hash-based de-duplication of chain assignments
+#   16-Oct-2026     Add residue position interval index and getDomainsAtResidue()/getDomainsOverlapping()
+#   16-Oct-2026     Materialize id and name lineage tables once per release (stored with the cache)
+#   16-Oct-2026     Fetch the names and domain assignment resources concurrently
+#   16-Oct-2026     Add incrementalUpdate() applying daily release changes to the cached assignment index
+#   16-Oct-2026     Export the tree node list once per release (stored with the cache) and add iterTreeNodes()
+#   16-Oct-2026     Add getBatchAnnotations() returning the annotations for many chains in one call
+#   16-Oct-2026     Add lazy loading of the cache on first access (lazyLoad)
+#   16-Oct-2026     Add memory-mapped columnar assignment cache (useMappedCache)
+#   16-Oct-2026     Add freezeForFork() for sharing the provider with pre-fork worker pools
+#   17-Oct-2026     Add per-phase build timing and memory statistics (getBuildStats(), buildStatsPath)
+#   17-Oct-2026     Add accessor call, hit and miss counters and latency histograms (lookupStats)
+#   17-Oct-2026     Add fromBackup option to load the cache directly from the backup resource
+#   17-Oct-2026     Write a cache manifest (getCacheManifest(), testCacheManifest())
+#   17-Oct-2026     Add node member queries with subtree roll-ups (getNodeMembers(), getNodeMemberCount())
+#   17-Oct-2026     Add nested-set hierarchy queries (isDescendant(), getDescendants(), getSubtreeSize())
+#   17-Oct-2026     Add lowest common ancestor queries (getLowestCommonAncestor(), getLowestCommonAncestors())
+#   17-Oct-2026     Add iterDomainIntervals() for bulk cross-classification overlap mapping
+#   17-Oct-2026     Add dense per-residue label arrays (getResidueLabels(), getResidueLabelsBulk())
+#   17-Oct-2026     Add streaming JSON-lines tree node export (exportTreeNodes(), getTreeNodeBytes())
+#   17-Oct-2026     Store incremental update digests only for parsed records and drop the assignments of records failing to parse
+#   17-Oct-2026     Return the stored tree node list from getTreeNodeList() without copying
+#   17-Oct-2026     Reuse only successful tree node encodings and reset the derived tree node data in freezeForFork()
+#   17-Oct-2026     Record the daily release in the cache and manifest (getVersion()) and check the cache against CATH_CACHE_MIN_COUNT_D
 ##
 """
   Extract CATH domain assignments, term descriptions and CATH classification hierarchy
@@ -14,20 +39,76 @@
 """
 
 import collections
+import concurrent.futures
+import gzip
+import io
 import logging
 import os.path
+import re
 import sys
+import threading
+import time
+import urllib.request
+import zlib
 from datetime import datetime
 from datetime import timedelta
+from email.utils import parsedate_to_datetime
 
 from rcsb.utils.io.FileUtil import FileUtil
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.StashableBase import StashableBase
+from rcsb.utils.struct.BuildStats import BuildStats
+from rcsb.utils.struct.CacheManifest import checkCacheManifest
+from rcsb.utils.struct.CacheManifest import readCacheManifest
+from rcsb.utils.struct.CacheManifest import writeCacheManifest
+from rcsb.utils.struct.DomainIntervalIndex import DomainIntervalIndex
+from rcsb.utils.struct.HierarchyIndex import HierarchyIndex
+from rcsb.utils.struct.LookupStats import LookupStatsMixin
+from rcsb.utils.struct.LookupStats import isAncestorFound
+from rcsb.utils.struct.LookupStats import isAnyAnnotated
+from rcsb.utils.struct.LookupStats import isAnyFound
+from rcsb.utils.struct.LookupStats import isAnyLabeled
+from rcsb.utils.struct.LookupStats import isFound
+from rcsb.utils.struct.LookupStats import isNonEmpty
+from rcsb.utils.struct.LookupStats import isPositive
+from rcsb.utils.struct.MappedAssignmentStore import MappedAssignmentStore
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedCache
+from rcsb.utils.struct.MappedAssignmentStore import loadMappedCache
+from rcsb.utils.struct.NodeMemberIndex import NodeMemberIndex
+from rcsb.utils.struct.ResidueLabelArrays import encodeResidueLabels
+from rcsb.utils.struct.TreeNodeExport import encodeTreeNodes
+from rcsb.utils.struct.TreeNodeExport import writeTreeNodes
 
 logger = logging.getLogger(__name__)
 
+# Layout of the assignment tuples (cathId, domainId, (authAsymId, resBeg, resEnd), version) in the mapped cache
+CATH_ASSIGNMENT_SHAPE = [0, 0, 3, 0]
+# CATH name and lineage tables and tree node list read in place from the mapped cache
+CATH_MAPPED_TABLE_KEYS = ["names", "idLineage", "nameLineage", "treeNodes"]
+# Record counts to be exceeded by a valid cache (cf. testCache())
+CATH_CACHE_MIN_COUNT_D = {"names": 100, "assignments": 5000}
+# Hierarchy level codes by tree depth (cf. getLowestCommonAncestor())
+CATH_LEVEL_NAMES = ["C", "A", "T", "H"]
+# Lookup accessors counted with lookupStats and the tests of their results counted as hits
+CATH_LOOKUP_ACCESSOR_D = {
+    "getCathVersions": isNonEmpty,
+    "getCathIds": isNonEmpty,
+    "getCathDomainNames": isNonEmpty,
+    "getCathResidueRanges": isNonEmpty,
+    "getBatchAnnotations": isAnyAnnotated,
+    "getDomainsAtResidue": isNonEmpty,
+    "getDomainsOverlapping": isNonEmpty,
+    "getResidueLabels": isAnyLabeled,
+    "getCathName": isFound,
+    "getNodeMembers": isNonEmpty,
+    "getNodeMemberCount": isPositive,
+    "getIdLineage": isNonEmpty,
+    "getNameLineage": isAnyFound,
+    "getLowestCommonAncestor": isAncestorFound,
+}
 
-class CathClassificationProvider(StashableBase):
+
+class CathClassificationProvider(StashableBase, LookupStatsMixin):
     """Extract CATH domain assignments, term descriptions and CATH classification hierarchy
     from CATH flat files.
     """
@@ -44,27 +125,138 @@ class CathClassificationProvider(StashableBase):
         super(CathClassificationProvider, self).__init__(self.__cachePath, [self.__dirName])
         #
         useCache = kwargs.get("useCache", True)
+        # Build the (pdbId, authAsymId) index directly from the domain file stream rather than via intermediate lists
+        self.__streamingBuild = kwargs.get("cathStreamingBuild", False)
+        # Number of threads used to fetch independent source resources concurrently
+        self.__fetchWorkers = kwargs.get("fetchWorkers", 4)
         urlTarget = kwargs.get("cathTargetUrl", "https://download.cathdb.info/cath/releases/daily-release/newest")
         urlFallbackTarget = kwargs.get("cathTargetUrl", "https://download.cathdb.info/cath/releases/daily-release/archive")
         # no trailing /
         urlBackupPath = kwargs.get("cathUrlBackupPath", "https://raw.githubusercontent.com/rcsb/py-rcsb_exdb_assets/master/fall_back/CATH")
         #
+        self.__urlTarget = urlTarget
+        self.__urlFallbackTarget = urlFallbackTarget
+        self.__urlBackupPath = urlBackupPath
+        self.__useCache = useCache
+        # Skip the primary sources in rebuilds and load the cache directly from the backup resource
+        self.__fromBackup = kwargs.get("fromBackup", False)
         self.__mU = MarshalUtil(workPath=self.__cathDirPath)
-        self.__nD, self.__pdbD = self.__reload(urlTarget, urlFallbackTarget, self.__cathDirPath, useCache=useCache)
-        if not self.testCache() and not useCache:
-            ok = self.__fetchFromBackup(urlBackupPath, self.__cathDirPath)
+        # Read the assignment index in place from a memory-mapped copy of the cache (written alongside the pickle cache)
+        self.__useMappedCache = kwargs.get("useMappedCache", False)
+        # Record the per-phase timing (and optionally the traced memory) of each reload with an optional JSON report
+        self.__traceMemory = kwargs.get("traceMemory", False)
+        self.__buildStatsPath = kwargs.get("buildStatsPath", None)
+        self.__buildStats = None
+        self._initLookupStats(kwargs.get("lookupStats", False), CATH_LOOKUP_ACCESSOR_D)
+        # Defer reading (or building) the cache until the first accessor call
+        self.__lazyLoad = kwargs.get("lazyLoad", False)
+        self.__loadLock = threading.Lock()
+        self.__isLoaded = False
+        if self.__lazyLoad:
+            cathDomainPath = os.path.join(self.__cathDirPath, self.__getCathDomainFileName())
+            logger.info("Deferring CATH load (cache %r present %r)", cathDomainPath, self.__mU.exists(cathDomainPath))
+        else:
+            self.__load()
+        #
+
+    def __load(self):
+        if self.__fromBackup and not self.__useCache:
+            ok = self.__fetchFromBackup(self.__urlBackupPath, self.__cathDirPath)
+            logger.info("CATH backup fetch status %r", ok)
+            self.__nD, self.__pdbD = self.__reload(self.__urlTarget, self.__urlFallbackTarget, self.__cathDirPath, useCache=True, useMappedCache=self.__useMappedCache)
+            if ok:
+                self.__writeManifest(self.__nD, self.__pdbD)
+        else:
+            self.__nD, self.__pdbD = self.__reload(self.__urlTarget, self.__urlFallbackTarget, self.__cathDirPath, useCache=self.__useCache, useMappedCache=self.__useMappedCache)
+        if not self.__testCache() and not self.__useCache and not self.__fromBackup:
+            ok = self.__fetchFromBackup(self.__urlBackupPath, self.__cathDirPath)
             if ok:
-                self.__nD, self.__pdbD = self.__reload(urlTarget, urlFallbackTarget, self.__cathDirPath, useCache=True)
+                self.__nD, self.__pdbD = self.__reload(self.__urlTarget, self.__urlFallbackTarget, self.__cathDirPath, useCache=True, useMappedCache=self.__useMappedCache)
+                self.__writeManifest(self.__nD, self.__pdbD)
         #
+        self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange, lazy=isinstance(self.__pdbD, MappedAssignmentStore))
+        self.__resetMemberIndex()
+        self.__isLoaded = True
+
+    def __ensureLoaded(self):
+        if not self.__isLoaded:
+            with self.__loadLock:
+                if not self.__isLoaded:
+                    self.__load()
 
     def testCache(self):
+        self.__ensureLoaded()
+        return self.__testCache()
+
+    def __testCache(self):
         logger.info("CATH lengths nD %d pdbD %d", len(self.__nD), len(self.__pdbD))
-        if (len(self.__nD) > 100) and (len(self.__pdbD) > 5000):
-            return True
-        return False
+        countD = {"names": len(self.__nD), "assignments": len(self.__pdbD)}
+        return all(countD[ky] > minCount for ky, minCount in CATH_CACHE_MIN_COUNT_D.items())
+
+    def getVersion(self):
+        """Return the CATH daily release (YYYYMMDD) of the cached data or None if the release is not known (e.g., caches from the backup)."""
+        self.__ensureLoaded()
+        return self.__release
+
+    def getCacheManifest(self):
+        """Return the manifest of the CATH cache file (cf. readCacheManifest()) or {} if there is no manifest (the cache is not loaded)."""
+        return readCacheManifest(os.path.join(self.__cathDirPath, self.__getCathDomainFileName())) or {}
+
+    def testCacheManifest(self, verifyChecksum=False):
+        """Check the CATH cache file and record counts against the manifest without loading the cache (cf. checkCacheManifest())."""
+        return checkCacheManifest(os.path.join(self.__cathDirPath, self.__getCathDomainFileName()), CATH_CACHE_MIN_COUNT_D, verifyChecksum=verifyChecksum)
+
+    def getBuildStats(self):
+        """Return the per-phase statistics of the last CATH cache load or rebuild (cf. BuildStats.getStats()) or {} if not available."""
+        self.__ensureLoaded()
+        return self.__buildStats.getStats() if self.__buildStats else {}
+
+    def __finishBuildStats(self, bS):
+        bS.finish()
+        self.__buildStats = bS
+        if self.__buildStatsPath:
+            ok = bS.writeReport(self.__buildStatsPath)
+            logger.debug("Build report %r save status %r", self.__buildStatsPath, ok)
+
+    def freezeForFork(self):
+        """Switch the CATH name, lineage, tree node and assignment tables to the mapped cache form shared by forked workers (cf. freezeGcForFork()).
+
+        Returns:
+            bool: True if the provider tables are memory-mapped or False otherwise
+        """
+        self.__ensureLoaded()
+        ok = isinstance(self.__pdbD, MappedAssignmentStore)
+        if not ok:
+            cathDomainPath = os.path.join(self.__cathDirPath, self.__getCathDomainFileName())
+            sD = loadMappedCache(cathDomainPath, ["assignments"], tableKeyL=CATH_MAPPED_TABLE_KEYS)
+            if sD is None:
+                cD = {
+                    "names": self.__nD,
+                    "assignments": self.__pdbD,
+                    "idLineage": self.__idLineageD,
+                    "nameLineage": self.__nameLineageD,
+                    "treeNodes": self.__treeNodeL,
+                    "updateLog": self.__updateLogL,
+                }
+                if exportMappedCache(cathDomainPath, cD, {"assignments": CATH_ASSIGNMENT_SHAPE}, tableKeyL=CATH_MAPPED_TABLE_KEYS):
+                    sD = loadMappedCache(cathDomainPath, ["assignments"], tableKeyL=CATH_MAPPED_TABLE_KEYS)
+            if sD is not None:
+                self.__nD, self.__pdbD = sD["names"], sD["assignments"]
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+                self.__treeNodeL = self.__treeNodeL if sD.get("treeNodes") is None else sD["treeNodes"]
+                self.__hierarchyIndex = None
+                self.__treeNodeBytesD = {}
+                # The per-domain source digests are restored from the pickle cache by incrementalUpdate()
+                self.__domainDigestD = {}
+                self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange, lazy=True)
+                self.__resetMemberIndex()
+                ok = True
+        logger.info("CATH provider frozen for fork (mapped tables %r)", ok)
+        return ok
 
     def getCathVersions(self, pdbId, authAsymId):
         """aD[(pdbId, authAsymId)] = [(cathId, domainId, (authAsymId, resBeg, resEnd), version)]"""
+        self.__ensureLoaded()
         try:
             return list(set([tup[3] for tup in self.__pdbD[(pdbId, authAsymId)]]))
         except Exception as e:
@@ -73,6 +265,7 @@ class CathClassificationProvider(StashableBase):
         return []
 
     def getCathIds(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[0] for tup in self.__pdbD[(pdbId, authAsymId)]]))
         except Exception as e:
@@ -81,6 +274,7 @@ class CathClassificationProvider(StashableBase):
         return []
 
     def getCathDomainNames(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[1] for tup in self.__pdbD[(pdbId, authAsymId)]]))
         except Exception as e:
@@ -89,6 +283,7 @@ class CathClassificationProvider(StashableBase):
         return []
 
     def getCathResidueRanges(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return [(tup[0], tup[1], tup[2][0], tup[2][1], tup[2][2]) for tup in self.__pdbD[(pdbId, authAsymId)]]
         except Exception as e:
@@ -96,14 +291,153 @@ class CathClassificationProvider(StashableBase):
 
         return []
 
+    def getBatchAnnotations(self, chainKeys, fields=None):
+        """Return the CATH annotations for a batch of chains in a single call.
+
+        Args:
+            chainKeys (iterable): chain keys [(pdbId, authAsymId), ...]
+            fields (list, optional): annotation fields (cathIds, domainNames, versions, residueRanges). Defaults to all fields.
+
+        Returns:
+            dict: {(pdbId, authAsymId): {field: [...], ...}, ...} with empty field lists for chains without assignments
+        """
+        self.__ensureLoaded()
+        fD = {
+            "cathIds": lambda tupL: list({tup[0]: None for tup in tupL}),
+            "domainNames": lambda tupL: list({tup[1]: None for tup in tupL}),
+            "versions": lambda tupL: list({tup[3]: None for tup in tupL}),
+            "residueRanges": lambda tupL: [(tup[0], tup[1], tup[2][0], tup[2][1], tup[2][2]) for tup in tupL],
+        }
+        fieldL = fields if fields else list(fD.keys())
+        funcL = [(field, fD[field]) for field in fieldL if field in fD]
+        if len(funcL) < len(fieldL):
+            logger.warning("Skipping unsupported annotation fields %r", [field for field in fieldL if field not in fD])
+        rD = {}
+        for pdbId, authAsymId in chainKeys:
+            tupL = self.__pdbD.get((pdbId, authAsymId))
+            rD[(pdbId, authAsymId)] = {field: func(tupL) if tupL else [] for field, func in funcL}
+        return rD
+
+    def getDomainsAtResidue(self, pdbId, authAsymId, resNum):
+        """Return the CATH domain residue ranges covering the input residue number.
+
+        Returns:
+            list: [(cathId, domainId, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        return self.__intervalIndex.getAtResidue((pdbId, authAsymId), resNum)
+
+    def getDomainsOverlapping(self, pdbId, authAsymId, begResNum, endResNum):
+        """Return the CATH domain residue ranges overlapping the input (inclusive) residue range.
+
+        Returns:
+            list: [(cathId, domainId, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        return self.__intervalIndex.getOverlapping((pdbId, authAsymId), begResNum, endResNum)
+
+    def iterDomainIntervals(self):
+        """Yield the CATH domain residue intervals of each chain (ordered by residue range begin).
+
+        Yields:
+            ((pdbId, authAsymId), [(resBeg, resEnd, (cathId, domainId)), ...]) with integer residue bounds
+        """
+        self.__ensureLoaded()
+        for chainKey in self.__intervalIndex.getChainKeys():
+            yield chainKey, self.__getDomainIntervals(chainKey)
+
+    def getResidueLabels(self, pdbId, authAsymId, begResNum, endResNum, labelType="node", vocabulary=None):
+        """Return the per-residue CATH labels of the input chain over the input (inclusive) residue numbering span.
+
+        Args:
+            pdbId (str): PDB identifier
+            authAsymId (str): author chain identifier
+            begResNum (int): first residue number of the span
+            endResNum (int): last residue number of the span
+            labelType (str, optional): residue labels "node" (CATH identifiers) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+        Returns:
+            (array, ResidueLabelVocabulary): label codes of the residues in the span (0 for unassigned residues) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        labelA, _, vocabulary = self.__getResidueLabelsBulk([(pdbId, authAsymId, begResNum, endResNum)], labelType=labelType, vocabulary=vocabulary)
+        return labelA, vocabulary
+
+    def getResidueLabelsBulk(self, chainSpanL, labelType="node", vocabulary=None):
+        """Return the per-residue CATH labels of a batch of chains in a single contiguous label array (cf. encodeResidueLabels()).
+
+        Args:
+            chainSpanL (list): chains and residue numbering spans [(pdbId, authAsymId, begResNum, endResNum), ...]
+            labelType (str, optional): residue labels "node" (CATH identifiers) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+        Returns:
+            (array, list, ResidueLabelVocabulary): label array, start offsets of the chains (followed by the total length) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        return self.__getResidueLabelsBulk(chainSpanL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getResidueLabelsBulk(self, chainSpanL, labelType, vocabulary):
+        chainIntervalL = [(self.__getDomainIntervals((pdbId, authAsymId)), begResNum, endResNum) for pdbId, authAsymId, begResNum, endResNum in chainSpanL]
+        return encodeResidueLabels(chainIntervalL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getDomainIntervals(self, chainKey):
+        return [(resBeg, resEnd, (tup[0], tup[1])) for resBeg, resEnd, tup in self.__intervalIndex.getIntervals(chainKey)]
+
+    def __getNodeMember(self, tup):
+        return (tup[0], tup[1])
+
+    def __resetMemberIndex(self):
+        # Reverse index from nodes to member chain domains (built on the first member query)
+        self.__memberIndex = NodeMemberIndex([self.__pdbD], self.__getNodeMember, lambda nodeId: self.__idLineageD.get(nodeId))
+
+    def __getIntervalRange(self, tup):
+        return tup[2][1], tup[2][2], (tup[0], tup[1], tup[2][0], tup[2][1], tup[2][2])
+
     def getCathName(self, cathId):
+        self.__ensureLoaded()
         try:
             return self.__nD[cathId]
         except Exception:
             logger.debug("Undefined CATH id %r", cathId)
         return None
 
+    def getNodeMembers(self, cathId, subtree=False):
+        """Return the chain domains assigned to the input CATH node (or to any node in its subtree).
+
+        Args:
+            cathId (str): CATH node identifier (e.g., 1.10.490.10)
+            subtree (bool, optional): include the members of all descendant nodes. Defaults to False.
+
+        Returns:
+            list: [(pdbId, authAsymId, domainId), ...]
+        """
+        self.__ensureLoaded()
+        return self.__memberIndex.getMembers(cathId, subtree=subtree)
+
+    def getNodeMemberCount(self, cathId, subtree=False):
+        """Return the number of chain domains assigned to the input CATH node (or to any node in its subtree)."""
+        self.__ensureLoaded()
+        return self.__memberIndex.getMemberCount(cathId, subtree=subtree)
+
     def getIdLineage(self, cathId):
+        self.__ensureLoaded()
+        if cathId in self.__idLineageD:
+            return list(self.__idLineageD[cathId])
+        return self.__getIdLineage(cathId)
+
+    def getNameLineage(self, cathId):
+        self.__ensureLoaded()
+        if cathId in self.__nameLineageD:
+            return list(self.__nameLineageD[cathId])
+        try:
+            return [self.__nD.get(cId) for cId in self.__getIdLineage(cathId)]
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def __getIdLineage(self, cathId):
         try:
             ff = cathId.split(".")
             return [".".join(ff[0:jj]) for jj in range(1, len(ff) + 1)]
@@ -111,51 +445,396 @@ class CathClassificationProvider(StashableBase):
             logger.debug("No lineage for bad CATH id %r", cathId)
         return None
 
-    def getNameLineage(self, cathId):
-        try:
-            return [self.getCathName(cId) for cId in self.getIdLineage(cathId)]
-        except Exception as e:
-            logger.exception("Failing with %s", str(e))
-        return None
+    def __buildLineageTables(self, nD):
+        """Materialize the id and name lineages for all named CATH nodes.
+
+        Returns:
+            (dict, dict): idLineageD[cathId] = (cathId, ...), nameLineageD[cathId] = (name, ...)  ordered from the root
+        """
+        idLineageD = {}
+        nameLineageD = {}
+        for cathId in nD:
+            idL = self.__getIdLineage(cathId)
+            idLineageD[cathId] = tuple(idL)
+            nameLineageD[cathId] = tuple([nD.get(cId) for cId in idL])
+        logger.debug("CATH lineage tables (%d)", len(idLineageD))
+        return idLineageD, nameLineageD
+
+    def isDescendant(self, cathId, ancestorId):
+        """Return True if the input CATH node is a (proper) descendant of the input ancestor node (nested-set test).
+
+        Args:
+            cathId (str): CATH node identifier
+            ancestorId (str): CATH ancestor node identifier
+
+        Returns:
+            bool: True if ancestorId is a proper ancestor of cathId or False otherwise
+        """
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().isDescendant(cathId, ancestorId)
+
+    def getDescendants(self, cathId):
+        """Return the (proper) descendants of the input CATH node in tree pre-order."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getDescendants(cathId)
+
+    def getSubtreeSize(self, cathId):
+        """Return the number of CATH nodes in the subtree rooted at the input node (including the node)."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getSubtreeSize(cathId)
+
+    def getLowestCommonAncestor(self, cathId1, cathId2):
+        """Return the lowest common ancestor of the input CATH nodes and its level (C, A, T or H).
+
+        Args:
+            cathId1 (str): CATH node identifier
+            cathId2 (str): CATH node identifier
+
+        Returns:
+            (str, str): lowest common ancestor identifier and level or (None, None) if the nodes share no ancestor
+        """
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors([(cathId1, cathId2)])[0]
+
+    def getLowestCommonAncestors(self, cathIdPairL):
+        """Return the lowest common ancestors and levels of the input CATH node pairs (cf. getLowestCommonAncestor())."""
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors(cathIdPairL)
+
+    def __getLowestCommonAncestors(self, cathIdPairL):
+        return [(lcaId, CATH_LEVEL_NAMES[depth] if lcaId is not None and depth < len(CATH_LEVEL_NAMES) else None) for lcaId, depth in self.__getHierarchyIndex().getLcaList(cathIdPairL)]
+
+    def __getHierarchyIndex(self):
+        # Nested-set index built from the tree node list on the first hierarchy query
+        if self.__hierarchyIndex is None:
+            self.__hierarchyIndex = HierarchyIndex(self.iterTreeNodes())
+        return self.__hierarchyIndex
 
     def getTreeNodeList(self):
-        return self.__exportTreeNodeList(self.__nD)
+        """Return the CATH tree node list (computed once per release and stored with the cache).
+
+        The stored list is returned without copying and must be treated as read-only (iterTreeNodes() yields copies of the nodes).
+        A mapped tree node list (useMappedCache or freezeForFork()) is decoded on the first call and stored in its place.
+        """
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            self.__treeNodeL = self.__exportTreeNodeList(self.__nD)
+            self.__hierarchyIndex = None
+        elif not isinstance(self.__treeNodeL, list):
+            # Decode the mapped tree node list once (iterTreeNodes() streams from the mapped file)
+            self.__treeNodeL = list(self.__treeNodeL)
+        return self.__treeNodeL
+
+    def iterTreeNodes(self):
+        """Yield the CATH tree nodes one at a time (in the order of getTreeNodeList())."""
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            yield from self.__iterTreeNodes(self.__nD)
+        else:
+            for dD in self.__treeNodeL:
+                yield dict(dD)
+
+    def exportTreeNodes(self, target, compress=None):
+        """Write the CATH tree nodes (cf. iterTreeNodes()) incrementally as JSON lines.
+
+        Args:
+            target (str|file): output file path or file-like object (binary for compressed output)
+            compress (bool, optional): gzip compress the output. Defaults to None (compress paths with a .gz suffix).
+
+        Returns:
+            int: number of tree nodes written or None on failure
+        """
+        return writeTreeNodes(self.iterTreeNodes(), target, compress=compress)
+
+    def getTreeNodeBytes(self, compress=False):
+        """Return the CATH tree nodes serialized as JSON lines (optionally gzip compressed), encoded on first use and reused."""
+        self.__ensureLoaded()
+        treeBytes = self.__treeNodeBytesD.get(compress)
+        if treeBytes is None:
+            treeBytes = encodeTreeNodes(self.iterTreeNodes(), compress=compress)
+            # Failed encodings (None) are not stored so later calls try again
+            if treeBytes is not None:
+                self.__treeNodeBytesD[compress] = treeBytes
+        return treeBytes
 
     def __getCathDomainFileName(self):
         pyVersion = sys.version_info[0]
         fn = "cath_domains-py%s.pic" % str(pyVersion)
         return fn
 
-    def __reload(self, urlTarget, urlFallbackTarget, cathDirPath, useCache=True):
+    def __reload(self, urlTarget, urlFallbackTarget, cathDirPath, useCache=True, useMappedCache=False):
         nD = {}
         pdbD = {}
+        self.__idLineageD, self.__nameLineageD = {}, {}
+        self.__domainDigestD, self.__updateLogL = {}, []
+        self.__release = None
+        self.__treeNodeL = None
+        self.__hierarchyIndex = None
+        self.__treeNodeBytesD = {}
         fn = self.__getCathDomainFileName()
         cathDomainPath = os.path.join(cathDirPath, fn)
         self.__mU.mkdir(cathDirPath)
+        bS = BuildStats("CATH", traceMemory=self.__traceMemory)
         #
         # cathDomainPath = os.path.join(cathDirPath, "cath_domains.json")
         #
-        if useCache and self.__mU.exists(cathDomainPath):
+        if useCache:
+            bS.beginPhase("load")
+        sD = loadMappedCache(cathDomainPath, ["assignments"], tableKeyL=CATH_MAPPED_TABLE_KEYS) if useCache and useMappedCache else None
+        if sD is None and useCache and self.__mU.exists(cathDomainPath):
             sD = self.__mU.doImport(cathDomainPath, fmt="pickle")
+            if useMappedCache:
+                ok = exportMappedCache(cathDomainPath, sD, {"assignments": CATH_ASSIGNMENT_SHAPE}, excludeKeyL=["domainDigests"], tableKeyL=CATH_MAPPED_TABLE_KEYS)
+                logger.debug("Mapped cache save status %r", ok)
+        if sD is not None:
             logger.debug("Cath domain length %d", len(sD))
             nD = sD["names"]
             pdbD = sD["assignments"]
+            if "idLineage" in sD and "nameLineage" in sD:
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+            else:
+                self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD)
+            self.__domainDigestD = sD.get("domainDigests", {})
+            self.__updateLogL = sD.get("updateLog", [])
+            self.__release = sD.get("release", None)
+            self.__treeNodeL = sD.get("treeNodes", None)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(pdbD))
+        elif not useCache and self.__streamingBuild:
+            minLen = 1000
+            logger.info("Stream CATH name and domain assignment data from primary data source %s", urlTarget)
+            # Fetching, parsing and the assignment index build are a single streamed phase
+            bS.beginPhase("fetch")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.__fetchWorkers) as executor:
+                nmFuture = executor.submit(self.__fetchNamesFromSource, urlTarget, urlFallbackTarget, minLen)
+                dmFuture = executor.submit(self.__streamAssignmentsFromSource, urlTarget, urlFallbackTarget, minLen)
+                nD = self.__extractNames(nmFuture.result())
+                pdbD, self.__domainDigestD = dmFuture.result()
+            bS.endPhase(records=len(self.__domainDigestD))
+            #
+            bS.beginPhase("hierarchy")
+            self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD)
+            self.__treeNodeL = self.__exportTreeNodeList(nD)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(self.__treeNodeL))
+            bS.beginPhase("export")
+            ok = self.__exportCache(cathDomainPath, nD, pdbD, minLen)
+            bS.endPhase(records=len(pdbD) if ok else 0)
+            logger.debug("Cache save status %r", ok)
+            #
         elif not useCache:
             minLen = 1000
             logger.info("Fetch CATH name and domain assignment data from primary data source %s", urlTarget)
+            bS.beginPhase("fetch")
             nmL, dmL = self.__fetchFromSource(urlTarget, urlFallbackTarget, minLen)
+            bS.endPhase(records=len(nmL or []) + len(dmL or []))
             #
-            ok = False
+            bS.beginPhase("parse")
             nD = self.__extractNames(nmL)
             dD = self.__extractDomainAssignments(dmL)
+            self.__domainDigestD = {dm.split(" ", 1)[0]: self.__getLineDigest(dm) for dm in dmL}
+            del dmL
+            bS.endPhase(records=len(dD))
+            bS.beginPhase("assignments")
             pdbD = self.__buildAssignments(dD)
-            sD = {"names": nD, "assignments": pdbD}
-            if (len(nD) > minLen) and (len(dD) > minLen):
-                ok = self.__mU.doExport(cathDomainPath, sD, fmt="pickle")
+            bS.endPhase(records=len(pdbD))
+            bS.beginPhase("hierarchy")
+            self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD)
+            self.__treeNodeL = self.__exportTreeNodeList(nD)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(self.__treeNodeL))
+            bS.beginPhase("export")
+            ok = self.__exportCache(cathDomainPath, nD, pdbD, minLen)
+            bS.endPhase(records=len(pdbD) if ok else 0)
             logger.debug("Cache save status %r", ok)
             #
+        self.__finishBuildStats(bS)
         return nD, pdbD
 
+    def __exportCache(self, cathDomainPath, nD, pdbD, minLen):
+        """Save the names, assignment index, lineage tables, tree node list, source release and per-domain source digests (used by incrementalUpdate())."""
+        ok = False
+        sD = {
+            "names": nD,
+            "assignments": pdbD,
+            "idLineage": self.__idLineageD,
+            "nameLineage": self.__nameLineageD,
+            "treeNodes": self.__treeNodeL,
+            "domainDigests": self.__domainDigestD,
+            "updateLog": self.__updateLogL,
+            "release": self.__release,
+        }
+        if (len(nD) > minLen) and (len(self.__domainDigestD) > minLen):
+            ok = self.__mU.doExport(cathDomainPath, sD, fmt="pickle")
+            if ok and self.__useMappedCache:
+                ok = exportMappedCache(cathDomainPath, sD, {"assignments": CATH_ASSIGNMENT_SHAPE}, excludeKeyL=["domainDigests"], tableKeyL=CATH_MAPPED_TABLE_KEYS)
+            if ok:
+                self.__writeManifest(nD, pdbD)
+        return ok
+
+    def __writeManifest(self, nD, pdbD):
+        cathDomainPath = os.path.join(self.__cathDirPath, self.__getCathDomainFileName())
+        ok = writeCacheManifest(cathDomainPath, "CATH", {"names": len(nD), "assignments": len(pdbD)}, version=self.__release)
+        logger.debug("Cache manifest save status %r", ok)
+        return ok
+
+    def incrementalUpdate(self, maxLogLength=30):
+        """Update the cached CATH data from the current daily release applying only the added, removed
+        and changed domain records to the (pdbId, authAsymId) assignment index.
+
+        Each line of the new domain file is compared with the digest of the corresponding domain record
+        in the cached release, and only new or modified records are parsed.  The chains of modified and
+        removed domains are rebuilt, the cache is saved only if there are changes, and a summary of the
+        changes is appended to the update log (cf. getUpdateLog()).  The assignments of new or modified
+        records that fail to parse are removed and no digest is stored for these records (so they are
+        parsed again by the next update).  A full rebuild is performed if the cached release has no domain
+        digests (e.g., caches created by prior versions or from the backup).
+
+        Args:
+            maxLogLength (int, optional): maximum number of update summaries retained in the update log. Defaults to 30.
+
+        Returns:
+            dict: {"timestamp": ..., "locator": ..., "added": [domainId, ...], "removed": [...], "changed": [...], "failed": [...],
+                   "names": number of changed names} or None if the update fails
+        """
+        self.__ensureLoaded()
+        minLen = 1000
+        cathDomainPath = os.path.join(self.__cathDirPath, self.__getCathDomainFileName())
+        try:
+            if isinstance(self.__pdbD, MappedAssignmentStore):
+                # The mapped cache is read-only and omits the domain digests - continue from the pickle cache
+                self.__nD, self.__pdbD = self.__reload(self.__urlTarget, self.__urlFallbackTarget, self.__cathDirPath, useCache=True)
+                self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange)
+                self.__resetMemberIndex()
+            if not self.__domainDigestD:
+                logger.info("No domain digests in the cached CATH release - performing a full rebuild")
+                self.__nD, self.__pdbD = self.__reload(self.__urlTarget, self.__urlFallbackTarget, self.__cathDirPath, useCache=False)
+                self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange)
+                self.__resetMemberIndex()
+                uD = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()), "locator": self.__urlTarget, "fullRebuild": True}
+                return uD if self.testCache() else None
+            #
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.__fetchWorkers) as executor:
+                nmFuture = executor.submit(self.__fetchNamesFromSource, self.__urlTarget, self.__urlFallbackTarget, minLen)
+                dmFuture = executor.submit(self.__scanDomainChangesFromSource, self.__urlTarget, self.__urlFallbackTarget, minLen)
+                nmL = nmFuture.result()
+                locator, digestD, modD, failL = dmFuture.result()
+            if len(digestD) < minLen or len(nmL) < minLen:
+                logger.error("Incomplete CATH release data (domains %d names %d) - cache unchanged", len(digestD), len(nmL))
+                return None
+            #
+            failS = set(failL)
+            addL = [domId for domId in modD if domId not in self.__domainDigestD]
+            changeL = [domId for domId in modD if domId in self.__domainDigestD]
+            removeL = [domId for domId in self.__domainDigestD if domId not in digestD and domId not in failS]
+            chainKeyL = self.__applyDomainChanges(self.__pdbD, modD, set(changeL + removeL + failL))
+            self.__domainDigestD = digestD
+            self.__intervalIndex.updateChains(self.__pdbD, chainKeyL, self.__getIntervalRange)
+            self.__resetMemberIndex()
+            #
+            nD = self.__extractNames(nmL)
+            numNames = len(set(nD.items()) ^ set(self.__nD.items()))
+            if numNames:
+                self.__nD = nD
+                self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD)
+                self.__treeNodeL = self.__exportTreeNodeList(nD)
+                self.__hierarchyIndex = None
+                self.__treeNodeBytesD = {}
+            #
+            uD = {
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+                "locator": locator,
+                "added": addL,
+                "removed": removeL,
+                "changed": changeL,
+                "failed": failL,
+                "names": numNames,
+            }
+            logger.info("CATH update added %d removed %d changed %d domains (%d chains) and %d names", len(addL), len(removeL), len(changeL), len(chainKeyL), numNames)
+            if failL:
+                logger.error("CATH update failed to parse %d domain records (assignments removed) %r", len(failL), failL[:10])
+            if addL or removeL or changeL or failL or numNames:
+                self.__release = self.__getSourceRelease(locator)
+                self.__updateLogL = (self.__updateLogL + [uD])[-maxLogLength:]
+                ok = self.__exportCache(cathDomainPath, self.__nD, self.__pdbD, minLen)
+                logger.debug("Cache save status %r", ok)
+            return uD
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def getUpdateLog(self):
+        """Return the summaries of the changes applied by prior incremental updates (oldest first)."""
+        self.__ensureLoaded()
+        return list(self.__updateLogL)
+
+    def __scanDomainChangesFromSource(self, urlTarget, urlFallbackTarget, minLen):
+        """Compare the domain records of the newest release (or the prior daily archive release) with the cached digests.
+
+        Returns:
+            (str, dict, dict, list): locator, digestD[domainId] = digest for all parsed domains,
+                                     modD[domainId] = (cathId, rangelist, version) for added or changed domains, and
+                                     the identifiers of added or changed domains failing to parse
+        """
+        locator = os.path.join(urlTarget, "cath-b-newest-all.gz")
+        digestD, modD, failL = self.__scanDomainChanges(locator)
+        if len(digestD) < minLen:
+            dS = datetime.strftime(datetime.now() - timedelta(1), "%Y%m%d")
+            fn = "cath-b-%s-all.gz" % dS
+            locator = os.path.join(urlFallbackTarget, fn)
+            logger.info("Using fallback resource for %s", fn)
+            digestD, modD, failL = self.__scanDomainChanges(locator)
+        return locator, digestD, modD, failL
+
+    def __scanDomainChanges(self, locator):
+        digestD = {}
+        modD = {}
+        failL = []
+        for dm in self.__iterDomainFileLines(locator):
+            domId = dm.split(" ", 1)[0]
+            digest = self.__getLineDigest(dm)
+            if self.__domainDigestD.get(domId) != digest:
+                try:
+                    domId, cathId, dmTupL, version = self.__parseDomainLine(dm)
+                    modD[domId] = (cathId, dmTupL, version)
+                except Exception:
+                    logger.info("Failing for case %r", dm)
+                    failL.append(domId)
+                    continue
+            digestD[domId] = digest
+        logger.info("Scanned domain records (%d) modified or new (%d) failing (%d) from %s", len(digestD), len(modD), len(failL), locator)
+        return digestD, modD, failL
+
+    def __applyDomainChanges(self, pdbD, modD, dropS):
+        """Remove the assignments for the domains in dropS and add the assignments in modD to the index pdbD in place.
+
+        Affected chains are reordered by domain identifier (the order of the CATH release files).
+
+        Returns:
+            list: affected (pdbId, authAsymId) chain keys
+        """
+        pdbIdS = set([domId[:4] for domId in dropS])
+        chainKeyS = set([cKey for cKey in pdbD if cKey[0] in pdbIdS]) if pdbIdS else set()
+        for cKey in chainKeyS:
+            pdbD[cKey] = [tup for tup in pdbD[cKey] if tup[1] not in dropS]
+        #
+        for domId, dTup in modD.items():
+            self.__addAssignment(pdbD, domId, dTup)
+            chainKeyS.update([(domId[:4], rTup[0]) for rTup in dTup[1]])
+        #
+        for cKey in chainKeyS:
+            if not pdbD[cKey]:
+                del pdbD[cKey]
+                continue
+            pdbD[cKey] = list(dict.fromkeys(sorted(pdbD[cKey], key=lambda tup: tup[1])))
+        return list(chainKeyS)
+
+    def __getLineDigest(self, line):
+        return zlib.crc32(line.encode("utf-8"))
+
     def __fetchFromBackup(self, urlBackupPath, cathDirPath):
         fn = self.__getCathDomainFileName()
         cathDomainPath = os.path.join(cathDirPath, fn)
@@ -176,9 +855,35 @@ class CathClassificationProvider(StashableBase):
         http://download.cathdb.info/cath/releases/daily-release/archive/cath-b-yyyymmdd-all.gz
         http://download.cathdb.info/cath/releases/daily-release/archive/cath-b-yyyymmdd-names-all.gz
         """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.__fetchWorkers) as executor:
+            nmFuture = executor.submit(self.__fetchNamesFromSource, urlTarget, urlFallbackTarget, minLen)
+            dmFuture = executor.submit(self.__fetchDomainsFromSource, urlTarget, urlFallbackTarget, minLen)
+            return nmFuture.result(), dmFuture.result()
+
+    def __fetchDomainsFromSource(self, urlTarget, urlFallbackTarget, minLen):
+        """Fetch the domain assignments from the CATH repo (newest or fallback archive release)."""
+        mU = MarshalUtil(workPath=self.__cathDirPath)
+        fn = "cath-b-newest-all.gz"
+        url = os.path.join(urlTarget, fn)
+        dmL = mU.doImport(url, fmt="list", uncomment=True)
+        #
+        if not dmL or len(dmL) < minLen:
+            dS = datetime.today().strftime("%Y%m%d")
+            dS = datetime.strftime(datetime.now() - timedelta(1), "%Y%m%d")
+            fn = "cath-b-%s-all.gz" % dS
+            url = os.path.join(urlFallbackTarget, fn)
+            logger.info("Using fallback resource for %s", fn)
+            dmL = mU.doImport(url, fmt="list", uncomment=True)
+        #
+        self.__release = self.__getSourceRelease(url)
+        return dmL
+
+    def __fetchNamesFromSource(self, urlTarget, urlFallbackTarget, minLen):
+        """Fetch the classification names from the CATH repo (newest or fallback archive release)."""
+        mU = MarshalUtil(workPath=self.__cathDirPath)
         fn = "cath-b-newest-names.gz"
         url = os.path.join(urlTarget, fn)
-        nmL = self.__mU.doImport(url, fmt="list", uncomment=True)
+        nmL = mU.doImport(url, fmt="list", uncomment=True)
         #
         if not nmL or len(nmL) < minLen:
             dS = datetime.today().strftime("%Y%m%d")
@@ -186,21 +891,107 @@ class CathClassificationProvider(StashableBase):
             fn = "cath-b-%s-names-all.gz" % dS
             url = os.path.join(urlFallbackTarget, fn)
             logger.info("Using fallback resource for %s", fn)
-            nmL = self.__mU.doImport(url, fmt="list", uncomment=True)
+            nmL = mU.doImport(url, fmt="list", uncomment=True)
         #
+        return nmL
+
+    def __streamAssignmentsFromSource(self, urlTarget, urlFallbackTarget, minLen):
+        """Stream the CATH domain assignments from the newest release (or the prior daily archive release)
+        directly into the (pdbId, authAsymId) assignment index.
+
+        Returns:
+            (dict, dict): aD[(pdbId, authAsymId)] = [(cathId, domainId, (authAsymId, resBeg, resEnd), version)], digestD[domainId] = digest
+        """
         fn = "cath-b-newest-all.gz"
         url = os.path.join(urlTarget, fn)
-        dmL = self.__mU.doImport(url, fmt="list", uncomment=True)
+        pdbD, digestD = self.__streamAssignments(url)
         #
-        if not dmL or len(dmL) < minLen:
-            dS = datetime.today().strftime("%Y%m%d")
+        if len(digestD) < minLen:
             dS = datetime.strftime(datetime.now() - timedelta(1), "%Y%m%d")
             fn = "cath-b-%s-all.gz" % dS
             url = os.path.join(urlFallbackTarget, fn)
             logger.info("Using fallback resource for %s", fn)
-            dmL = self.__mU.doImport(url, fmt="list", uncomment=True)
+            pdbD, digestD = self.__streamAssignments(url)
         #
-        return nmL, dmL
+        self.__release = self.__getSourceRelease(url)
+        return pdbD, digestD
+
+    def __getSourceRelease(self, locator):
+        """Return the daily release (YYYYMMDD) of the CATH domain assignment file at the input locator taken from
+        the archive file name (cath-b-yyyymmdd-all.gz) or, for the newest release, from the Last-Modified header
+        of the remote resource (or the modification time of a local file).  Returns None if the release cannot be determined.
+        """
+        mObj = re.search(r"cath-b-(\d{8})-all", locator)
+        if mObj:
+            return mObj.group(1)
+        try:
+            fU = FileUtil()
+            if fU.isLocal(locator):
+                return datetime.fromtimestamp(os.path.getmtime(fU.getFilePath(locator))).strftime("%Y%m%d")
+            with urllib.request.urlopen(urllib.request.Request(locator, method="HEAD"), timeout=60) as resp:
+                lastModified = resp.headers.get("Last-Modified")
+            return parsedate_to_datetime(lastModified).strftime("%Y%m%d") if lastModified else None
+        except Exception as e:
+            logger.warning("Failing to determine the release of %r with %s", locator, str(e))
+        return None
+
+    def __streamAssignments(self, locator):
+        """Read the CATH domain assignment file at the input locator line by line and add each domain
+        to the assignment index.  Only the assignment index, the domain digests and one input line are held in memory.
+        """
+        pdbD = {}
+        digestD = {}
+        numDomains = 0
+        for dm in self.__iterDomainFileLines(locator):
+            try:
+                domId, cathId, dmTupL, version = self.__parseDomainLine(dm)
+            except Exception:
+                logger.info("Failing for case %r", dm)
+                continue
+            self.__addAssignment(pdbD, domId, (sys.intern(cathId), dmTupL, sys.intern(version)))
+            digestD[domId] = self.__getLineDigest(dm)
+            numDomains += 1
+        self.__dedupAssignments(pdbD)
+        logger.info("Streamed domain assignments (%d) chains (%d) from %s", numDomains, len(pdbD), locator)
+        return pdbD, digestD
+
+    def __iterDomainFileLines(self, locator):
+        """Yield the domain records of the CATH domain assignment file at the input locator.
+        Remote resources are first copied to a temporary local file which is removed after reading.
+        """
+        fU = FileUtil()
+        if fU.isLocal(locator):
+            filePath = fU.getFilePath(locator)
+            tmpPath = None
+        else:
+            tmpPath = os.path.join(self.__cathDirPath, "_stream_" + fU.getFileName(locator))
+            filePath = tmpPath if fU.get(locator, tmpPath) else None
+        if not filePath or not fU.exists(filePath):
+            logger.error("Failing to fetch %r", locator)
+            return
+        #
+        try:
+            for dm in self.__iterLines(filePath):
+                yield dm
+        except Exception as e:
+            logger.error("Failing reading %r with %s", filePath, str(e))
+        finally:
+            if tmpPath:
+                fU.remove(tmpPath)
+
+    def __iterLines(self, filePath):
+        """Yield the uncommented, non-blank lines of the (optionally gzipped) input file (cf. MarshalUtil list format)."""
+        if filePath[-3:] == ".gz":
+            ifh = gzip.open(filePath, "rt", encoding="utf-8-sig", errors="ignore")
+        else:
+            ifh = io.open(filePath, encoding="utf-8-sig", errors="ignore")
+        with ifh:
+            for line in ifh:
+                line = line[:-1] if line.endswith("\n") else line
+                line = line.encode("ascii", "xmlcharrefreplace").decode("ascii")
+                if not line or line.startswith("#"):
+                    continue
+                yield line
 
     def __extractNames(self, nmL):
         """
@@ -267,20 +1058,29 @@ class CathClassificationProvider(StashableBase):
         for dm in dmL:
             #
             try:
-                ff = dm.split(" ")
-                #
-                rngL = ff[3].split(",")
-                dmTupL = []
-                for rng in rngL:
-                    tL = rng.split(":")
-                    rL = tL[0].split("-")
-                    dmTupL.append((tL[1], rL[0], rL[1]))
-                #
-                dD[ff[0]] = (ff[2], dmTupL, ff[1])
+                domId, cathId, dmTupL, version = self.__parseDomainLine(dm)
+                dD[domId] = (cathId, dmTupL, version)
             except Exception:
-                logger.info("Failing for case %r: %r", ff, dm)
+                logger.info("Failing for case %r", dm)
         return dD
 
+    def __parseDomainLine(self, dm):
+        """Parse a single cath-b-newest-all domain record (e.g., 10gsA01 v4_2_0 3.40.30.10 2-78:A,187-208:A)
+
+        Returns:
+            (str, str, list, str): domainId, cathId, [(authAsymId, resBeg, resEnd), ...], version
+        """
+        ff = dm.split(" ")
+        #
+        rngL = ff[3].split(",")
+        dmTupL = []
+        for rng in rngL:
+            tL = rng.split(":")
+            rL = tL[0].split("-")
+            dmTupL.append((tL[1], rL[0], rL[1]))
+        #
+        return ff[0], ff[2], dmTupL, ff[1]
+
     def __buildAssignments(self, dD):
         """
           Input internal data structure with domain assignments -
@@ -294,18 +1094,31 @@ class CathClassificationProvider(StashableBase):
         """
         pdbD = {}
         for domId, dTup in dD.items():
-            pdbId = domId[:4]
-            for rTup in dTup[1]:
-                cKey = (pdbId, rTup[0])
-                cTup = (dTup[0], domId, rTup, dTup[2])
-                if cKey not in pdbD:
-                    pdbD[cKey] = []
-                if cTup not in pdbD[cKey]:
-                    pdbD[cKey].append(cTup)
+            self.__addAssignment(pdbD, domId, dTup)
+        self.__dedupAssignments(pdbD)
         return pdbD
 
+    def __addAssignment(self, pdbD, domId, dTup):
+        """Add the chain segments of the input domain (cathId, rangelist, version) to the assignment index pdbD.
+
+        Duplicate segments are removed in a single pass by __dedupAssignments() once all domains are added.
+        """
+        pdbId = domId[:4]
+        for rTup in dTup[1]:
+            pdbD.setdefault((pdbId, rTup[0]), []).append((dTup[0], domId, rTup, dTup[2]))
+
+    def __dedupAssignments(self, pdbD):
+        """Remove duplicate assignments for each chain in place preserving the order of first occurrence (linear in the chain length)."""
+        for cKey, cTupL in pdbD.items():
+            if len(cTupL) > 1:
+                pdbD[cKey] = list(dict.fromkeys(cTupL))
+
     def __exportTreeNodeList(self, nD):
         """Create node list from name dictionary and lineage dictionaries."""
+        return list(self.__iterTreeNodes(nD))
+
+    def __iterTreeNodes(self, nD):
+        """Yield the tree nodes in breadth first order from the name dictionary."""
         # create parent dictionary
         #
         pL = []
@@ -343,7 +1156,6 @@ class CathClassificationProvider(StashableBase):
                         queue.append(childId)
                         visited.add(childId)
         #
-        dL = []
         for tId in idL:
             displayName = nD[tId]
             ptId = pD[tId]
@@ -355,6 +1167,4 @@ class CathClassificationProvider(StashableBase):
                 dD = {"id": tId, "name": displayName, "depth": 0}
             else:
                 dD = {"id": tId, "name": displayName, "parents": [ptId], "depth": len(lL) - 1}
-            dL.append(dD)
-
-        return dL
+            yield dD
@@ -0,0 +1,314 @@
+##
+#  File:  ClassificationBenchmark.py
+#  Date:  16-Oct-2026
+#
+#  Updates:
+#  17-Oct-2026  Add the per-phase build times reported by the providers
+#  17-Oct-2026  Add the lookup time ratio of providers with and without lookup statistics (lookupStats)
+#  17-Oct-2026  Add node member query throughput
+#  17-Oct-2026  Add the assignment build scaling on synthetic worst-case (many domains per chain) sources
+#
+##
+"""
+  Offline benchmarks of the CATH, ECOD, SCOPe and SCOP2 classification providers built from
+  synthetic source files (SyntheticClassificationData) at configurable scale, with results
+  stored as JSON and compared against a stored baseline.
+
+"""
+
+import datetime
+import logging
+import math
+import os
+import platform
+import sys
+import time
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.struct.CathClassificationProvider import CathClassificationProvider
+from rcsb.utils.struct.EcodClassificationProvider import EcodClassificationProvider
+from rcsb.utils.struct.Scop2ClassificationProvider import Scop2ClassificationProvider
+from rcsb.utils.struct.ScopClassificationProvider import ScopClassificationProvider
+from rcsb.utils.struct.SyntheticClassificationData import writeCathSourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeEcodSourceFile
+from rcsb.utils.struct.SyntheticClassificationData import writeScop2SourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeScopeSourceFiles
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_PROVIDER_NAMES = ["cath", "ecod", "scope", "scop2"]
+WORST_CASE_PROVIDER_NAMES = ["cath", "scop2"]
+SCOPE_SYNTHETIC_VERSION = "2.08-synthetic"
+
+
+class ClassificationBenchmark(object):
+    """Time the source parse and cache build, pickle cache export and import, cache load, chain lookup
+    throughput (with and without lookup statistics), tree node list export and node member query
+    throughput of the classification providers using synthetic source files, and the scaling of the
+    assignment build with the number of domains per chain.
+    """
+
+    def __init__(self, workPath, **kwargs):
+        """
+        Args:
+            workPath (str): directory for the synthetic source files and provider caches
+            numLookups (int, optional): number of chain lookups timed per provider. Defaults to 100000.
+            maxKeys (int, optional): number of distinct chain keys sampled for lookups. Defaults to 10000.
+            keepFiles (bool, optional): retain the synthetic source files and caches after each run. Defaults to False.
+        """
+        self.__workPath = os.path.abspath(workPath)
+        self.__numLookups = kwargs.get("numLookups", 100000)
+        self.__maxKeys = kwargs.get("maxKeys", 10000)
+        self.__keepFiles = kwargs.get("keepFiles", False)
+        self.__mU = MarshalUtil(workPath=self.__workPath)
+
+    def run(self, numLinesL=None, providerNameL=None):
+        """Run the benchmarks for each provider and scale.
+
+        Args:
+            numLinesL (list, optional): numbers of synthetic domain records. Defaults to [10000, 100000, 1000000].
+            providerNameL (list, optional): provider names (cath, ecod, scope, scop2). Defaults to all providers.
+
+        Returns:
+            dict: {"created": ..., "python": ..., "platform": ..., "cpuCount": ..., "results": [{"provider": ..., "numLines": ..., <metrics>}, ...]}
+        """
+        numLinesL = numLinesL if numLinesL else [10000, 100000, 1000000]
+        providerNameL = providerNameL if providerNameL else BENCHMARK_PROVIDER_NAMES
+        rD = {
+            "created": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpuCount": os.cpu_count(),
+            "numLookups": self.__numLookups,
+            "results": [],
+        }
+        for providerName in providerNameL:
+            for numLines in numLinesL:
+                rD["results"].append(self.runProvider(providerName, numLines))
+        return rD
+
+    def runProvider(self, providerName, numLines):
+        """Run the benchmark of a single provider at the input scale.
+
+        Args:
+            providerName (str): provider name (cath, ecod, scope, scop2)
+            numLines (int): number of synthetic domain records
+
+        Returns:
+            dict: {"provider": ..., "numLines": ..., <metric>: value, ...} where times are in seconds and sizes in bytes
+        """
+        if providerName not in BENCHMARK_PROVIDER_NAMES:
+            raise ValueError("Unsupported benchmark provider %r" % providerName)
+        runPath = os.path.join(self.__workPath, "%s-%d" % (providerName, numLines))
+        dataPath = os.path.join(runPath, "source")
+        cachePath = os.path.join(runPath, "CACHE")
+        rD = {"provider": providerName, "numLines": numLines}
+        try:
+            startTime = time.time()
+            keyL = self.__writeSourceFiles(providerName, dataPath, numLines)
+            rD["generateSeconds"] = time.time() - startTime
+            rD["sourceBytes"] = sum([os.path.getsize(os.path.join(dataPath, fn)) for fn in os.listdir(dataPath)])
+            #
+            startTime = time.time()
+            prov = self.__getProvider(providerName, dataPath, cachePath, useCache=False)
+            rD["buildSeconds"] = time.time() - startTime
+            rD["cacheValid"] = prov.testCache()
+            for pD in prov.getBuildStats().get("phases", []):
+                rD["%sPhaseSeconds" % pD["phase"]] = pD["wallSeconds"]
+            del prov
+            #
+            cacheFilePath = self.__getCacheFilePath(providerName, cachePath)
+            rD["cacheBytes"] = os.path.getsize(cacheFilePath)
+            startTime = time.time()
+            sD = self.__mU.doImport(cacheFilePath, fmt="pickle")
+            rD["pickleImportSeconds"] = time.time() - startTime
+            exportPath = os.path.join(runPath, "export.pic")
+            startTime = time.time()
+            self.__mU.doExport(exportPath, sD, fmt="pickle")
+            rD["pickleExportSeconds"] = time.time() - startTime
+            del sD
+            os.remove(exportPath)
+            #
+            startTime = time.time()
+            prov = self.__getProvider(providerName, dataPath, cachePath, useCache=True)
+            rD["loadSeconds"] = time.time() - startTime
+            #
+            rD.update(self.__timeLookups(providerName, prov, keyL))
+            startTime = time.time()
+            treeNodeL = prov.getTreeNodeList()
+            rD["treeNodeListSeconds"] = time.time() - startTime
+            rD["treeNodeCount"] = len(treeNodeL)
+            rD.update(self.__timeMemberQueries(providerName, prov, treeNodeL))
+            del prov
+            #
+            prov = self.__getProvider(providerName, dataPath, cachePath, useCache=True, lookupStats=True)
+            rD["instrumentedLookupSeconds"] = self.__timeLookups(providerName, prov, keyL)["lookupSeconds"]
+            rD["lookupStatsOverheadRatio"] = rD["instrumentedLookupSeconds"] / rD["lookupSeconds"] if rD["lookupSeconds"] > 0 else 0.0
+            logger.info("Benchmark %s (%d lines) %r", providerName, numLines, rD)
+        except Exception as e:
+            logger.exception("Failing benchmark %s (%d lines) with %s", providerName, numLines, str(e))
+            rD["error"] = str(e)
+        finally:
+            if not self.__keepFiles:
+                self.__mU.remove(runPath)
+        return rD
+
+    def runAssignmentScaling(self, providerName, domainsPerChainL=None, numChains=4):
+        """Time the provider build from synthetic worst-case sources with many domains on every chain and
+        every tenth assignment record repeated.
+
+        Args:
+            providerName (str): provider name (cath, scop2)
+            domainsPerChainL (list, optional): numbers of domains per chain. Defaults to [2000, 8000].
+            numChains (int, optional): number of chains. Defaults to 4.
+
+        Returns:
+            list: [{"provider": ..., "numLines": ..., "domainsPerChain": ..., "buildSeconds": ..., "buildScalingExponent": ...}, ...]
+                  where the scaling exponent log(t/t0) / log(d/d0) is relative to the first scale (about 1 for a
+                  linear and 2 for a quadratic assignment build)
+        """
+        if providerName not in WORST_CASE_PROVIDER_NAMES:
+            raise ValueError("Unsupported worst-case benchmark provider %r" % providerName)
+        domainsPerChainL = domainsPerChainL if domainsPerChainL else [2000, 8000]
+        rL = []
+        for domainsPerChain in domainsPerChainL:
+            numLines = numChains * domainsPerChain
+            runPath = os.path.join(self.__workPath, "%s-worst-%d" % (providerName, domainsPerChain))
+            dataPath = os.path.join(runPath, "source")
+            rD = {"provider": providerName, "numLines": numLines, "domainsPerChain": domainsPerChain}
+            try:
+                if providerName == "cath":
+                    writeCathSourceFiles(dataPath, numLines, maxKeys=self.__maxKeys, domainsPerChain=domainsPerChain, duplicateEvery=10)
+                else:
+                    writeScop2SourceFiles(dataPath, numLines, maxKeys=self.__maxKeys, domainsPerChain=domainsPerChain, duplicateEvery=10)
+                startTime = time.time()
+                prov = self.__getProvider(providerName, dataPath, os.path.join(runPath, "CACHE"), useCache=False)
+                rD["buildSeconds"] = time.time() - startTime
+                for pD in prov.getBuildStats().get("phases", []):
+                    rD["%sPhaseSeconds" % pD["phase"]] = pD["wallSeconds"]
+                del prov
+                t0D = rL[0] if rL else {}
+                if t0D.get("buildSeconds") and rD["buildSeconds"] > 0 and domainsPerChain != t0D["domainsPerChain"]:
+                    rD["buildScalingExponent"] = math.log(rD["buildSeconds"] / t0D["buildSeconds"]) / math.log(domainsPerChain / t0D["domainsPerChain"])
+                logger.info("Worst-case benchmark %s (%d domains per chain) %r", providerName, domainsPerChain, rD)
+            except Exception as e:
+                logger.exception("Failing worst-case benchmark %s (%d domains per chain) with %s", providerName, domainsPerChain, str(e))
+                rD["error"] = str(e)
+            finally:
+                if not self.__keepFiles:
+                    self.__mU.remove(runPath)
+            rL.append(rD)
+        return rL
+
+    def writeResults(self, resultD, filePath):
+        """Write benchmark results (e.g., as returned by run()) to the input JSON file path."""
+        return self.__mU.doExport(filePath, resultD, fmt="json", indent=3)
+
+    def readResults(self, filePath):
+        """Read benchmark results from the input JSON file path (or None if the file is missing)."""
+        return self.__mU.doImport(filePath, fmt="json") if self.__mU.exists(filePath) else None
+
+    def compareResults(self, resultD, baselineD, tolerance=0.25):
+        """Compare benchmark results with a baseline run.
+
+        Times (metrics ending in "Seconds") regress when they exceed the baseline by more than the
+        tolerance and rates (metrics ending in "PerSecond") regress when they fall below the baseline by more
+        than the tolerance.  Only provider and scale combinations present in both runs are compared.
+
+        Args:
+            resultD (dict): current benchmark results
+            baselineD (dict): baseline benchmark results
+            tolerance (float, optional): fractional tolerance. Defaults to 0.25.
+
+        Returns:
+            list: [{"provider": ..., "numLines": ..., "metric": ..., "baseline": ..., "current": ..., "ratio": current/baseline}, ...] regressions
+        """
+        regressionL = []
+        baseD = {(tD["provider"], tD["numLines"]): tD for tD in baselineD.get("results", [])}
+        for tD in resultD.get("results", []):
+            bD = baseD.get((tD["provider"], tD["numLines"]))
+            if not bD:
+                continue
+            for metric, value in tD.items():
+                baseValue = bD.get(metric)
+                if not isinstance(baseValue, (int, float)) or isinstance(baseValue, bool) or not baseValue:
+                    continue
+                ratio = value / baseValue
+                if (metric.endswith("PerSecond") and ratio < 1.0 / (1.0 + tolerance)) or (metric.endswith("Seconds") and ratio > 1.0 + tolerance):
+                    regressionL.append({"provider": tD["provider"], "numLines": tD["numLines"], "metric": metric, "baseline": baseValue, "current": value, "ratio": ratio})
+        for regD in regressionL:
+            logger.info(
+                "Regression %s (%d lines) %s baseline %r current %r (ratio %.2f)", regD["provider"], regD["numLines"], regD["metric"], regD["baseline"], regD["current"], regD["ratio"]
+            )
+        return regressionL
+
+    def __writeSourceFiles(self, providerName, dataPath, numLines):
+        if providerName == "cath":
+            return writeCathSourceFiles(dataPath, numLines, maxKeys=self.__maxKeys)
+        elif providerName == "ecod":
+            return writeEcodSourceFile(os.path.join(dataPath, "ecod.latest.domains.txt"), numLines, maxKeys=self.__maxKeys)
+        elif providerName == "scope":
+            return writeScopeSourceFiles(dataPath, numLines, version=SCOPE_SYNTHETIC_VERSION, maxKeys=self.__maxKeys)
+        return writeScop2SourceFiles(dataPath, numLines, maxKeys=self.__maxKeys)
+
+    def __getProvider(self, providerName, dataPath, cachePath, useCache, lookupStats=False):
+        # Backup resources point to the (local) synthetic sources so incomplete builds never fall back to the network
+        if providerName == "cath":
+            return CathClassificationProvider(cachePath=cachePath, useCache=useCache, cathTargetUrl=dataPath, cathUrlBackupPath=dataPath, lookupStats=lookupStats)
+        elif providerName == "ecod":
+            ecodPath = os.path.join(dataPath, "ecod.latest.domains.txt")
+            return EcodClassificationProvider(cachePath, useCache, ecodTargetUrl=ecodPath, ecodUrlBackupPath=ecodPath, lookupStats=lookupStats)
+        elif providerName == "scope":
+            return ScopClassificationProvider(
+                cachePath=cachePath, useCache=useCache, scopTargetUrl=dataPath, scopVersion=SCOPE_SYNTHETIC_VERSION, scopUrlBackupPath=dataPath, lookupStats=lookupStats
+            )
+        return Scop2ClassificationProvider(cachePath, useCache, urlTargetScop2=dataPath, urlTargetSifts=dataPath, lookupStats=lookupStats)
+
+    def __getCacheFilePath(self, providerName, cachePath):
+        pyVersion = sys.version_info[0]
+        if providerName == "cath":
+            return os.path.join(cachePath, "cath", "cath_domains-py%s.pic" % str(pyVersion))
+        elif providerName == "ecod":
+            return os.path.join(cachePath, "ecod", "ecod_domains-py%s.pic" % str(pyVersion))
+        elif providerName == "scope":
+            return os.path.join(cachePath, "scop", "scop_domains-py%s.pic" % str(pyVersion))
+        return os.path.join(cachePath, "scop2", "scop2_domain_assignments.pic")
+
+    def __timeLookups(self, providerName, prov, keyL):
+        """Time per-chain residue range lookups cycling over the sampled chain keys."""
+        if providerName == "cath":
+            lookup = prov.getCathResidueRanges
+        elif providerName == "scope":
+            lookup = prov.getScopResidueRanges
+        else:
+            lookup = prov.getFamilyResidueRanges
+        lookupL = (keyL * (self.__numLookups // max(1, len(keyL)) + 1))[: self.__numLookups]
+        numHits = 0
+        startTime = time.time()
+        for pdbId, authAsymId in lookupL:
+            if lookup(pdbId, authAsymId):
+                numHits += 1
+        lookupSeconds = time.time() - startTime
+        return {
+            "lookupSeconds": lookupSeconds,
+            "lookupsPerSecond": len(lookupL) / lookupSeconds if lookupSeconds > 0 else 0.0,
+            "lookupHitFraction": numHits / len(lookupL) if lookupL else 0.0,
+        }
+
+    def __timeMemberQueries(self, providerName, prov, treeNodeL):
+        """Time the member index build and the node and subtree member queries of each tree node."""
+        # Tree node identifiers are strings while the ECOD and SCOPe node tables are keyed by integer identifiers
+        nodeIdL = [int(dD["id"]) if providerName in ["ecod", "scope"] else dD["id"] for dD in treeNodeL]
+        startTime = time.time()
+        prov.getNodeMemberCount(nodeIdL[0])
+        memberIndexSeconds = time.time() - startTime
+        startTime = time.time()
+        for nodeId in nodeIdL:
+            prov.getNodeMembers(nodeId)
+            prov.getNodeMemberCount(nodeId, subtree=True)
+        memberQuerySeconds = time.time() - startTime
+        return {
+            "memberIndexSeconds": memberIndexSeconds,
+            "memberQuerySeconds": memberQuerySeconds,
+            "memberQueriesPerSecond": 2 * len(nodeIdL) / memberQuerySeconds if memberQuerySeconds > 0 else 0.0,
+        }
@@ -0,0 +1,179 @@
+##
+#  File:  ClassificationCacheExec.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#  17-Oct-2026  Add manifest-only cache verification (verify --manifest_only)
+#
+##
+"""
+  Command-line entry point to build, verify and profile the classification provider caches.
+
+  classification_cache_cli build  --cache_path ./CACHE --providers cath,ecod --timeout 3600
+  classification_cache_cli verify --cache_path ./CACHE [--manifest_only]
+  classification_cache_cli stats  --cache_path ./CACHE --report_path stats.json
+  classification_cache_cli bench  --work_path ./bench-work --num_lines 10000,100000 --baseline_path baseline.json
+
+  Exit status is 0 on success, 1 if any provider build or verification fails (or a benchmark regresses)
+  and 2 for usage errors.
+
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.struct.ClassificationBenchmark import ClassificationBenchmark
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import REBUILD_PROVIDER_NAMES
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import ClassificationRebuildOrchestrator
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import getClassificationProvider
+
+logger = logging.getLogger(__name__)
+
+# Cache directory (below cachePath) of each provider
+CACHE_DIR_NAMES = {"cath": "cath", "ecod": "ecod", "scope": "scop", "scop2": "scop2"}
+
+
+def getCacheSize(cachePath, providerName):
+    """Return the total size in bytes of the files in the provider cache directory."""
+    dirPath = os.path.join(cachePath, CACHE_DIR_NAMES[providerName])
+    numBytes = 0
+    for root, _, fnL in os.walk(dirPath):
+        for fn in fnL:
+            numBytes += os.path.getsize(os.path.join(root, fn))
+    return numBytes
+
+
+def buildCaches(cachePath, providerNameL, providerKwargsD, timeout, useBackup):
+    cRO = ClassificationRebuildOrchestrator(cachePath, timeout=timeout, useBackup=useBackup, providerKwargsD=providerKwargsD)
+    rD = cRO.run(providerNameL=providerNameL)
+    resultL = []
+    for providerName in providerNameL:
+        tD = rD["results"][providerName]
+        resultL.append({"provider": providerName, "status": tD["status"], "valid": tD["valid"], "seconds": tD["seconds"], "cacheBytes": getCacheSize(cachePath, providerName)})
+    return resultL
+
+
+def verifyCaches(cachePath, providerNameL, providerKwargsD, manifestOnly=False):
+    resultL = []
+    for providerName in providerNameL:
+        tD = {"provider": providerName, "status": "failed", "valid": False}
+        startTime = time.time()
+        try:
+            # With manifestOnly, the caches are checked against their manifests without loading them
+            prov = getClassificationProvider(providerName, cachePath, useCache=True, lazyLoad=manifestOnly, **providerKwargsD.get(providerName, {}))
+            tD["valid"] = prov.testCacheManifest() if manifestOnly else prov.testCache()
+            tD["status"] = "valid" if tD["valid"] else "invalid"
+        except Exception as e:
+            logger.exception("Failing verify of %s with %s", providerName, str(e))
+        tD["seconds"] = time.time() - startTime
+        tD["cacheBytes"] = getCacheSize(cachePath, providerName)
+        resultL.append(tD)
+    return resultL
+
+
+def getCacheStats(cachePath, providerNameL, providerKwargsD):
+    resultL = []
+    for providerName in providerNameL:
+        tD = {"provider": providerName, "status": "failed", "valid": False}
+        startTime = time.time()
+        try:
+            prov = getClassificationProvider(providerName, cachePath, useCache=True, **providerKwargsD.get(providerName, {}))
+            tD["valid"] = prov.testCache()
+            tD["status"] = "valid" if tD["valid"] else "invalid"
+            tD["treeNodeCount"] = len(prov.getTreeNodeList())
+            tD["buildStats"] = prov.getBuildStats()
+        except Exception as e:
+            logger.exception("Failing stats of %s with %s", providerName, str(e))
+        tD["seconds"] = time.time() - startTime
+        tD["cacheBytes"] = getCacheSize(cachePath, providerName)
+        dirPath = os.path.join(cachePath, CACHE_DIR_NAMES[providerName])
+        tD["files"] = {fn: os.path.getsize(os.path.join(dirPath, fn)) for fn in sorted(os.listdir(dirPath))} if os.path.isdir(dirPath) else {}
+        resultL.append(tD)
+    return resultL
+
+
+def printResults(resultL, stream=None):
+    stream = stream if stream else sys.stdout
+    stream.write("%-8s %-10s %10s %14s\n" % ("provider", "status", "seconds", "cache bytes"))
+    for tD in resultL:
+        stream.write("%-8s %-10s %10.2f %14d\n" % (tD["provider"], tD["status"], tD["seconds"], tD["cacheBytes"]))
+        for pD in tD.get("buildStats", {}).get("phases", []):
+            stream.write("  %-16s %10.2f %14s\n" % (pD["phase"], pD["wallSeconds"], pD["records"] if pD["records"] is not None else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="classification_cache_cli", description="Build, verify and profile the structure classification provider caches")
+    subParsers = parser.add_subparsers(dest="command", required=True)
+    for command, helpText in [
+        ("build", "rebuild the provider caches in parallel processes"),
+        ("verify", "load and check the provider caches"),
+        ("stats", "report cache sizes, tree node counts and load times"),
+    ]:
+        subParser = subParsers.add_parser(command, help=helpText)
+        subParser.add_argument("--cache_path", required=True, help="top-level cache directory")
+        subParser.add_argument("--providers", default=",".join(REBUILD_PROVIDER_NAMES), help="comma separated providers (%s)" % ",".join(REBUILD_PROVIDER_NAMES))
+        subParser.add_argument("--provider_args_path", default=None, help="JSON file of provider keyword arguments {provider: {...}, ...}")
+        subParser.add_argument("--report_path", default=None, help="JSON report file")
+        if command == "build":
+            subParser.add_argument("--timeout", type=float, default=3600, help="per-provider rebuild timeout (seconds)")
+            subParser.add_argument("--no_backup", action="store_true", default=False, help="do not fall back to the backup resources")
+        elif command == "verify":
+            subParser.add_argument("--manifest_only", action="store_true", default=False, help="check the cache manifests without loading the caches")
+    benchParser = subParsers.add_parser("bench", help="run the offline benchmarks on synthetic sources")
+    benchParser.add_argument("--work_path", required=True, help="working directory for synthetic sources and caches")
+    benchParser.add_argument("--providers", default=",".join(REBUILD_PROVIDER_NAMES), help="comma separated providers (%s)" % ",".join(REBUILD_PROVIDER_NAMES))
+    benchParser.add_argument("--num_lines", default="10000", help="comma separated numbers of synthetic domain records")
+    benchParser.add_argument("--num_lookups", type=int, default=100000, help="number of timed chain lookups")
+    benchParser.add_argument("--report_path", default=None, help="JSON results file")
+    benchParser.add_argument("--baseline_path", default=None, help="JSON baseline results file")
+    benchParser.add_argument("--tolerance", type=float, default=0.25, help="fractional regression tolerance")
+    parser.add_argument("--debug", action="store_true", default=False, help="debug logging")
+    args = parser.parse_args(argv)
+    #
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+    providerNameL = [pN.strip() for pN in args.providers.split(",") if pN.strip()]
+    unknownL = [pN for pN in providerNameL if pN not in REBUILD_PROVIDER_NAMES]
+    if unknownL:
+        parser.error("unsupported providers %r" % unknownL)
+    mU = MarshalUtil()
+    try:
+        if args.command == "bench":
+            numLinesL = [int(nS) for nS in args.num_lines.split(",")]
+            cB = ClassificationBenchmark(args.work_path, numLookups=args.num_lookups)
+            rD = cB.run(numLinesL=numLinesL, providerNameL=providerNameL)
+            for tD in rD["results"]:
+                sys.stdout.write("%-8s %10d %10.2f %12.0f %s\n" % (tD["provider"], tD["numLines"], tD.get("buildSeconds", 0.0), tD.get("lookupsPerSecond", 0.0), tD.get("error", "")))
+            if args.report_path:
+                cB.writeResults(rD, args.report_path)
+            ok = all(["error" not in tD for tD in rD["results"]])
+            baselineD = cB.readResults(args.baseline_path) if args.baseline_path else None
+            if baselineD:
+                regressionL = cB.compareResults(rD, baselineD, tolerance=args.tolerance)
+                for regD in regressionL:
+                    sys.stdout.write("regression %s %d %s %.2f\n" % (regD["provider"], regD["numLines"], regD["metric"], regD["ratio"]))
+                ok = ok and not regressionL
+            return 0 if ok else 1
+        #
+        providerKwargsD = mU.doImport(args.provider_args_path, fmt="json") if args.provider_args_path else {}
+        cachePath = os.path.abspath(args.cache_path)
+        if args.command == "build":
+            resultL = buildCaches(cachePath, providerNameL, providerKwargsD, args.timeout, not args.no_backup)
+        elif args.command == "verify":
+            resultL = verifyCaches(cachePath, providerNameL, providerKwargsD, manifestOnly=args.manifest_only)
+        else:
+            resultL = getCacheStats(cachePath, providerNameL, providerKwargsD)
+        printResults(resultL)
+        if args.report_path:
+            mU.doExport(args.report_path, resultL, fmt="json", indent=3)
+        return 0 if all([tD["valid"] for tD in resultL]) else 1
+    except Exception as e:
+        logger.exception("Failing %s with %s", args.command, str(e))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
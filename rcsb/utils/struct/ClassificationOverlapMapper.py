@@ -0,0 +1,213 @@
+##
+#  File:  ClassificationOverlapMapper.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Bulk residue overlap mapping between the domain assignments of pairs of classification providers
+  (CATH, ECOD, SCOPe and SCOP2) using a per-chain interval sweep.
+
+"""
+
+import logging
+import os
+import sys
+import time
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+
+logger = logging.getLogger(__name__)
+
+# Columns of the overlap tables (cf. ClassificationOverlapMapper.getOverlapTables())
+OVERLAP_TABLE_COLUMNS = ["pdbId", "authAsymId", "domainId1", "nodeId1", "domainId2", "nodeId2", "overlapResidues", "domainResidues1", "domainResidues2"]
+
+
+def sweepOverlaps(intervalL1, intervalL2):
+    """Return the overlapping pairs of two interval lists in a single sweep.
+
+    Args:
+        intervalL1 (list): [(resBeg, resEnd, item), ...] sorted on resBeg (inclusive integer bounds)
+        intervalL2 (list): [(resBeg, resEnd, item), ...] sorted on resBeg (inclusive integer bounds)
+
+    Returns:
+        list: [(item1, item2, overlapBeg, overlapEnd), ...] in order of the overlap begin
+    """
+    oL = []
+    activeL1 = []
+    activeL2 = []
+    ii = jj = 0
+    num1 = len(intervalL1)
+    num2 = len(intervalL2)
+    while ii < num1 or jj < num2:
+        if jj >= num2 or (ii < num1 and intervalL1[ii][0] <= intervalL2[jj][0]):
+            beg, end, item = intervalL1[ii]
+            ii += 1
+            # intervals of the other list still active at this begin overlap the new interval
+            activeL2 = [tup for tup in activeL2 if tup[1] >= beg]
+            for _, end2, item2 in activeL2:
+                oL.append((item, item2, beg, min(end, end2)))
+            activeL1.append((beg, end, item))
+        else:
+            beg, end, item = intervalL2[jj]
+            jj += 1
+            activeL1 = [tup for tup in activeL1 if tup[1] >= beg]
+            for _, end1, item1 in activeL1:
+                oL.append((item1, item, beg, min(end, end1)))
+            activeL2.append((beg, end, item))
+    return oL
+
+
+def getResidueCount(resBeg, resEnd):
+    """Return the number of residues in the input inclusive range (or None for unbounded ranges)."""
+    if resBeg <= -sys.maxsize or resEnd >= sys.maxsize:
+        return None
+    return resEnd - resBeg + 1
+
+
+class ClassificationOverlapMapper(object):
+    """Residue overlaps between the domains assigned to each chain by pairs of classification providers.
+
+    The domain intervals of each provider are read once (iterDomainIntervals()) and grouped by chain with
+    the PDB identifier in upper case (the providers differ in identifier case).  For each chain assigned by
+    both providers of a pair, the two sorted interval lists are merged in a single sweep, so a chain costs
+    time linear in its intervals and overlaps.  Overlaps of the segments of multi-segment domains are summed
+    per domain pair.
+    """
+
+    def __init__(self, providerD, **kwargs):
+        """
+        Args:
+            providerD (dict): classification providers {sourceName: provider, ...} (e.g., {"cath": ..., "ecod": ...})
+            assignmentTypeD (dict, optional): provider assignment types {sourceName: assignmentType} (e.g., {"scop2": "superfamily"}). Defaults to {}.
+        """
+        self.__providerD = providerD
+        self.__assignmentTypeD = kwargs.get("assignmentTypeD", {})
+        self.__chainIntervalD = {}
+
+    def __getChainIntervals(self, sourceName):
+        try:
+            return self.__chainIntervalD[sourceName]
+        except KeyError:
+            pass
+        startTime = time.time()
+        prov = self.__providerD[sourceName]
+        kwD = {"assignmentType": self.__assignmentTypeD[sourceName]} if sourceName in self.__assignmentTypeD else {}
+        cD = {}
+        for (pdbId, authAsymId), intervalL in prov.iterDomainIntervals(**kwD):
+            cD[(pdbId.upper(), authAsymId)] = intervalL
+        self.__chainIntervalD[sourceName] = cD
+        logger.info("%s domain intervals for chains (%d) (%.4f seconds)", sourceName, len(cD), time.time() - startTime)
+        return cD
+
+    def getChainOverlaps(self, sourceName1, sourceName2, pdbId, authAsymId):
+        """Return the residue overlaps between the domains assigned to the input chain by two providers (cf. getOverlapTables())."""
+        chainKey = (pdbId.upper(), authAsymId)
+        cD1 = self.__getChainIntervals(sourceName1)
+        cD2 = self.__getChainIntervals(sourceName2)
+        if chainKey not in cD1 or chainKey not in cD2:
+            return []
+        return self.__getOverlapRows(chainKey, cD1[chainKey], cD2[chainKey], 1)
+
+    def getOverlapTables(self, sourcePairL=None, minOverlap=1):
+        """Return the residue overlap tables for pairs of providers over all chains.
+
+        Args:
+            sourcePairL (list, optional): provider pairs [(sourceName1, sourceName2), ...]. Defaults to all pairs of providers.
+            minOverlap (int, optional): minimum number of overlapping residues. Defaults to 1.
+
+        Returns:
+            dict: {(sourceName1, sourceName2): [{"pdbId": ..., "authAsymId": ..., "domainId1": ..., "nodeId1": ...,
+                   "domainId2": ..., "nodeId2": ..., "overlapResidues": ..., "domainResidues1": ..., "domainResidues2": ...}, ...], ...}
+                   with rows ordered by chain and overlap position (residue counts are None for unbounded whole chain domains)
+        """
+        sourceNameL = list(self.__providerD.keys())
+        if sourcePairL is None:
+            sourcePairL = [(sourceNameL[ii], sourceNameL[jj]) for ii in range(len(sourceNameL)) for jj in range(ii + 1, len(sourceNameL))]
+        startTime = time.time()
+        rD = {}
+        for sourceName1, sourceName2 in sourcePairL:
+            cD1 = self.__getChainIntervals(sourceName1)
+            cD2 = self.__getChainIntervals(sourceName2)
+            rowL = []
+            for chainKey in sorted(cD1.keys() & cD2.keys()):
+                rowL.extend(self.__getOverlapRows(chainKey, cD1[chainKey], cD2[chainKey], minOverlap))
+            rD[(sourceName1, sourceName2)] = rowL
+            logger.info("%s-%s overlaps (%d)", sourceName1, sourceName2, len(rowL))
+        logger.info("Overlap tables (%d) completed (%.4f seconds)", len(rD), time.time() - startTime)
+        return rD
+
+    def __getOverlapRows(self, chainKey, intervalL1, intervalL2, minOverlap):
+        # Overlapping residues summed over the segments of each domain pair
+        overlapD = {}
+        for item1, item2, beg, end in sweepOverlaps(intervalL1, intervalL2):
+            numRes = getResidueCount(beg, end)
+            ky = (item1, item2)
+            if ky in overlapD:
+                overlapD[ky] = overlapD[ky] + numRes if overlapD[ky] is not None and numRes is not None else None
+            else:
+                overlapD[ky] = numRes
+        if not overlapD:
+            return []
+        lenD1 = self.__getDomainResidueCounts(intervalL1)
+        lenD2 = self.__getDomainResidueCounts(intervalL2)
+        rowL = []
+        for ((nodeId1, domainId1), (nodeId2, domainId2)), numRes in overlapD.items():
+            if numRes is not None and numRes < minOverlap:
+                continue
+            rowL.append(
+                {
+                    "pdbId": chainKey[0],
+                    "authAsymId": chainKey[1],
+                    "domainId1": domainId1,
+                    "nodeId1": nodeId1,
+                    "domainId2": domainId2,
+                    "nodeId2": nodeId2,
+                    "overlapResidues": numRes,
+                    "domainResidues1": lenD1[(nodeId1, domainId1)],
+                    "domainResidues2": lenD2[(nodeId2, domainId2)],
+                }
+            )
+        return rowL
+
+    def __getDomainResidueCounts(self, intervalL):
+        lenD = {}
+        for beg, end, item in intervalL:
+            numRes = getResidueCount(beg, end)
+            if item in lenD:
+                lenD[item] = lenD[item] + numRes if lenD[item] is not None and numRes is not None else None
+            else:
+                lenD[item] = numRes
+        return lenD
+
+    def writeOverlapTables(self, dirPath, sourcePairL=None, minOverlap=1):
+        """Write the residue overlap tables (cf. getOverlapTables()) as CSV files <dirPath>/<sourceName1>-<sourceName2>-overlaps.csv.
+
+        Returns:
+            dict: {(sourceName1, sourceName2): filePath, ...} for the tables written successfully
+        """
+        mU = MarshalUtil()
+        mU.mkdir(dirPath)
+        pathD = {}
+        for (sourceName1, sourceName2), rowL in self.getOverlapTables(sourcePairL=sourcePairL, minOverlap=minOverlap).items():
+            filePath = os.path.join(dirPath, "%s-%s-overlaps.csv" % (sourceName1, sourceName2))
+            ok = self.__writeCsv(filePath, rowL)
+            if ok:
+                pathD[(sourceName1, sourceName2)] = filePath
+            else:
+                logger.error("Failing writing overlap table %r", filePath)
+        return pathD
+
+    def __writeCsv(self, filePath, rowL):
+        # MarshalUtil takes the column names from the first row, so empty tables are written directly
+        if rowL:
+            mU = MarshalUtil()
+            return mU.doExport(filePath, rowL, fmt="csv", fieldNames=OVERLAP_TABLE_COLUMNS)
+        try:
+            with open(filePath, "w", encoding="utf-8") as ofh:
+                ofh.write(",".join(OVERLAP_TABLE_COLUMNS) + "\n")
+            return True
+        except Exception as e:
+            logger.error("Failing writing %r with %s", filePath, str(e))
+        return False
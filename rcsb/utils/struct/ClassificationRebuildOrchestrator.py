@@ -0,0 +1,186 @@
+##
+#  File:  ClassificationRebuildOrchestrator.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Concurrent (asyncio) rebuilds of the CATH, ECOD, SCOPe and SCOP2 classification provider caches
+  with per-source timeouts and fallback to the backup resources.
+
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import signal
+import time
+
+from rcsb.utils.struct.CathClassificationProvider import CathClassificationProvider
+from rcsb.utils.struct.EcodClassificationProvider import EcodClassificationProvider
+from rcsb.utils.struct.Scop2ClassificationProvider import Scop2ClassificationProvider
+from rcsb.utils.struct.ScopClassificationProvider import ScopClassificationProvider
+
+logger = logging.getLogger(__name__)
+
+REBUILD_PROVIDER_NAMES = ["cath", "ecod", "scope", "scop2"]
+
+
+def getClassificationProvider(providerName, cachePath, useCache=True, **kwargs):
+    """Return the classification provider instance for the input provider name.
+
+    Args:
+        providerName (str): provider name (cath, ecod, scope, scop2)
+        cachePath (str): top-level cache directory
+        useCache (bool, optional): load the existing cache rather than rebuilding it. Defaults to True.
+        kwargs: provider keyword arguments (e.g., source and backup locators)
+
+    Returns:
+        object: provider instance
+    """
+    if providerName == "cath":
+        return CathClassificationProvider(cachePath=cachePath, useCache=useCache, **kwargs)
+    elif providerName == "ecod":
+        return EcodClassificationProvider(cachePath, useCache, **kwargs)
+    elif providerName == "scope":
+        return ScopClassificationProvider(cachePath=cachePath, useCache=useCache, **kwargs)
+    elif providerName == "scop2":
+        return Scop2ClassificationProvider(cachePath, useCache, **kwargs)
+    raise ValueError("Unsupported classification provider %r" % providerName)
+
+
+class ClassificationRebuildOrchestrator(object):
+    """Rebuild the classification provider caches concurrently.
+
+    Each provider rebuild (source fetch, parse and cache export) runs in a worker process of its own
+    single-process executor (awaited with loop.run_in_executor() and asyncio.wait_for()), so the downloads
+    and the CPU-bound parses of the different sources overlap when more than one CPU is available.  A rebuild
+    that fails or exceeds its timeout is terminated and the provider cache is then loaded from the provider
+    backup resource (fromBackup).  Separate executors allow a timed out worker to be terminated without
+    breaking the other rebuilds.
+    """
+
+    def __init__(self, cachePath, **kwargs):
+        """
+        Args:
+            cachePath (str): top-level cache directory
+            timeout (float, optional): default per-source rebuild timeout in seconds (None for no limit). Defaults to 3600.
+            timeoutD (dict, optional): per-source rebuild timeouts {providerName: seconds, ...}. Defaults to {}.
+            backupTimeout (float, optional): timeout for loading a cache from its backup resource. Defaults to 600.
+            useBackup (bool, optional): fall back to the backup resources for failed or timed out rebuilds. Defaults to True.
+            providerKwargsD (dict, optional): provider keyword arguments {providerName: {...}, ...}. Defaults to {}.
+        """
+        self.__cachePath = os.path.abspath(cachePath)
+        self.__timeout = kwargs.get("timeout", 3600)
+        self.__timeoutD = kwargs.get("timeoutD", {})
+        self.__backupTimeout = kwargs.get("backupTimeout", 600)
+        self.__useBackup = kwargs.get("useBackup", True)
+        self.__providerKwargsD = kwargs.get("providerKwargsD", {})
+        self.__ctx = multiprocessing.get_context("spawn")
+
+    def run(self, providerNameL=None):
+        """Rebuild the provider caches (cf. rebuild()) from synchronous code."""
+        return asyncio.run(self.rebuild(providerNameL=providerNameL))
+
+    async def rebuild(self, providerNameL=None):
+        """Rebuild the provider caches concurrently.
+
+        Args:
+            providerNameL (list, optional): provider names (cath, ecod, scope, scop2). Defaults to all providers.
+
+        Returns:
+            dict: {"wallSeconds": ..., "results": {providerName: {"status": "primary"|"backup"|"failed", "valid": bool,
+                   "seconds": ..., "attempts": [{"source": "primary"|"backup", "valid": ..., "seconds": ..., "error": ...}, ...],
+                   "buildStats": {...}}, ...}}
+        """
+        providerNameL = providerNameL if providerNameL else REBUILD_PROVIDER_NAMES
+        for providerName in providerNameL:
+            if providerName not in REBUILD_PROVIDER_NAMES:
+                raise ValueError("Unsupported classification provider %r" % providerName)
+        startTime = time.time()
+        resultL = await asyncio.gather(*[self.__rebuildProvider(providerName) for providerName in providerNameL])
+        rD = {"wallSeconds": time.time() - startTime, "results": dict(zip(providerNameL, resultL))}
+        logger.info("Rebuilt %r in %.2f seconds", {pN: tD["status"] for pN, tD in rD["results"].items()}, rD["wallSeconds"])
+        return rD
+
+    async def __rebuildProvider(self, providerName):
+        startTime = time.time()
+        kwD = dict(self.__providerKwargsD.get(providerName, {}))
+        rD = {"status": "failed", "valid": False, "attempts": [], "buildStats": {}}
+        tD = await self.__runWorker(providerName, "primary", kwD, self.__timeoutD.get(providerName, self.__timeout))
+        rD["attempts"].append(tD)
+        if not tD["valid"] and self.__useBackup:
+            kwD["fromBackup"] = True
+            tD = await self.__runWorker(providerName, "backup", kwD, self.__backupTimeout)
+            rD["attempts"].append(tD)
+        if tD["valid"]:
+            rD["status"] = tD["source"]
+            rD["valid"] = True
+            rD["buildStats"] = tD.pop("buildStats", {})
+        rD["seconds"] = time.time() - startTime
+        logger.info("%s rebuild status %r (%.2f seconds)", providerName, rD["status"], rD["seconds"])
+        return rD
+
+    async def __runWorker(self, providerName, source, kwD, timeout):
+        """Run a single provider rebuild in a worker process (terminated if it exceeds the timeout)."""
+        startTime = time.time()
+        tD = {"source": source, "valid": False}
+        loop = asyncio.get_running_loop()
+        # The worker records its process id on start and skips the rebuild if it is cancelled before it starts
+        pidValue = self.__ctx.Value("i", 0)
+        cancelValue = self.__ctx.Value("i", 0)
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=self.__ctx, initializer=_initRebuildWorker, initargs=(pidValue, cancelValue))
+        try:
+            future = loop.run_in_executor(executor, _rebuildWorker, providerName, self.__cachePath, kwD)
+            tD.update(await asyncio.wait_for(future, timeout))
+        except asyncio.TimeoutError:
+            tD["error"] = "timeout after %.1f seconds" % timeout
+            cancelValue.value = 1
+            if pidValue.value:
+                _terminateProcess(pidValue.value)
+        except concurrent.futures.process.BrokenProcessPool as e:
+            tD["error"] = "worker exited (%s)" % str(e)
+        except Exception as e:
+            logger.exception("Failing %s %s rebuild with %s", providerName, source, str(e))
+            tD["error"] = str(e)
+        finally:
+            await loop.run_in_executor(None, executor.shutdown)
+        tD["seconds"] = time.time() - startTime
+        if tD.get("error"):
+            logger.warning("%s %s rebuild failed (%s)", providerName, source, tD["error"])
+        return tD
+
+
+def _terminateProcess(pid):
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError as e:
+        logger.debug("Failing to terminate process %r with %s", pid, str(e))
+
+
+_WORKER_CANCEL_VALUE = None
+
+
+def _initRebuildWorker(pidValue, cancelValue):
+    global _WORKER_CANCEL_VALUE
+    _WORKER_CANCEL_VALUE = cancelValue
+    pidValue.value = os.getpid()
+
+
+def _rebuildWorker(providerName, cachePath, kwD):
+    """Rebuild (or load from backup) a provider cache in a worker process and return the outcome."""
+    tD = {"valid": False}
+    if _WORKER_CANCEL_VALUE is not None and _WORKER_CANCEL_VALUE.value:
+        tD["error"] = "cancelled"
+        return tD
+    try:
+        prov = getClassificationProvider(providerName, cachePath, useCache=False, **kwD)
+        tD["valid"] = prov.testCache()
+        tD["buildStats"] = prov.getBuildStats()
+    except Exception as e:
+        logger.exception("Failing %s rebuild with %s", providerName, str(e))
+        tD["error"] = str(e)
+    return tD
@@ -0,0 +1,239 @@
+##
+#  File:  DomainIntervalIndex.py
+#  Date:  16-Oct-2026
+#
+#  Updates:
+#   16-Oct-2026  Add updateChains() for incremental updates
+#   16-Oct-2026  Add lazy mode indexing chains on first query
+#   17-Oct-2026  Replace the running maximum end scan with a nested containment list
+##
+"""
+  Per-chain sorted interval index supporting residue position and residue range queries
+  over domain assignments.
+
+"""
+
+import bisect
+import logging
+import re
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+class DomainIntervalIndex(object):
+    """Per-chain sorted interval index over domain residue ranges.
+
+    Intervals for each chain are stored in parallel lists sorted on (begin, end) and arranged as a nested
+    containment list: each interval contained in another interval is placed in the sublist of its innermost
+    containing interval, so no interval in a sublist contains another and the end positions in each sublist
+    are sorted.  A query bisects the top-level sublist on end position, scans forward over the overlapping
+    intervals (stopping at the first interval beginning after the query) and descends only into the sublists
+    of overlapping intervals.  For n intervals on the chain and k results, a query visits at most
+    k + 1 + (number of sublists descended) intervals after O(log n) bisections per sublist, so long and
+    whole-chain intervals are visited once instead of forcing a scan of the intervals they contain.
+
+    Residue bounds are converted to integers at build time (insertion codes are ignored).  Assignments
+    with undefined bounds on both ends (e.g., whole chain SCOPe domains) cover every residue position.
+
+    In lazy mode, the entry for each chain is built from the assignment dictionary on the first query for the chain.
+    """
+
+    def __init__(self, assignD=None, rangeFunc=None, lazy=False):
+        """
+        Args:
+            assignD (dict, optional): assignment dictionary aD[chainKey] = [assignment tuple, ...]. Defaults to None.
+            rangeFunc (func, optional): function returning (resBeg, resEnd, item) for an assignment tuple. Defaults to None.
+            lazy (bool, optional): index chains on first query rather than at construction. Defaults to False.
+        """
+        self.__indexD = {}
+        self.__assignD = None
+        self.__rangeFunc = None
+        self.__numVisited = 0
+        if assignD and lazy:
+            self.__assignD, self.__rangeFunc = assignD, rangeFunc
+        elif assignD:
+            self.build(assignD, rangeFunc)
+
+    def build(self, assignD, rangeFunc):
+        """Build the index from the input assignment dictionary.
+
+        Args:
+            assignD (dict): assignment dictionary aD[chainKey] = [assignment tuple, ...]
+            rangeFunc (func): function returning (resBeg, resEnd, item) for an assignment tuple, where item
+                              is the object returned by queries (e.g., a residue range tuple)
+
+        Returns:
+            int: number of indexed chains
+        """
+        self.__indexD = {}
+        self.__assignD = None
+        numSkipped = 0
+        for chainKey, tupL in assignD.items():
+            rL = []
+            for tup in tupL:
+                interval = self.__getInterval(tup, rangeFunc)
+                if not interval:
+                    numSkipped += 1
+                    continue
+                rL.append(interval)
+            if rL:
+                self.__indexD[chainKey] = self.__buildChainIndex(rL)
+        logger.debug("Indexed chains (%d) skipped ranges (%d)", len(self.__indexD), numSkipped)
+        return len(self.__indexD)
+
+    def updateChains(self, assignD, chainKeyL, rangeFunc):
+        """Rebuild the index entries for the input chains from the current assignment dictionary
+        (chains no longer present in the assignment dictionary are removed).
+
+        Args:
+            assignD (dict): assignment dictionary aD[chainKey] = [assignment tuple, ...]
+            chainKeyL (list): chain keys to rebuild
+            rangeFunc (func): function returning (resBeg, resEnd, item) for an assignment tuple
+
+        Returns:
+            int: number of indexed chains
+        """
+        if self.__assignD is not None:
+            self.__assignD, self.__rangeFunc = assignD, rangeFunc
+        for chainKey in chainKeyL:
+            self.__indexD.pop(chainKey, None)
+            if self.__assignD is not None:
+                continue
+            rL = []
+            for tup in assignD.get(chainKey, []):
+                interval = self.__getInterval(tup, rangeFunc)
+                if interval:
+                    rL.append(interval)
+            if rL:
+                self.__indexD[chainKey] = self.__buildChainIndex(rL)
+        return len(self.__indexD)
+
+    def __getInterval(self, tup, rangeFunc):
+        resBeg, resEnd, item = rangeFunc(tup)
+        begNum = toResidueNumber(resBeg)
+        endNum = toResidueNumber(resEnd)
+        if resBeg is None and resEnd is None:
+            begNum, endNum = -sys.maxsize, sys.maxsize
+        if begNum is None or endNum is None:
+            return None
+        return (min(begNum, endNum), max(begNum, endNum), item)
+
+    def __buildChainIndex(self, rL):
+        rL.sort(key=lambda t: (t[0], t[1]))
+        begL = [t[0] for t in rL]
+        endL = [t[1] for t in rL]
+        itemL = [t[2] for t in rL]
+        # subListL[subId] = (sorted end positions, interval indices) and childL[ii] = subId of the intervals
+        # contained in interval ii (0 if none, as sublist 0 is the top level)
+        childL = [0] * len(rL)
+        subListL = [([], [])]
+        parentL = []
+        for ii in sorted(range(len(rL)), key=lambda jj: (begL[jj], -endL[jj])):
+            while parentL and endL[parentL[-1]] < endL[ii]:
+                parentL.pop()
+            subId = 0
+            if parentL:
+                subId = childL[parentL[-1]]
+                if not subId:
+                    subId = childL[parentL[-1]] = len(subListL)
+                    subListL.append(([], []))
+            subListL[subId][0].append(endL[ii])
+            subListL[subId][1].append(ii)
+            parentL.append(ii)
+        return (begL, endL, itemL, childL, subListL)
+
+    def __getChainIndex(self, chainKey):
+        try:
+            return self.__indexD[chainKey]
+        except KeyError:
+            pass
+        if self.__assignD is None:
+            return None
+        rL = []
+        for tup in self.__assignD.get(chainKey, []):
+            interval = self.__getInterval(tup, self.__rangeFunc)
+            if interval:
+                rL.append(interval)
+        if not rL:
+            return None
+        self.__indexD[chainKey] = self.__buildChainIndex(rL)
+        return self.__indexD[chainKey]
+
+    def __buildAll(self):
+        if self.__assignD is not None:
+            self.build(self.__assignD, self.__rangeFunc)
+
+    def __len__(self):
+        self.__buildAll()
+        return len(self.__indexD)
+
+    def __contains__(self, chainKey):
+        return self.__getChainIndex(chainKey) is not None
+
+    def getChainKeys(self):
+        self.__buildAll()
+        return list(self.__indexD.keys())
+
+    def getIntervals(self, chainKey):
+        """Return the sorted list of (resBeg, resEnd, item) intervals for the input chain."""
+        chainIndex = self.__getChainIndex(chainKey)
+        if not chainIndex:
+            return []
+        begL, endL, itemL, _, _ = chainIndex
+        return list(zip(begL, endL, itemL))
+
+    def getAtResidue(self, chainKey, resNum):
+        """Return the items for intervals covering the input residue number (in order of interval begin)."""
+        return self.getOverlapping(chainKey, resNum, resNum)
+
+    def getOverlapping(self, chainKey, resBeg, resEnd):
+        """Return the items for intervals overlapping the input (inclusive) residue range (in order of interval begin)."""
+        begNum = toResidueNumber(resBeg)
+        endNum = toResidueNumber(resEnd)
+        chainIndex = self.__getChainIndex(chainKey) if begNum is not None and endNum is not None else None
+        if not chainIndex:
+            return []
+        begNum, endNum = min(begNum, endNum), max(begNum, endNum)
+        begL, _, itemL, childL, subListL = chainIndex
+        hitL = []
+        numVisited = 0
+        subIdL = [0]
+        # Sublists of overlapping intervals are appended to subIdL while it is traversed
+        for subId in subIdL:
+            subEndL, subIdxL = subListL[subId]
+            for jj in range(bisect.bisect_left(subEndL, begNum), len(subIdxL)):
+                ii = subIdxL[jj]
+                numVisited += 1
+                if begL[ii] > endNum:
+                    break
+                hitL.append(ii)
+                if childL[ii]:
+                    subIdL.append(childL[ii])
+        self.__numVisited += numVisited
+        if len(subIdL) > 1:
+            hitL.sort()
+        return [itemL[ii] for ii in hitL]
+
+    def getNumVisited(self):
+        """Return the number of intervals examined by the queries on this index (cf. the query cost in the class description)."""
+        return self.__numVisited
+
+
+RESIDUE_NUMBER_PATTERN = re.compile(r"^\s*(-?\d+)")
+
+
+def toResidueNumber(val):
+    """Convert the input residue number (int or string with optional insertion code, e.g., '12A') to an integer.
+
+    Returns:
+        int: residue number or None if the input is undefined or cannot be interpreted
+    """
+    if isinstance(val, int):
+        return val
+    try:
+        mObj = RESIDUE_NUMBER_PATTERN.match(val)
+        return int(mObj.group(1)) if mObj else None
+    except Exception:
+        pass
+    return None
@@ -5,6 +5,29 @@
 #  Updates:
 #  16-Nov-2021 dwp Append additional ecod annotations for given entryId and chainId instead of overwriting
 #  18-Apr-2023 aae Get version from data list directly rather than opening file twice
+#  16-Oct-2026     Add residue position interval index and getDomainsAtResidue()/getDomainsOverlapping()
+#  16-Oct-2026     Materialize id and name lineage tables once per release (stored with the cache)
+#  16-Oct-2026     Export the tree node list once per release (stored with the cache) and add iterTreeNodes()
+#  16-Oct-2026     Add chunked multiprocess parsing of the ECOD domain file (numProc/chunkSize)
+#  16-Oct-2026     Add single pass streaming ingest of the ECOD domain file (ecodStreamingIngest)
+#  16-Oct-2026     Add getBatchAnnotations() and log lookup misses at debug level
+#  16-Oct-2026     Add lazy loading of the cache on first access (lazyLoad)
+#  16-Oct-2026     Add memory-mapped columnar assignment cache (useMappedCache)
+#  16-Oct-2026     Add freezeForFork() for sharing the provider with pre-fork worker pools
+#  17-Oct-2026     Add per-phase build timing and memory statistics (getBuildStats(), buildStatsPath)
+#  17-Oct-2026     Add accessor call, hit and miss counters and latency histograms (lookupStats)
+#  17-Oct-2026     Add fromBackup option to rebuild directly from the backup domain file
+#  17-Oct-2026     Write a cache manifest (getCacheManifest(), testCacheManifest())
+#  17-Oct-2026     Add node member queries with subtree roll-ups (getNodeMembers(), getNodeMemberCount())
+#  17-Oct-2026     Add nested-set hierarchy queries (isDescendant(), getDescendants(), getSubtreeSize())
+#  17-Oct-2026     Add lowest common ancestor queries (getLowestCommonAncestor(), getLowestCommonAncestors())
+#  17-Oct-2026     Add iterDomainIntervals() for bulk cross-classification overlap mapping
+#  17-Oct-2026     Add dense per-residue label arrays (getResidueLabels(), getResidueLabelsBulk())
+#  17-Oct-2026     Add streaming JSON-lines tree node export (exportTreeNodes(), getTreeNodeBytes())
+#  17-Oct-2026     Return the stored tree node list from getTreeNodeList() without copying
+#  17-Oct-2026     Reuse only successful tree node encodings and reset the derived tree node data in freezeForFork()
+#  17-Oct-2026     Check the cache against ECOD_CACHE_MIN_COUNT_D
+#  17-Oct-2026     Stream remote domain files directly from the HTTP response (temporary file only as fallback)
 #
 ##
 """
@@ -14,19 +37,74 @@
 """
 
 import collections
+import concurrent.futures
 import datetime
+import gc
+import gzip
+import io
+import itertools
 import logging
 import os.path
 import sys
+import threading
+import time
+import urllib.error
+import urllib.request
 
 from rcsb.utils.io.FileUtil import FileUtil
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.StashableBase import StashableBase
+from rcsb.utils.struct.BuildStats import BuildStats
+from rcsb.utils.struct.CacheManifest import checkCacheManifest
+from rcsb.utils.struct.CacheManifest import readCacheManifest
+from rcsb.utils.struct.CacheManifest import writeCacheManifest
+from rcsb.utils.struct.DomainIntervalIndex import DomainIntervalIndex
+from rcsb.utils.struct.HierarchyIndex import HierarchyIndex
+from rcsb.utils.struct.LookupStats import LookupStatsMixin
+from rcsb.utils.struct.LookupStats import isAncestorFound
+from rcsb.utils.struct.LookupStats import isAnyAnnotated
+from rcsb.utils.struct.LookupStats import isAnyFound
+from rcsb.utils.struct.LookupStats import isAnyLabeled
+from rcsb.utils.struct.LookupStats import isFound
+from rcsb.utils.struct.LookupStats import isNonEmpty
+from rcsb.utils.struct.LookupStats import isPositive
+from rcsb.utils.struct.MappedAssignmentStore import MappedAssignmentStore
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedCache
+from rcsb.utils.struct.MappedAssignmentStore import loadMappedCache
+from rcsb.utils.struct.NodeMemberIndex import NodeMemberIndex
+from rcsb.utils.struct.ResidueLabelArrays import encodeResidueLabels
+from rcsb.utils.struct.TreeNodeExport import encodeTreeNodes
+from rcsb.utils.struct.TreeNodeExport import writeTreeNodes
 
 logger = logging.getLogger(__name__)
 
+# Layout of the assignment tuples (domainId, familyId, authAsymId, resBeg, resEnd) in the mapped cache
+ECOD_ASSIGNMENT_SHAPE = [0, 0, 0, 0, 0]
+# ECOD name, name type, parent and lineage tables and tree node list read in place from the mapped cache
+ECOD_MAPPED_TABLE_KEYS = ["names", "nametypes", "parents", "idLineage", "nameLineage", "treeNodes"]
+# Record counts to be exceeded by a valid cache (cf. testCache())
+ECOD_CACHE_MIN_COUNT_D = {"names": 100, "assignments": 5000}
+# Lookup accessors counted with lookupStats and the tests of their results counted as hits
+ECOD_LOOKUP_ACCESSOR_D = {
+    "getFamilyIds": isNonEmpty,
+    "getDomainIds": isNonEmpty,
+    "getFamilyNames": isNonEmpty,
+    "getFamilyResidueRanges": isNonEmpty,
+    "getBatchAnnotations": isAnyAnnotated,
+    "getDomainsAtResidue": isNonEmpty,
+    "getDomainsOverlapping": isNonEmpty,
+    "getResidueLabels": isAnyLabeled,
+    "getName": isFound,
+    "getNameType": isFound,
+    "getNodeMembers": isNonEmpty,
+    "getNodeMemberCount": isPositive,
+    "getIdLineage": isNonEmpty,
+    "getNameLineage": isAnyFound,
+    "getLowestCommonAncestor": isAncestorFound,
+}
 
-class EcodClassificationProvider(StashableBase):
+
+class EcodClassificationProvider(StashableBase, LookupStatsMixin):
     """Extract ECOD domain assignments, term descriptions and ECOD classification hierarchy
     from ECOD flat files.
 
@@ -53,42 +131,140 @@ class EcodClassificationProvider(StashableBase):
         #
         urlTarget = kwargs.get("ecodTargetUrl", "http://prodata.swmed.edu/ecod/distributions/ecod.latest.domains.txt")
         urlBackup = kwargs.get("ecodUrlBackupPath", "https://raw.githubusercontent.com/rcsb/py-rcsb_exdb_assets/master/fall_back/ECOD/ecod.latest.domains.txt.gz")
+        # Number of worker processes and lines per chunk used to parse the ECOD domain file (numProc=1 parses in process)
+        self.__numProc = kwargs.get("numProc", 1)
+        self.__chunkSize = kwargs.get("chunkSize", 50000)
+        # Parse the ECOD domain file while it is read (and decompressed) rather than from a downloaded copy
+        self.__streamingIngest = kwargs.get("ecodStreamingIngest", False)
         #
+        self.__urlTarget = urlTarget
+        self.__urlBackup = urlBackup
+        # Skip the primary source in rebuilds and rebuild directly from the backup domain file
+        self.__fromBackup = kwargs.get("fromBackup", False)
         self.__mU = MarshalUtil(workPath=self.__dirPath)
-        self.__pD, self.__nD, self.__ntD, self.__pdbD = self.__reload(urlTarget, urlBackup, self.__dirPath, useCache=useCache)
+        # Read the assignment index in place from a memory-mapped copy of the cache (written alongside the pickle cache)
+        self.__useMappedCache = kwargs.get("useMappedCache", False)
+        # Record the per-phase timing (and optionally the traced memory) of each reload with an optional JSON report
+        self.__traceMemory = kwargs.get("traceMemory", False)
+        self.__buildStatsPath = kwargs.get("buildStatsPath", None)
+        self.__buildStats = None
+        self._initLookupStats(kwargs.get("lookupStats", False), ECOD_LOOKUP_ACCESSOR_D)
+        # Defer reading (or building) the cache until the first accessor call
+        self.__lazyLoad = kwargs.get("lazyLoad", False)
+        self.__loadLock = threading.Lock()
+        self.__isLoaded = False
+        if self.__lazyLoad:
+            ecodDomainPath = os.path.join(self.__dirPath, self.__getDomainFileName())
+            logger.info("Deferring ECOD load (cache %r present %r)", ecodDomainPath, self.__mU.exists(ecodDomainPath))
+        else:
+            self.__load()
+
+    def __load(self):
+        urlTarget = self.__urlBackup if self.__fromBackup else self.__urlTarget
+        self.__pD, self.__nD, self.__ntD, self.__pdbD = self.__reload(urlTarget, self.__urlBackup, self.__dirPath, useCache=self.__useCache)
+        self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange, lazy=isinstance(self.__pdbD, MappedAssignmentStore))
+        self.__resetMemberIndex()
+        self.__isLoaded = True
+
+    def __ensureLoaded(self):
+        if not self.__isLoaded:
+            with self.__loadLock:
+                if not self.__isLoaded:
+                    self.__load()
 
     def testCache(self):
+        self.__ensureLoaded()
         logger.info("ECOD Lengths nD %d pdbD %d", len(self.__nD), len(self.__pdbD))
-        if (len(self.__nD) > 100) and (len(self.__pdbD) > 5000):
-            return True
-        return False
+        countD = {"names": len(self.__nD), "assignments": len(self.__pdbD)}
+        return all(countD[ky] > minCount for ky, minCount in ECOD_CACHE_MIN_COUNT_D.items())
+
+    def getCacheManifest(self):
+        """Return the manifest of the ECOD cache file (cf. readCacheManifest()) or {} if there is no manifest (the cache is not loaded)."""
+        return readCacheManifest(os.path.join(self.__dirPath, self.__getDomainFileName())) or {}
+
+    def testCacheManifest(self, verifyChecksum=False):
+        """Check the ECOD cache file and record counts against the manifest without loading the cache (cf. checkCacheManifest())."""
+        return checkCacheManifest(os.path.join(self.__dirPath, self.__getDomainFileName()), ECOD_CACHE_MIN_COUNT_D, verifyChecksum=verifyChecksum)
+
+    def getBuildStats(self):
+        """Return the per-phase statistics of the last ECOD cache load or rebuild (cf. BuildStats.getStats()) or {} if not available."""
+        self.__ensureLoaded()
+        return self.__buildStats.getStats() if self.__buildStats else {}
+
+    def __finishBuildStats(self, bS):
+        bS.finish()
+        self.__buildStats = bS
+        if self.__buildStatsPath:
+            ok = bS.writeReport(self.__buildStatsPath)
+            logger.debug("Build report %r save status %r", self.__buildStatsPath, ok)
+
+    def freezeForFork(self):
+        """Switch the ECOD name, name type, parent, lineage, tree node and assignment tables to the mapped cache form shared by forked workers (cf. freezeGcForFork()).
+
+        Returns:
+            bool: True if the provider tables are memory-mapped or False otherwise
+        """
+        self.__ensureLoaded()
+        ok = isinstance(self.__pdbD, MappedAssignmentStore)
+        if not ok:
+            ecodDomainPath = os.path.join(self.__dirPath, self.__getDomainFileName())
+            sD = loadMappedCache(ecodDomainPath, ["assignments"], tableKeyL=ECOD_MAPPED_TABLE_KEYS)
+            if sD is None:
+                cD = {
+                    "version": self.__version,
+                    "names": self.__nD,
+                    "nametypes": self.__ntD,
+                    "parents": self.__pD,
+                    "assignments": self.__pdbD,
+                    "idLineage": self.__idLineageD,
+                    "nameLineage": self.__nameLineageD,
+                    "treeNodes": self.__treeNodeL,
+                }
+                if exportMappedCache(ecodDomainPath, cD, {"assignments": ECOD_ASSIGNMENT_SHAPE}, tableKeyL=ECOD_MAPPED_TABLE_KEYS):
+                    sD = loadMappedCache(ecodDomainPath, ["assignments"], tableKeyL=ECOD_MAPPED_TABLE_KEYS)
+            if sD is not None:
+                self.__nD, self.__ntD, self.__pD, self.__pdbD = sD["names"], sD["nametypes"], sD["parents"], sD["assignments"]
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+                self.__treeNodeL = self.__treeNodeL if sD.get("treeNodes") is None else sD["treeNodes"]
+                self.__hierarchyIndex = None
+                self.__treeNodeBytesD = {}
+                self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange, lazy=True)
+                self.__resetMemberIndex()
+                ok = True
+        logger.info("ECOD provider frozen for fork (mapped tables %r)", ok)
+        return ok
 
     def getVersion(self):
+        self.__ensureLoaded()
         return self.__version
 
     # --
     def getFamilyIds(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[1] for tup in self.__pdbD[(pdbId.lower(), authAsymId)]]))
         except Exception as e:
-            logger.exception("Failing for %r %r with %s", pdbId, authAsymId, str(e))
+            logger.debug("Failing for %r %r with %s", pdbId, authAsymId, str(e))
         return []
 
     def getDomainIds(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[0] for tup in self.__pdbD[(pdbId.lower(), authAsymId)]]))
         except Exception as e:
-            logger.exception("Failing for %r %r with %s", pdbId, authAsymId, str(e))
+            logger.debug("Failing for %r %r with %s", pdbId, authAsymId, str(e))
         return []
 
     def getFamilyNames(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
-            return list(set([self.getName(tup[1]) for tup in self.__pdbD[(pdbId.lower(), authAsymId)]]))
+            return list(set([self.__getName(tup[1]) for tup in self.__pdbD[(pdbId.lower(), authAsymId)]]))
         except Exception as e:
-            logger.exception("Failing for %r %r with %s", pdbId, authAsymId, str(e))
+            logger.debug("Failing for %r %r with %s", pdbId, authAsymId, str(e))
         return []
 
     def getFamilyResidueRanges(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             # pdbD.setdefault((pdbId, authAsymId), []).append((domId, fId, authAsymId, authSeqBeg, authSeqEnd))
             return [(tup[0], tup[1], tup[2], tup[3], tup[4]) for tup in self.__pdbD[(pdbId.lower(), authAsymId)]]
@@ -96,7 +272,115 @@ class EcodClassificationProvider(StashableBase):
             logger.debug("Failing for %r %r with %s", pdbId, authAsymId, str(e))
         return []
 
+    def getBatchAnnotations(self, chainKeys, fields=None):
+        """Return the ECOD annotations for a batch of chains in a single call.
+
+        Args:
+            chainKeys (iterable): chain keys [(pdbId, authAsymId), ...]
+            fields (list, optional): annotation fields (familyIds, domainIds, familyNames, residueRanges). Defaults to all fields.
+
+        Returns:
+            dict: {(pdbId, authAsymId): {field: [...], ...}, ...} with empty field lists for chains without assignments
+        """
+        self.__ensureLoaded()
+        fD = {
+            "familyIds": lambda tupL: list({tup[1]: None for tup in tupL}),
+            "domainIds": lambda tupL: list({tup[0]: None for tup in tupL}),
+            "familyNames": lambda tupL: list({self.__getName(tup[1]): None for tup in tupL}),
+            "residueRanges": lambda tupL: [(tup[0], tup[1], tup[2], tup[3], tup[4]) for tup in tupL],
+        }
+        fieldL = fields if fields else list(fD.keys())
+        funcL = [(field, fD[field]) for field in fieldL if field in fD]
+        if len(funcL) < len(fieldL):
+            logger.warning("Skipping unsupported annotation fields %r", [field for field in fieldL if field not in fD])
+        rD = {}
+        for pdbId, authAsymId in chainKeys:
+            tupL = self.__pdbD.get((pdbId.lower(), authAsymId))
+            rD[(pdbId, authAsymId)] = {field: func(tupL) if tupL else [] for field, func in funcL}
+        return rD
+
+    def getDomainsAtResidue(self, pdbId, authAsymId, resNum):
+        """Return the ECOD domain residue ranges covering the input residue number.
+
+        Returns:
+            list: [(domainId, familyId, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        return self.__intervalIndex.getAtResidue((pdbId.lower(), authAsymId), resNum)
+
+    def getDomainsOverlapping(self, pdbId, authAsymId, begResNum, endResNum):
+        """Return the ECOD domain residue ranges overlapping the input (inclusive) residue range.
+
+        Returns:
+            list: [(domainId, familyId, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        return self.__intervalIndex.getOverlapping((pdbId.lower(), authAsymId), begResNum, endResNum)
+
+    def iterDomainIntervals(self):
+        """Yield the ECOD domain residue intervals of each chain (ordered by residue range begin).
+
+        Yields:
+            ((pdbId, authAsymId), [(resBeg, resEnd, (familyId, domainId)), ...]) with integer residue bounds
+        """
+        self.__ensureLoaded()
+        for chainKey in self.__intervalIndex.getChainKeys():
+            yield chainKey, self.__getDomainIntervals(chainKey)
+
+    def getResidueLabels(self, pdbId, authAsymId, begResNum, endResNum, labelType="node", vocabulary=None):
+        """Return the per-residue ECOD labels of the input chain over the input (inclusive) residue numbering span.
+
+        Args:
+            pdbId (str): PDB identifier
+            authAsymId (str): author chain identifier
+            begResNum (int): first residue number of the span
+            endResNum (int): last residue number of the span
+            labelType (str, optional): residue labels "node" (ECOD family identifiers) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+        Returns:
+            (array, ResidueLabelVocabulary): label codes of the residues in the span (0 for unassigned residues) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        labelA, _, vocabulary = self.__getResidueLabelsBulk([(pdbId, authAsymId, begResNum, endResNum)], labelType=labelType, vocabulary=vocabulary)
+        return labelA, vocabulary
+
+    def getResidueLabelsBulk(self, chainSpanL, labelType="node", vocabulary=None):
+        """Return the per-residue ECOD labels of a batch of chains in a single contiguous label array (cf. encodeResidueLabels()).
+
+        Args:
+            chainSpanL (list): chains and residue numbering spans [(pdbId, authAsymId, begResNum, endResNum), ...]
+            labelType (str, optional): residue labels "node" (ECOD family identifiers) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+        Returns:
+            (array, list, ResidueLabelVocabulary): label array, start offsets of the chains (followed by the total length) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        return self.__getResidueLabelsBulk(chainSpanL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getResidueLabelsBulk(self, chainSpanL, labelType, vocabulary):
+        chainIntervalL = [(self.__getDomainIntervals((pdbId.lower(), authAsymId)), begResNum, endResNum) for pdbId, authAsymId, begResNum, endResNum in chainSpanL]
+        return encodeResidueLabels(chainIntervalL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getDomainIntervals(self, chainKey):
+        return [(resBeg, resEnd, (tup[1], tup[0])) for resBeg, resEnd, tup in self.__intervalIndex.getIntervals(chainKey)]
+
+    def __getNodeMember(self, tup):
+        return (tup[1], tup[0])
+
+    def __resetMemberIndex(self):
+        # Reverse index from nodes to member chain domains (built on the first member query)
+        self.__memberIndex = NodeMemberIndex([self.__pdbD], self.__getNodeMember, lambda nodeId: self.__idLineageD.get(nodeId))
+
+    def __getIntervalRange(self, tup):
+        return tup[3], tup[4], (tup[0], tup[1], tup[2], tup[3], tup[4])
+
     def getName(self, domId):
+        self.__ensureLoaded()
+        return self.__getName(domId)
+
+    def __getName(self, domId):
         try:
             return self.__nD[domId].split("|")[0]
         except Exception:
@@ -104,6 +388,7 @@ class EcodClassificationProvider(StashableBase):
         return None
 
     def getNameType(self, domId):
+        self.__ensureLoaded()
         qD = {"A": "Architecture", "X": "Possible Homology", "H": "Homology", "T": "Topology", "F": "Family"}
         try:
             return qD[self.__ntD[domId]]
@@ -111,36 +396,177 @@ class EcodClassificationProvider(StashableBase):
             logger.debug("Undefined ECOD id %r", domId)
         return None
 
+    def getNodeMembers(self, domId, subtree=False):
+        """Return the chain domains assigned to the input ECOD node (or to any node in its subtree).
+
+        Args:
+            domId (int): ECOD node identifier (e.g., family identifier 500123)
+            subtree (bool, optional): include the members of all descendant nodes. Defaults to False.
+
+        Returns:
+            list: [(pdbId, authAsymId, domainId), ...]
+        """
+        self.__ensureLoaded()
+        return self.__memberIndex.getMembers(domId, subtree=subtree)
+
+    def getNodeMemberCount(self, domId, subtree=False):
+        """Return the number of chain domains assigned to the input ECOD node (or to any node in its subtree)."""
+        self.__ensureLoaded()
+        return self.__memberIndex.getMemberCount(domId, subtree=subtree)
+
     def getIdLineage(self, domId):
+        self.__ensureLoaded()
+        if domId in self.__idLineageD:
+            return list(self.__idLineageD[domId])
+        return self.__getIdLineage(domId, self.__pD)
+
+    def getNameLineage(self, domId):
+        self.__ensureLoaded()
+        if domId in self.__nameLineageD:
+            return list(self.__nameLineageD[domId])
+        try:
+            nL = []
+            for dId in self.__getIdLineage(domId, self.__pD):
+                tN = self.__getName(dId)
+                tN = tN if tN else "Unnamed"
+                nL.append(tN)
+            return nL
+        except Exception as e:
+            logger.exception("Failing for %r with %s", domId, str(e))
+        return None
+
+    def __getIdLineage(self, domId, pD):
         pList = []
         try:
             pList.append(domId)
             if domId == 0:
                 return pList
-            pt = self.__pD[domId]
+            pt = pD[domId]
             while (pt is not None) and (pt != 0):
                 pList.append(pt)
-                pt = self.__pD[pt]
+                pt = pD[pt]
         except Exception as e:
             logger.exception("Failing for %r with %s", domId, str(e))
         #
         pList.reverse()
         return pList
 
-    def getNameLineage(self, domId):
-        try:
-            nL = []
-            for dId in self.getIdLineage(domId):
-                tN = self.getName(dId)
-                tN = tN if tN else "Unnamed"
-                nL.append(tN)
-            return nL
-        except Exception as e:
-            logger.exception("Failing for %r with %s", domId, str(e))
-        return None
+    def __buildLineageTables(self, nD, pD):
+        """Materialize the id and name lineages for all nodes in the ECOD hierarchy (including the root 0).
+
+        Returns:
+            (dict, dict): idLineageD[domId] = (domId, ...), nameLineageD[domId] = (name, ...)  ordered from the root
+        """
+        idLineageD = {}
+        nameLineageD = {}
+        nameD = {}
+        for domId in [0] + list(pD.keys()):
+            idL = self.__getIdLineage(domId, pD)
+            idLineageD[domId] = tuple(idL)
+            for dId in idL:
+                if dId not in nameD:
+                    tN = nD[dId].split("|")[0] if dId in nD else None
+                    nameD[dId] = tN if tN else "Unnamed"
+            nameLineageD[domId] = tuple([nameD[dId] for dId in idL])
+        logger.debug("ECOD lineage tables (%d)", len(idLineageD))
+        return idLineageD, nameLineageD
+
+    def isDescendant(self, domId, ancestorId):
+        """Return True if the input ECOD node is a (proper) descendant of the input ancestor node (nested-set test).
+
+        Args:
+            domId (int): ECOD node identifier
+            ancestorId (int): ECOD ancestor node identifier
+
+        Returns:
+            bool: True if ancestorId is a proper ancestor of domId or False otherwise
+        """
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().isDescendant(domId, ancestorId)
+
+    def getDescendants(self, domId):
+        """Return the (proper) descendants of the input ECOD node in tree pre-order."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getDescendants(domId)
+
+    def getSubtreeSize(self, domId):
+        """Return the number of ECOD nodes in the subtree rooted at the input node (including the node)."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getSubtreeSize(domId)
+
+    def getLowestCommonAncestor(self, domId1, domId2):
+        """Return the lowest common ancestor of the input ECOD nodes and its level (A, X, H, T or F).
+
+        Args:
+            domId1 (int): ECOD node identifier
+            domId2 (int): ECOD node identifier
+
+        Returns:
+            (int, str): lowest common ancestor identifier and level or (None, None) if the nodes share no ancestor
+        """
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors([(domId1, domId2)])[0]
+
+    def getLowestCommonAncestors(self, domIdPairL):
+        """Return the lowest common ancestors and levels of the input ECOD node pairs (cf. getLowestCommonAncestor())."""
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors(domIdPairL)
+
+    def __getLowestCommonAncestors(self, domIdPairL):
+        return [(lcaId, self.__ntD.get(lcaId)) for lcaId, _ in self.__getHierarchyIndex().getLcaList(domIdPairL)]
+
+    def __getHierarchyIndex(self):
+        # Nested-set index built from the tree node list (with string identifiers) on the first hierarchy query
+        if self.__hierarchyIndex is None:
+            self.__hierarchyIndex = HierarchyIndex({"id": int(dD["id"]), "parents": [int(pId) for pId in dD.get("parents", [])]} for dD in self.iterTreeNodes())
+        return self.__hierarchyIndex
 
     def getTreeNodeList(self):
-        return self.__exportTreeNodeList(self.__pD)
+        """Return the ECOD tree node list (computed once per release and stored with the cache).
+
+        The stored list is returned without copying and must be treated as read-only (iterTreeNodes() yields copies of the nodes).
+        A mapped tree node list (useMappedCache or freezeForFork()) is decoded on the first call and stored in its place.
+        """
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            self.__treeNodeL = self.__exportTreeNodeList(self.__nD, self.__pD, self.__idLineageD)
+            self.__hierarchyIndex = None
+        elif not isinstance(self.__treeNodeL, list):
+            # Decode the mapped tree node list once (iterTreeNodes() streams from the mapped file)
+            self.__treeNodeL = list(self.__treeNodeL)
+        return self.__treeNodeL
+
+    def iterTreeNodes(self):
+        """Yield the ECOD tree nodes one at a time (in the order of getTreeNodeList())."""
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            yield from self.__iterTreeNodes(self.__nD, self.__pD, self.__idLineageD)
+        else:
+            for dD in self.__treeNodeL:
+                yield dict(dD)
+
+    def exportTreeNodes(self, target, compress=None):
+        """Write the ECOD tree nodes (cf. iterTreeNodes()) incrementally as JSON lines.
+
+        Args:
+            target (str|file): output file path or file-like object (binary for compressed output)
+            compress (bool, optional): gzip compress the output. Defaults to None (compress paths with a .gz suffix).
+
+        Returns:
+            int: number of tree nodes written or None on failure
+        """
+        return writeTreeNodes(self.iterTreeNodes(), target, compress=compress)
+
+    def getTreeNodeBytes(self, compress=False):
+        """Return the ECOD tree nodes serialized as JSON lines (optionally gzip compressed), encoded on first use and reused."""
+        self.__ensureLoaded()
+        treeBytes = self.__treeNodeBytesD.get(compress)
+        if treeBytes is None:
+            treeBytes = encodeTreeNodes(self.iterTreeNodes(), compress=compress)
+            # Failed encodings (None) are not stored so later calls try again
+            if treeBytes is not None:
+                self.__treeNodeBytesD[compress] = treeBytes
+        return treeBytes
 
     def __getDomainFileName(self):
         pyVersion = sys.version_info[0]
@@ -149,36 +575,98 @@ class EcodClassificationProvider(StashableBase):
 
     def __reload(self, urlTarget, urlBackup, ecodDirPath, useCache=True):
         pD = nD = ntD = pdbD = {}
+        self.__idLineageD, self.__nameLineageD = {}, {}
+        self.__treeNodeL = None
+        self.__hierarchyIndex = None
+        self.__treeNodeBytesD = {}
         fn = self.__getDomainFileName()
         ecodDomainPath = os.path.join(ecodDirPath, fn)
         self.__mU.mkdir(ecodDirPath)
+        bS = BuildStats("ECOD", traceMemory=self.__traceMemory)
         #
-        if useCache and self.__mU.exists(ecodDomainPath):
+        if useCache:
+            bS.beginPhase("load")
+        sD = loadMappedCache(ecodDomainPath, ["assignments"], tableKeyL=ECOD_MAPPED_TABLE_KEYS) if useCache and self.__useMappedCache else None
+        if sD is None and useCache and self.__mU.exists(ecodDomainPath):
             sD = self.__mU.doImport(ecodDomainPath, fmt="pickle")
+            if self.__useMappedCache:
+                ok = exportMappedCache(ecodDomainPath, sD, {"assignments": ECOD_ASSIGNMENT_SHAPE}, tableKeyL=ECOD_MAPPED_TABLE_KEYS)
+                logger.debug("Mapped cache save status %r", ok)
+        if sD is not None:
             logger.debug("ECOD domain length %d", len(sD))
             nD = sD["names"]
             ntD = sD["nametypes"]
             pD = sD["parents"]
             pdbD = sD["assignments"]
             self.__version = sD["version"]
+            if "idLineage" in sD and "nameLineage" in sD:
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+            else:
+                self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD, pD)
+            self.__treeNodeL = sD.get("treeNodes", None)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(pdbD))
         elif not useCache:
             minLen = 1000
-            logger.info("Fetch ECOD name and domain assignment data from primary data source %s", urlTarget)
-            nmL = self.__fetchFromSource(urlTarget)
-            if not nmL:
-                nmL = self.__fetchFromSource(urlBackup)
-            #
-            logger.info("ECOD raw file length (%d)", len(nmL))
             ok = False
-            pD, nD, ntD, pdbD = self.__extractDomainHierarchy(nmL)
+            # The hierarchy build allocates millions of long lived objects - suspend cyclic garbage collection
+            gcEnabled = gc.isenabled()
+            gc.disable()
+            try:
+                if self.__streamingIngest:
+                    # Fetching and parsing (with the hierarchy and assignment builds) are a single streamed phase
+                    bS.beginPhase("fetch")
+                    pD, nD, ntD, pdbD = self.__streamDomainHierarchy(urlTarget, urlBackup, minLen)
+                    bS.endPhase(records=len(pdbD))
+                else:
+                    logger.info("Fetch ECOD name and domain assignment data from primary data source %s", urlTarget)
+                    bS.beginPhase("fetch")
+                    nmL = self.__fetchFromSource(urlTarget)
+                    if not nmL:
+                        nmL = self.__fetchFromSource(urlBackup)
+                    bS.endPhase(records=len(nmL or []))
+                    #
+                    logger.info("ECOD raw file length (%d)", len(nmL))
+                    bS.beginPhase("parse")
+                    pD, nD, ntD, pdbD = self.__extractDomainHierarchy(nmL)
+                    bS.endPhase(records=len(pdbD))
+                    del nmL
+            finally:
+                if gcEnabled:
+                    gc.enable()
             #
             tS = datetime.datetime.now().isoformat()
             vS = self.__version
-            sD = {"version": vS, "created": tS, "names": nD, "nametypes": ntD, "parents": pD, "assignments": pdbD}
+            bS.beginPhase("hierarchy")
+            self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD, pD)
+            self.__treeNodeL = self.__exportTreeNodeList(nD, pD, self.__idLineageD)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(self.__treeNodeL))
+            sD = {
+                "version": vS,
+                "created": tS,
+                "names": nD,
+                "nametypes": ntD,
+                "parents": pD,
+                "assignments": pdbD,
+                "idLineage": self.__idLineageD,
+                "nameLineage": self.__nameLineageD,
+                "treeNodes": self.__treeNodeL,
+            }
+            bS.beginPhase("export")
             if (len(nD) > minLen) and (len(pD) > minLen):
                 ok = self.__mU.doExport(ecodDomainPath, sD, fmt="pickle")
+                if ok and self.__useMappedCache:
+                    ok = exportMappedCache(ecodDomainPath, sD, {"assignments": ECOD_ASSIGNMENT_SHAPE}, tableKeyL=ECOD_MAPPED_TABLE_KEYS)
+                if ok:
+                    okM = writeCacheManifest(ecodDomainPath, "ECOD", {"names": len(nD), "parents": len(pD), "assignments": len(pdbD)}, version=vS, created=tS)
+                    logger.debug("Cache manifest save status %r", okM)
+            bS.endPhase(records=len(pdbD) if ok else 0)
             logger.debug("Cache save status %r", ok)
             #
+        self.__finishBuildStats(bS)
         return pD, nD, ntD, pdbD
 
     def __fetchFromSource(self, urlTarget):
@@ -201,6 +689,86 @@ class EcodClassificationProvider(StashableBase):
         #
         return nmL
 
+    def __streamDomainHierarchy(self, urlTarget, urlBackup, minLen):
+        """Build the ECOD hierarchy and assignments in a single pass over the domain file from the primary
+        source (or the backup source if the primary source is unavailable or incomplete).  Empty tables are
+        returned if neither source provides complete data.
+        """
+        for locator in [urlTarget, urlBackup]:
+            logger.info("Stream ECOD name and domain assignment data from data source %s", locator)
+            try:
+                pD, nD, ntD, pdbD = self.__extractDomainHierarchy(self.__iterSourceLines(locator))
+                if (len(nD) > minLen) and (len(pD) > minLen):
+                    return pD, nD, ntD, pdbD
+                logger.error("Incomplete ECOD domain data (%d) from %s", len(nD), locator)
+            except Exception as e:
+                logger.error("Failing reading %s with %s", locator, str(e))
+        return {}, {}, {}, {}
+
+    def __iterSourceLines(self, locator):
+        """Yield the domain records from the (optionally gzip compressed) ECOD domain file at the input locator
+        as the file is read, with the release version taken from the file header.  Remote files are decompressed
+        and decoded directly from the HTTP response (opening the connection is retried with backoff).  Only if the
+        connection cannot be opened is the file fetched to a temporary local file (cf. FileUtil.get()) and read from there.
+        """
+        fU = FileUtil()
+        tmpPath = None
+        ifh = None
+        if fU.isLocal(locator):
+            filePath = fU.getFilePath(locator)
+            ifh = io.open(filePath, "rb") if fU.exists(filePath) else None
+        else:
+            resp = self.__openSourceUrl(locator)
+            if resp is not None:
+                ifh = io.BufferedReader(resp)
+            else:
+                logger.info("Fetching %r to a temporary file", locator)
+                tmpPath = os.path.join(self.__dirPath, "_stream_" + fU.getFileName(locator))
+                ifh = io.open(tmpPath, "rb") if fU.get(locator, tmpPath) and fU.exists(tmpPath) else None
+        if ifh is None:
+            logger.error("Failing to fetch %r", locator)
+            if tmpPath:
+                fU.remove(tmpPath)
+            return
+        try:
+            with ifh:
+                bfh = gzip.GzipFile(fileobj=ifh) if ifh.peek(2)[:2] == b"\x1f\x8b" else ifh
+                with io.TextIOWrapper(bfh, encoding="utf-8-sig", errors="ignore") as tfh:
+                    numLines = 0
+                    for line in tfh:
+                        line = line[:-1] if line.endswith("\n") else line
+                        line = line.encode("ascii", "xmlcharrefreplace").decode("ascii")
+                        if not line:
+                            continue
+                        numLines += 1
+                        if numLines == 3:
+                            self.__version = line.split()[-1]
+                        if line.startswith("#"):
+                            continue
+                        yield line
+        finally:
+            if tmpPath:
+                fU.remove(tmpPath)
+
+    def __openSourceUrl(self, url, retries=3, backoffSeconds=1.0, timeout=60):
+        """Open the HTTP response for the input url retrying failed connections (and server errors) with exponential backoff.
+
+        Returns:
+            (obj): HTTP response object or None if the connection cannot be opened
+        """
+        for attempt in range(retries):
+            try:
+                return urllib.request.urlopen(url, timeout=timeout)
+            except urllib.error.HTTPError as e:
+                logger.warning("Failing to open %r (attempt %d) with %s", url, attempt + 1, str(e))
+                if e.code < 500:
+                    break
+            except Exception as e:
+                logger.warning("Failing to open %r (attempt %d) with %s", url, attempt + 1, str(e))
+            if attempt + 1 < retries:
+                time.sleep(backoffSeconds * 2**attempt)
+        return None
+
     def __extractDomainHierarchy(self, nmL):
         """
         #/data/ecod/database_versions/v280/ecod.develop280.domains.txt
@@ -212,142 +780,126 @@ class EcodClassificationProvider(StashableBase):
         002728572	e7d5aA2	AUTO_NONREP	1.1.1	7d5a	A	A:-3-183	A:20-206	NO_UNP	beta barrels	"cradle loop barrel"	"RIFT-related"	"acid protease"	F_UNCLASSIFIED
         002726563	e7b1eA1	AUTO_NONREP	1.1.1	7b1e	A	A:46P-183	A:14-199	NO_UNP	beta barrels	"cradle loop barrel"	"RIFT-related"	"acid protease"	F_UNCLASSIFIED
         002726573	e7b1pA2	AUTO_NONREP	1.1.1	7b1p	A	A:47P-183	A:15-199	NO_UNP	beta barrels	"cradle loop barrel"	"RIFT-related"	"acid protease"	F_UNCLASSIFIED
+
+        Domain records are parsed in chunks of lines (in worker processes when numProc > 1) and merged
+        in file order, so the synthetic A/X/H/T/F identifiers are independent of the number of processes.
         """
         assignD = {}
         pD = {}
         ntD = {}
-        hD = {}
+        hD = {"A": set(), "X": set(), "H": set(), "T": set(), "F": set()}
         pIdD = {}
         nmD = {}
         #
-        logger.info("Length of input ECOD name list %d", len(nmL))
-        for nm in nmL:
-            ff = nm.split("\t")
-            # uId = ff[0]
-            # ecodId is the linkable identifier -
-            ecodId = ff[1]
-            entryId = ff[4].lower()
-            authAsymId = ff[5]
-            resRange = ff[6]
-            #
-            #  There are no unique identifiers published for the internal elements of the hierarchy
-            #   so these are assigned here similar to scop -   There are also many unnamed nodes
-            #   that are conventionally filled in from the leaf levels of the tree...
-            #  {"A": "Architecture", "X": "Possible Homology", "H": "Homology", "T": "Topology", "F": "Family"}
-            aGroupOrg = "A: " + ff[9].replace('"', "")
-            xGroupOrg = "X: " + ff[10].replace('"', "")
-            hGroupOrg = "H: " + ff[11].replace('"', "")
-            tGroupOrg = "T: " + ff[12].replace('"', "")
-            fGroupOrg = "F: " + ff[13].replace('"', "")
-            if hGroupOrg == "H: NO_H_NAME":
-                # hGroupOrg = tGroupOrg  + "|(NO_H)"
-                hGroupOrg = "H: " + ff[12].replace('"', "") + " (From Topology)" + "|(NO_H)"
-            if xGroupOrg == "X: NO_X_NAME":
-                if ff[11].replace('"', "") == "NO_H_NAME":
-                    # xGroupOrg = hGroupOrg + "|(NO_X)"
-                    xGroupOrg = "X: " + ff[12].replace('"', "") + " (From Topology)" + "|(NO_X)"
-                else:
-                    xGroupOrg = "X: " + ff[11].replace('"', "") + " (From Homology)" + "|(NO_X)"
-                #
-            fGroupOrg = fGroupOrg if fGroupOrg != "F_UNCLASSIFIED" else "Unmapped domain of " + tGroupOrg
-            #
-            # Remove redundancy in names and assign unique ids
-            #
-            aGroup = aGroupOrg
-            xGroup = xGroupOrg + "|" + aGroupOrg
-            hGroup = hGroupOrg + "|" + xGroupOrg + "|" + aGroupOrg
-            tGroup = tGroupOrg + "|" + hGroupOrg + "|" + xGroupOrg
-            fGroup = fGroupOrg + "|" + tGroupOrg
-            #
-            hD.setdefault("A", set()).add(aGroup)
-            hD.setdefault("X", set()).add(xGroup)
-            hD.setdefault("H", set()).add(hGroup)
-            hD.setdefault("T", set()).add(tGroup)
-            hD.setdefault("F", set()).add(fGroup)
-            aId = 100000 + len(hD["A"])
-            xId = 200000 + len(hD["X"])
-            hId = 300000 + len(hD["H"])
-            tId = 400000 + len(hD["T"])
-            fId = 500000 + len(hD["F"])
-            #
-            #
-            if xGroup in pD and pD[xGroup] != aGroup:
-                logger.error("skipping %r multiple parents for xGroup %r  %r and %r ", ecodId, xGroup, pD[xGroup], aGroup)
-                continue
-            #
-            if hGroup in pD and pD[hGroup] != xGroup:
-                logger.error("skipping %r multiple parents for hGroup %r  %r and %r ", ecodId, hGroup, pD[hGroup], xGroup)
-                continue
-            #
-            if tGroup in pD and pD[tGroup] != hGroup:
-                logger.error("skipping %r multiple parents for tGroup %r  %r and %r ", ecodId, tGroup, pD[tGroup], hGroup)
-                continue
-            #
-            if fGroup in pD and pD[fGroup] != tGroup:
-                logger.error("skipping %r multiple parents for fGroup %r  %r and %r ", ecodId, fGroup, pD[fGroup], tGroup)
-                continue
+        numRecords = 0
+        for groupL, recL in self.__iterParsedChunks(nmL):
+            numRecords += len(recL)
+            prevIdx = None
+            for ecodId, entryId, authAsymId, gIdx, rL in recL:
+                # Consecutive records with the same groups (e.g., the same family) leave the group sets and the
+                # hierarchy unchanged and reuse the identifiers of the preceding record
+                if gIdx != prevIdx:
+                    prevIdx = None
+                    aGroup, xGroup, hGroup, tGroup, fGroup, aGroupOrg, xGroupOrg, hGroupOrg, tGroupOrg, fGroupOrg = groupL[gIdx]
+                    #
+                    #  Identifiers are assigned serially from the current size of each group set
+                    hD["A"].add(aGroup)
+                    hD["X"].add(xGroup)
+                    hD["H"].add(hGroup)
+                    hD["T"].add(tGroup)
+                    hD["F"].add(fGroup)
+                    aId = 100000 + len(hD["A"])
+                    xId = 200000 + len(hD["X"])
+                    hId = 300000 + len(hD["H"])
+                    tId = 400000 + len(hD["T"])
+                    fId = 500000 + len(hD["F"])
+                    #
+                    #
+                    if xGroup in pD and pD[xGroup] != aGroup:
+                        logger.error("skipping %r multiple parents for xGroup %r  %r and %r ", ecodId, xGroup, pD[xGroup], aGroup)
+                        continue
+                    #
+                    if hGroup in pD and pD[hGroup] != xGroup:
+                        logger.error("skipping %r multiple parents for hGroup %r  %r and %r ", ecodId, hGroup, pD[hGroup], xGroup)
+                        continue
+                    #
+                    if tGroup in pD and pD[tGroup] != hGroup:
+                        logger.error("skipping %r multiple parents for tGroup %r  %r and %r ", ecodId, tGroup, pD[tGroup], hGroup)
+                        continue
+                    #
+                    if fGroup in pD and pD[fGroup] != tGroup:
+                        logger.error("skipping %r multiple parents for fGroup %r  %r and %r ", ecodId, fGroup, pD[fGroup], tGroup)
+                        continue
 
-            if xId in pIdD and pIdD[xId] != aId:
-                logger.error("skipped %r multiple parents for xId %r  %r and %r ", ecodId, xId, pIdD[xId], aId)
-            #
-            if hId in pIdD and pIdD[hId] != xId:
-                logger.error("skipped %r multiple parents for hId %r  %r and %r ", ecodId, hId, pIdD[hId], xId)
-            #
-            if tId in pIdD and pIdD[tId] != hId:
-                logger.error("skipped %r multiple parents for tId %r  %r and %r ", ecodId, tId, pIdD[tId], hId)
-            #
-            if fId in pIdD and pIdD[fId] != tId:
-                logger.error("skipped %r multiple parents for fId %r  %r and %r ", ecodId, fId, pIdD[fId], tId)
+                    if xId in pIdD and pIdD[xId] != aId:
+                        logger.error("skipped %r multiple parents for xId %r  %r and %r ", ecodId, xId, pIdD[xId], aId)
+                    #
+                    if hId in pIdD and pIdD[hId] != xId:
+                        logger.error("skipped %r multiple parents for hId %r  %r and %r ", ecodId, hId, pIdD[hId], xId)
+                    #
+                    if tId in pIdD and pIdD[tId] != hId:
+                        logger.error("skipped %r multiple parents for tId %r  %r and %r ", ecodId, tId, pIdD[tId], hId)
+                    #
+                    if fId in pIdD and pIdD[fId] != tId:
+                        logger.error("skipped %r multiple parents for fId %r  %r and %r ", ecodId, fId, pIdD[fId], tId)
 
-            #
-            pIdD[aId] = 0
-            pIdD[xId] = aId
-            pIdD[hId] = xId
-            pIdD[tId] = hId
-            pIdD[fId] = tId
-            #
-            nmD[aId] = aGroupOrg
-            nmD[xId] = xGroupOrg
-            nmD[hId] = hGroupOrg
-            nmD[tId] = tGroupOrg
-            nmD[fId] = fGroupOrg
-            #
-            ntD[aId] = "A"
-            ntD[xId] = "X"
-            ntD[hId] = "H"
-            ntD[tId] = "T"
-            ntD[fId] = "F"
-            rL = self.__parseRanges(resRange)
-            if (entryId, authAsymId) not in assignD:
-                assignD[(entryId, authAsymId)] = [(ecodId, fId, t[0], t[1], t[2]) for t in rL]
-            else:
-                for t in rL:
-                    assignD[(entryId, authAsymId)].append((ecodId, fId, t[0], t[1], t[2]))
-            #
+                    #
+                    pIdD[aId] = 0
+                    pIdD[xId] = aId
+                    pIdD[hId] = xId
+                    pIdD[tId] = hId
+                    pIdD[fId] = tId
+                    #
+                    nmD[aId] = aGroupOrg
+                    nmD[xId] = xGroupOrg
+                    nmD[hId] = hGroupOrg
+                    nmD[tId] = tGroupOrg
+                    nmD[fId] = fGroupOrg
+                    #
+                    ntD[aId] = "A"
+                    ntD[xId] = "X"
+                    ntD[hId] = "H"
+                    ntD[tId] = "T"
+                    ntD[fId] = "F"
+                    prevIdx = gIdx
+                #
+                if (entryId, authAsymId) not in assignD:
+                    assignD[(entryId, authAsymId)] = [(ecodId, fId, t[0], t[1], t[2]) for t in rL]
+                else:
+                    for t in rL:
+                        assignD[(entryId, authAsymId)].append((ecodId, fId, t[0], t[1], t[2]))
+                #
+        logger.info("Length of input ECOD domain records %d", numRecords)
         return pIdD, nmD, ntD, assignD
 
-    def __parseRanges(self, rS):
-        rL = []
-        authAsymId = authSeqBeg = authSeqEnd = None
-        try:
-            tSL = rS.split(",")
-            for tS in tSL:
-                fL = tS.split(":")
-                authAsymId = fL[0]
-                rS = fL[1]
-                if rS[0] == "-":
-                    authSeqBeg = -int(rS[1:].split("-")[0])
-                    authSeqEnd = int(rS[1:].split("-")[1])
-                else:
-                    authSeqBeg = int(rS.split("-")[0])
-                    authSeqEnd = int(rS.split("-")[1])
-            rL.append((authAsymId, authSeqBeg, authSeqEnd))
-        except Exception:
-            pass
-        return rL
+    def __iterParsedChunks(self, nmL):
+        """Yield the parsed domain records (cf. parseDomainLines()) for consecutive chunks of the input lines in order.
 
-    def __exportTreeNodeList(self, pD):
+        With numProc > 1 the chunks are parsed in a process pool holding at most 2 * numProc chunks in flight.
+        """
+        lineIt = iter(nmL)
+        chunkIt = iter(lambda: list(itertools.islice(lineIt, self.__chunkSize)), [])
+        if self.__numProc <= 1:
+            for lineL in chunkIt:
+                yield parseDomainLines(lineL)
+            return
+        #
+        logger.info("Parsing ECOD domain records with %d processes (chunk size %d)", self.__numProc, self.__chunkSize)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.__numProc) as executor:
+            futureQ = collections.deque()
+            for lineL in chunkIt:
+                futureQ.append(executor.submit(parseDomainLines, lineL))
+                if len(futureQ) >= 2 * self.__numProc:
+                    yield futureQ.popleft().result()
+            while futureQ:
+                yield futureQ.popleft().result()
+
+    def __exportTreeNodeList(self, nD, pD, idLineageD):
         """Create node list from name dictionary and lineage dictionaries."""
+        return list(self.__iterTreeNodes(nD, pD, idLineageD))
+
+    def __iterTreeNodes(self, nD, pD, idLineageD):
+        """Yield the tree nodes in breadth first order from the name, parent and id lineage dictionaries."""
         #
         rootId = 0
         pL = [rootId]
@@ -377,11 +929,10 @@ class EcodClassificationProvider(StashableBase):
                         queue.append(childId)
                         visited.add(childId)
         #
-        dL = []
         for tId in idL:
-            displayName = self.getName(tId)
+            displayName = nD[tId].split("|")[0] if tId in nD else None
             ptId = pD[tId] if tId in pD else None
-            lL = self.getIdLineage(tId)[1:]
+            lL = idLineageD[tId][1:] if tId in idLineageD else self.__getIdLineage(tId, pD)[1:]
             #
             if tId == rootId:
                 continue
@@ -389,6 +940,84 @@ class EcodClassificationProvider(StashableBase):
                 dD = {"id": str(tId), "name": displayName, "depth": 0}
             else:
                 dD = {"id": str(tId), "name": displayName, "parents": [str(ptId)], "depth": len(lL)}
-            dL.append(dD)
+            yield dD
+
+
+def parseDomainLines(lineL):
+    """Parse ECOD domain records (tab separated lines of the ECOD domain file, comments removed).
+
+    The group names for each distinct (arch_name, x_name, h_name, t_name, f_name) combination are
+    constructed once per call and shared by all records in the chunk.
+
+    Returns:
+        (list, list): [(aGroup, xGroup, hGroup, tGroup, fGroup, aGroupOrg, xGroupOrg, hGroupOrg, tGroupOrg, fGroupOrg), ...],
+                      [(ecodId, entryId, authAsymId, group list index, [(authAsymId, authSeqBeg, authSeqEnd), ...]), ...]
+    """
+    groupIdxD = {}
+    groupL = []
+    recL = []
+    for nm in lineL:
+        ff = nm.split("\t")
+        # uId = ff[0]
+        # ecodId is the linkable identifier -
+        gKey = (ff[9], ff[10], ff[11], ff[12], ff[13])
+        gIdx = groupIdxD.get(gKey)
+        if gIdx is None:
+            gIdx = groupIdxD[gKey] = len(groupL)
+            groupL.append(_getDomainGroups(ff))
+        recL.append((ff[1], ff[4].lower(), ff[5], gIdx, parseDomainRanges(ff[6])))
+    return groupL, recL
+
 
-        return dL
+def _getDomainGroups(ff):
+    #
+    #  There are no unique identifiers published for the internal elements of the hierarchy
+    #   so these are assigned here similar to scop -   There are also many unnamed nodes
+    #   that are conventionally filled in from the leaf levels of the tree...
+    #  {"A": "Architecture", "X": "Possible Homology", "H": "Homology", "T": "Topology", "F": "Family"}
+    aGroupOrg = "A: " + ff[9].replace('"', "")
+    xGroupOrg = "X: " + ff[10].replace('"', "")
+    hGroupOrg = "H: " + ff[11].replace('"', "")
+    tGroupOrg = "T: " + ff[12].replace('"', "")
+    fGroupOrg = "F: " + ff[13].replace('"', "")
+    if hGroupOrg == "H: NO_H_NAME":
+        # hGroupOrg = tGroupOrg  + "|(NO_H)"
+        hGroupOrg = "H: " + ff[12].replace('"', "") + " (From Topology)" + "|(NO_H)"
+    if xGroupOrg == "X: NO_X_NAME":
+        if ff[11].replace('"', "") == "NO_H_NAME":
+            # xGroupOrg = hGroupOrg + "|(NO_X)"
+            xGroupOrg = "X: " + ff[12].replace('"', "") + " (From Topology)" + "|(NO_X)"
+        else:
+            xGroupOrg = "X: " + ff[11].replace('"', "") + " (From Homology)" + "|(NO_X)"
+        #
+    fGroupOrg = fGroupOrg if fGroupOrg != "F_UNCLASSIFIED" else "Unmapped domain of " + tGroupOrg
+    #
+    # Remove redundancy in names and assign unique ids
+    #
+    aGroup = aGroupOrg
+    xGroup = xGroupOrg + "|" + aGroupOrg
+    hGroup = hGroupOrg + "|" + xGroupOrg + "|" + aGroupOrg
+    tGroup = tGroupOrg + "|" + hGroupOrg + "|" + xGroupOrg
+    fGroup = fGroupOrg + "|" + tGroupOrg
+    return (aGroup, xGroup, hGroup, tGroup, fGroup, aGroupOrg, xGroupOrg, hGroupOrg, tGroupOrg, fGroupOrg)
+
+
+def parseDomainRanges(rS):
+    rL = []
+    authAsymId = authSeqBeg = authSeqEnd = None
+    try:
+        tSL = rS.split(",")
+        for tS in tSL:
+            fL = tS.split(":")
+            authAsymId = fL[0]
+            rS = fL[1]
+            if rS[0] == "-":
+                authSeqBeg = -int(rS[1:].split("-")[0])
+                authSeqEnd = int(rS[1:].split("-")[1])
+            else:
+                authSeqBeg = int(rS.split("-")[0])
+                authSeqEnd = int(rS.split("-")[1])
+        rL.append((authAsymId, authSeqBeg, authSeqEnd))
+    except Exception:
+        pass
+    return rL
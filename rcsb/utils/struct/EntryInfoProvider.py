@@ -3,6 +3,9 @@
 #  Date:           22-Sep-2021 jdw
 #
 #  Updated:
+#  16-Oct-2026     Add lazy loading of the cache on first access (lazyLoad)
+#  17-Oct-2026     Add accessor call, hit and miss counters and latency histograms (lookupStats)
+#  17-Oct-2026     Add a cache manifest (writeCacheManifest(), getCacheManifest(), testCacheManifest())
 #
 ##
 """
@@ -14,15 +17,29 @@ Generator methods are in rcsb.exdb.entry.EntryInfoProvider.
 
 import logging
 import os.path
+import threading
 import time
 
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.StashableBase import StashableBase
+from rcsb.utils.struct.CacheManifest import checkCacheManifest
+from rcsb.utils.struct.CacheManifest import readCacheManifest
+from rcsb.utils.struct.CacheManifest import writeCacheManifest
+from rcsb.utils.struct.LookupStats import LookupStatsMixin
+from rcsb.utils.struct.LookupStats import isNonEmpty
 
 logger = logging.getLogger(__name__)
 
+# Lookup accessors counted with lookupStats and the tests of their results counted as hits
+ENTRY_INFO_LOOKUP_ACCESSOR_D = {
+    "getEntryInfo": isNonEmpty,
+    "getEntriesByPolymerEntityCount": isNonEmpty,
+}
+# Minimum record counts of a valid entry-info cache (cf. testCache() and testCacheManifest())
+ENTRY_INFO_CACHE_MIN_COUNT_D = {"entries": 1}
 
-class EntryInfoProvider(StashableBase):
+
+class EntryInfoProvider(StashableBase, LookupStatsMixin):
     """Accessors (only) for entry-level annotations."""
 
     def __init__(self, **kwargs):
@@ -35,10 +52,27 @@ class EntryInfoProvider(StashableBase):
         super(EntryInfoProvider, self).__init__(cachePath, [self.__dirName])
         #
         self.__mU = MarshalUtil(workPath=self.__dirPath)
-        self.__entryInfoD = self.__reload(fmt="json", useCache=useCache)
+        self._initLookupStats(kwargs.get("lookupStats", False), ENTRY_INFO_LOOKUP_ACCESSOR_D)
+        # Defer reading the cache until the first accessor call
+        self.__useCache = useCache
+        self.__lazyLoad = kwargs.get("lazyLoad", False)
+        self.__loadLock = threading.Lock()
+        self.__entryInfoD = None
+        if self.__lazyLoad:
+            entryInfoFilePath = self.__getEntryInfoFilePath(fmt="json")
+            logger.info("Deferring entry-info load (cache %r present %r)", entryInfoFilePath, self.__mU.exists(entryInfoFilePath))
+        else:
+            self.__entryInfoD = self.__reload(fmt="json", useCache=useCache)
         #
 
+    def __ensureLoaded(self):
+        if self.__entryInfoD is None:
+            with self.__loadLock:
+                if self.__entryInfoD is None:
+                    self.__entryInfoD = self.__reload(fmt="json", useCache=self.__useCache)
+
     def testCache(self, minCount=1):
+        self.__ensureLoaded()
         if minCount == 0:
             return True
         if self.__entryInfoD and minCount and "entryInfo" in self.__entryInfoD and len(self.__entryInfoD["entryInfo"]) > minCount:
@@ -46,12 +80,39 @@ class EntryInfoProvider(StashableBase):
             return True
         return False
 
+    def writeCacheManifest(self):
+        """Write the manifest of the current entry-info cache file (the cache is generated by rcsb.exdb, so the
+        manifest is written on request, e.g., after the cache file is generated or restored).
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        self.__ensureLoaded()
+        try:
+            entryInfoFilePath = self.__getEntryInfoFilePath(fmt="json")
+            if not self.__mU.exists(entryInfoFilePath):
+                return False
+            countD = {"entries": len(self.__entryInfoD.get("entryInfo", {}))}
+            return writeCacheManifest(entryInfoFilePath, "EntryInfo", countD, version=self.__entryInfoD.get("version"), created=self.__entryInfoD.get("created"))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return False
+
+    def getCacheManifest(self):
+        """Return the manifest of the entry-info cache file (cf. readCacheManifest()) or {} if there is no manifest."""
+        return readCacheManifest(self.__getEntryInfoFilePath(fmt="json")) or {}
+
+    def testCacheManifest(self, verifyChecksum=False):
+        """Check the entry-info cache file and record counts against the manifest without loading the cache (cf. checkCacheManifest())."""
+        return checkCacheManifest(self.__getEntryInfoFilePath(fmt="json"), ENTRY_INFO_CACHE_MIN_COUNT_D, verifyChecksum=verifyChecksum)
+
     def getEntryInfo(self, entryId):
         """Return a dictionary of entry-level annotations.
 
         Returns:
             (dict): of entry-level annotations
         """
+        self.__ensureLoaded()
         try:
             return self.__entryInfoD["entryInfo"][entryId.upper()] if entryId.upper() in self.__entryInfoD["entryInfo"] else {}
         except Exception as e:
@@ -59,6 +120,7 @@ class EntryInfoProvider(StashableBase):
         return {}
 
     def getEntriesByPolymerEntityCount(self, count):
+        self.__ensureLoaded()
         oL = []
         try:
             for entryId, eD in self.__entryInfoD["entryInfo"].items():
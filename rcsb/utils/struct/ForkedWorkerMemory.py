@@ -0,0 +1,100 @@
+##
+#  File:  ForkedWorkerMemory.py
+#  Date:  16-Oct-2026
+#
+#  Updates:
+#  17-Oct-2026  Add freezeGcForFork()
+#
+##
+"""
+  Measurement harness reporting the unique and proportional set sizes of forked worker processes
+  (e.g., workers sharing classification providers loaded by the parent process) and the garbage
+  collector freeze run by the parent process before forking.
+
+"""
+
+import gc
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def freezeGcForFork():
+    """Collect garbage and move all surviving objects to the permanent generation (gc.freeze()), so collections
+    in forked workers do not write to the pages shared with the parent process.  This is a process wide change
+    to be made once by the parent after loading (and calling freezeForFork() on) all providers and before forking.
+    """
+    gc.collect()
+    gc.freeze()
+    logger.info("Garbage collector frozen (%d objects)", gc.get_freeze_count())
+
+
+def getProcessMemory(pid=None):
+    """Return the memory use of the input process from /proc/<pid>/smaps_rollup (Linux).
+
+    Args:
+        pid (int, optional): process id. Defaults to the current process.
+
+    Returns:
+        dict: {"rss": bytes, "pss": bytes, "uss": bytes} where uss is the private (clean and dirty) memory
+              of the process, or {} if the process memory map is not available
+    """
+    pid = pid if pid else os.getpid()
+    tD = {}
+    try:
+        with open("/proc/%d/smaps_rollup" % pid, "r", encoding="utf-8") as ifh:
+            for line in ifh:
+                fL = line.split()
+                if len(fL) == 3 and fL[2] == "kB":
+                    tD[fL[0][:-1]] = int(fL[1]) * 1024
+        return {"rss": tD["Rss"], "pss": tD["Pss"], "uss": tD["Private_Clean"] + tD["Private_Dirty"]}
+    except Exception as e:
+        logger.debug("Memory map not available for %r with %s", pid, str(e))
+    return {}
+
+
+def measureForkedWorkers(workFunc, numWorkers=4, args=()):
+    """Fork worker processes that each run workFunc(*args) and report their memory use.
+
+    The workers remain alive until all have reported, so the proportional set sizes reflect the
+    pages shared among the workers and the parent process.
+
+    Args:
+        workFunc (func): function run by each worker (e.g., lookups on providers loaded before the fork)
+        numWorkers (int, optional): number of worker processes. Defaults to 4.
+        args (tuple, optional): arguments passed to workFunc. Defaults to ().
+
+    Returns:
+        list: [{"worker": index, "pid": pid, "rss": bytes, "pss": bytes, "uss": bytes}, ...] in worker order
+    """
+    ctx = multiprocessing.get_context("fork")
+    resultQueue = ctx.Queue()
+    releaseEvent = ctx.Event()
+    procL = [ctx.Process(target=_runWorker, args=(ii, workFunc, args, resultQueue, releaseEvent)) for ii in range(numWorkers)]
+    for proc in procL:
+        proc.start()
+    rL = []
+    try:
+        for _ in procL:
+            rL.append(resultQueue.get(timeout=600))
+    finally:
+        releaseEvent.set()
+        for proc in procL:
+            proc.join()
+    rL.sort(key=lambda dD: dD["worker"])
+    for dD in rL:
+        logger.info("Worker %d pid %d uss %.1f MB pss %.1f MB rss %.1f MB", dD["worker"], dD["pid"], dD.get("uss", 0) / 2**20, dD.get("pss", 0) / 2**20, dD.get("rss", 0) / 2**20)
+    return rL
+
+
+def _runWorker(index, workFunc, args, resultQueue, releaseEvent):
+    try:
+        workFunc(*args)
+    except Exception as e:
+        logger.exception("Worker %d failing with %s", index, str(e))
+    mD = getProcessMemory()
+    mD.update({"worker": index, "pid": os.getpid()})
+    resultQueue.put(mD)
+    releaseEvent.wait(600)
@@ -0,0 +1,206 @@
+##
+#  File:  HierarchyIndex.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#  17-Oct-2026  Add lowest common ancestor queries (getLca(), getLcaList())
+#
+##
+"""
+  Nested-set (pre-order interval) index over classification hierarchies supporting constant time
+  ancestor/descendant tests, output-linear subtree enumeration and lowest common ancestor queries.
+
+"""
+
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+
+class HierarchyIndex(object):
+    """Nested-set index over the tree node list of a classification hierarchy.
+
+    Nodes are numbered in a depth-first pre-order traversal from the root nodes and each node visit is
+    assigned the interval [pre, end) of the traversal positions spanned by its subtree, so that node a is a
+    descendant of node b if an interval of a lies within an interval of b and the descendants of b are the
+    traversal positions following pre(b) up to end(b).
+
+    In a strict tree each node has a single interval.  Nodes with several parents (e.g., SCOP2) are visited
+    once below each parent and carry one interval per visit; queries on these nodes combine their intervals
+    and de-duplicate the result (subtree sizes are memoized).
+
+    Lowest common ancestors use the pre-order form of the Euler tour reduction: for visits u and v with
+    pre(u) < pre(v), the shallowest visit at the traversal positions (pre(u), pre(v)] is a child of the lowest
+    common ancestor on the path to v.  A sparse table of (depth, position) minima over the traversal
+    (built on the first ancestor query) answers each range minimum with two lookups.  For nodes with
+    several visits the deepest ancestor over all visit pairs is returned.
+    """
+
+    def __init__(self, treeNodeL):
+        """
+        Args:
+            treeNodeL (iterable): tree nodes [{"id": ..., "parents": [parentId, ...]}, ...] (roots omit parents)
+        """
+        self.__orderL = []
+        self.__depthA = array("i")
+        self.__parentA = array("i")
+        self.__intervalD = {}
+        self.__sparseL = None
+        self.__isTree = True
+        self.__sizeD = {}
+        self.__build(treeNodeL)
+
+    def __build(self, treeNodeL):
+        childD = {}
+        rootL = []
+        nodeL = [(dD["id"], dD.get("parents", [])) for dD in treeNodeL]
+        nodeIdS = {nodeId for nodeId, _ in nodeL}
+        for nodeId, parentL in nodeL:
+            pL = [pId for pId in parentL if pId in nodeIdS and pId != nodeId]
+            if not pL:
+                rootL.append(nodeId)
+            for pId in pL:
+                childD.setdefault(pId, []).append(nodeId)
+        #
+        # Iterative depth-first traversal - stack entries are (nodeId, pre, depth, parent pre) with pre set
+        # for visits awaiting their end position
+        orderL = self.__orderL
+        depthA = self.__depthA
+        parentA = self.__parentA
+        intervalD = self.__intervalD
+        for rootId in dict.fromkeys(rootL):
+            pathS = set()
+            stackL = [(rootId, None, 0, -1)]
+            while stackL:
+                nodeId, pre, depth, parentPre = stackL.pop()
+                if pre is not None:
+                    intervalD.setdefault(nodeId, []).append((pre, len(orderL)))
+                    pathS.discard(nodeId)
+                    continue
+                if nodeId in pathS:
+                    logger.warning("Skipping cyclic hierarchy reference to %r", nodeId)
+                    continue
+                pathS.add(nodeId)
+                pre = len(orderL)
+                stackL.append((nodeId, pre, depth, parentPre))
+                orderL.append(nodeId)
+                depthA.append(depth)
+                parentA.append(parentPre)
+                for childId in reversed(childD.get(nodeId, [])):
+                    stackL.append((childId, None, depth + 1, pre))
+        self.__isTree = all([len(iL) == 1 for iL in intervalD.values()])
+        logger.debug("Indexed hierarchy nodes (%d) visits (%d) tree %r", len(intervalD), len(orderL), self.__isTree)
+
+    def __contains__(self, nodeId):
+        return nodeId in self.__intervalD
+
+    def __len__(self):
+        return len(self.__intervalD)
+
+    def isDescendant(self, nodeId, ancestorId):
+        """Return True if the input node is a (proper) descendant of the input ancestor node or False otherwise."""
+        if nodeId == ancestorId:
+            return False
+        try:
+            iL = self.__intervalD[nodeId]
+            aL = self.__intervalD[ancestorId]
+        except KeyError:
+            return False
+        if len(iL) == 1 and len(aL) == 1:
+            return aL[0][0] < iL[0][0] < aL[0][1]
+        return any([aPre < pre < aEnd for pre, _ in iL for aPre, aEnd in aL])
+
+    def getDescendants(self, nodeId):
+        """Return the (proper) descendants of the input node in pre-order."""
+        iL = self.__intervalD.get(nodeId, [])
+        if self.__isTree and iL:
+            pre, end = iL[0]
+            return self.__orderL[pre + 1 : end]
+        return list(dict.fromkeys([dId for pre, end in iL for dId in self.__orderL[pre + 1 : end]]))
+
+    def getSubtreeSize(self, nodeId):
+        """Return the number of nodes in the subtree rooted at the input node (including the node) or 0 for undefined nodes."""
+        iL = self.__intervalD.get(nodeId)
+        if not iL:
+            return 0
+        if self.__isTree:
+            return iL[0][1] - iL[0][0]
+        try:
+            return self.__sizeD[nodeId]
+        except KeyError:
+            pass
+        self.__sizeD[nodeId] = len(self.getDescendants(nodeId)) + 1
+        return self.__sizeD[nodeId]
+
+    def __buildSparseTable(self):
+        """Build the sparse table of range minima of the keys depth * numVisits + position over the traversal."""
+        numVisits = len(self.__orderL)
+        maxKey = (max(self.__depthA, default=0) + 1) * numVisits
+        typeCode = "i" if maxKey < 2**31 else "q"
+        sparseL = [array(typeCode, [depth * numVisits + pos for pos, depth in enumerate(self.__depthA)])]
+        span = 1
+        while 2 * span <= numVisits:
+            prevA = sparseL[-1]
+            sparseL.append(array(typeCode, map(min, prevA[: len(prevA) - span], prevA[span:])))
+            span *= 2
+        logger.debug("Sparse table visits (%d) levels (%d)", numVisits, len(sparseL))
+        return sparseL
+
+    def __getVisitLca(self, pre1, pre2, sparseL, numVisits):
+        """Return the traversal position of the lowest common ancestor of two visits (or -1 for visits in different trees)."""
+        if pre1 == pre2:
+            return pre1
+        if pre1 > pre2:
+            pre1, pre2 = pre2, pre1
+        # shallowest visit in positions (pre1, pre2]
+        level = (pre2 - pre1).bit_length() - 1
+        levelA = sparseL[level]
+        key = min(levelA[pre1 + 1], levelA[pre2 - (1 << level) + 1])
+        if key < numVisits:
+            return -1
+        return self.__parentA[key % numVisits]
+
+    def getLca(self, nodeId1, nodeId2):
+        """Return the lowest common ancestor of the input nodes.
+
+        Args:
+            nodeId1 (str|int): node identifier
+            nodeId2 (str|int): node identifier
+
+        Returns:
+            (str|int, int): lowest common ancestor node identifier and its depth (0 for root nodes) or (None, None)
+                            if the nodes are undefined or have no common ancestor
+        """
+        return self.getLcaList([(nodeId1, nodeId2)])[0]
+
+    def getLcaList(self, nodePairL):
+        """Return the lowest common ancestors of the input node pairs.
+
+        Args:
+            nodePairL (iterable): node identifier pairs [(nodeId1, nodeId2), ...]
+
+        Returns:
+            list: [(lcaNodeId, depth), ...] aligned with the input pairs (cf. getLca())
+        """
+        if self.__sparseL is None:
+            self.__sparseL = self.__buildSparseTable()
+        sparseL = self.__sparseL
+        numVisits = len(self.__orderL)
+        orderL = self.__orderL
+        depthA = self.__depthA
+        intervalD = self.__intervalD
+        getVisitLca = self.__getVisitLca
+        rL = []
+        for nodeId1, nodeId2 in nodePairL:
+            iL1 = intervalD.get(nodeId1)
+            iL2 = intervalD.get(nodeId2)
+            if not iL1 or not iL2:
+                rL.append((None, None))
+                continue
+            if len(iL1) == 1 and len(iL2) == 1:
+                pre = getVisitLca(iL1[0][0], iL2[0][0], sparseL, numVisits)
+            else:
+                pre = max([getVisitLca(pre1, pre2, sparseL, numVisits) for pre1, _ in iL1 for pre2, _ in iL2], key=lambda x: depthA[x] if x >= 0 else -1)
+            rL.append((orderL[pre], depthA[pre]) if pre >= 0 else (None, None))
+        return rL
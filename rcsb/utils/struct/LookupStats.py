@@ -0,0 +1,167 @@
+##
+#  File:  LookupStats.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Call, hit and miss counters and latency histograms for provider lookup accessors.
+
+"""
+
+import functools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket i counts calls taking [2**(i-1), 2**i) nanoseconds (the last bucket is open ended)
+NUM_LATENCY_BUCKETS = 40
+
+
+def isFound(ret):
+    """Hit test for accessors returning a value or None."""
+    return ret is not None
+
+
+def isNonEmpty(ret):
+    """Hit test for accessors returning a (possibly empty) list or dictionary."""
+    return bool(ret)
+
+
+def isPositive(ret):
+    """Hit test for accessors returning a count."""
+    return ret is not None and ret > 0
+
+
+def isAnyFound(ret):
+    """Hit test for accessors returning a list of values that may all be None (e.g., name lineages of undefined nodes)."""
+    return bool(ret) and any(val is not None for val in ret)
+
+
+def isAncestorFound(ret):
+    """Hit test for accessors returning (nodeId, level) or (None, None)."""
+    return ret is not None and ret[0] is not None
+
+
+def isAnyLabeled(ret):
+    """Hit test for accessors returning (labelArray, vocabulary) with label code 0 for unassigned residues."""
+    return ret is not None and any(ret[0])
+
+
+def isAnyAnnotated(ret):
+    """Hit test for accessors returning {chainKey: {field: [...], ...}, ...} with empty field lists for chains without annotations."""
+    return bool(ret) and any(any(fD.values()) for fD in ret.values())
+
+
+class LookupStats(object):
+    """Count the calls, hits and misses of provider lookup accessors and keep power-of-two latency
+    histograms for each accessor.
+
+    Accessors are instrumented by binding wrapped methods on the provider instance (cf. instrument()), so
+    providers that are not instrumented run the unmodified class methods at no cost.  Counters are updated
+    without locking and may undercount slightly under heavy concurrent use from many threads.
+    """
+
+    def __init__(self):
+        self.__statsD = {}
+
+    def instrument(self, obj, accessorD):
+        """Replace the lookup accessors of the input object with instrumented wrappers.
+
+        Args:
+            obj (object): provider instance
+            accessorD (dict): {accessorName: isHit, ...} with isHit(ret) returning True if the accessor result is a hit (e.g., isFound())
+
+        Returns:
+            list: names of the instrumented accessors
+        """
+        for name, isHit in accessorD.items():
+            setattr(obj, name, self.__wrap(name, getattr(obj, name), isHit))
+        logger.debug("Instrumented %s accessors %r", type(obj).__name__, list(accessorD))
+        return list(accessorD)
+
+    def __wrap(self, name, func, isHit):
+        # [calls, hits, totalNanoseconds, histogram]
+        rec = self.__statsD.setdefault(name, [0, 0, 0, [0] * NUM_LATENCY_BUCKETS])
+        lastBucket = NUM_LATENCY_BUCKETS - 1
+        perfCounter = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            startTime = perfCounter()
+            ret = func(*args, **kwargs)
+            elapsed = perfCounter() - startTime
+            rec[0] += 1
+            if isHit(ret):
+                rec[1] += 1
+            rec[2] += elapsed
+            rec[3][min(elapsed.bit_length(), lastBucket)] += 1
+            return ret
+
+        return wrapper
+
+    def getStats(self):
+        """Return a snapshot of the accessor counters and latency histograms.
+
+        Returns:
+            dict: {accessorName: {"calls": ..., "hits": ..., "misses": ..., "totalSeconds": ..., "meanSeconds": ...,
+                   "p50Seconds": ..., "p99Seconds": ..., "histogram": [(upperBoundSeconds, count), ...]}, ...}
+                   with percentiles given as histogram bucket upper bounds and only non-empty buckets listed
+        """
+        rD = {}
+        for name, (calls, hits, totalNs, histL) in self.__statsD.items():
+            histL = list(histL)
+            rD[name] = {
+                "calls": calls,
+                "hits": hits,
+                "misses": calls - hits,
+                "totalSeconds": totalNs / 1.0e9,
+                "meanSeconds": totalNs / 1.0e9 / calls if calls else 0.0,
+                "p50Seconds": self.__getPercentile(histL, calls, 0.50),
+                "p99Seconds": self.__getPercentile(histL, calls, 0.99),
+                "histogram": [(2**ii / 1.0e9, count) for ii, count in enumerate(histL) if count],
+            }
+        return rD
+
+    def reset(self):
+        """Reset all counters and histograms (the accessors remain instrumented)."""
+        for rec in self.__statsD.values():
+            rec[0] = rec[1] = rec[2] = 0
+            rec[3][:] = [0] * NUM_LATENCY_BUCKETS
+
+    def __getPercentile(self, histL, calls, fraction):
+        if not calls:
+            return 0.0
+        cumCount = 0
+        for ii, count in enumerate(histL):
+            cumCount += count
+            if cumCount >= fraction * calls:
+                return 2**ii / 1.0e9
+        return 2 ** (len(histL) - 1) / 1.0e9
+
+
+class LookupStatsMixin(object):
+    """Provider methods reporting the statistics of the lookup accessors (enabled with the provider lookupStats option)."""
+
+    __lookupStats = None
+
+    def _initLookupStats(self, enabled, accessorD):
+        # The accessors are only wrapped when enabled so providers without statistics run the class methods directly
+        if enabled:
+            self.__lookupStats = LookupStats()
+            self.__lookupStats.instrument(self, accessorD)
+
+    def getLookupStats(self):
+        """Return the call, hit and miss counts and latency histograms of the lookup accessors.
+
+        Returns:
+            dict: accessor statistics (cf. LookupStats.getStats()) or {} if lookupStats is not enabled
+        """
+        return self.__lookupStats.getStats() if self.__lookupStats else {}
+
+    def resetLookupStats(self):
+        """Reset the call counts and latency histograms of the lookup accessors."""
+        if self.__lookupStats:
+            self.__lookupStats.reset()
@@ -0,0 +1,518 @@
+##
+#  File:  MappedAssignmentStore.py
+#  Date:  16-Oct-2026
+#
+#  Updates:
+#  17-Oct-2026  Add mapped name, parent and lineage tables (MappedTable) and tree node lists (MappedTreeNodeList)
+#
+##
+"""
+  Memory-mapped columnar store for chain domain assignment dictionaries, node tables and tree node lists
+  and helpers to write and read the mapped form of the classification provider caches.
+
+"""
+
+import json
+import logging
+import mmap
+import os.path
+import struct
+import sys
+import zlib
+from array import array
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.struct.TreeNodeExport import writeTreeNodes
+
+logger = logging.getLogger(__name__)
+
+MAPPED_STORE_MAGIC = b"RCSBMAP1"
+MAPPED_STORE_FORMAT_VERSION = 1
+
+
+class MappedAssignmentStore(object):
+    """Read-only mapping over a memory-mapped assignment file (see exportMappedAssignments()).
+
+    The file holds a table of distinct scalar values (strings, integers and None) stored as a utf-8
+    string heap with an offset array and type codes, the chain keys as value ids with an open addressing
+    hash table, and the assignment tuples as fixed width rows of value ids grouped by chain.  All arrays
+    are used in place from the mapped file, so opening a store costs almost nothing and processes mapping
+    the same file share a single page cache copy.  Lookups decode only the rows of the requested chain.
+
+    Lookups (store[chainKey], store.get(chainKey), chainKey in store) return the same lists of tuples as
+    the source dictionary.
+    """
+
+    def __init__(self, filePath, valueCacheSize=65536):
+        """
+        Args:
+            filePath (str): path to a file written by exportMappedAssignments()
+            valueCacheSize (int, optional): maximum number of decoded values held in memory. Defaults to 65536.
+        """
+        self.__filePath = filePath
+        self.__valueCacheSize = valueCacheSize
+        self.__valueCacheD = {}
+        with open(filePath, "rb") as ifh:
+            self.__mm = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__mm[0:8] != MAPPED_STORE_MAGIC:
+            self.__mm.close()
+            raise ValueError("Not a mapped assignment file %r" % filePath)
+        headerLen = struct.unpack_from("<Q", self.__mm, 8)[0]
+        hD = json.loads(self.__mm[16 : 16 + headerLen].decode("utf-8"))
+        if hD["formatVersion"] != MAPPED_STORE_FORMAT_VERSION or hD["byteOrder"] != sys.byteorder:
+            self.__mm.close()
+            raise ValueError("Unsupported mapped assignment file %r (version %r byte order %r)" % (filePath, hD["formatVersion"], hD["byteOrder"]))
+        #
+        self.__attributeD = hD.get("attributes", {})
+        self.__numChains = hD["numChains"]
+        self.__keyWidth = hD["keyWidth"]
+        self.__width = hD["width"]
+        self.__hashMask = hD["hashSize"] - 1
+        # (start column, tuple length) for each assignment tuple element (tuple length 0 for scalar elements)
+        self.__shapeL = []
+        col = 0
+        for num in hD["shape"]:
+            self.__shapeL.append((col, num))
+            col += max(1, num)
+        self.__isFlat = not any([num for _, num in self.__shapeL])
+        #
+        self.__mv = memoryview(self.__mm)
+        self.__dataStart = align(16 + headerLen)
+        sectionD = hD["sections"]
+        self.__valueBase = self.__dataStart + sectionD["valueBytes"][0]
+        self.__valueOffsets = self.__getSection(sectionD, "valueOffsets", "q")
+        self.__valueTypes = self.__getSection(sectionD, "valueTypes", "B")
+        self.__keys = self.__getSection(sectionD, "keys", "i")
+        self.__rowOffsets = self.__getSection(sectionD, "rowOffsets", "q")
+        self.__rows = self.__getSection(sectionD, "rows", "i")
+        self.__hashSlots = self.__getSection(sectionD, "hashSlots", "i")
+
+    def __getSection(self, sectionD, name, typeCode):
+        offset, length = sectionD[name]
+        offset += self.__dataStart
+        return self.__mv[offset : offset + length].cast(typeCode)
+
+    def close(self):
+        """Release the array views and the file mapping."""
+        if self.__mv is None:
+            return
+        for view in [self.__valueOffsets, self.__valueTypes, self.__keys, self.__rowOffsets, self.__rows, self.__hashSlots]:
+            view.release()
+        self.__mv.release()
+        self.__mv = None
+        self.__mm.close()
+
+    def getFilePath(self):
+        return self.__filePath
+
+    def getAttributes(self):
+        return self.__attributeD
+
+    def __len__(self):
+        return self.__numChains
+
+    def __contains__(self, chainKey):
+        return self.__findChain(chainKey) >= 0
+
+    def __getitem__(self, chainKey):
+        idx = self.__findChain(chainKey)
+        if idx < 0:
+            raise KeyError(chainKey)
+        return self.__getRows(idx)
+
+    def __iter__(self):
+        for idx in range(self.__numChains):
+            yield self.__getKey(idx)
+
+    def get(self, chainKey, default=None):
+        idx = self.__findChain(chainKey)
+        return self.__getRows(idx) if idx >= 0 else default
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for idx in range(self.__numChains):
+            yield self.__getRows(idx)
+
+    def items(self):
+        for idx in range(self.__numChains):
+            yield self.__getKey(idx), self.__getRows(idx)
+
+    def __findChain(self, chainKey):
+        try:
+            chainKey = tuple(chainKey)
+            slot = getKeyHash(chainKey) & self.__hashMask
+        except Exception:
+            return -1
+        hashSlots = self.__hashSlots
+        while True:
+            idx = hashSlots[slot]
+            if idx < 0:
+                return -1
+            if self.__getKey(idx) == chainKey:
+                return idx
+            slot = (slot + 1) & self.__hashMask
+
+    def __getValue(self, vId):
+        # Distinct values are few relative to their uses - keep a bounded table of decoded values
+        if vId in self.__valueCacheD:
+            return self.__valueCacheD[vId]
+        typeCode = self.__valueTypes[vId]
+        if typeCode == 110:
+            val = None
+        else:
+            val = self.__mm[self.__valueBase + self.__valueOffsets[vId] : self.__valueBase + self.__valueOffsets[vId + 1]].decode("utf-8")
+            val = int(val) if typeCode == 105 else val
+        if len(self.__valueCacheD) >= self.__valueCacheSize:
+            self.__valueCacheD.clear()
+        self.__valueCacheD[vId] = val
+        return val
+
+    def __getValues(self, vIdL):
+        try:
+            return list(map(self.__valueCacheD.__getitem__, vIdL))
+        except KeyError:
+            return [self.__getValue(vId) for vId in vIdL]
+
+    def __getKey(self, idx):
+        base = idx * self.__keyWidth
+        return tuple(self.__getValues(self.__keys[base : base + self.__keyWidth].tolist()))
+
+    def __getRows(self, idx):
+        width = self.__width
+        vL = self.__getValues(self.__rows[self.__rowOffsets[idx] * width : self.__rowOffsets[idx + 1] * width].tolist())
+        if self.__isFlat:
+            return [tuple(vL[base : base + width]) for base in range(0, len(vL), width)]
+        return [tuple([vL[base + col] if num == 0 else tuple(vL[base + col : base + col + num]) for col, num in self.__shapeL]) for base in range(0, len(vL), width)]
+
+
+def getKeyHash(chainKey):
+    return zlib.crc32("\x1f".join([str(val) for val in chainKey]).encode("utf-8"))
+
+
+class MappedTable(object):
+    """Read-only mapping over a memory-mapped node table tD[nodeId] = scalar or tuple of scalars (see exportMappedTable()),
+    e.g., the name, parent and lineage tables of the classification providers.
+
+    The table is held in the MappedAssignmentStore format with single element keys and one single element
+    row for a scalar value (or for each element of a tuple value).
+    """
+
+    def __init__(self, filePath, valueCacheSize=65536):
+        self.__store = MappedAssignmentStore(filePath, valueCacheSize=valueCacheSize)
+        self.__isTuple = self.__store.getAttributes().get("valueKind") == "tuple"
+
+    def close(self):
+        self.__store.close()
+
+    def getFilePath(self):
+        return self.__store.getFilePath()
+
+    def __len__(self):
+        return len(self.__store)
+
+    def __contains__(self, key):
+        return (key,) in self.__store
+
+    def __getitem__(self, key):
+        try:
+            return self.__getValue(self.__store[(key,)])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for (key,) in self.__store:
+            yield key
+
+    def get(self, key, default=None):
+        rowL = self.__store.get((key,))
+        return self.__getValue(rowL) if rowL is not None else default
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for rowL in self.__store.values():
+            yield self.__getValue(rowL)
+
+    def items(self):
+        for (key,), rowL in self.__store.items():
+            yield key, self.__getValue(rowL)
+
+    def __getValue(self, rowL):
+        return tuple([row[0] for row in rowL]) if self.__isTuple else rowL[0][0]
+
+
+def exportMappedTable(filePath, tableD):
+    """Write a node table tD[nodeId] = value with scalar (str, int or None) keys and either scalar or tuple
+    values (all of one kind) in the format read by MappedTable.
+
+    Returns:
+        bool: True for success or False otherwise
+    """
+    try:
+        isTuple = bool(tableD) and isinstance(next(iter(tableD.values())), (tuple, list))
+        assignD = {}
+        for key, val in tableD.items():
+            if isinstance(val, (tuple, list)) != isTuple:
+                raise ValueError("Inconsistent table value %r for %r" % (val, key))
+            assignD[(key,)] = [(tV,) for tV in val] if isTuple else [(val,)]
+        return exportMappedAssignments(filePath, assignD, [0], attributeD={"valueKind": "tuple" if isTuple else "scalar"})
+    except Exception as e:
+        logger.exception("Failing for %r with %s", filePath, str(e))
+    return False
+
+
+class MappedTreeNodeList(object):
+    """Read-only sequence of tree node dictionaries decoded on iteration from a memory-mapped JSON-lines
+    file (see TreeNodeExport.writeTreeNodes()).
+    """
+
+    def __init__(self, filePath):
+        self.__filePath = filePath
+        self.__numNodes = None
+        self.__mm = None
+        if os.path.getsize(filePath):
+            with open(filePath, "rb") as ifh:
+                self.__mm = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self.__mm is not None:
+            self.__mm.close()
+            self.__mm = None
+
+    def getFilePath(self):
+        return self.__filePath
+
+    def __len__(self):
+        if self.__numNodes is None:
+            self.__numNodes = sum([1 for _ in self.__iterSpans()])
+        return self.__numNodes
+
+    def __iter__(self):
+        for begPos, endPos in self.__iterSpans():
+            yield json.loads(self.__mm[begPos:endPos])
+
+    def __iterSpans(self):
+        mm = self.__mm
+        if mm is None:
+            return
+        begPos = 0
+        size = len(mm)
+        while begPos < size:
+            endPos = mm.find(b"\n", begPos)
+            endPos = size if endPos < 0 else endPos
+            yield begPos, endPos
+            begPos = endPos + 1
+
+
+def exportMappedAssignments(filePath, assignD, shape, attributeD=None):
+    """Write an assignment dictionary aD[chainKey] = [assignment tuple, ...] in the memory-mappable
+    columnar format read by MappedAssignmentStore (the file is replaced atomically).
+
+    Args:
+        filePath (str): output file path
+        assignD (dict): assignment dictionary with tuple chain keys of scalar values
+        shape (list): assignment tuple layout with one entry per tuple element, 0 for a scalar (str, int or None)
+                      element or the length of a nested tuple of scalars (e.g., [0, 0, 3, 0] for CATH tuples
+                      (cathId, domainId, (authAsymId, resBeg, resEnd), version))
+        attributeD (dict, optional): JSON serializable attributes stored in the file header. Defaults to None.
+
+    Returns:
+        bool: True for success or False otherwise
+    """
+    try:
+        valueD = {}
+        valueTypes = bytearray()
+        valueOffsets = array("q", [0])
+        valueBytes = bytearray()
+
+        def getValueId(val):
+            vKey = (type(val), val)
+            vId = valueD.get(vKey)
+            if vId is None:
+                if val is None:
+                    typeCode, vB = b"n", b""
+                elif isinstance(val, str):
+                    typeCode, vB = b"s", val.encode("utf-8")
+                elif isinstance(val, int) and not isinstance(val, bool):
+                    typeCode, vB = b"i", str(val).encode("utf-8")
+                else:
+                    raise ValueError("Unsupported value type %r" % type(val))
+                vId = valueD[vKey] = len(valueTypes)
+                valueTypes.extend(typeCode)
+                valueBytes.extend(vB)
+                valueOffsets.append(len(valueBytes))
+            return vId
+
+        #
+        width = sum([max(1, num) for num in shape])
+        keyWidth = len(next(iter(assignD))) if assignD else 2
+        keys = array("i")
+        rowOffsets = array("q", [0])
+        rows = array("i")
+        hashSize = 8
+        while hashSize < 2 * len(assignD):
+            hashSize *= 2
+        hashSlots = array("i", [-1]) * hashSize
+        for idx, (chainKey, tupL) in enumerate(assignD.items()):
+            if len(chainKey) != keyWidth:
+                raise ValueError("Inconsistent chain key %r" % (chainKey,))
+            keys.extend([getValueId(val) for val in chainKey])
+            slot = getKeyHash(chainKey) & (hashSize - 1)
+            while hashSlots[slot] >= 0:
+                slot = (slot + 1) & (hashSize - 1)
+            hashSlots[slot] = idx
+            for tup in tupL:
+                for val, num in zip(tup, shape):
+                    if num == 0:
+                        rows.append(getValueId(val))
+                    elif len(val) == num:
+                        rows.extend([getValueId(tV) for tV in val])
+                    else:
+                        raise ValueError("Assignment %r does not match shape %r" % (tup, shape))
+            rowOffsets.append(len(rows) // width)
+        #
+        sectionL = [
+            ("valueOffsets", valueOffsets.tobytes()),
+            ("valueTypes", bytes(valueTypes)),
+            ("valueBytes", bytes(valueBytes)),
+            ("keys", keys.tobytes()),
+            ("rowOffsets", rowOffsets.tobytes()),
+            ("rows", rows.tobytes()),
+            ("hashSlots", hashSlots.tobytes()),
+        ]
+        hD = {
+            "formatVersion": MAPPED_STORE_FORMAT_VERSION,
+            "byteOrder": sys.byteorder,
+            "shape": list(shape),
+            "width": width,
+            "keyWidth": keyWidth,
+            "numChains": len(assignD),
+            "numValues": len(valueTypes),
+            "hashSize": hashSize,
+            "attributes": attributeD if attributeD else {},
+            "sections": {},
+        }
+        # Section offsets are relative to the (aligned) end of the header
+        offset = 0
+        for name, bS in sectionL:
+            hD["sections"][name] = [offset, len(bS)]
+            offset = align(offset + len(bS))
+        headerB = json.dumps(hD).encode("utf-8")
+        dataStart = align(16 + len(headerB))
+        #
+        tmpPath = "%s.%d.tmp" % (filePath, os.getpid())
+        with open(tmpPath, "wb") as ofh:
+            ofh.write(MAPPED_STORE_MAGIC)
+            ofh.write(struct.pack("<Q", len(headerB)))
+            ofh.write(headerB)
+            for name, bS in sectionL:
+                ofh.write(b"\0" * (dataStart + hD["sections"][name][0] - ofh.tell()))
+                ofh.write(bS)
+        os.replace(tmpPath, filePath)
+        logger.info("Mapped assignments for %d chains (%d distinct values) written to %r", len(assignD), len(valueTypes), filePath)
+        return True
+    except Exception as e:
+        logger.exception("Failing for %r with %s", filePath, str(e))
+    return False
+
+
+def align(offset, size=8):
+    return (offset + size - 1) // size * size
+
+
+def getMappedCachePaths(cacheFilePath, assignKeyL):
+    """Return the metadata path and the mapped assignment file paths for the input pickle cache file."""
+    basePath = os.path.splitext(cacheFilePath)[0]
+    return basePath + "-meta.pic", {assignKey: basePath + "-" + assignKey + ".map" for assignKey in assignKeyL}
+
+
+def getMappedTablePath(cacheFilePath, tableKey, isNodeList):
+    """Return the mapped node table (.map) or tree node list (.jsonl) file path for the input pickle cache file."""
+    return os.path.splitext(cacheFilePath)[0] + "-" + tableKey + (".jsonl" if isNodeList else ".map")
+
+
+def exportMappedCache(cacheFilePath, sD, assignShapeD, excludeKeyL=None, tableKeyL=None):
+    """Write the mapped form of a pickle cache: one mapped file per assignment dictionary and per node table
+    or tree node list (tableKeyL) plus a pickle holding the remaining (scalar) cache content less excludeKeyL,
+    the kinds of the mapped tables and the modification time of the pickle cache file (used to detect stale
+    mapped files).
+
+    Args:
+        cacheFilePath (str): path to the pickle cache file (sD)
+        sD (dict): pickle cache content
+        assignShapeD (dict): {assignment dictionary key in sD: assignment tuple shape, ...}
+        excludeKeyL (list, optional): keys of sD omitted from the mapped form. Defaults to None.
+        tableKeyL (list, optional): keys of node tables (dict) and tree node lists (list) in sD stored in
+                                    mapped form (None values are kept in the pickle). Defaults to None.
+
+    Returns:
+        bool: True for success or False otherwise
+    """
+    try:
+        metaPath, mapPathD = getMappedCachePaths(cacheFilePath, assignShapeD.keys())
+        mU = MarshalUtil()
+        if mU.exists(metaPath):
+            os.remove(metaPath)
+        for assignKey, shape in assignShapeD.items():
+            if not exportMappedAssignments(mapPathD[assignKey], sD[assignKey], shape):
+                return False
+        tableKindD = {}
+        for tableKey in tableKeyL if tableKeyL else []:
+            val = sD.get(tableKey)
+            if val is None:
+                continue
+            isNodeList = isinstance(val, list)
+            tablePath = getMappedTablePath(cacheFilePath, tableKey, isNodeList)
+            ok = writeTreeNodes(iter(val), tablePath, compress=False) is not None if isNodeList else exportMappedTable(tablePath, val)
+            if not ok:
+                return False
+            tableKindD[tableKey] = "nodes" if isNodeList else "table"
+        skipS = set(assignShapeD.keys()) | set(tableKindD.keys()) | set(excludeKeyL if excludeKeyL else [])
+        mD = {ky: val for ky, val in sD.items() if ky not in skipS}
+        mD["mappedTables"] = tableKindD
+        mD["cacheModified"] = os.path.getmtime(cacheFilePath)
+        return mU.doExport(metaPath, mD, fmt="pickle")
+    except Exception as e:
+        logger.exception("Failing for %r with %s", cacheFilePath, str(e))
+    return False
+
+
+def loadMappedCache(cacheFilePath, assignKeyL, tableKeyL=None):
+    """Return the pickle cache content with the assignment dictionaries replaced by MappedAssignmentStore
+    objects and the mapped node tables and tree node lists by MappedTable and MappedTreeNodeList objects,
+    or None if the mapped form is missing, incomplete or older than the pickle cache file.
+
+    Args:
+        cacheFilePath (str): path to the pickle cache file
+        assignKeyL (list): assignment dictionary keys
+        tableKeyL (list, optional): node table and tree node list keys expected in mapped form. Defaults to None.
+
+    Returns:
+        dict: cache content (less any keys excluded from the mapped form) or None
+    """
+    try:
+        metaPath, mapPathD = getMappedCachePaths(cacheFilePath, assignKeyL)
+        mU = MarshalUtil()
+        if not mU.exists(cacheFilePath) or not mU.exists(metaPath) or not all([mU.exists(mapPath) for mapPath in mapPathD.values()]):
+            return None
+        sD = mU.doImport(metaPath, fmt="pickle")
+        if sD.get("cacheModified") != os.path.getmtime(cacheFilePath):
+            logger.info("Mapped cache for %r is out of date", cacheFilePath)
+            return None
+        tableKindD = sD.pop("mappedTables", {})
+        if any([sD.get(tableKey) is not None for tableKey in (tableKeyL if tableKeyL else [])]):
+            logger.info("Mapped cache for %r is missing mapped tables", cacheFilePath)
+            return None
+        for assignKey, mapPath in mapPathD.items():
+            sD[assignKey] = MappedAssignmentStore(mapPath)
+        for tableKey, kind in tableKindD.items():
+            isNodeList = kind == "nodes"
+            tablePath = getMappedTablePath(cacheFilePath, tableKey, isNodeList)
+            sD[tableKey] = MappedTreeNodeList(tablePath) if isNodeList else MappedTable(tablePath)
+        return sD
+    except Exception as e:
+        logger.exception("Failing for %r with %s", cacheFilePath, str(e))
+    return None
@@ -0,0 +1,110 @@
+##
+#  File:  NodeMemberIndex.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Reverse index from classification tree nodes to their member chain domains (pdbId, authAsymId, domainId)
+  with subtree roll-ups.
+
+"""
+
+import itertools
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class NodeMemberIndex(object):
+    """Reverse index from classification nodes to member chain domains.
+
+    The direct members of each node are stored as sorted lists of (pdbId, authAsymId, domainId) tuples
+    (a domain with several segments is listed once).  For subtree roll-ups, each node is mapped to the
+    nodes with direct members in its subtree (i.e., the nodes with the node in their id lineage), so a
+    roll-up costs time proportional to the size of the result.  Subtree member counts are memoized.
+
+    The index is built from the assignment dictionaries on the first query.
+    """
+
+    def __init__(self, assignDL, nodeFunc, lineageFunc):
+        """
+        Args:
+            assignDL (list): assignment dictionaries aD[(pdbId, authAsymId)] = [assignment tuple, ...]
+            nodeFunc (func): function returning (nodeId, domainId) for an assignment tuple
+            lineageFunc (func): function returning the id lineage (root to node) of a node or None
+        """
+        self.__assignDL = assignDL
+        self.__nodeFunc = nodeFunc
+        self.__lineageFunc = lineageFunc
+        self.__memberD = None
+        self.__subtreeD = None
+        self.__subtreeCountD = {}
+        self.__buildLock = threading.Lock()
+
+    def build(self):
+        """Build the index from the assignment dictionaries.
+
+        Returns:
+            int: number of nodes with direct members
+        """
+        memberD = {}
+        for assignD in self.__assignDL:
+            for (pdbId, authAsymId), tupL in assignD.items():
+                for tup in tupL:
+                    nodeId, domainId = self.__nodeFunc(tup)
+                    memberD.setdefault(nodeId, set()).add((pdbId, authAsymId, domainId))
+        subtreeD = {}
+        for nodeId in memberD:
+            lineageL = self.__lineageFunc(nodeId) or [nodeId]
+            for ancId in set(lineageL) | {nodeId}:
+                subtreeD.setdefault(ancId, []).append(nodeId)
+        self.__memberD = {nodeId: sorted(mS) for nodeId, mS in memberD.items()}
+        self.__subtreeD = subtreeD
+        self.__subtreeCountD = {}
+        logger.debug("Indexed members of nodes (%d) subtrees (%d)", len(self.__memberD), len(self.__subtreeD))
+        return len(self.__memberD)
+
+    def __ensureBuilt(self):
+        if self.__memberD is None:
+            with self.__buildLock:
+                if self.__memberD is None:
+                    self.build()
+
+    def getNodeIds(self):
+        """Return the nodes with direct members."""
+        self.__ensureBuilt()
+        return list(self.__memberD.keys())
+
+    def getMembers(self, nodeId, subtree=False):
+        """Return the member chain domains of the input node.
+
+        Args:
+            nodeId (str|int): classification node identifier
+            subtree (bool, optional): include the members of all descendant nodes. Defaults to False.
+
+        Returns:
+            list: [(pdbId, authAsymId, domainId), ...] sorted for direct members and in subtree node order for roll-ups
+        """
+        self.__ensureBuilt()
+        if not subtree:
+            return list(self.__memberD.get(nodeId, []))
+        nodeIdL = self.__subtreeD.get(nodeId, [])
+        if len(nodeIdL) == 1:
+            return list(self.__memberD[nodeIdL[0]])
+        return list(dict.fromkeys(itertools.chain.from_iterable([self.__memberD[nId] for nId in nodeIdL])))
+
+    def getMemberCount(self, nodeId, subtree=False):
+        """Return the number of member chain domains of the input node (cf. getMembers())."""
+        self.__ensureBuilt()
+        if not subtree:
+            return len(self.__memberD.get(nodeId, []))
+        try:
+            return self.__subtreeCountD[nodeId]
+        except KeyError:
+            pass
+        numMembers = len(self.getMembers(nodeId, subtree=True))
+        self.__subtreeCountD[nodeId] = numMembers
+        return numMembers
@@ -0,0 +1,146 @@
+##
+#  File:  ResidueLabelArrays.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Dense per-residue integer label arrays (with label vocabularies) encoding the domain assignments of
+  classification providers over residue numbering spans.
+
+"""
+
+import logging
+from array import array
+
+from rcsb.utils.struct.DomainIntervalIndex import toResidueNumber
+
+logger = logging.getLogger(__name__)
+
+# Label array element type (signed 32 bit integers)
+RESIDUE_LABEL_TYPECODE = "i"
+
+
+class ResidueLabelVocabulary(object):
+    """Dense integer codes for residue labels (node or domain identifiers).
+
+    Code 0 is reserved for unlabeled residues and labels are assigned codes 1, 2, ... in order of first use,
+    so codes remain stable when a vocabulary is shared across calls.
+    """
+
+    def __init__(self, labelL=None):
+        """
+        Args:
+            labelL (list, optional): labels for codes 1, 2, ... (e.g., from a previous getLabels()[1:]). Defaults to None.
+        """
+        self.__labelL = [None]
+        self.__codeD = {}
+        for label in labelL or []:
+            self.getCode(label)
+
+    def __len__(self):
+        return len(self.__labelL)
+
+    def __contains__(self, label):
+        return label in self.__codeD
+
+    def getCode(self, label):
+        """Return the code of the input label (assigning the next code to a new label)."""
+        try:
+            return self.__codeD[label]
+        except KeyError:
+            pass
+        code = len(self.__labelL)
+        self.__codeD[label] = code
+        self.__labelL.append(label)
+        return code
+
+    def getLabel(self, code):
+        """Return the label of the input code (None for code 0 or undefined codes)."""
+        try:
+            return self.__labelL[code] if code > 0 else None
+        except IndexError:
+            return None
+
+    def getLabels(self):
+        """Return the labels in code order ([None, label1, label2, ...])."""
+        return list(self.__labelL)
+
+
+def encodeResidueLabels(chainIntervalL, labelType="node", vocabulary=None):
+    """Fill a single contiguous label array for a batch of chains.
+
+    Args:
+        chainIntervalL (list): [(intervalL, begResNum, endResNum), ...] with intervalL as [(resBeg, resEnd, (nodeId, domainId)), ...]
+                               sorted on resBeg (inclusive integer bounds) and the inclusive residue numbering span of each chain
+        labelType (str, optional): residue labels "node" (classification node identifiers) or "domain" (domain identifiers). Defaults to "node".
+        vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+    Returns:
+        (array, list, ResidueLabelVocabulary): label array (concatenated over the chains), start offsets of the chains in the
+                                               label array (followed by the total length) and the label vocabulary
+
+    Residues of the span outside any domain have label code 0.  Where domains overlap, residues take the label of the
+    domain beginning last.
+    """
+    if labelType not in ["node", "domain"]:
+        raise ValueError("Unsupported residue label type %r" % labelType)
+    itemIndex = 0 if labelType == "node" else 1
+    vocabulary = vocabulary if vocabulary is not None else ResidueLabelVocabulary()
+    spanL = []
+    offsetL = [0]
+    for _, begResNum, endResNum in chainIntervalL:
+        begNum, endNum = toResidueNumber(begResNum), toResidueNumber(endResNum)
+        if begNum is None or endNum is None:
+            raise ValueError("Undefined residue numbering span (%r, %r)" % (begResNum, endResNum))
+        spanL.append((begNum, endNum))
+        offsetL.append(offsetL[-1] + max(0, endNum - begNum + 1))
+    labelA = array(RESIDUE_LABEL_TYPECODE, [0]) * offsetL[-1]
+    getCode = vocabulary.getCode
+    for (intervalL, _, _), (begNum, endNum), offset in zip(chainIntervalL, spanL, offsetL):
+        for resBeg, resEnd, item in intervalL:
+            lo = resBeg if resBeg > begNum else begNum
+            hi = resEnd if resEnd < endNum else endNum
+            if lo > hi:
+                continue
+            labelA[offset + lo - begNum : offset + hi - begNum + 1] = array(RESIDUE_LABEL_TYPECODE, [getCode(item[itemIndex])]) * (hi - lo + 1)
+    return labelA, offsetL, vocabulary
+
+
+class ResidueLabelEncoder(object):
+    """Per-residue label arrays for a batch of chains from several classification providers at once.
+
+    Each provider keeps its own vocabulary across calls, so label codes are stable over successive batches.
+    """
+
+    def __init__(self, providerD, **kwargs):
+        """
+        Args:
+            providerD (dict): classification providers {sourceName: provider, ...} (e.g., {"cath": ..., "ecod": ...})
+            labelType (str, optional): residue labels "node" or "domain" (cf. encodeResidueLabels()). Defaults to "node".
+            assignmentTypeD (dict, optional): provider assignment types {sourceName: assignmentType} (e.g., {"scop2": "superfamily"}). Defaults to {}.
+        """
+        self.__providerD = providerD
+        self.__labelType = kwargs.get("labelType", "node")
+        self.__assignmentTypeD = kwargs.get("assignmentTypeD", {})
+        self.__vocabularyD = {sourceName: ResidueLabelVocabulary() for sourceName in providerD}
+
+    def getVocabulary(self, sourceName):
+        return self.__vocabularyD[sourceName]
+
+    def encode(self, chainSpanL):
+        """Return the label arrays of the input chains for each provider.
+
+        Args:
+            chainSpanL (list): chains and residue numbering spans [(pdbId, authAsymId, begResNum, endResNum), ...]
+
+        Returns:
+            dict: {sourceName: (labelArray, offsetList), ...} (cf. encodeResidueLabels())
+        """
+        rD = {}
+        for sourceName, prov in self.__providerD.items():
+            kwD = {"assignmentType": self.__assignmentTypeD[sourceName]} if sourceName in self.__assignmentTypeD else {}
+            labelA, offsetL, _ = prov.getResidueLabelsBulk(chainSpanL, labelType=self.__labelType, vocabulary=self.__vocabularyD[sourceName], **kwD)
+            rD[sourceName] = (labelA, offsetL)
+        return rD
@@ -10,6 +10,28 @@
 #   23-Apr-2024 dwp SCOP2/SCOP2B website was shut down--turn off fetching of source data until/if new site is made available again
 #    9-May-2024 dwp Adjust reload process to not re-download fallback data upon every instantiation
 #   10-Jun-2024 dwp Update SCOP2 source to new website; restructure data reloading/building steps
+#   16-Oct-2026     Use order-preserving hash-based de-duplication of family and superfamily assignments
+#   16-Oct-2026     Add residue position interval indices and getDomainsAtResidue()/getDomainsOverlapping()
+#   16-Oct-2026     Materialize id and name lineage tables once per release (stored with the cache)
+#   16-Oct-2026     Fetch the SCOP2 and SIFTS source resources concurrently (single fetch of the classification file)
+#   16-Oct-2026     Export the tree node list once per release (stored with the cache) and add iterTreeNodes()
+#   16-Oct-2026     Add getBatchAnnotations() returning the annotations for many chains in one call
+#   16-Oct-2026     Add lazy loading of the cache on first access (lazyLoad)
+#   16-Oct-2026     Add memory-mapped columnar assignment cache (useMappedCache)
+#   16-Oct-2026     Add freezeForFork() for sharing the provider with pre-fork worker pools
+#   17-Oct-2026     Add per-phase build timing and memory statistics (getBuildStats(), buildStatsPath)
+#   17-Oct-2026     Add accessor call, hit and miss counters and latency histograms (lookupStats)
+#   17-Oct-2026     Add fromBackup option to load the cache directly from the backup resource (urlFallbackTarget)
+#   17-Oct-2026     Write a cache manifest (getCacheManifest(), testCacheManifest())
+#   17-Oct-2026     Add node member queries with subtree roll-ups (getNodeMembers(), getNodeMemberCount())
+#   17-Oct-2026     Add nested-set hierarchy queries (isDescendant(), getDescendants(), getSubtreeSize())
+#   17-Oct-2026     Add lowest common ancestor queries (getLowestCommonAncestor(), getLowestCommonAncestors())
+#   17-Oct-2026     Add iterDomainIntervals() for bulk cross-classification overlap mapping
+#   17-Oct-2026     Add dense per-residue label arrays (getResidueLabels(), getResidueLabelsBulk())
+#   17-Oct-2026     Add streaming JSON-lines tree node export (exportTreeNodes(), getTreeNodeBytes())
+#   17-Oct-2026     Return the stored tree node list from getTreeNodeList() without copying
+#   17-Oct-2026     Reuse only successful tree node encodings and reset the derived tree node data in freezeForFork()
+#   17-Oct-2026     Check the cache against SCOP2_CACHE_MIN_COUNT_D
 ##
 """
   Extract SCOP2 domain assignments, term descriptions and SCOP2 classification hierarchy
@@ -18,19 +40,72 @@
 """
 
 import collections
+import concurrent.futures
 import datetime
 import logging
 import os.path
 import sys
+import threading
 
 from rcsb.utils.io.FileUtil import FileUtil
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.StashableBase import StashableBase
+from rcsb.utils.struct.BuildStats import BuildStats
+from rcsb.utils.struct.CacheManifest import checkCacheManifest
+from rcsb.utils.struct.CacheManifest import readCacheManifest
+from rcsb.utils.struct.CacheManifest import writeCacheManifest
+from rcsb.utils.struct.DomainIntervalIndex import DomainIntervalIndex
+from rcsb.utils.struct.HierarchyIndex import HierarchyIndex
+from rcsb.utils.struct.LookupStats import LookupStatsMixin
+from rcsb.utils.struct.LookupStats import isAncestorFound
+from rcsb.utils.struct.LookupStats import isAnyAnnotated
+from rcsb.utils.struct.LookupStats import isAnyFound
+from rcsb.utils.struct.LookupStats import isAnyLabeled
+from rcsb.utils.struct.LookupStats import isFound
+from rcsb.utils.struct.LookupStats import isNonEmpty
+from rcsb.utils.struct.LookupStats import isPositive
+from rcsb.utils.struct.MappedAssignmentStore import MappedAssignmentStore
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedCache
+from rcsb.utils.struct.MappedAssignmentStore import loadMappedCache
+from rcsb.utils.struct.NodeMemberIndex import NodeMemberIndex
+from rcsb.utils.struct.ResidueLabelArrays import encodeResidueLabels
+from rcsb.utils.struct.TreeNodeExport import encodeTreeNodes
+from rcsb.utils.struct.TreeNodeExport import writeTreeNodes
 
 logger = logging.getLogger(__name__)
 
+# Layout of the family and superfamily assignment tuples (domainId, familyOrSuperFamilyId, authAsymId, resBeg, resEnd) in the mapped cache
+SCOP2_ASSIGNMENT_SHAPE_D = {"families": [0, 0, 0, 0, 0], "superfamilies": [0, 0, 0, 0, 0], "superfamilies2b": [0, 0, 0, 0, 0]}
+# SCOP2 name, name type, parent (type, class and class root) and lineage tables and tree node list read in place from the mapped cache
+SCOP2_MAPPED_TABLE_KEYS = ["names", "nametypes", "parentsType", "parentsClass", "parentsClassRoot", "idLineage", "nameLineage", "treeNodes"]
+# Record counts to be exceeded by a valid cache (cf. testCache())
+SCOP2_CACHE_MIN_COUNT_D = {"names": 9000, "parentsType": 70000}
+# Lookup accessors counted with lookupStats and the tests of their results counted as hits
+SCOP2_LOOKUP_ACCESSOR_D = {
+    "getFamilyIds": isNonEmpty,
+    "getSuperFamilyIds": isNonEmpty,
+    "getFamilyNames": isNonEmpty,
+    "getSuperFamilyNames": isNonEmpty,
+    "getFamilyResidueRanges": isNonEmpty,
+    "getSuperFamilyResidueRanges": isNonEmpty,
+    "getSuperFamilyNames2B": isNonEmpty,
+    "getSuperFamilyIds2B": isNonEmpty,
+    "getSuperFamilyResidueRanges2B": isNonEmpty,
+    "getBatchAnnotations": isAnyAnnotated,
+    "getDomainsAtResidue": isNonEmpty,
+    "getDomainsOverlapping": isNonEmpty,
+    "getResidueLabels": isAnyLabeled,
+    "getName": isFound,
+    "getNameType": isFound,
+    "getNodeMembers": isNonEmpty,
+    "getNodeMemberCount": isPositive,
+    "getIdLineage": isNonEmpty,
+    "getNameLineage": isAnyFound,
+    "getLowestCommonAncestor": isAncestorFound,
+}
 
-class Scop2ClassificationProvider(StashableBase):
+
+class Scop2ClassificationProvider(StashableBase, LookupStatsMixin):
     """Extract SCOP2 domain assignments, term descriptions and SCOP classification hierarchy
     from SCOP and SCOP2B flat files.
     """
@@ -46,31 +121,139 @@ class Scop2ClassificationProvider(StashableBase):
         #
         self.__urlTargetScop2 = kwargs.get("urlTargetScop2", "https://www.ebi.ac.uk/pdbe/scop/files")
         self.__urlTargetSifts = kwargs.get("urlTargetSifts", "http://ftp.ebi.ac.uk/pub/databases/msd/sifts/flatfiles/tsv")  # JDW note cert issues with this site
-        self.__urlFallbackTarget = "https://raw.githubusercontent.com/rcsb/py-rcsb_exdb_assets/master/fall_back/SCOP2"
+        self.__urlFallbackTarget = kwargs.get("urlFallbackTarget", "https://raw.githubusercontent.com/rcsb/py-rcsb_exdb_assets/master/fall_back/SCOP2")
+        # Skip the primary sources in rebuilds and load the cache directly from the backup resource
+        self.__fromBackup = kwargs.get("fromBackup", False)
         #
         self.__version = "latest"
         self.__fmt = "pickle"
         self.__mU = MarshalUtil(workPath=self.__dirPath)
-        #
+        # Number of threads used to fetch independent source resources concurrently
+        self.__fetchWorkers = kwargs.get("fetchWorkers", 4)
+        # Read the assignment index in place from a memory-mapped copy of the cache (written alongside the pickle cache)
+        self.__useMappedCache = kwargs.get("useMappedCache", False)
+        # Record the per-phase timing (and optionally the traced memory) of each reload with an optional JSON report
+        self.__traceMemory = kwargs.get("traceMemory", False)
+        self.__buildStatsPath = kwargs.get("buildStatsPath", None)
+        self.__buildStats = None
+        self._initLookupStats(kwargs.get("lookupStats", False), SCOP2_LOOKUP_ACCESSOR_D)
+        # Defer reading (or building) the cache until the first accessor call
+        self.__lazyLoad = kwargs.get("lazyLoad", False)
+        self.__loadLock = threading.Lock()
+        self.__isLoaded = False
+        if self.__lazyLoad:
+            assignmentPath = os.path.join(self.__dirPath, self.__getAssignmentFileName(fmt=self.__fmt))
+            logger.info("Deferring SCOP2 load (cache %r present %r)", assignmentPath, self.__mU.exists(assignmentPath))
+        else:
+            self.__load()
+
+    def __load(self):
         self.__nD, self.__ntD, self.__pAD, self.__pBD, self.__pBRootD, self.__fD, self.__sfD, self.__sf2bD = self.__reload(useCache=self.__useCache, fmt=self.__fmt)
         #
-        if not self.testCache():
+        lazy = isinstance(self.__fD, MappedAssignmentStore)
+        self.__intervalIndexD = {
+            "family": DomainIntervalIndex(self.__fD, self.__getIntervalRange, lazy=lazy),
+            "superfamily": DomainIntervalIndex(self.__sfD, self.__getIntervalRange, lazy=lazy),
+            "superfamily2b": DomainIntervalIndex(self.__sf2bD, self.__getIntervalRange, lazy=lazy),
+        }
+        self.__resetMemberIndex()
+        self.__isLoaded = True
+        #
+        if not self.__testCache():
             logger.error("Failed to build SCOP2 CACHE")
 
+    def __ensureLoaded(self):
+        if not self.__isLoaded:
+            with self.__loadLock:
+                if not self.__isLoaded:
+                    self.__load()
+
     def testCache(self):
+        self.__ensureLoaded()
+        return self.__testCache()
+
+    def __testCache(self):
         logger.info(
             "SCOP2 lengths nD %d pAD %d pBD %d pBRootD %d fD %d sfD %d sf2bD %d",
             len(self.__nD), len(self.__pAD), len(self.__pBD), len(self.__pBRootD), len(self.__fD), len(self.__sfD), len(self.__sf2bD)
         )
-        if (len(self.__nD) > 9000) and (len(self.__pAD) > 70000):
-            return True
-        return False
+        countD = {"names": len(self.__nD), "parentsType": len(self.__pAD)}
+        return all(countD[ky] > minCount for ky, minCount in SCOP2_CACHE_MIN_COUNT_D.items())
+
+    def getCacheManifest(self):
+        """Return the manifest of the SCOP2 cache file (cf. readCacheManifest()) or {} if there is no manifest (the cache is not loaded)."""
+        return readCacheManifest(os.path.join(self.__dirPath, self.__getAssignmentFileName(fmt=self.__fmt))) or {}
+
+    def testCacheManifest(self, verifyChecksum=False):
+        """Check the SCOP2 cache file and record counts against the manifest without loading the cache (cf. checkCacheManifest())."""
+        return checkCacheManifest(os.path.join(self.__dirPath, self.__getAssignmentFileName(fmt=self.__fmt)), SCOP2_CACHE_MIN_COUNT_D, verifyChecksum=verifyChecksum)
+
+    def getBuildStats(self):
+        """Return the per-phase statistics of the last SCOP2 cache load or rebuild (cf. BuildStats.getStats()) or {} if not available."""
+        self.__ensureLoaded()
+        return self.__buildStats.getStats() if self.__buildStats else {}
+
+    def __finishBuildStats(self, bS):
+        bS.finish()
+        self.__buildStats = bS
+        if self.__buildStatsPath:
+            ok = bS.writeReport(self.__buildStatsPath)
+            logger.debug("Build report %r save status %r", self.__buildStatsPath, ok)
+
+    def freezeForFork(self):
+        """Switch the SCOP2 name, name type, parent, lineage, tree node and assignment tables to the mapped cache form shared by forked workers (cf. freezeGcForFork()).
+
+        Returns:
+            bool: True if the provider tables are memory-mapped or False otherwise
+        """
+        self.__ensureLoaded()
+        ok = isinstance(self.__fD, MappedAssignmentStore)
+        if not ok and self.__fmt == "pickle":
+            assignmentPath = os.path.join(self.__dirPath, self.__getAssignmentFileName(fmt=self.__fmt))
+            assignKeyL = list(SCOP2_ASSIGNMENT_SHAPE_D.keys())
+            sD = loadMappedCache(assignmentPath, assignKeyL, tableKeyL=SCOP2_MAPPED_TABLE_KEYS)
+            if sD is None:
+                cD = {
+                    "version": self.__version,
+                    "names": self.__nD,
+                    "nametypes": self.__ntD,
+                    "parentsType": self.__pAD,
+                    "parentsClass": self.__pBD,
+                    "parentsClassRoot": self.__pBRootD,
+                    "families": self.__fD,
+                    "superfamilies": self.__sfD,
+                    "superfamilies2b": self.__sf2bD,
+                    "idLineage": self.__idLineageD,
+                    "nameLineage": self.__nameLineageD,
+                    "treeNodes": self.__treeNodeL,
+                }
+                if exportMappedCache(assignmentPath, cD, SCOP2_ASSIGNMENT_SHAPE_D, tableKeyL=SCOP2_MAPPED_TABLE_KEYS):
+                    sD = loadMappedCache(assignmentPath, assignKeyL, tableKeyL=SCOP2_MAPPED_TABLE_KEYS)
+            if sD is not None:
+                self.__nD, self.__ntD = sD["names"], sD["nametypes"]
+                self.__pAD, self.__pBD, self.__pBRootD = sD["parentsType"], sD["parentsClass"], sD["parentsClassRoot"]
+                self.__fD, self.__sfD, self.__sf2bD = sD["families"], sD["superfamilies"], sD["superfamilies2b"]
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+                self.__treeNodeL = self.__treeNodeL if sD.get("treeNodes") is None else sD["treeNodes"]
+                self.__hierarchyIndex = None
+                self.__treeNodeBytesD = {}
+                self.__intervalIndexD = {
+                    "family": DomainIntervalIndex(self.__fD, self.__getIntervalRange, lazy=True),
+                    "superfamily": DomainIntervalIndex(self.__sfD, self.__getIntervalRange, lazy=True),
+                    "superfamily2b": DomainIntervalIndex(self.__sf2bD, self.__getIntervalRange, lazy=True),
+                }
+                self.__resetMemberIndex()
+                ok = True
+        logger.info("SCOP2 provider frozen for fork (mapped tables %r)", ok)
+        return ok
 
     def getVersion(self):
         """Returns the SCOP2 version"""
+        self.__ensureLoaded()
         return self.__version
 
     def getFamilyIds(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[1] for tup in self.__fD[(pdbId.upper(), authAsymId)]]))
         except Exception as e:
@@ -78,6 +261,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getSuperFamilyIds(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[1] for tup in self.__sfD[(pdbId.upper(), authAsymId)]]))
         except Exception as e:
@@ -85,6 +269,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getFamilyNames(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([self.__nD[tup[1]] for tup in self.__fD[(pdbId.upper(), authAsymId)]]))
         except Exception as e:
@@ -92,6 +277,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getSuperFamilyNames(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([self.__nD[tup[1]] for tup in self.__sfD[(pdbId.upper(), authAsymId)]]))
         except Exception as e:
@@ -99,6 +285,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getFamilyResidueRanges(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             # s/fD.setdefault((pdbId, authAsymId), []).append((domSuperFamilyId, authAsymId, authSeqBeg, authSeqEnd))
             return [(tup[0], tup[1], tup[2], tup[3], tup[4]) for tup in self.__fD[(pdbId.upper(), authAsymId)]]
@@ -107,6 +294,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getSuperFamilyResidueRanges(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return [(tup[0], tup[1], tup[2], tup[3], tup[4]) for tup in self.__sfD[(pdbId.upper(), authAsymId)]]
         except Exception as e:
@@ -114,6 +302,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getSuperFamilyNames2B(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([self.__nD[tup[1]] for tup in self.__sf2bD[(pdbId.upper(), authAsymId)]]))
         except Exception as e:
@@ -121,6 +310,7 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getSuperFamilyIds2B(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[1] for tup in self.__sf2bD[(pdbId.upper(), authAsymId)]]))
         except Exception as e:
@@ -128,13 +318,141 @@ class Scop2ClassificationProvider(StashableBase):
         return []
 
     def getSuperFamilyResidueRanges2B(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return [(tup[0], tup[1], tup[2], tup[3], tup[4]) for tup in self.__sf2bD[(pdbId.upper(), authAsymId)]]
         except Exception as e:
             logger.debug("Failing for %r %r with %s", pdbId, authAsymId, str(e))
         return []
 
+    def getBatchAnnotations(self, chainKeys, fields=None):
+        """Return the SCOP2 and SCOP2B annotations for a batch of chains in a single call.
+
+        Args:
+            chainKeys (iterable): chain keys [(pdbId, authAsymId), ...]
+            fields (list, optional): annotation fields (familyIds, familyNames, familyResidueRanges, superFamilyIds,
+                                     superFamilyNames, superFamilyResidueRanges, superFamilyIds2B, superFamilyNames2B,
+                                     superFamilyResidueRanges2B). Defaults to all fields.
+
+        Returns:
+            dict: {(pdbId, authAsymId): {field: [...], ...}, ...} with empty field lists for chains without assignments
+        """
+        self.__ensureLoaded()
+        fD = {}
+        for prefix, suffix, aD in [("family", "", self.__fD), ("superFamily", "", self.__sfD), ("superFamily", "2B", self.__sf2bD)]:
+            fD[prefix + "Ids" + suffix] = (aD, lambda tupL: list({tup[1]: None for tup in tupL}))
+            fD[prefix + "Names" + suffix] = (aD, lambda tupL: list({self.__nD.get(tup[1]): None for tup in tupL}))
+            fD[prefix + "ResidueRanges" + suffix] = (aD, lambda tupL: [(tup[0], tup[1], tup[2], tup[3], tup[4]) for tup in tupL])
+        fieldL = fields if fields else list(fD.keys())
+        funcL = [(field, fD[field][0], fD[field][1]) for field in fieldL if field in fD]
+        if len(funcL) < len(fieldL):
+            logger.warning("Skipping unsupported annotation fields %r", [field for field in fieldL if field not in fD])
+        rD = {}
+        for pdbId, authAsymId in chainKeys:
+            chainKey = (pdbId.upper(), authAsymId)
+            rD[(pdbId, authAsymId)] = {field: func(aD[chainKey]) if chainKey in aD else [] for field, aD, func in funcL}
+        return rD
+
+    def getDomainsAtResidue(self, pdbId, authAsymId, resNum, assignmentType="family"):
+        """Return the SCOP2 domain residue ranges covering the input residue number.
+
+        Args:
+            assignmentType (str, optional): family, superfamily or superfamily2b (SCOP2B). Defaults to "family".
+
+        Returns:
+            list: [(domId, familyOrSuperFamilyId, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        try:
+            return self.__intervalIndexD[assignmentType].getAtResidue((pdbId.upper(), authAsymId), resNum)
+        except Exception as e:
+            logger.debug("Failing for %r %r %r with %s", pdbId, authAsymId, assignmentType, str(e))
+        return []
+
+    def getDomainsOverlapping(self, pdbId, authAsymId, begResNum, endResNum, assignmentType="family"):
+        """Return the SCOP2 domain residue ranges overlapping the input (inclusive) residue range.
+
+        Args:
+            assignmentType (str, optional): family, superfamily or superfamily2b (SCOP2B). Defaults to "family".
+
+        Returns:
+            list: [(domId, familyOrSuperFamilyId, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        try:
+            return self.__intervalIndexD[assignmentType].getOverlapping((pdbId.upper(), authAsymId), begResNum, endResNum)
+        except Exception as e:
+            logger.debug("Failing for %r %r %r with %s", pdbId, authAsymId, assignmentType, str(e))
+        return []
+
+    def iterDomainIntervals(self, assignmentType="family"):
+        """Yield the SCOP2 domain residue intervals of each chain (ordered by residue range begin).
+
+        Args:
+            assignmentType (str, optional): family, superfamily or superfamily2b (SCOP2B). Defaults to "family".
+
+        Yields:
+            ((pdbId, authAsymId), [(resBeg, resEnd, (familyOrSuperFamilyId, domId)), ...]) with integer residue bounds
+        """
+        self.__ensureLoaded()
+        for chainKey in self.__intervalIndexD[assignmentType].getChainKeys():
+            yield chainKey, self.__getDomainIntervals(assignmentType, chainKey)
+
+    def getResidueLabels(self, pdbId, authAsymId, begResNum, endResNum, labelType="node", vocabulary=None, assignmentType="family"):
+        """Return the per-residue SCOP2 labels of the input chain over the input (inclusive) residue numbering span.
+
+        Args:
+            pdbId (str): PDB identifier
+            authAsymId (str): author chain identifier
+            begResNum (int): first residue number of the span
+            endResNum (int): last residue number of the span
+            labelType (str, optional): residue labels "node" (SCOP2 family or superfamily identifiers) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+            assignmentType (str, optional): family, superfamily or superfamily2b (SCOP2B). Defaults to "family".
+
+        Returns:
+            (array, ResidueLabelVocabulary): label codes of the residues in the span (0 for unassigned residues) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        labelA, _, vocabulary = self.__getResidueLabelsBulk([(pdbId, authAsymId, begResNum, endResNum)], labelType=labelType, vocabulary=vocabulary, assignmentType=assignmentType)
+        return labelA, vocabulary
+
+    def getResidueLabelsBulk(self, chainSpanL, labelType="node", vocabulary=None, assignmentType="family"):
+        """Return the per-residue SCOP2 labels of a batch of chains in a single contiguous label array (cf. encodeResidueLabels()).
+
+        Args:
+            chainSpanL (list): chains and residue numbering spans [(pdbId, authAsymId, begResNum, endResNum), ...]
+            labelType (str, optional): residue labels "node" (SCOP2 family or superfamily identifiers) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+            assignmentType (str, optional): family, superfamily or superfamily2b (SCOP2B). Defaults to "family".
+
+        Returns:
+            (array, list, ResidueLabelVocabulary): label array, start offsets of the chains (followed by the total length) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        return self.__getResidueLabelsBulk(chainSpanL, labelType=labelType, vocabulary=vocabulary, assignmentType=assignmentType)
+
+    def __getResidueLabelsBulk(self, chainSpanL, labelType, vocabulary, assignmentType):
+        if assignmentType not in self.__intervalIndexD:
+            raise ValueError("Unsupported SCOP2 assignment type %r" % assignmentType)
+        chainIntervalL = [(self.__getDomainIntervals(assignmentType, (pdbId.upper(), authAsymId)), begResNum, endResNum) for pdbId, authAsymId, begResNum, endResNum in chainSpanL]
+        return encodeResidueLabels(chainIntervalL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getDomainIntervals(self, assignmentType, chainKey):
+        return [(resBeg, resEnd, (tup[1], tup[0])) for resBeg, resEnd, tup in self.__intervalIndexD[assignmentType].getIntervals(chainKey)]
+
+    def __getNodeMember(self, tup):
+        return (tup[1], tup[0])
+
+    def __resetMemberIndex(self):
+        # Reverse index from nodes to member chain domains (SCOP2 family and superfamily assignments) (built on the first member query)
+        self.__memberIndex = NodeMemberIndex([self.__fD, self.__sfD], self.__getNodeMember, lambda nodeId: self.__idLineageD.get(nodeId))
+
+    def __getIntervalRange(self, tup):
+        return tup[3], tup[4], (tup[0], tup[1], tup[2], tup[3], tup[4])
+
     def getName(self, domId):
+        self.__ensureLoaded()
         try:
             return self.__nD[domId]
         except Exception:
@@ -142,6 +460,7 @@ class Scop2ClassificationProvider(StashableBase):
         return None
 
     def getNameType(self, domId):
+        self.__ensureLoaded()
         qD = {"TP": "Protein Type", "CL": "Protein Class", "CF": "Fold", "SF": "Superfamily", "FA": "Family"}
         try:
             return qD[self.__ntD[domId]]
@@ -149,39 +468,174 @@ class Scop2ClassificationProvider(StashableBase):
             logger.debug("Undefined ECOD id %r", domId)
         return None
 
+    def getNodeMembers(self, domId, subtree=False):
+        """Return the SCOP2 family and superfamily chain domains assigned to the input SCOP2 node (or to any node in its subtree).
+
+        Args:
+            domId (str): SCOP2 family or superfamily identifier (e.g., 3002524)
+            subtree (bool, optional): include the members of all descendant nodes. Defaults to False.
+
+        Returns:
+            list: [(pdbId, authAsymId, domainId), ...]
+        """
+        self.__ensureLoaded()
+        return self.__memberIndex.getMembers(domId, subtree=subtree)
+
+    def getNodeMemberCount(self, domId, subtree=False):
+        """Return the number of SCOP2 family and superfamily chain domains assigned to the input SCOP2 node (or to any node in its subtree)."""
+        self.__ensureLoaded()
+        return self.__memberIndex.getMemberCount(domId, subtree=subtree)
+
     def getIdLineage(self, domId):
+        self.__ensureLoaded()
+        if domId in self.__idLineageD:
+            return list(self.__idLineageD[domId])
+        return self.__getIdLineage(domId, self.__pAD, self.__pBD)
+
+    def getNameLineage(self, domId):
+        self.__ensureLoaded()
+        if domId in self.__nameLineageD:
+            return list(self.__nameLineageD[domId])
+        try:
+            nL = []
+            for dId in self.__getIdLineage(domId, self.__pAD, self.__pBD):
+                tN = self.__nD.get(dId)
+                tN = tN if tN else "Unnamed"
+                nL.append(tN)
+            return nL
+        except Exception as e:
+            logger.debug("Failing for %r with %s", domId, str(e))
+        return None
+
+    def __getIdLineage(self, domId, pAD, pBD):
         pS = set()
         try:
             pS.add(domId)
-            pt = self.__pAD[domId]
+            pt = pAD[domId]
             while (pt is not None) and (pt != 0):
                 pS.add(pt)
-                pt = self.__pAD[pt]
+                pt = pAD[pt]
             #
-            pt = self.__pBD[domId]
+            pt = pBD[domId]
             while (pt is not None) and (pt != 0):
                 pS.add(pt)
-                pt = self.__pBD[pt]
+                pt = pBD[pt]
         except Exception as e:
             logger.debug("Failing for %r with %s", domId, str(e))
         #
         return sorted(pS)
 
-    def getNameLineage(self, domId):
-        try:
-            nL = []
-            for dId in self.getIdLineage(domId):
-                tN = self.getName(dId)
-                tN = tN if tN else "Unnamed"
-                nL.append(tN)
-            return nL
-        except Exception as e:
-            logger.debug("Failing for %r with %s", domId, str(e))
-        return None
+    def __buildLineageTables(self, nD, pAD, pBD):
+        """Materialize the id and name lineages for all nodes in the protein type and structural class hierarchies.
+
+        Returns:
+            (dict, dict): idLineageD[domId] = (domId, ...), nameLineageD[domId] = (name, ...)
+        """
+        idLineageD = {}
+        nameLineageD = {}
+        for domId in set(pAD.keys()) | set(pBD.keys()):
+            idL = self.__getIdLineage(domId, pAD, pBD)
+            idLineageD[domId] = tuple(idL)
+            nameLineageD[domId] = tuple([nD[dId] if nD.get(dId) else "Unnamed" for dId in idL])
+        logger.debug("SCOP2 lineage tables (%d)", len(idLineageD))
+        return idLineageD, nameLineageD
+
+    def isDescendant(self, domId, ancestorId):
+        """Return True if the input SCOP2 node is a (proper) descendant of the input ancestor node (nested-set test).
+
+        Args:
+            domId (str): SCOP2 node identifier
+            ancestorId (str): SCOP2 ancestor node identifier
+
+        Returns:
+            bool: True if ancestorId is a proper ancestor of domId or False otherwise
+        """
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().isDescendant(domId, ancestorId)
+
+    def getDescendants(self, domId):
+        """Return the (proper) descendants of the input SCOP2 node in tree pre-order."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getDescendants(domId)
+
+    def getSubtreeSize(self, domId):
+        """Return the number of SCOP2 nodes in the subtree rooted at the input node (including the node)."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getSubtreeSize(domId)
+
+    def getLowestCommonAncestor(self, domId1, domId2):
+        """Return the lowest common ancestor of the input SCOP2 nodes and its level (TP, CL, CF, SF or FA).
+
+        Args:
+            domId1 (str): SCOP2 node identifier
+            domId2 (str): SCOP2 node identifier
+
+        Returns:
+            (str, str): lowest common ancestor identifier and level or (None, None) if the nodes share no ancestor
+        """
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors([(domId1, domId2)])[0]
+
+    def getLowestCommonAncestors(self, domIdPairL):
+        """Return the lowest common ancestors and levels of the input SCOP2 node pairs (cf. getLowestCommonAncestor())."""
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors(domIdPairL)
+
+    def __getLowestCommonAncestors(self, domIdPairL):
+        return [(lcaId, self.__ntD.get(lcaId)) for lcaId, _ in self.__getHierarchyIndex().getLcaList(domIdPairL)]
+
+    def __getHierarchyIndex(self):
+        # Nested-set index built from the tree node list on the first hierarchy query
+        if self.__hierarchyIndex is None:
+            self.__hierarchyIndex = HierarchyIndex(self.iterTreeNodes())
+        return self.__hierarchyIndex
 
     def getTreeNodeList(self):
-        tnL = self.__exportTreeNodeList(self.__nD, self.__pAD, self.__pBRootD)
-        return tnL
+        """Return the SCOP2 tree node list (computed once per release and stored with the cache).
+
+        The stored list is returned without copying and must be treated as read-only (iterTreeNodes() yields copies of the nodes).
+        A mapped tree node list (useMappedCache or freezeForFork()) is decoded on the first call and stored in its place.
+        """
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            self.__treeNodeL = self.__exportTreeNodeList(self.__nD, self.__pAD, self.__pBD, self.__pBRootD, self.__idLineageD)
+            self.__hierarchyIndex = None
+        elif not isinstance(self.__treeNodeL, list):
+            # Decode the mapped tree node list once (iterTreeNodes() streams from the mapped file)
+            self.__treeNodeL = list(self.__treeNodeL)
+        return self.__treeNodeL
+
+    def iterTreeNodes(self):
+        """Yield the SCOP2 tree nodes one at a time (in the order of getTreeNodeList())."""
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            yield from self.__iterTreeNodes(self.__nD, self.__pAD, self.__pBD, self.__pBRootD, self.__idLineageD)
+        else:
+            for dD in self.__treeNodeL:
+                yield dict(dD)
+
+    def exportTreeNodes(self, target, compress=None):
+        """Write the SCOP2 tree nodes (cf. iterTreeNodes()) incrementally as JSON lines.
+
+        Args:
+            target (str|file): output file path or file-like object (binary for compressed output)
+            compress (bool, optional): gzip compress the output. Defaults to None (compress paths with a .gz suffix).
+
+        Returns:
+            int: number of tree nodes written or None on failure
+        """
+        return writeTreeNodes(self.iterTreeNodes(), target, compress=compress)
+
+    def getTreeNodeBytes(self, compress=False):
+        """Return the SCOP2 tree nodes serialized as JSON lines (optionally gzip compressed), encoded on first use and reused."""
+        self.__ensureLoaded()
+        treeBytes = self.__treeNodeBytesD.get(compress)
+        if treeBytes is None:
+            treeBytes = encodeTreeNodes(self.iterTreeNodes(), compress=compress)
+            # Failed encodings (None) are not stored so later calls try again
+            if treeBytes is not None:
+                self.__treeNodeBytesD[compress] = treeBytes
+        return treeBytes
 
     def __getAssignmentFileName(self, fmt="pickle"):
         ext = "json" if fmt == "json" else "pic"
@@ -193,11 +647,24 @@ class Scop2ClassificationProvider(StashableBase):
         fn = self.__getAssignmentFileName(fmt=fmt)
         assignmentPath = os.path.join(self.__dirPath, fn)
         self.__mU.mkdir(self.__dirPath)
+        bS = BuildStats("SCOP2", traceMemory=self.__traceMemory)
         #
-        if useCache and self.__mU.exists(assignmentPath):
+        if useCache:
+            bS.beginPhase("load")
+        assignKeyL = list(SCOP2_ASSIGNMENT_SHAPE_D.keys())
+        sD = loadMappedCache(assignmentPath, assignKeyL, tableKeyL=SCOP2_MAPPED_TABLE_KEYS) if useCache and self.__useMappedCache and fmt == "pickle" else None
+        if sD is None and useCache and self.__mU.exists(assignmentPath):
             sD = self.__mU.doImport(assignmentPath, fmt=fmt)
+            if self.__useMappedCache and fmt == "pickle":
+                ok = exportMappedCache(assignmentPath, sD, SCOP2_ASSIGNMENT_SHAPE_D, tableKeyL=SCOP2_MAPPED_TABLE_KEYS)
+                logger.debug("Mapped cache save status %r", ok)
+        if sD is not None:
+            bS.endPhase(records=len(sD["families"]))
+        elif self.__fromBackup:
+            sD = self.__loadFromBackup(assignmentPath, bS, fmt=fmt)
         else:
-            sD = self.__rebuildData(assignmentPath, fmt=fmt)
+            sD = self.__rebuildData(assignmentPath, bS, fmt=fmt)
+        self.__finishBuildStats(bS)
         #
         logger.debug("Domain name count %d", len(sD["names"]))
         self.__version = sD["version"]
@@ -209,25 +676,38 @@ class Scop2ClassificationProvider(StashableBase):
         fD = sD["families"]
         sfD = sD["superfamilies"]
         sf2bD = sD["superfamilies2b"]
+        if "idLineage" in sD and "nameLineage" in sD:
+            self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+        else:
+            self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD, pAD, pBD)
+        self.__treeNodeL = sD.get("treeNodes", None)
+        self.__hierarchyIndex = None
+        self.__treeNodeBytesD = {}
 
         return nD, ntD, pAD, pBD, pBRootD, fD, sfD, sf2bD
 
-    def __rebuildData(self, assignmentPath, fmt="pickle"):
+    def __rebuildData(self, assignmentPath, bS, fmt="pickle"):
         sD = {}
         try:
+            bS.beginPhase("fetch")
             nmL, dmL, scop2bL, _ = self.__fetchFromSource()
+            bS.endPhase(records=len(nmL) + len(dmL) + len(scop2bL))
             #
             ok = False
+            bS.beginPhase("parse")
             nD = self.__extractNames(nmL)
             logger.info("Domain name dictionary (%d)", len(nD))
             pAD, pBD, pBRootD, ntD, fD, sfD, domToSfD = self.__extractDomainHierarchy(dmL)
+            bS.endPhase(records=len(dmL))
             #
             logger.info("Domain node parent hierarchy (protein type) (%d)", len(pAD))
             logger.info("Domain node parent hierarchy (structural class) (%d)", len(pBD))
             logger.info("Domain node parent hierarchy (structural class root) (%d)", len(pBRootD))
             logger.info("SCOP2 core domain assignments (family %d) (sf %d)", len(fD), len(sfD))
             #
+            bS.beginPhase("assignments")
             sf2bD = self.__extractScop2bSuperFamilyAssignments(scop2bL, domToSfD)
+            bS.endPhase(records=len(fD) + len(sfD) + len(sf2bD))
             logger.info("SCOP2B SF domain assignments (%d)", len(sf2bD))
             #
             tS = datetime.datetime.now().isoformat()
@@ -243,22 +723,46 @@ class Scop2ClassificationProvider(StashableBase):
                 "parentsClassRoot": pBRootD,
                 "families": fD,
                 "superfamilies": sfD,
-                "superfamilies2b": sf2bD
+                "superfamilies2b": sf2bD,
             }
+            bS.beginPhase("hierarchy")
+            sD["idLineage"], sD["nameLineage"] = self.__buildLineageTables(nD, pAD, pBD)
+            sD["treeNodes"] = self.__exportTreeNodeList(nD, pAD, pBD, pBRootD, sD["idLineage"])
+            bS.endPhase(records=len(sD["treeNodes"]))
+            bS.beginPhase("export")
             ok = self.__mU.doExport(assignmentPath, sD, fmt=fmt, indent=3)
+            if ok and self.__useMappedCache and fmt == "pickle":
+                ok = exportMappedCache(assignmentPath, sD, SCOP2_ASSIGNMENT_SHAPE_D, tableKeyL=SCOP2_MAPPED_TABLE_KEYS)
+            if ok:
+                self.__writeManifest(assignmentPath, sD)
+            bS.endPhase(records=len(fD) if ok else 0)
             logger.info("Cache save status %r", ok)
         except Exception as e:
             logger.exception("Failing rebuild from source with: %s", str(e))
         #
         if not sD:
-            logger.info("Fetching data from backup")
-            ok = self.__fetchFromBackup(fmt=fmt)
-            sD = self.__mU.doImport(assignmentPath, fmt=fmt)
-            if not ok and sD:
-                logger.error("failed to fetch from fallback - fetch status %r len(sD) %r", ok, len(sD))
+            sD = self.__loadFromBackup(assignmentPath, bS, fmt=fmt)
         #
         return sD
 
+    def __loadFromBackup(self, assignmentPath, bS, fmt="pickle"):
+        logger.info("Fetching data from backup")
+        bS.beginPhase("backup")
+        ok = self.__fetchFromBackup(fmt=fmt)
+        sD = self.__mU.doImport(assignmentPath, fmt=fmt)
+        bS.endPhase(records=len(sD["families"]) if sD else 0)
+        if not ok and sD:
+            logger.error("failed to fetch from fallback - fetch status %r len(sD) %r", ok, len(sD))
+        if ok and sD:
+            self.__writeManifest(assignmentPath, sD)
+        return sD
+
+    def __writeManifest(self, assignmentPath, sD):
+        countD = {ky: len(sD[ky]) for ky in ["names", "parentsType", "parentsClass", "families", "superfamilies", "superfamilies2b"]}
+        ok = writeCacheManifest(assignmentPath, "SCOP2", countD, version=sD["version"], created=sD["created"])
+        logger.debug("Cache manifest save status %r", ok)
+        return ok
+
     def __fetchFromBackup(self, fmt="pickle"):
         fn = self.__getAssignmentFileName(fmt=fmt)
         assignmentPath = os.path.join(self.__dirPath, fn)
@@ -286,39 +790,41 @@ class Scop2ClassificationProvider(StashableBase):
             https://ftp.ebi.ac.uk/pub/databases/msd/sifts/flatfiles/tsv/pdb_chain_scop2_uniprot.tsv.gz
 
         """
-        encoding = "utf-8-sig" if sys.version_info[0] > 2 else "ascii"
-        fn = "scop-des-latest.txt"
-        url = os.path.join(self.__urlTargetScop2, fn)
-        desL = self.__mU.doImport(url, fmt="list", uncomment=True, encoding=encoding)
-        if not desL:
-            raise ValueError("Failed to fetch or load %r" % url)
-        logger.info("Fetched URL is %s len %d", url, len(desL))
-        #
-        fn = "scop-cla-latest.txt"
-        url = os.path.join(self.__urlTargetScop2, fn)
-        claL = self.__mU.doImport(url, fmt="list", uncomment=True, encoding=encoding)
-        if not claL:
-            raise ValueError("Failed to fetch or load %r" % url)
-        logger.info("Fetched URL is %s len %d", url, len(claL))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.__fetchWorkers) as executor:
+            desFuture = executor.submit(self.__fetchListFromSource, os.path.join(self.__urlTargetScop2, "scop-des-latest.txt"))
+            claFuture = executor.submit(self.__fetchListFromSource, os.path.join(self.__urlTargetScop2, "scop-cla-latest.txt"))
+            scop2bFuture = executor.submit(self.__fetchTableFromSource, os.path.join(self.__urlTargetSifts, "pdb_chain_scop2b_sf_uniprot.tsv.gz"))
+            scop2Future = executor.submit(self.__fetchTableFromSource, os.path.join(self.__urlTargetSifts, "pdb_chain_scop2_uniprot.tsv.gz"))
+            desL = [line for line in desFuture.result() if not line.startswith("#")]
+            claHeaderL = claFuture.result()
+            scop2bL = scop2bFuture.result()
+            scop2L = scop2Future.result()
         #
-        headerLines = self.__mU.doImport(url, fmt="list", uncomment=False, encoding=encoding)
-        self.__version = headerLines[0].split(" ")[3] if headerLines else "2021-05-27"
+        # The release version is read from the header of the classification file (fetched once, with comments)
+        self.__version = claHeaderL[0].split(" ")[3] if claHeaderL else "2021-05-27"
+        claL = [line for line in claHeaderL if not line.startswith("#")]
         #
-        fn = "pdb_chain_scop2b_sf_uniprot.tsv.gz"
-        url = os.path.join(self.__urlTargetSifts, fn)
-        scop2bL = self.__mU.doImport(url, fmt="tdd", rowFormat="dict", uncomment=True, encoding=encoding)
-        if not scop2bL:
+        return desL, claL, scop2bL, scop2L
+
+    def __fetchListFromSource(self, url):
+        """Fetch a line-oriented resource retaining comment lines (one MarshalUtil instance per fetch thread)."""
+        encoding = "utf-8-sig" if sys.version_info[0] > 2 else "ascii"
+        mU = MarshalUtil(workPath=self.__dirPath)
+        rowL = mU.doImport(url, fmt="list", uncomment=False, encoding=encoding)
+        if not rowL:
             raise ValueError("Failed to fetch or load %r" % url)
-        logger.info("Fetched URL is %s len %d", url, len(scop2bL))
-        #
-        fn = "pdb_chain_scop2_uniprot.tsv.gz"
-        url = os.path.join(self.__urlTargetSifts, fn)
-        scop2L = self.__mU.doImport(url, fmt="tdd", rowFormat="dict", uncomment=True, encoding=encoding)
-        if not scop2L:
+        logger.info("Fetched URL is %s len %d", url, len(rowL))
+        return rowL
+
+    def __fetchTableFromSource(self, url):
+        """Fetch a tab delimited resource as a list of row dictionaries (one MarshalUtil instance per fetch thread)."""
+        encoding = "utf-8-sig" if sys.version_info[0] > 2 else "ascii"
+        mU = MarshalUtil(workPath=self.__dirPath)
+        rowL = mU.doImport(url, fmt="tdd", rowFormat="dict", uncomment=True, encoding=encoding)
+        if not rowL:
             raise ValueError("Failed to fetch or load %r" % url)
-        logger.info("Fetched URL is %s len %d", url, len(scop2bL))
-        #
-        return desL, claL, scop2bL, scop2L
+        logger.info("Fetched URL is %s len %d", url, len(rowL))
+        return rowL
 
     def __extractNames(self, nmL):
         """ """
@@ -415,26 +921,22 @@ class Scop2ClassificationProvider(StashableBase):
                 pdbId = ff[1]
                 authAsymId, authSeqBeg, authSeqEnd = self.__parseAssignment(ff[2])
                 if authAsymId is not None:
-                    fKey = (pdbId, authAsymId)
-                    fTup = (domFamilyId, tD["FA"], authAsymId, authSeqBeg, authSeqEnd)
-                    if fKey not in fD:
-                        fD[fKey] = []
-                    if fTup not in fD[fKey]:
-                        fD[fKey].append(fTup)
+                    fD.setdefault((pdbId, authAsymId), []).append((domFamilyId, tD["FA"], authAsymId, authSeqBeg, authSeqEnd))
                 pdbId = ff[6]
                 authAsymId, authSeqBeg, authSeqEnd = self.__parseAssignment(ff[7])
                 if authAsymId is not None:
-                    sfKey = (pdbId, authAsymId)
-                    sfTup = (domSuperFamilyId, tD["SF"], authAsymId, authSeqBeg, authSeqEnd)
-                    if sfKey not in sfD:
-                        sfD[sfKey] = []
-                    if sfTup not in sfD[sfKey]:
-                        sfD[sfKey].append(sfTup)
+                    sfD.setdefault((pdbId, authAsymId), []).append((domSuperFamilyId, tD["SF"], authAsymId, authSeqBeg, authSeqEnd))
                 #
                 domToSfD[domSuperFamilyId] = tD["SF"]
             except Exception as e:
                 logger.exception("Failing for case %r: %s", dm, str(e))
         #
+        # Remove duplicate chain assignments in a single pass preserving the order of first occurrence
+        for aD in [fD, sfD]:
+            for aKey, aTupL in aD.items():
+                if len(aTupL) > 1:
+                    aD[aKey] = list(dict.fromkeys(aTupL))
+        #
         logger.info("pAD (%d) pBD (%d) pBRootD (%d) ntD (%d)", len(pAD), len(pBD), len(pBRootD), len(ntD))
         logger.info("fD (%d) sfD (%d)", len(fD), len(sfD))
         return pAD, pBD, pBRootD, ntD, fD, sfD, domToSfD
@@ -484,12 +986,16 @@ class Scop2ClassificationProvider(StashableBase):
             logger.exception("Failing with %s", str(e))
         return sfD
 
-    def __exportTreeNodeList(self, nD, pAD, pBRootD):
+    def __exportTreeNodeList(self, nD, pAD, pBD, pBRootD, idLineageD):
         """Create node list from the SCOP2 parent and name/description dictionaries.
 
         Exclude the root node from the tree.
 
         """
+        return list(self.__iterTreeNodes(nD, pAD, pBD, pBRootD, idLineageD))
+
+    def __iterTreeNodes(self, nD, pAD, pBD, pBRootD, idLineageD):
+        """Yield the tree nodes (excluding the root) in breadth first order from the name, parent and id lineage dictionaries."""
         #
         rootId = 0
         pL = [rootId]
@@ -519,7 +1025,6 @@ class Scop2ClassificationProvider(StashableBase):
                         queue.append(childId)
                         visited.add(childId)
         #
-        dL = []
         for tId in idL:
             displayName = nD[tId] if tId in nD else None
             ptIdL = []
@@ -527,7 +1032,7 @@ class Scop2ClassificationProvider(StashableBase):
                 ptIdL.append(pAD[tId])
             if tId in pBRootD:
                 ptIdL.append(pBRootD[tId])
-            lL = self.getIdLineage(tId)[1:]
+            lL = idLineageD[tId][1:] if tId in idLineageD else self.__getIdLineage(tId, pAD, pBD)[1:]
             #
             # d = {'id': str(tId), 'name': displayName, 'lineage': [str(t) for t in lL], 'parents': [str(ptId)], 'depth': len(lL)}
             if tId == rootId:
@@ -537,6 +1042,4 @@ class Scop2ClassificationProvider(StashableBase):
             else:
                 displayName = displayName if displayName else "Domain %s" % str(tId)
                 dD = {"id": str(tId), "name": displayName, "parents": ptIdL, "depth": len(lL)}
-            dL.append(dD)
-
-        return dL
+            yield dD
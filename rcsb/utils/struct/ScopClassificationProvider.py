@@ -5,6 +5,27 @@
 #  Updated:
 #  24-Apr-2019  jdw Exclude the root node from the exported tree node list
 #   6-Jan-2026  dwp Change base URL to Zenodo (temporary downtime at scop.berkeley.edu)
+#  16-Oct-2026      Add residue position interval index and getDomainsAtResidue()/getDomainsOverlapping()
+#  16-Oct-2026      Materialize id and name lineage tables once per release (stored with the cache)
+#  16-Oct-2026      Fetch the description, classification and hierarchy resources concurrently
+#  16-Oct-2026      Export the tree node list once per release (stored with the cache) and add iterTreeNodes()
+#  16-Oct-2026      Add getBatchAnnotations() returning the annotations for many chains in one call
+#  16-Oct-2026      Add lazy loading of the cache on first access (lazyLoad)
+#  16-Oct-2026      Add memory-mapped columnar assignment cache (useMappedCache)
+#  16-Oct-2026      Add freezeForFork() for sharing the provider with pre-fork worker pools
+#  17-Oct-2026      Add per-phase build timing and memory statistics (getBuildStats(), buildStatsPath)
+#  17-Oct-2026      Add accessor call, hit and miss counters and latency histograms (lookupStats)
+#  17-Oct-2026      Add fromBackup option to load the cache directly from the backup resource
+#  17-Oct-2026      Write a cache manifest (getCacheManifest(), testCacheManifest())
+#  17-Oct-2026      Add node member queries with subtree roll-ups (getNodeMembers(), getNodeMemberCount())
+#  17-Oct-2026      Add nested-set hierarchy queries (isDescendant(), getDescendants(), getSubtreeSize())
+#  17-Oct-2026      Add lowest common ancestor queries (getLowestCommonAncestor(), getLowestCommonAncestors())
+#  17-Oct-2026      Add iterDomainIntervals() for bulk cross-classification overlap mapping
+#  17-Oct-2026      Add dense per-residue label arrays (getResidueLabels(), getResidueLabelsBulk())
+#  17-Oct-2026      Add streaming JSON-lines tree node export (exportTreeNodes(), getTreeNodeBytes())
+#  17-Oct-2026      Return the stored tree node list from getTreeNodeList() without copying
+#  17-Oct-2026      Reuse only successful tree node encodings and reset the derived tree node data in freezeForFork()
+#  17-Oct-2026      Check the cache against SCOP_CACHE_MIN_COUNT_D
 ##
 """
   Extract SCOPe assignments, term descriptions and SCOP classifications
@@ -13,18 +34,67 @@
 """
 
 import collections
+import concurrent.futures
 import logging
 import os.path
 import sys
+import threading
 
 from rcsb.utils.io.FileUtil import FileUtil
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.StashableBase import StashableBase
+from rcsb.utils.struct.BuildStats import BuildStats
+from rcsb.utils.struct.CacheManifest import checkCacheManifest
+from rcsb.utils.struct.CacheManifest import readCacheManifest
+from rcsb.utils.struct.CacheManifest import writeCacheManifest
+from rcsb.utils.struct.DomainIntervalIndex import DomainIntervalIndex
+from rcsb.utils.struct.HierarchyIndex import HierarchyIndex
+from rcsb.utils.struct.LookupStats import LookupStatsMixin
+from rcsb.utils.struct.LookupStats import isAncestorFound
+from rcsb.utils.struct.LookupStats import isAnyAnnotated
+from rcsb.utils.struct.LookupStats import isAnyFound
+from rcsb.utils.struct.LookupStats import isAnyLabeled
+from rcsb.utils.struct.LookupStats import isFound
+from rcsb.utils.struct.LookupStats import isNonEmpty
+from rcsb.utils.struct.LookupStats import isPositive
+from rcsb.utils.struct.MappedAssignmentStore import MappedAssignmentStore
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedCache
+from rcsb.utils.struct.MappedAssignmentStore import loadMappedCache
+from rcsb.utils.struct.NodeMemberIndex import NodeMemberIndex
+from rcsb.utils.struct.ResidueLabelArrays import encodeResidueLabels
+from rcsb.utils.struct.TreeNodeExport import encodeTreeNodes
+from rcsb.utils.struct.TreeNodeExport import writeTreeNodes
 
 logger = logging.getLogger(__name__)
 
-
-class ScopClassificationProvider(StashableBase):
+# Layout of the assignment tuples (sunId, domainId, sccs, (authAsymId, resBeg, resEnd)) in the mapped cache
+SCOP_ASSIGNMENT_SHAPE = [0, 0, 0, 3]
+# SCOPe name, parent and lineage tables and tree node list read in place from the mapped cache
+SCOP_MAPPED_TABLE_KEYS = ["names", "parents", "idLineage", "nameLineage", "treeNodes"]
+# Record counts to be exceeded by a valid cache (cf. testCache())
+SCOP_CACHE_MIN_COUNT_D = {"names": 100, "parents": 100, "assignments": 100}
+# Hierarchy level codes by tree depth (cf. getLowestCommonAncestor())
+SCOP_LEVEL_NAMES = ["cl", "cf", "sf", "fa", "dm", "sp", "px"]
+# Lookup accessors counted with lookupStats and the tests of their results counted as hits
+SCOP_LOOKUP_ACCESSOR_D = {
+    "getScopSunIds": isNonEmpty,
+    "getScopDomainNames": isNonEmpty,
+    "getScopSccsNames": isNonEmpty,
+    "getScopResidueRanges": isNonEmpty,
+    "getBatchAnnotations": isAnyAnnotated,
+    "getDomainsAtResidue": isNonEmpty,
+    "getDomainsOverlapping": isNonEmpty,
+    "getResidueLabels": isAnyLabeled,
+    "getScopName": isFound,
+    "getNodeMembers": isNonEmpty,
+    "getNodeMemberCount": isPositive,
+    "getIdLineage": isNonEmpty,
+    "getNameLineage": isAnyFound,
+    "getLowestCommonAncestor": isAncestorFound,
+}
+
+
+class ScopClassificationProvider(StashableBase, LookupStatsMixin):
     """Extract SCOPe assignments, term descriptions and SCOP classifications
     from SCOP flat files.
 
@@ -50,22 +120,68 @@ class ScopClassificationProvider(StashableBase):
         urlTarget = kwargs.get("scopTargetUrl", "https://zenodo.org/records/5829561/files")
         # urlTarget = kwargs.get("scopTargetUrl", "http://scop.berkeley.edu/downloads/parse")
         self.__version = kwargs.get("scopVersion", "2.08-stable")
+        # Number of threads used to fetch independent source resources concurrently
+        self.__fetchWorkers = kwargs.get("fetchWorkers", 4)
         #
         urlBackupPath = kwargs.get("scopUrlBackupPath", "https://raw.githubusercontent.com/rcsb/py-rcsb_exdb_assets/master/fall_back/SCOP")
         #
+        self.__urlTarget = urlTarget
+        self.__urlBackupPath = urlBackupPath
+        self.__useCache = useCache
+        # Skip the primary sources in rebuilds and load the cache directly from the backup resource
+        self.__fromBackup = kwargs.get("fromBackup", False)
         self.__mU = MarshalUtil(workPath=self.__scopDirPath)
-        self.__nD, self.__pD, self.__pdbD = self.__reload(urlTarget, self.__scopDirPath, useCache=useCache, version=self.__version)
+        # Read the assignment index in place from a memory-mapped copy of the cache (written alongside the pickle cache)
+        self.__useMappedCache = kwargs.get("useMappedCache", False)
+        # Record the per-phase timing (and optionally the traced memory) of each reload with an optional JSON report
+        self.__traceMemory = kwargs.get("traceMemory", False)
+        self.__buildStatsPath = kwargs.get("buildStatsPath", None)
+        self.__buildStats = None
+        self._initLookupStats(kwargs.get("lookupStats", False), SCOP_LOOKUP_ACCESSOR_D)
+        # Defer reading (or building) the cache until the first accessor call
+        self.__lazyLoad = kwargs.get("lazyLoad", False)
+        self.__loadLock = threading.Lock()
+        self.__isLoaded = False
+        if self.__lazyLoad:
+            scopDomainPath = os.path.join(self.__scopDirPath, "scop_domains-py%s.pic" % str(sys.version_info[0]))
+            logger.info("Deferring SCOP load (cache %r present %r)", scopDomainPath, self.__mU.exists(scopDomainPath))
+        else:
+            self.__load()
+
+    def __load(self):
+        if self.__fromBackup and not self.__useCache:
+            ok = self.__fetchFromBackup(self.__urlBackupPath, self.__scopDirPath)
+            logger.info("SCOP backup fetch status %r", ok)
+            self.__nD, self.__pD, self.__pdbD = self.__reload(self.__urlTarget, self.__scopDirPath, useCache=True, version=self.__version)
+            if ok:
+                self.__writeManifest(self.__nD, self.__pD, self.__pdbD)
+        else:
+            self.__nD, self.__pD, self.__pdbD = self.__reload(self.__urlTarget, self.__scopDirPath, useCache=self.__useCache, version=self.__version)
         #
-        if not useCache and not self.testCache():
-            ok = self.__fetchFromBackup(urlBackupPath, self.__scopDirPath)
+        if not self.__useCache and not self.__fromBackup and not self.__testCache():
+            ok = self.__fetchFromBackup(self.__urlBackupPath, self.__scopDirPath)
             if ok:
-                self.__nD, self.__pD, self.__pdbD = self.__reload(urlTarget, self.__scopDirPath, useCache=True, version=self.__version)
+                self.__nD, self.__pD, self.__pdbD = self.__reload(self.__urlTarget, self.__scopDirPath, useCache=True, version=self.__version)
+                self.__writeManifest(self.__nD, self.__pD, self.__pdbD)
+        #
+        self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange, lazy=isinstance(self.__pdbD, MappedAssignmentStore))
+        self.__resetMemberIndex()
+        self.__isLoaded = True
+
+    def __ensureLoaded(self):
+        if not self.__isLoaded:
+            with self.__loadLock:
+                if not self.__isLoaded:
+                    self.__load()
 
     def testCache(self):
+        self.__ensureLoaded()
+        return self.__testCache()
+
+    def __testCache(self):
         logger.info("SCOP lengths nD %d pD %d pdbD %d", len(self.__nD), len(self.__pD), len(self.__pdbD))
-        if (len(self.__nD) > 100) and (len(self.__pD) > 100) and (len(self.__pdbD) > 100):
-            return True
-        return False
+        countD = {"names": len(self.__nD), "parents": len(self.__pD), "assignments": len(self.__pdbD)}
+        return all(countD[ky] > minCount for ky, minCount in SCOP_CACHE_MIN_COUNT_D.items())
 
     def __fetchFromBackup(self, urlBackupPath, scopDirPath):
         pyVersion = sys.version_info[0]
@@ -79,6 +195,60 @@ class ScopClassificationProvider(StashableBase):
         ok = fU.get(backupUrl, scopDomainPath)
         return ok
 
+    def getCacheManifest(self):
+        """Return the manifest of the SCOPe cache file (cf. readCacheManifest()) or {} if there is no manifest (the cache is not loaded)."""
+        return readCacheManifest(os.path.join(self.__scopDirPath, "scop_domains-py%s.pic" % str(sys.version_info[0]))) or {}
+
+    def testCacheManifest(self, verifyChecksum=False):
+        """Check the SCOPe cache file and record counts against the manifest without loading the cache (cf. checkCacheManifest())."""
+        return checkCacheManifest(os.path.join(self.__scopDirPath, "scop_domains-py%s.pic" % str(sys.version_info[0])), SCOP_CACHE_MIN_COUNT_D, verifyChecksum=verifyChecksum)
+
+    def getBuildStats(self):
+        """Return the per-phase statistics of the last SCOPe cache load or rebuild (cf. BuildStats.getStats()) or {} if not available."""
+        self.__ensureLoaded()
+        return self.__buildStats.getStats() if self.__buildStats else {}
+
+    def __finishBuildStats(self, bS):
+        bS.finish()
+        self.__buildStats = bS
+        if self.__buildStatsPath:
+            ok = bS.writeReport(self.__buildStatsPath)
+            logger.debug("Build report %r save status %r", self.__buildStatsPath, ok)
+
+    def freezeForFork(self):
+        """Switch the SCOPe name, parent, lineage, tree node and assignment tables to the mapped cache form shared by forked workers (cf. freezeGcForFork()).
+
+        Returns:
+            bool: True if the provider tables are memory-mapped or False otherwise
+        """
+        self.__ensureLoaded()
+        ok = isinstance(self.__pdbD, MappedAssignmentStore)
+        if not ok:
+            scopDomainPath = os.path.join(self.__scopDirPath, "scop_domains-py%s.pic" % str(sys.version_info[0]))
+            sD = loadMappedCache(scopDomainPath, ["assignments"], tableKeyL=SCOP_MAPPED_TABLE_KEYS)
+            if sD is None:
+                cD = {
+                    "names": self.__nD,
+                    "parents": self.__pD,
+                    "assignments": self.__pdbD,
+                    "idLineage": self.__idLineageD,
+                    "nameLineage": self.__nameLineageD,
+                    "treeNodes": self.__treeNodeL,
+                }
+                if exportMappedCache(scopDomainPath, cD, {"assignments": SCOP_ASSIGNMENT_SHAPE}, tableKeyL=SCOP_MAPPED_TABLE_KEYS):
+                    sD = loadMappedCache(scopDomainPath, ["assignments"], tableKeyL=SCOP_MAPPED_TABLE_KEYS)
+            if sD is not None:
+                self.__nD, self.__pD, self.__pdbD = sD["names"], sD["parents"], sD["assignments"]
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+                self.__treeNodeL = self.__treeNodeL if sD.get("treeNodes") is None else sD["treeNodes"]
+                self.__hierarchyIndex = None
+                self.__treeNodeBytesD = {}
+                self.__intervalIndex = DomainIntervalIndex(self.__pdbD, self.__getIntervalRange, lazy=True)
+                self.__resetMemberIndex()
+                ok = True
+        logger.info("SCOPe provider frozen for fork (mapped tables %r)", ok)
+        return ok
+
     def getScopVersion(self):
         return self.__version
 
@@ -90,6 +260,7 @@ class ScopClassificationProvider(StashableBase):
 
         aD[(pdbId, authAsymId)] = [(domSunId, domainId, sccs, (authAsymId, resBeg, resEnd))]
         """
+        self.__ensureLoaded()
         try:
             return list(set([tup[0] for tup in self.__pdbD[(pdbId, authAsymId)]]))
         except Exception as e:
@@ -98,6 +269,7 @@ class ScopClassificationProvider(StashableBase):
         return []
 
     def getScopDomainNames(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[1] for tup in self.__pdbD[(pdbId, authAsymId)]]))
         except Exception as e:
@@ -106,6 +278,7 @@ class ScopClassificationProvider(StashableBase):
         return []
 
     def getScopSccsNames(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return list(set([tup[2] for tup in self.__pdbD[(pdbId, authAsymId)]]))
         except Exception as e:
@@ -114,6 +287,7 @@ class ScopClassificationProvider(StashableBase):
         return []
 
     def getScopResidueRanges(self, pdbId, authAsymId):
+        self.__ensureLoaded()
         try:
             return [(tup[0], tup[1], tup[2], tup[3][0], tup[3][1], tup[3][2]) for tup in self.__pdbD[(pdbId, authAsymId)]]
         except Exception as e:
@@ -121,36 +295,278 @@ class ScopClassificationProvider(StashableBase):
 
         return []
 
+    def getBatchAnnotations(self, chainKeys, fields=None):
+        """Return the SCOPe annotations for a batch of chains in a single call.
+
+        Args:
+            chainKeys (iterable): chain keys [(pdbId, authAsymId), ...]
+            fields (list, optional): annotation fields (sunIds, domainNames, sccsNames, residueRanges). Defaults to all fields.
+
+        Returns:
+            dict: {(pdbId, authAsymId): {field: [...], ...}, ...} with empty field lists for chains without assignments
+        """
+        self.__ensureLoaded()
+        fD = {
+            "sunIds": lambda tupL: list({tup[0]: None for tup in tupL}),
+            "domainNames": lambda tupL: list({tup[1]: None for tup in tupL}),
+            "sccsNames": lambda tupL: list({tup[2]: None for tup in tupL}),
+            "residueRanges": lambda tupL: [(tup[0], tup[1], tup[2], tup[3][0], tup[3][1], tup[3][2]) for tup in tupL],
+        }
+        fieldL = fields if fields else list(fD.keys())
+        funcL = [(field, fD[field]) for field in fieldL if field in fD]
+        if len(funcL) < len(fieldL):
+            logger.warning("Skipping unsupported annotation fields %r", [field for field in fieldL if field not in fD])
+        rD = {}
+        for pdbId, authAsymId in chainKeys:
+            tupL = self.__pdbD.get((pdbId, authAsymId))
+            rD[(pdbId, authAsymId)] = {field: func(tupL) if tupL else [] for field, func in funcL}
+        return rD
+
+    def getDomainsAtResidue(self, pdbId, authAsymId, resNum):
+        """Return the SCOPe domain residue ranges covering the input residue number (whole chain domains cover all residues).
+
+        Returns:
+            list: [(sunId, domainId, sccs, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        return self.__intervalIndex.getAtResidue((pdbId, authAsymId), resNum)
+
+    def getDomainsOverlapping(self, pdbId, authAsymId, begResNum, endResNum):
+        """Return the SCOPe domain residue ranges overlapping the input (inclusive) residue range.
+
+        Returns:
+            list: [(sunId, domainId, sccs, authAsymId, resBeg, resEnd), ...]
+        """
+        self.__ensureLoaded()
+        return self.__intervalIndex.getOverlapping((pdbId, authAsymId), begResNum, endResNum)
+
+    def iterDomainIntervals(self):
+        """Yield the SCOPe domain residue intervals of each chain (ordered by residue range begin).
+
+        Yields:
+            ((pdbId, authAsymId), [(resBeg, resEnd, (sunId, domainId)), ...]) with integer residue bounds
+            (-sys.maxsize, sys.maxsize for whole chain domains)
+        """
+        self.__ensureLoaded()
+        for chainKey in self.__intervalIndex.getChainKeys():
+            yield chainKey, self.__getDomainIntervals(chainKey)
+
+    def getResidueLabels(self, pdbId, authAsymId, begResNum, endResNum, labelType="node", vocabulary=None):
+        """Return the per-residue SCOPe labels of the input chain over the input (inclusive) residue numbering span.
+
+        Args:
+            pdbId (str): PDB identifier
+            authAsymId (str): author chain identifier
+            begResNum (int): first residue number of the span
+            endResNum (int): last residue number of the span
+            labelType (str, optional): residue labels "node" (SCOPe sunIds) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+        Returns:
+            (array, ResidueLabelVocabulary): label codes of the residues in the span (0 for unassigned residues) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        labelA, _, vocabulary = self.__getResidueLabelsBulk([(pdbId, authAsymId, begResNum, endResNum)], labelType=labelType, vocabulary=vocabulary)
+        return labelA, vocabulary
+
+    def getResidueLabelsBulk(self, chainSpanL, labelType="node", vocabulary=None):
+        """Return the per-residue SCOPe labels of a batch of chains in a single contiguous label array (cf. encodeResidueLabels()).
+
+        Args:
+            chainSpanL (list): chains and residue numbering spans [(pdbId, authAsymId, begResNum, endResNum), ...]
+            labelType (str, optional): residue labels "node" (SCOPe sunIds) or "domain" (domain identifiers). Defaults to "node".
+            vocabulary (ResidueLabelVocabulary, optional): label vocabulary to extend. Defaults to a new vocabulary.
+
+        Returns:
+            (array, list, ResidueLabelVocabulary): label array, start offsets of the chains (followed by the total length) and the label vocabulary
+        """
+        self.__ensureLoaded()
+        return self.__getResidueLabelsBulk(chainSpanL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getResidueLabelsBulk(self, chainSpanL, labelType, vocabulary):
+        chainIntervalL = [(self.__getDomainIntervals((pdbId, authAsymId)), begResNum, endResNum) for pdbId, authAsymId, begResNum, endResNum in chainSpanL]
+        return encodeResidueLabels(chainIntervalL, labelType=labelType, vocabulary=vocabulary)
+
+    def __getDomainIntervals(self, chainKey):
+        return [(resBeg, resEnd, (tup[0], tup[1])) for resBeg, resEnd, tup in self.__intervalIndex.getIntervals(chainKey)]
+
+    def __getNodeMember(self, tup):
+        return (tup[0], tup[1])
+
+    def __resetMemberIndex(self):
+        # Reverse index from nodes to member chain domains (built on the first member query)
+        self.__memberIndex = NodeMemberIndex([self.__pdbD], self.__getNodeMember, lambda nodeId: self.__idLineageD.get(nodeId))
+
+    def __getIntervalRange(self, tup):
+        return tup[3][1], tup[3][2], (tup[0], tup[1], tup[2], tup[3][0], tup[3][1], tup[3][2])
+
     def getScopName(self, sunId):
+        self.__ensureLoaded()
         try:
             return self.__nD[sunId]
         except Exception:
             logger.debug("Undefined SCOP sunId %r", sunId)
         return None
 
+    def getNodeMembers(self, sunId, subtree=False):
+        """Return the chain domains assigned to the input SCOPe node (or to any node in its subtree).
+
+        Args:
+            sunId (int): SCOPe node identifier (sunid)
+            subtree (bool, optional): include the members of all descendant nodes. Defaults to False.
+
+        Returns:
+            list: [(pdbId, authAsymId, domainId), ...]
+        """
+        self.__ensureLoaded()
+        return self.__memberIndex.getMembers(sunId, subtree=subtree)
+
+    def getNodeMemberCount(self, sunId, subtree=False):
+        """Return the number of chain domains assigned to the input SCOPe node (or to any node in its subtree)."""
+        self.__ensureLoaded()
+        return self.__memberIndex.getMemberCount(sunId, subtree=subtree)
+
     def getIdLineage(self, sunId):
+        self.__ensureLoaded()
+        if sunId in self.__idLineageD:
+            return list(self.__idLineageD[sunId])
+        return self.__getIdLineage(sunId, self.__pD)
+
+    def getNameLineage(self, sunId):
+        self.__ensureLoaded()
+        if sunId in self.__nameLineageD:
+            return list(self.__nameLineageD[sunId])
+        try:
+            return [self.__nD.get(cId) for cId in self.__getIdLineage(sunId, self.__pD)]
+        except Exception as e:
+            logger.exception("Failing for %r with %s", sunId, str(e))
+        return None
+
+    def __getIdLineage(self, sunId, pD):
         pList = []
         try:
             pList.append(sunId)
-            pt = self.__pD[sunId]
+            pt = pD[sunId]
             while (pt is not None) and (pt != 0):
                 pList.append(pt)
-                pt = self.__pD[pt]
+                pt = pD[pt]
         except Exception as e:
             logger.exception("Failing for %r with %s", sunId, str(e))
         #
         pList.reverse()
         return pList
 
-    def getNameLineage(self, sunId):
-        try:
-            return [self.getScopName(cId) for cId in self.getIdLineage(sunId)]
-        except Exception as e:
-            logger.exception("Failing for %r with %s", sunId, str(e))
-        return None
+    def __buildLineageTables(self, nD, pD):
+        """Materialize the id and name lineages for all nodes in the SCOPe hierarchy.
+
+        Returns:
+            (dict, dict): idLineageD[sunId] = (sunId, ...), nameLineageD[sunId] = (name, ...)  ordered from the root
+        """
+        idLineageD = {}
+        nameLineageD = {}
+        for sunId in pD:
+            idL = self.__getIdLineage(sunId, pD)
+            idLineageD[sunId] = tuple(idL)
+            nameLineageD[sunId] = tuple([nD.get(cId) for cId in idL])
+        logger.debug("SCOPe lineage tables (%d)", len(idLineageD))
+        return idLineageD, nameLineageD
+
+    def isDescendant(self, sunId, ancestorId):
+        """Return True if the input SCOPe node is a (proper) descendant of the input ancestor node (nested-set test).
+
+        Args:
+            sunId (int): SCOPe node identifier
+            ancestorId (int): SCOPe ancestor node identifier
+
+        Returns:
+            bool: True if ancestorId is a proper ancestor of sunId or False otherwise
+        """
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().isDescendant(sunId, ancestorId)
+
+    def getDescendants(self, sunId):
+        """Return the (proper) descendants of the input SCOPe node in tree pre-order."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getDescendants(sunId)
+
+    def getSubtreeSize(self, sunId):
+        """Return the number of SCOPe nodes in the subtree rooted at the input node (including the node)."""
+        self.__ensureLoaded()
+        return self.__getHierarchyIndex().getSubtreeSize(sunId)
+
+    def getLowestCommonAncestor(self, sunId1, sunId2):
+        """Return the lowest common ancestor of the input SCOPe nodes and its level (cl, cf, sf, fa, dm, sp or px).
+
+        Args:
+            sunId1 (int): SCOPe node identifier
+            sunId2 (int): SCOPe node identifier
+
+        Returns:
+            (int, str): lowest common ancestor identifier and level or (None, None) if the nodes share no ancestor
+        """
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors([(sunId1, sunId2)])[0]
+
+    def getLowestCommonAncestors(self, sunIdPairL):
+        """Return the lowest common ancestors and levels of the input SCOPe node pairs (cf. getLowestCommonAncestor())."""
+        self.__ensureLoaded()
+        return self.__getLowestCommonAncestors(sunIdPairL)
+
+    def __getLowestCommonAncestors(self, sunIdPairL):
+        return [(lcaId, SCOP_LEVEL_NAMES[depth] if lcaId is not None and depth < len(SCOP_LEVEL_NAMES) else None) for lcaId, depth in self.__getHierarchyIndex().getLcaList(sunIdPairL)]
+
+    def __getHierarchyIndex(self):
+        # Nested-set index built from the tree node list (with string identifiers) on the first hierarchy query
+        if self.__hierarchyIndex is None:
+            self.__hierarchyIndex = HierarchyIndex({"id": int(dD["id"]), "parents": [int(pId) for pId in dD.get("parents", [])]} for dD in self.iterTreeNodes())
+        return self.__hierarchyIndex
 
     def getTreeNodeList(self):
-        return self.__exportTreeNodeList(self.__nD, self.__pD)
+        """Return the SCOPe tree node list (computed once per release and stored with the cache).
+
+        The stored list is returned without copying and must be treated as read-only (iterTreeNodes() yields copies of the nodes).
+        A mapped tree node list (useMappedCache or freezeForFork()) is decoded on the first call and stored in its place.
+        """
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            self.__treeNodeL = self.__exportTreeNodeList(self.__nD, self.__pD, self.__idLineageD)
+            self.__hierarchyIndex = None
+        elif not isinstance(self.__treeNodeL, list):
+            # Decode the mapped tree node list once (iterTreeNodes() streams from the mapped file)
+            self.__treeNodeL = list(self.__treeNodeL)
+        return self.__treeNodeL
+
+    def iterTreeNodes(self):
+        """Yield the SCOPe tree nodes one at a time (in the order of getTreeNodeList())."""
+        self.__ensureLoaded()
+        if self.__treeNodeL is None:
+            yield from self.__iterTreeNodes(self.__nD, self.__pD, self.__idLineageD)
+        else:
+            for dD in self.__treeNodeL:
+                yield dict(dD)
+
+    def exportTreeNodes(self, target, compress=None):
+        """Write the SCOPe tree nodes (cf. iterTreeNodes()) incrementally as JSON lines.
+
+        Args:
+            target (str|file): output file path or file-like object (binary for compressed output)
+            compress (bool, optional): gzip compress the output. Defaults to None (compress paths with a .gz suffix).
+
+        Returns:
+            int: number of tree nodes written or None on failure
+        """
+        return writeTreeNodes(self.iterTreeNodes(), target, compress=compress)
+
+    def getTreeNodeBytes(self, compress=False):
+        """Return the SCOPe tree nodes serialized as JSON lines (optionally gzip compressed), encoded on first use and reused."""
+        self.__ensureLoaded()
+        treeBytes = self.__treeNodeBytesD.get(compress)
+        if treeBytes is None:
+            treeBytes = encodeTreeNodes(self.iterTreeNodes(), compress=compress)
+            # Failed encodings (None) are not stored so later calls try again
+            if treeBytes is not None:
+                self.__treeNodeBytesD[compress] = treeBytes
+        return treeBytes
 
     #
     ###
@@ -158,37 +574,89 @@ class ScopClassificationProvider(StashableBase):
     #
     def __reload(self, urlTarget, scopDirPath, useCache=True, version=None):
         nD = pD = pdbD = {}
+        self.__idLineageD, self.__nameLineageD = {}, {}
+        self.__treeNodeL = None
+        self.__hierarchyIndex = None
+        self.__treeNodeBytesD = {}
         pyVersion = sys.version_info[0]
         scopDomainPath = os.path.join(scopDirPath, "scop_domains-py%s.pic" % str(pyVersion))
         self.__mU.mkdir(scopDirPath)
+        bS = BuildStats("SCOPe", traceMemory=self.__traceMemory)
         #
         # scopDomainPath = os.path.join(scopDirPath, "scop_domains.json")
         #
-        if useCache and self.__mU.exists(scopDomainPath):
+        if useCache:
+            bS.beginPhase("load")
+        sD = loadMappedCache(scopDomainPath, ["assignments"], tableKeyL=SCOP_MAPPED_TABLE_KEYS) if useCache and self.__useMappedCache else None
+        if sD is None and useCache and self.__mU.exists(scopDomainPath):
             sD = self.__mU.doImport(scopDomainPath, fmt="pickle")
+            if self.__useMappedCache:
+                ok = exportMappedCache(scopDomainPath, sD, {"assignments": SCOP_ASSIGNMENT_SHAPE}, tableKeyL=SCOP_MAPPED_TABLE_KEYS)
+                logger.debug("Mapped cache save status %r", ok)
+        if sD is not None:
             logger.debug("SCOPe name length %d parent length %d assignments %d", len(sD["names"]), len(sD["parents"]), len(sD["assignments"]))
             nD = sD["names"]
             pD = sD["parents"]
             pdbD = sD["assignments"]
+            if "idLineage" in sD and "nameLineage" in sD:
+                self.__idLineageD, self.__nameLineageD = sD["idLineage"], sD["nameLineage"]
+            else:
+                self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD, pD)
+            self.__treeNodeL = sD.get("treeNodes", None)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(pdbD))
 
         elif not useCache:
             ok = False
             minLen = 1000
             logger.info("Fetch SCOPe name and domain assignment data using target URL %s", urlTarget)
+            bS.beginPhase("fetch")
             desL, claL, hieL = self.__fetchFromSource(urlTarget, version=version)
+            bS.endPhase(records=len(desL or []) + len(claL or []) + len(hieL or []))
             #
+            bS.beginPhase("parse")
             nD = self.__extractDescription(desL)
             dmD = self.__extractAssignments(claL)
             pD = self.__extractHierarchy(hieL, nD)
+            bS.endPhase(records=len(dmD))
+            bS.beginPhase("assignments")
             pdbD = self.__buildAssignments(dmD)
+            bS.endPhase(records=len(pdbD))
             logger.info("nD %d dmD %d pD %d", len(nD), len(dmD), len(pD))
-            scopD = {"names": nD, "parents": pD, "assignments": pdbD}
+            bS.beginPhase("hierarchy")
+            self.__idLineageD, self.__nameLineageD = self.__buildLineageTables(nD, pD)
+            self.__treeNodeL = self.__exportTreeNodeList(nD, pD, self.__idLineageD)
+            self.__hierarchyIndex = None
+            self.__treeNodeBytesD = {}
+            bS.endPhase(records=len(self.__treeNodeL))
+            scopD = {
+                "names": nD,
+                "parents": pD,
+                "assignments": pdbD,
+                "idLineage": self.__idLineageD,
+                "nameLineage": self.__nameLineageD,
+                "treeNodes": self.__treeNodeL,
+            }
+            bS.beginPhase("export")
             if (len(nD) > minLen) and (len(pD) > minLen) and (len(pD) > minLen):
                 ok = self.__mU.doExport(scopDomainPath, scopD, fmt="pickle")
+                if ok and self.__useMappedCache:
+                    ok = exportMappedCache(scopDomainPath, scopD, {"assignments": SCOP_ASSIGNMENT_SHAPE}, tableKeyL=SCOP_MAPPED_TABLE_KEYS)
+                if ok:
+                    self.__writeManifest(nD, pD, pdbD)
+            bS.endPhase(records=len(pdbD) if ok else 0)
             logger.debug("Cache save status %r", ok)
             #
+        self.__finishBuildStats(bS)
         return nD, pD, pdbD
 
+    def __writeManifest(self, nD, pD, pdbD):
+        scopDomainPath = os.path.join(self.__scopDirPath, "scop_domains-py%s.pic" % str(sys.version_info[0]))
+        ok = writeCacheManifest(scopDomainPath, "SCOPe", {"names": len(nD), "parents": len(pD), "assignments": len(pdbD)}, version=self.__version)
+        logger.debug("Cache manifest save status %r", ok)
+        return ok
+
     def __fetchFromSource(self, urlTarget, version="2.07-2019-07-23"):
         """Fetch the classification names and domain assignments from SCOPe repo.
         #
@@ -196,25 +664,20 @@ class ScopClassificationProvider(StashableBase):
                 dir.cla.scope.2.07-2019-03-07.txt
                 dir.hie.scope.2.07-2019-03-07.txt
         """
-        encoding = "utf-8-sig" if sys.version_info[0] > 2 else "ascii"
-        #
-        fn = "dir.des.scope.%s.txt" % version
-        url = os.path.join(urlTarget, fn)
-        desL = self.__mU.doImport(url, fmt="tdd", rowFormat="list", uncomment=True, encoding=encoding)
-        logger.info("Fetched URL is %s len %d", url, len(desL))
-        #
-        fn = "dir.cla.scope.%s.txt" % version
-        url = os.path.join(urlTarget, fn)
-        claL = self.__mU.doImport(url, fmt="tdd", rowFormat="list", uncomment=True, encoding=encoding)
-        logger.info("Fetched URL is %s len %d", url, len(claL))
-        #
-        fn = "dir.hie.scope.%s.txt" % version
-        url = os.path.join(urlTarget, fn)
-        hieL = self.__mU.doImport(url, fmt="tdd", rowFormat="list", uncomment=True, encoding=encoding)
-        logger.info("Fetched URL is %s len %d", url, len(hieL))
+        urlL = [os.path.join(urlTarget, fn % version) for fn in ["dir.des.scope.%s.txt", "dir.cla.scope.%s.txt", "dir.hie.scope.%s.txt"]]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.__fetchWorkers) as executor:
+            futureL = [executor.submit(self.__fetchTableFromSource, url) for url in urlL]
+            desL, claL, hieL = [future.result() for future in futureL]
         #
         return desL, claL, hieL
 
+    def __fetchTableFromSource(self, url):
+        encoding = "utf-8-sig" if sys.version_info[0] > 2 else "ascii"
+        mU = MarshalUtil(workPath=self.__scopDirPath)
+        rowL = mU.doImport(url, fmt="tdd", rowFormat="list", uncomment=True, encoding=encoding)
+        logger.info("Fetched URL is %s len %d", url, len(rowL))
+        return rowL
+
     def __extractDescription(self, desL):
         """
         From  dir.des.scope.2.07-2019-03-07.txt:
@@ -361,12 +824,16 @@ class ScopClassificationProvider(StashableBase):
         logger.info("Length of domain parent dictionary %d", len(pD))
         return pD
 
-    def __exportTreeNodeList(self, nD, pD):
+    def __exportTreeNodeList(self, nD, pD, idLineageD):
         """Create node list from the SCOPe (sunid) parent and name/description dictionaries.
 
         Exclude the root node from the tree.
 
         """
+        return list(self.__iterTreeNodes(nD, pD, idLineageD))
+
+    def __iterTreeNodes(self, nD, pD, idLineageD):
+        """Yield the tree nodes (excluding the root) in breadth first order from the name, parent and id lineage dictionaries."""
         #
         rootId = 0
         pL = [rootId]
@@ -393,11 +860,10 @@ class ScopClassificationProvider(StashableBase):
                         queue.append(childId)
                         visited.add(childId)
         #
-        dL = []
         for tId in idL:
             displayName = nD[tId] if tId in nD else None
             ptId = pD[tId] if tId in pD else None
-            lL = self.getIdLineage(tId)[1:]
+            lL = idLineageD[tId][1:] if tId in idLineageD else self.__getIdLineage(tId, pD)[1:]
             #
             # d = {'id': str(tId), 'name': displayName, 'lineage': [str(t) for t in lL], 'parents': [str(ptId)], 'depth': len(lL)}
             if tId == rootId:
@@ -406,6 +872,4 @@ class ScopClassificationProvider(StashableBase):
                 dD = {"id": str(tId), "name": displayName, "depth": 0}
             else:
                 dD = {"id": str(tId), "name": displayName, "parents": [str(ptId)], "depth": len(lL)}
-            dL.append(dD)
-
-        return dL
+            yield dD
@@ -0,0 +1,307 @@
+##
+#  File:  SyntheticClassificationData.py
+#  Date:  16-Oct-2026
+#
+#  Updates:
+#   17-Oct-2026  Add many-domains-per-chain (domainsPerChain) and repeated record (duplicateEvery) worst cases
+##
+"""
+  Generators for synthetic CATH, ECOD, SCOPe and SCOP2 source files (in the formats read by the
+  classification providers) at a configurable scale, for offline builds and benchmarks.
+
+  Each generator writes numLines domain assignment records in the main assignment file of the
+  source, distributed over chains carrying alternately one and two domains (ten chains per entry),
+  together with name and hierarchy files sized to the number of assignments.  The generators return
+  a sample of at most maxKeys of the generated (pdbId, authAsymId) chain keys.
+
+  The CATH and SCOP2 generators also write worst-case sources for the per-chain assignment build, with
+  domainsPerChain domains on every chain and every duplicateEvery-th assignment record repeated.
+
+"""
+
+import gzip
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+CHAINS_PER_ENTRY = 10
+ID_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def getSyntheticPdbId(entryIndex):
+    """Return the synthetic four character PDB id (lower case) of the input entry index (up to 419904 entries)."""
+    num = entryIndex // 9
+    sufL = []
+    for _ in range(3):
+        num, rem = divmod(num, 36)
+        sufL.append(ID_DIGITS[rem])
+    return "%d%s" % (entryIndex % 9 + 1, "".join(reversed(sufL)))
+
+
+def iterSyntheticDomains(numLines, domainsPerChain=None):
+    """Yield (pdbId, authAsymId, domainIndex, numDomains, lineIndex) for numLines domain records.
+
+    Chains carry alternately one and two domains (or domainsPerChain domains if set) and each entry has CHAINS_PER_ENTRY chains.
+    """
+    lineIndex = chainIndex = 0
+    while lineIndex < numLines:
+        pdbId = getSyntheticPdbId(chainIndex // CHAINS_PER_ENTRY)
+        authAsymId = chr(ord("A") + chainIndex % CHAINS_PER_ENTRY)
+        numDomains = min(domainsPerChain if domainsPerChain else 1 + chainIndex % 2, numLines - lineIndex)
+        for domainIndex in range(numDomains):
+            yield pdbId, authAsymId, domainIndex, numDomains, lineIndex
+            lineIndex += 1
+        chainIndex += 1
+
+
+def getSyntheticRange(domainIndex, numDomains, lineIndex):
+    """Return [(resBeg, resEnd), ...] for the input domain (every fifth multi-domain chain has a two segment first domain)."""
+    beg = domainIndex * 100 + 1
+    if numDomains > 1 and domainIndex == 0 and lineIndex % 5 == 0:
+        return [(beg, beg + 39), (beg + 160, beg + 199)]
+    return [(beg, beg + 99)] if numDomains == 1 or domainIndex == 0 else [(beg + 100, beg + 159)]
+
+
+def writeCathSourceFiles(dirPath, numLines, maxKeys=10000, domainsPerChain=None, duplicateEvery=None):
+    """Write the synthetic cath-b-newest-names.gz and cath-b-newest-all.gz files with numLines domain records.
+
+    Args:
+        dirPath (str): output directory (used as the cathTargetUrl)
+        numLines (int): number of domain assignment records
+        maxKeys (int, optional): maximum number of chain keys returned. Defaults to 10000.
+        domainsPerChain (int, optional): number of domains on every chain. Defaults to alternately one and two domains.
+        duplicateEvery (int, optional): repeat every duplicateEvery-th domain record. Defaults to None (no repeated records).
+
+    Returns:
+        list: sample of generated (pdbId, authAsymId) chain keys
+    """
+    os.makedirs(dirPath, exist_ok=True)
+    # Superfamilies are spread over 4 classes with 3 architectures and numTop topologies each
+    numLeaves = max(1200, numLines // 20)
+    numTop = int(math.ceil(numLeaves / (4 * 3 * 20)))
+    cathIdL = []
+    with gzip.open(os.path.join(dirPath, "cath-b-newest-names.gz"), "wt", compresslevel=1) as ofh:
+        for cI in range(1, 5):
+            ofh.write("%d Class %d\n" % (cI, cI))
+            for aI in range(10, 40, 10):
+                ofh.write("%d.%d Architecture %d.%d\n" % (cI, aI, cI, aI))
+                for tI in range(1, numTop + 1):
+                    ofh.write("%d.%d.%d Topology %d.%d.%d\n" % (cI, aI, tI, cI, aI, tI))
+                    for hI in range(10, 210, 10):
+                        cathId = "%d.%d.%d.%d" % (cI, aI, tI, hI)
+                        ofh.write("%s Homologous superfamily %s\n" % (cathId, cathId))
+                        cathIdL.append(cathId)
+    #
+    keyL = []
+    stride = max(1, (numLines // 3) * 2 // maxKeys)
+    with gzip.open(os.path.join(dirPath, "cath-b-newest-all.gz"), "wt", compresslevel=1) as ofh:
+        lineL = []
+        for pdbId, authAsymId, domainIndex, numDomains, lineIndex in iterSyntheticDomains(numLines, domainsPerChain=domainsPerChain):
+            if domainIndex == 0 and (lineIndex // 3) % stride == 0 and len(keyL) < maxKeys:
+                keyL.append((pdbId, authAsymId))
+            rS = ",".join(["%d-%d:%s" % (beg, end, authAsymId) for beg, end in getSyntheticRange(domainIndex, numDomains, lineIndex)])
+            lineL.append("%s%s%02d v4_3_0 %s %s\n" % (pdbId, authAsymId, domainIndex + 1, cathIdL[(lineIndex * 7) % len(cathIdL)], rS))
+            if duplicateEvery and lineIndex % duplicateEvery == 0:
+                lineL.append(lineL[-1])
+            if len(lineL) >= 10000:
+                ofh.write("".join(lineL))
+                lineL = []
+        ofh.write("".join(lineL))
+    logger.info("Synthetic CATH files (%d superfamilies, %d domains) written to %r", len(cathIdL), numLines, dirPath)
+    return keyL
+
+
+def writeEcodSourceFile(filePath, numLines, maxKeys=10000):
+    """Write a synthetic ECOD domain file (ordered by family) with numLines domain records.
+
+    Args:
+        filePath (str): output file path (used as the ecodTargetUrl)
+        numLines (int): number of domain records
+        maxKeys (int, optional): maximum number of chain keys returned. Defaults to 10000.
+
+    Returns:
+        list: sample of generated (pdbId, authAsymId) chain keys
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(filePath)), exist_ok=True)
+    # Families are spread over 5 architectures with 4 X-groups, 4 H-groups and numT T-groups each
+    numFamilies = max(240, numLines // 20)
+    numT = int(math.ceil(numFamilies / (5 * 4 * 4 * 3)))
+    famL = [(aI, xI, hI, tI, fI) for aI in range(5) for xI in range(4) for hI in range(4) for tI in range(numT) for fI in range(3)]
+    keyL = []
+    stride = max(1, (numLines // 3) * 2 // maxKeys)
+    with open(filePath, "w", encoding="utf-8") as ofh:
+        ofh.write("#/data/ecod/database_versions/v999/ecod.develop999.domains.txt\n#ECOD version develop999\n#Domain list version 1.6\n")
+        ofh.write("#Grishin lab (http://prodata.swmed.edu/ecod)\n")
+        ofh.write("#uid\tecod_domain_id\tmanual_rep\tf_id\tpdb\tchain\tpdb_range\tseqid_range\tunp_acc\tarch_name\tx_name\th_name\tt_name\tf_name\tasm_status\tligand\n")
+        lineL = []
+        for pdbId, authAsymId, domainIndex, numDomains, lineIndex in iterSyntheticDomains(numLines):
+            if domainIndex == 0 and (lineIndex // 3) % stride == 0 and len(keyL) < maxKeys:
+                keyL.append((pdbId, authAsymId))
+            # Records are ordered by family (as in the ECOD release file)
+            aI, xI, hI, tI, fI = famL[lineIndex * len(famL) // numLines]
+            xName = "NO_X_NAME" if xI == 3 else '"x %d.%d"' % (aI, xI)
+            hName = "NO_H_NAME" if hI == 3 else '"h %d.%d.%d"' % (aI, xI, hI)
+            fName = "F_UNCLASSIFIED" if fI == 2 else "f %d.%d.%d.%d.%d" % (aI, xI, hI, tI, fI)
+            rS = ",".join(["%s:%d-%d" % (authAsymId, beg, end) for beg, end in getSyntheticRange(domainIndex, numDomains, lineIndex)])
+            lineL.append(
+                "%09d\te%s%s%d\tAUTO_NONREP\t%d.%d.%d\t%s\t%s\t%s\t%s\tNO_UNP\tarch %d\t%s\t%s\t\"t %d.%d.%d.%d\"\t%s\tNOT_REPRESENTATIVE\tNO_LIGANDS_4A\n"
+                % (lineIndex, pdbId, authAsymId, domainIndex + 1, xI, hI, tI, pdbId, authAsymId, rS, rS, aI, xName, hName, aI, xI, hI, tI, fName)
+            )
+            if len(lineL) >= 10000:
+                ofh.write("".join(lineL))
+                lineL = []
+        ofh.write("".join(lineL))
+    logger.info("Synthetic ECOD file (%d families, %d domains) written to %r", len(famL), numLines, filePath)
+    return keyL
+
+
+def writeScopeSourceFiles(dirPath, numLines, version="2.08-synthetic", maxKeys=10000):
+    """Write synthetic SCOPe dir.des, dir.cla and dir.hie files with numLines domain (px) records.
+
+    Args:
+        dirPath (str): output directory (used as the scopTargetUrl)
+        numLines (int): number of domain classification records
+        version (str, optional): release version in the file names (scopVersion). Defaults to "2.08-synthetic".
+        maxKeys (int, optional): maximum number of chain keys returned. Defaults to 10000.
+
+    Returns:
+        list: sample of generated (pdbId, authAsymId) chain keys
+    """
+    os.makedirs(dirPath, exist_ok=True)
+    # Families (each with one protein (dm) and one species (sp) node) are spread over 7 classes with
+    # numFolds folds, 3 superfamilies per fold and 4 families per superfamily
+    numFolds = int(math.ceil(max(500, numLines // 20) / (7 * 3 * 4)))
+    hdr = "# SCOPe release %s (synthetic)  [File format version 1.02]\n" % version
+    nodeL = []
+    famL = []
+    for clI in range(7):
+        clId, clS = 46456 + clI, "abcdefg"[clI]
+        nodeL.append((clId, 0, "cl", clS, "Class %s" % clS))
+        for cfI in range(numFolds):
+            cfId, cfS = 2000000 + clI * numFolds + cfI, "%s.%d" % (clS, cfI + 1)
+            nodeL.append((cfId, clId, "cf", cfS, "Fold %s" % cfS))
+            for sfI in range(3):
+                sfId, sfS = 3000000 + (clI * numFolds + cfI) * 3 + sfI, "%s.%d" % (cfS, sfI + 1)
+                nodeL.append((sfId, cfId, "sf", sfS, "Superfamily %s" % sfS))
+                for faI in range(4):
+                    faIndex = len(famL)
+                    faId, faS = 4000000 + faIndex, "%s.%d" % (sfS, faI + 1)
+                    dmId, spId = 5000000 + faIndex, 6000000 + faIndex
+                    nodeL.append((faId, sfId, "fa", faS, "Family %s" % faS))
+                    nodeL.append((dmId, faId, "dm", faS, "Protein %s" % faS))
+                    nodeL.append((spId, dmId, "sp", faS, "Species %s [TaxId: %d]" % (faS, 9606)))
+                    famL.append((clId, cfId, sfId, faId, dmId, spId, faS))
+    childD = {}
+    for nId, pId, _, _, _ in nodeL:
+        childD.setdefault(pId, []).append(nId)
+    #
+    keyL = []
+    stride = max(1, (numLines // 3) * 2 // maxKeys)
+    fnL = ["dir.des.scope.%s.txt", "dir.cla.scope.%s.txt", "dir.hie.scope.%s.txt"]
+    desFh, claFh, hieFh = [open(os.path.join(dirPath, fn % version), "w", encoding="utf-8") for fn in fnL]
+    try:
+        for ofh in [desFh, claFh, hieFh]:
+            ofh.write(hdr)
+        desFh.write("".join(["%d\t%s\t%s\t-\t%s\n" % (nId, level, sccs, name) for nId, _, level, sccs, name in nodeL]))
+        hieFh.write("0\t-\t%s\n" % ",".join([str(cId) for cId in childD[0]]))
+        hieFh.write("".join(["%d\t%d\t%s\n" % (nId, pId, ",".join([str(cId) for cId in childD.get(nId, [])]) or "-") for nId, pId, _, _, _ in nodeL]))
+        desL, claL, hieL = [], [], []
+        for pdbId, authAsymId, domainIndex, numDomains, lineIndex in iterSyntheticDomains(numLines):
+            if domainIndex == 0 and (lineIndex // 3) % stride == 0 and len(keyL) < maxKeys:
+                keyL.append((pdbId, authAsymId))
+            clId, cfId, sfId, faId, dmId, spId, sccs = famL[(lineIndex * 7) % len(famL)]
+            pxId = 10000000 + lineIndex
+            sid = "d%s%s%d" % (pdbId, authAsymId.lower(), domainIndex + 1) if numDomains > 1 else "d%s%s_" % (pdbId, authAsymId.lower())
+            rS = ",".join(["%s:%d-%d" % (authAsymId, beg, end) for beg, end in getSyntheticRange(domainIndex, numDomains, lineIndex)]) if numDomains > 1 else "%s:" % authAsymId
+            desL.append("%d\tpx\t%s\t%s\t%s %s\n" % (pxId, sccs, sid, pdbId, rS))
+            claL.append("%s\t%s\t%s\t%s\t%d\tcl=%d,cf=%d,sf=%d,fa=%d,dm=%d,sp=%d,px=%d\n" % (sid, pdbId, rS, sccs, pxId, clId, cfId, sfId, faId, dmId, spId, pxId))
+            hieL.append("%d\t%d\t-\n" % (pxId, spId))
+            if len(claL) >= 10000:
+                for ofh, lineL in [(desFh, desL), (claFh, claL), (hieFh, hieL)]:
+                    ofh.write("".join(lineL))
+                desL, claL, hieL = [], [], []
+        for ofh, lineL in [(desFh, desL), (claFh, claL), (hieFh, hieL)]:
+            ofh.write("".join(lineL))
+    finally:
+        for ofh in [desFh, claFh, hieFh]:
+            ofh.close()
+    logger.info("Synthetic SCOPe files (%d families, %d domains) written to %r", len(famL), numLines, dirPath)
+    return keyL
+
+
+def writeScop2SourceFiles(dirPath, numLines, maxKeys=10000, domainsPerChain=None, duplicateEvery=None):
+    """Write synthetic SCOP2 (scop-des-latest.txt, scop-cla-latest.txt) and SIFTS SCOP2/SCOP2B files with numLines
+    domain classification records (and a SIFTS record for every tenth domain).
+
+    Args:
+        dirPath (str): output directory (used as both the urlTargetScop2 and urlTargetSifts)
+        numLines (int): number of domain classification records
+        maxKeys (int, optional): maximum number of chain keys returned. Defaults to 10000.
+        domainsPerChain (int, optional): number of domains on every chain. Defaults to alternately one and two domains.
+        duplicateEvery (int, optional): repeat every duplicateEvery-th domain classification record. Defaults to None (no repeated records).
+
+    Returns:
+        list: sample of generated (pdbId, authAsymId) chain keys (upper case PDB ids)
+    """
+    os.makedirs(dirPath, exist_ok=True)
+    # Families are spread over 4 classes with numFolds folds and 2 superfamilies per fold
+    numFolds = int(math.ceil(max(300, numLines // 20) / (4 * 2 * 2)))
+    famL = []
+    with open(os.path.join(dirPath, "scop-des-latest.txt"), "w", encoding="utf-8") as ofh:
+        ofh.write("# SCOP release 2024-01-01\n")
+        ofh.write("1 Globular proteins\n")
+        for clI in range(4):
+            clId = 1000001 + clI
+            ofh.write("%d Class %d\n" % (clId, clI))
+            for cfI in range(numFolds):
+                cfId = 2000000 + clI * numFolds + cfI
+                ofh.write("%d Fold %d\n" % (cfId, cfId))
+                for sfI in range(2):
+                    sfId = 3000000 + (clI * numFolds + cfI) * 2 + sfI
+                    ofh.write("%d Superfamily %d\n" % (sfId, sfId))
+                    for _ in range(2):
+                        faId = 4000000 + len(famL)
+                        ofh.write("%d Family %d\n" % (faId, faId))
+                        famL.append("TP=1,CL=%d,CF=%d,SF=%d,FA=%d" % (clId, cfId, sfId, faId))
+    #
+    keyL = []
+    stride = max(1, (numLines // 3) * 2 // maxKeys)
+    hS = "PDB\tCHAIN\tSF_DOMID\tSP_PRIMARY\tRES_BEG\tRES_END\tPDB_BEG\tPDB_END\tSP_BEG\tSP_END\n"
+    claFh = open(os.path.join(dirPath, "scop-cla-latest.txt"), "w", encoding="utf-8")
+    siftsFhL = [gzip.open(os.path.join(dirPath, fn), "wt", compresslevel=1) for fn in ["pdb_chain_scop2b_sf_uniprot.tsv.gz", "pdb_chain_scop2_uniprot.tsv.gz"]]
+    try:
+        claFh.write("# SCOP release 2024-01-01\n# FA-DOMID FA-PDBID FA-PDBREG FA-UNIID FA-UNIREG SF-DOMID SF-PDBID SF-PDBREG SF-UNIID SF-UNIREG SCOPCLA\n")
+        for ofh in siftsFhL:
+            ofh.write("# 2024/01/01 - 00:00 | PDB: 01.24 | UniProt: 2024.01\n")
+            ofh.write(hS)
+        claL, siftsL = [], []
+        for pdbId, authAsymId, domainIndex, numDomains, lineIndex in iterSyntheticDomains(numLines, domainsPerChain=domainsPerChain):
+            pdbIdU = pdbId.upper()
+            if domainIndex == 0 and (lineIndex // 3) % stride == 0 and len(keyL) < maxKeys:
+                keyL.append((pdbIdU, authAsymId))
+            rS = ",".join(["%s:%d-%d" % (authAsymId, beg, end) for beg, end in getSyntheticRange(domainIndex, numDomains, lineIndex)])
+            uniId = "P%05d" % (lineIndex % 100000)
+            uS = "%d-%d" % (domainIndex * 100 + 1, domainIndex * 100 + 100)
+            sfDomId = 9000000 + lineIndex
+            claL.append("%d %s %s %s %s %d %s %s %s %s %s\n" % (8000000 + lineIndex, pdbIdU, rS, uniId, uS, sfDomId, pdbIdU, rS, uniId, uS, famL[(lineIndex * 7) % len(famL)]))
+            if duplicateEvery and lineIndex % duplicateEvery == 0:
+                claL.append(claL[-1])
+            if lineIndex % 10 == 0:
+                # SIFTS extrapolated superfamily assignment on a neighbouring chain of the entry
+                siftsL.append("%s\t%s\t%d\t%s\t1\t90\t1\t90\t1\t90\n" % (pdbId, chr(ord("A") + CHAINS_PER_ENTRY), sfDomId, uniId))
+            if len(claL) >= 10000:
+                claFh.write("".join(claL))
+                for ofh in siftsFhL:
+                    ofh.write("".join(siftsL))
+                claL, siftsL = [], []
+        claFh.write("".join(claL))
+        for ofh in siftsFhL:
+            ofh.write("".join(siftsL))
+    finally:
+        claFh.close()
+        for ofh in siftsFhL:
+            ofh.close()
+    logger.info("Synthetic SCOP2 files (%d families, %d domains) written to %r", len(famL), numLines, dirPath)
+    return keyL
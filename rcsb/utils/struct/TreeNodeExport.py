@@ -0,0 +1,108 @@
+##
+#  File:  TreeNodeExport.py
+#  Date:  17-Oct-2026
+#
+#  Updates:
+#
+##
+"""
+  Streaming JSON-lines serialization of classification tree node lists to files, file-like objects
+  or bytes (optionally gzip compressed).
+
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Compact encoder shared by the tree node writers (one JSON object per line)
+TREE_NODE_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def writeTreeNodes(treeNodeIter, target, compress=None, batchSize=1000):
+    """Write tree nodes as JSON lines, consuming the input one node at a time.
+
+    Args:
+        treeNodeIter (iterable): tree node dictionaries (e.g., provider.iterTreeNodes())
+        target (str|file): output file path or binary (or text) file-like object. Files are written to a
+                           temporary path and renamed on completion.
+        compress (bool, optional): gzip compress the output. Defaults to None (compress paths with a .gz suffix).
+        batchSize (int, optional): number of lines buffered between writes. Defaults to 1000.
+
+    Returns:
+        int: number of tree nodes written or None on failure
+    """
+    tmpPath = None
+    try:
+        if isinstance(target, (str, os.PathLike)):
+            filePath = os.fspath(target)
+            compress = filePath.endswith(".gz") if compress is None else compress
+            tmpPath = filePath + ".tmp"
+            with gzip.open(tmpPath, "wb") if compress else open(tmpPath, "wb") as ofh:
+                numNodes = _writeLines(treeNodeIter, ofh, batchSize)
+            os.replace(tmpPath, filePath)
+            return numNodes
+        if compress:
+            with gzip.GzipFile(fileobj=target, mode="wb") as ofh:
+                return _writeLines(treeNodeIter, ofh, batchSize)
+        return _writeLines(treeNodeIter, target, batchSize)
+    except Exception as e:
+        logger.exception("Failing writing tree nodes to %r with %s", target, str(e))
+        if tmpPath and os.path.exists(tmpPath):
+            os.remove(tmpPath)
+    return None
+
+
+def _writeLines(treeNodeIter, ofh, batchSize):
+    textMode = isinstance(ofh, io.TextIOBase)
+    encode = TREE_NODE_ENCODER.encode
+    numNodes = 0
+    lineL = []
+    for dD in treeNodeIter:
+        lineL.append(encode(dD))
+        numNodes += 1
+        if len(lineL) >= batchSize:
+            _writeBatch(ofh, lineL, textMode)
+            lineL = []
+    if lineL:
+        _writeBatch(ofh, lineL, textMode)
+    return numNodes
+
+
+def _writeBatch(ofh, lineL, textMode):
+    tS = "\n".join(lineL) + "\n"
+    ofh.write(tS if textMode else tS.encode("utf-8"))
+
+
+def encodeTreeNodes(treeNodeIter, compress=False):
+    """Return tree nodes serialized as JSON lines (cf. writeTreeNodes()).
+
+    Args:
+        treeNodeIter (iterable): tree node dictionaries
+        compress (bool, optional): gzip compress the serialized bytes. Defaults to False.
+
+    Returns:
+        bytes: serialized tree nodes or None on failure
+    """
+    bIo = io.BytesIO()
+    if writeTreeNodes(treeNodeIter, bIo, compress=compress) is None:
+        return None
+    return bIo.getvalue()
+
+
+def readTreeNodes(source):
+    """Yield the tree nodes of a JSON-lines file path (gzip compressed for a .gz suffix) or bytes (compressed or not)."""
+    if isinstance(source, (bytes, bytearray)):
+        data = gzip.decompress(source) if source[:2] == b"\x1f\x8b" else source
+        ifh = io.BytesIO(data)
+    else:
+        filePath = os.fspath(source)
+        ifh = gzip.open(filePath, "rb") if filePath.endswith(".gz") else open(filePath, "rb")
+    with ifh:
+        for line in ifh:
+            if line.strip():
+                yield json.loads(line)
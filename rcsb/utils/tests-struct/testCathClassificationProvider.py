@@ -3,20 +3,44 @@
 # Date:    3-Apr-2019  JDW
 #
 # Updates:
-#
+#  16-Oct-2026  Add offline tests of the streaming build using synthetic CATH release files
+#  16-Oct-2026  Add assignment build scaling benchmark for synthetic worst-case chains
+#  16-Oct-2026  Add residue position and range query tests
+#  16-Oct-2026  Add lineage table tests
+#  16-Oct-2026  Add concurrent source fetch test against a local HTTP server
+#  16-Oct-2026  Add incremental update test
+#  16-Oct-2026  Add cached tree node list tests
+#  16-Oct-2026  Add batch chain annotation test
+#  16-Oct-2026  Add mapped cache tests
+#  17-Oct-2026  Add build statistics test
+#  17-Oct-2026  Add lookup statistics test
+#  17-Oct-2026  Add node member index test
+#  17-Oct-2026  Add lowest common ancestor test
+#  17-Oct-2026  Add incremental update test for changed records failing to parse
+#  17-Oct-2026  Check that the stored tree node list is returned without copying
+#  17-Oct-2026  Check the release recorded with the cache and manifest
 ##
 """
 Test cases for operations that read CATH term and class data from flat files -
 
 """
 
+import functools
+import gzip
+import http.server
 import logging
 import os
+import threading
 import time
 import unittest
+from datetime import datetime
 
 from importlib.metadata import version as get_package_version
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.struct.CathClassificationProvider import CATH_LEVEL_NAMES
 from rcsb.utils.struct.CathClassificationProvider import CathClassificationProvider
+from rcsb.utils.struct.SyntheticClassificationData import getSyntheticPdbId
+from rcsb.utils.struct.SyntheticClassificationData import writeCathSourceFiles
 
 __version__ = get_package_version("rcsb.utils.struct")
 
@@ -27,6 +51,48 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(mo
 logger = logging.getLogger()
 
 
+def readSyntheticCathMembers(dirPath):
+    """Return the chain domains of each CATH node in the synthetic cath-b-newest-all.gz file {cathId: {(pdbId, authAsymId, domainId), ...}, ...}."""
+    memberD = {}
+    with gzip.open(os.path.join(dirPath, "cath-b-newest-all.gz"), "rt") as ifh:
+        for line in ifh:
+            domainId, _, cathId, _ = line.split()
+            memberD.setdefault(cathId, set()).add((domainId[:4], domainId[4], domainId))
+    return memberD
+
+
+class DelayedRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file request handler adding a fixed latency to each request (stand-in for a remote source)
+    and recording the maximum number of requests in flight at once.
+    """
+
+    delaySeconds = 0.5
+    inFlight = 0
+    maxInFlight = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def resetCounts(cls):
+        with cls.lock:
+            cls.inFlight = 0
+            cls.maxInFlight = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.inFlight += 1
+            cls.maxInFlight = max(cls.maxInFlight, cls.inFlight)
+        try:
+            time.sleep(self.delaySeconds)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.inFlight -= 1
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logger.debug(format, *args)
+
+
 class CathClassificationProviderTests(unittest.TestCase):
     def setUp(self):
         self.__workPath = os.path.join(HERE, "test-output")
@@ -40,6 +106,17 @@ class CathClassificationProviderTests(unittest.TestCase):
         endTime = time.time()
         logger.debug("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
 
+    def __getSyntheticProvider(self, cacheName, **kwargs):
+        """Build a cache from the synthetic CATH release files and return a provider reloaded from that cache"""
+        dataPath = os.path.join(self.__workPath, "cath-synthetic")
+        writeCathSourceFiles(dataPath, 8000)
+        cachePath = os.path.join(self.__workPath, cacheName)
+        ccu = CathClassificationProvider(cachePath=cachePath, useCache=False, cathStreamingBuild=True, cathTargetUrl=dataPath, cathUrlBackupPath=dataPath)
+        self.assertTrue(ccu.testCache())
+        ccu = CathClassificationProvider(cachePath=cachePath, useCache=True, **kwargs)
+        self.assertTrue(ccu.testCache())
+        return ccu
+
     # @unittest.skipIf(True, "Service temporarily down")
     def testGetCathData(self):
         """Load latest CATH data"""
@@ -87,11 +164,397 @@ class CathClassificationProviderTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testStreamingBuild(self):
+        """Compare the streaming and list-based builds using synthetic CATH release files"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic")
+            writeCathSourceFiles(dataPath, 8000)
+            kwD = {"cathTargetUrl": dataPath, "cathUrlBackupPath": dataPath}
+            ccuL = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-LIST"), useCache=False, **kwD)
+            self.assertTrue(ccuL.testCache())
+            ccuS = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-STREAM"), useCache=False, cathStreamingBuild=True, **kwD)
+            self.assertTrue(ccuS.testCache())
+            for pdbTup in [("1000", "A"), ("1000", "B"), ("4001", "A"), ("9014", "B")]:
+                rangesL = ccuL.getCathResidueRanges(pdbTup[0], pdbTup[1])
+                self.assertTrue(rangesL)
+                self.assertEqual(rangesL, ccuS.getCathResidueRanges(pdbTup[0], pdbTup[1]))
+                self.assertEqual(sorted(ccuL.getCathIds(pdbTup[0], pdbTup[1])), sorted(ccuS.getCathIds(pdbTup[0], pdbTup[1])))
+            #
+            ccuC = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-STREAM"), useCache=True)
+            self.assertTrue(ccuC.testCache())
+            self.assertEqual(ccuC.getCathResidueRanges("1000", "A"), ccuL.getCathResidueRanges("1000", "A"))
+            # The release of the newest (local) daily release file is taken from its modification time
+            releaseS = datetime.fromtimestamp(os.path.getmtime(os.path.join(dataPath, "cath-b-newest-all.gz"))).strftime("%Y%m%d")
+            self.assertEqual((ccuL.getVersion(), ccuS.getVersion(), ccuC.getVersion()), (releaseS, releaseS, releaseS))
+            self.assertEqual(ccuC.getCacheManifest()["version"], releaseS)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testResidueIntervalQueries(self):
+        """Test residue position and range queries on a cached synthetic CATH build"""
+        try:
+            ccu = self.__getSyntheticProvider("CACHE-INTERVAL")
+            # 1000 H has domains 1-40,161-200 and 201-260
+            self.assertEqual([t[1] for t in ccu.getDomainsAtResidue("1000", "H", 170)], ["1000H01"])
+            self.assertEqual([t[1] for t in ccu.getDomainsAtResidue("1000", "H", "201")], ["1000H02"])
+            self.assertEqual(ccu.getDomainsAtResidue("1000", "H", 100), [])
+            self.assertEqual([t[1] for t in ccu.getDomainsOverlapping("1000", "H", 30, 210)], ["1000H01", "1000H01", "1000H02"])
+            self.assertEqual(ccu.getDomainsOverlapping("1000", "Z", 1, 100), [])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testLineageTables(self):
+        """Test the id and name lineages materialized with a cached synthetic CATH build"""
+        try:
+            ccu = self.__getSyntheticProvider("CACHE-LINEAGE")
+            self.assertEqual(ccu.getIdLineage("1.10.1.10"), ["1", "1.10", "1.10.1", "1.10.1.10"])
+            self.assertEqual(ccu.getNameLineage("1.10.1.10"), ["Class 1", "Architecture 1.10", "Topology 1.10.1", "Homologous superfamily 1.10.1.10"])
+            self.assertEqual(ccu.getIdLineage("9.9.9"), ["9", "9.9", "9.9.9"])
+            self.assertEqual(ccu.getNameLineage("9.9"), [None, None])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testTreeNodeList(self):
+        """Test the tree node list stored with a cached synthetic CATH build"""
+        try:
+            ccu = self.__getSyntheticProvider("CACHE-TREE")
+            tnL = ccu.getTreeNodeList()
+            self.assertEqual(len(tnL), 1276)
+            self.assertEqual(tnL[:2], [{"id": "1", "name": "Class 1", "depth": 0}, {"id": "1.10", "name": "Architecture 1.10", "parents": ["1"], "depth": 1}])
+            self.assertEqual(list(ccu.iterTreeNodes()), tnL)
+            # The stored list is returned without copying while iterTreeNodes() yields copies
+            self.assertIs(ccu.getTreeNodeList(), tnL)
+            next(ccu.iterTreeNodes())["name"] = "Modified"
+            self.assertEqual(ccu.getTreeNodeList()[0]["name"], "Class 1")
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testMappedCache(self):
+        """Compare lookups on the mapped cache (written from the pickle cache on first use and then read in place) with the pickle cache"""
+        try:
+            ccu = self.__getSyntheticProvider("CACHE-MAPPED")
+            for _ in range(2):
+                ccuM = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-MAPPED"), useCache=True, useMappedCache=True)
+                self.assertTrue(ccuM.testCache())
+                self.assertTrue(os.path.exists(os.path.join(self.__workPath, "CACHE-MAPPED", "cath", "cath_domains-py3-assignments.map")))
+                # Only scalar content is held in the pickle loaded by each process
+                mD = MarshalUtil().doImport(os.path.join(self.__workPath, "CACHE-MAPPED", "cath", "cath_domains-py3-meta.pic"), fmt="pickle")
+                self.assertEqual(sorted(mD.keys()), ["cacheModified", "mappedTables", "release", "updateLog"])
+                for pdbTup in [("1000", "A"), ("1000", "B"), ("4001", "A"), ("9014", "B"), ("1000", "Z")]:
+                    self.assertEqual(ccuM.getCathResidueRanges(pdbTup[0], pdbTup[1]), ccu.getCathResidueRanges(pdbTup[0], pdbTup[1]))
+                    self.assertEqual(ccuM.getDomainsOverlapping(pdbTup[0], pdbTup[1], 90, 190), ccu.getDomainsOverlapping(pdbTup[0], pdbTup[1], 90, 190))
+                self.assertEqual(ccuM.getNameLineage("1.10.1.10"), ccu.getNameLineage("1.10.1.10"))
+                self.assertEqual(ccuM.getTreeNodeList(), ccu.getTreeNodeList())
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testBuildStats(self):
+        """Test the per-phase build statistics of list-based, streaming and cached loads (with JSON reports)"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic")
+            writeCathSourceFiles(dataPath, 8000)
+            kwD = {"cathTargetUrl": dataPath, "cathUrlBackupPath": dataPath}
+            reportPath = os.path.join(self.__workPath, "cath-build-stats.json")
+            for streamingBuild, phaseL in [(False, ["fetch", "parse", "assignments", "hierarchy", "export"]), (True, ["fetch", "hierarchy", "export"])]:
+                ccu = CathClassificationProvider(
+                    cachePath=os.path.join(self.__workPath, "CACHE-STATS"), useCache=False, cathStreamingBuild=streamingBuild, traceMemory=True, buildStatsPath=reportPath, **kwD
+                )
+                bD = ccu.getBuildStats()
+                logger.info("Build stats (streaming %r) %r", streamingBuild, bD)
+                self.assertEqual([pD["phase"] for pD in bD["phases"]], phaseL)
+                self.assertEqual(bD["phases"][0]["records"], 8000 if streamingBuild else 1276 + 8000)
+                self.assertEqual(bD["phases"][-1]["records"], 5334)
+                for pD in bD["phases"]:
+                    self.assertGreaterEqual(pD["wallSeconds"], 0.0)
+                    self.assertGreaterEqual(pD["peakMemoryBytes"], 0)
+                self.assertGreater(bD["phases"][1]["peakMemoryBytes"], 100000)
+                self.assertAlmostEqual(bD["wallSeconds"], sum([pD["wallSeconds"] for pD in bD["phases"]]))
+                self.assertEqual(MarshalUtil().doImport(reportPath, fmt="json"), bD)
+            #
+            ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-STATS"), useCache=True, lazyLoad=True, **kwD)
+            bD = ccu.getBuildStats()
+            self.assertEqual([(pD["phase"], pD["records"]) for pD in bD["phases"]], [("load", 5334)])
+            self.assertNotIn("peakMemoryBytes", bD["phases"][0])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testAssignmentBuildScaling(self):
+        """Test the assignment build on synthetic worst-case chains (many domains per chain, the build time scaling is
+        reported by ClassificationBenchmark.runAssignmentScaling())"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic-worst")
+            kwD = {"cathTargetUrl": dataPath, "cathUrlBackupPath": dataPath}
+            numDomains = 2000
+            writeCathSourceFiles(dataPath, 4 * numDomains, domainsPerChain=numDomains, duplicateEvery=10)
+            for streamingBuild in [False, True]:
+                ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-WORST"), useCache=False, cathStreamingBuild=streamingBuild, **kwD)
+                ranges = ccu.getCathResidueRanges("1000", "A")
+                # The first domain of each chain has two segments
+                self.assertEqual(len(ranges), numDomains + 1)
+                self.assertEqual(len(ranges), len(set(ranges)))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testConcurrentFetch(self):
+        """Compare serial and concurrent source fetching from a local HTTP server with per-request latency"""
+        httpd = None
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic-http")
+            writeCathSourceFiles(dataPath, 8000)
+            httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(DelayedRequestHandler, directory=dataPath))
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            url = "http://127.0.0.1:%d" % httpd.server_address[1]
+            kwD = {"cathTargetUrl": url, "cathUrlBackupPath": url}
+            for fetchWorkers in [1, 2]:
+                for streamingBuild in [False, True]:
+                    DelayedRequestHandler.resetCounts()
+                    startTime = time.time()
+                    cachePath = os.path.join(self.__workPath, "CACHE-HTTP-%d-%r" % (fetchWorkers, streamingBuild))
+                    ccu = CathClassificationProvider(cachePath=cachePath, useCache=False, cathStreamingBuild=streamingBuild, fetchWorkers=fetchWorkers, **kwD)
+                    logger.info("Fetch workers %d streaming %r build time %.4f seconds", fetchWorkers, streamingBuild, time.time() - startTime)
+                    self.assertTrue(ccu.testCache())
+                    self.assertEqual(ccu.getCathResidueRanges("1000", "A")[0][3:], ("1", "100"))
+                    # Both release files are requested at once only with concurrent fetching
+                    self.assertEqual(DelayedRequestHandler.maxInFlight, fetchWorkers)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+        finally:
+            if httpd:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def testIncrementalUpdate(self):
+        """Compare an incremental update with a full rebuild after modifying the synthetic daily release"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic-update")
+            writeCathSourceFiles(dataPath, 8000)
+            kwD = {"cathTargetUrl": dataPath, "cathUrlBackupPath": dataPath}
+            ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-UPDATE"), useCache=False, **kwD)
+            self.assertTrue(ccu.testCache())
+            uD = ccu.incrementalUpdate()
+            self.assertEqual((uD["added"], uD["removed"], uD["changed"], uD["names"]), ([], [], [], 0))
+            self.assertEqual(ccu.getUpdateLog(), [])
+            #
+            # Remove, change and add domain records in the next daily release
+            domainPath = os.path.join(dataPath, "cath-b-newest-all.gz")
+            with gzip.open(domainPath, "rt") as ifh:
+                dmL = ifh.read().splitlines()
+            oL = []
+            for ii, dm in enumerate(dmL):
+                if dm.startswith("1000H01"):
+                    oL.append(dm.replace("1-40:H,161-200:H", "1-60:H"))
+                elif ii % 97 == 5:
+                    continue
+                else:
+                    oL.append(dm)
+            oL.append("9zzzA01 v4_3_0 1.10.1.10 1-80:A")
+            oL.append("9zzzA02 v4_3_0 1.10.1.20 81-120:A,130-140:B")
+            with gzip.open(domainPath, "wt") as ofh:
+                ofh.write("\n".join(oL) + "\n")
+            #
+            uD = ccu.incrementalUpdate()
+            self.assertEqual(sorted(uD["added"]), ["9zzzA01", "9zzzA02"])
+            self.assertEqual(uD["changed"], ["1000H01"])
+            self.assertEqual(len(uD["removed"]), len([ii for ii in range(len(dmL)) if ii % 97 == 5]))
+            self.assertEqual(len(ccu.getUpdateLog()), 1)
+            self.assertEqual([t[1] for t in ccu.getDomainsAtResidue("1000", "H", 55)], ["1000H01"])
+            self.assertEqual([t[1] for t in ccu.getDomainsAtResidue("9zzz", "B", 135)], ["9zzzA02"])
+            #
+            ccuF = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-UPDATE-FULL"), useCache=False, **kwD)
+            ccuC = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-UPDATE"), useCache=True, **kwD)
+            self.assertEqual(len(ccuC.getUpdateLog()), 1)
+            pdbIdS = set([dm[:4] for dm in dmL + oL])
+            for pdbId in pdbIdS:
+                for chainId in "ABCDEFGHIJ":
+                    rangesF = ccuF.getCathResidueRanges(pdbId, chainId)
+                    self.assertEqual(ccu.getCathResidueRanges(pdbId, chainId), rangesF)
+                    self.assertEqual(ccuC.getCathResidueRanges(pdbId, chainId), rangesF)
+            #
+            uD = ccuC.incrementalUpdate()
+            self.assertEqual((uD["added"], uD["removed"], uD["changed"], uD["names"]), ([], [], [], 0))
+            #
+            # A changed record that fails to parse drops the cached assignment and is parsed again by the next update
+            self.assertEqual([t[1] for t in ccu.getCathResidueRanges("1000", "B")], ["1000B01", "1000B02"])
+            with gzip.open(domainPath, "wt") as ofh:
+                ofh.write("\n".join([dm.split(" ")[0] + " v4_3_0 1.10.1.150 201-" if dm.startswith("1000B02") else dm for dm in oL]) + "\n")
+            uD = ccu.incrementalUpdate()
+            self.assertEqual((uD["added"], uD["removed"], uD["changed"], uD["failed"]), ([], [], [], ["1000B02"]))
+            self.assertEqual(ccu.getUpdateLog()[-1]["failed"], ["1000B02"])
+            self.assertEqual([t[1] for t in ccu.getCathResidueRanges("1000", "B")], ["1000B01"])
+            with gzip.open(domainPath, "wt") as ofh:
+                ofh.write("\n".join(oL) + "\n")
+            uD = ccu.incrementalUpdate()
+            self.assertEqual((uD["added"], uD["removed"], uD["changed"], uD["failed"]), (["1000B02"], [], [], []))
+            self.assertEqual(ccu.getCathResidueRanges("1000", "B"), ccuF.getCathResidueRanges("1000", "B"))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testBatchAnnotations(self):
+        """Compare batch and per-chain annotation lookups using synthetic CATH release files"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic")
+            writeCathSourceFiles(dataPath, 8000)
+            ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-BATCH"), useCache=False, cathTargetUrl=dataPath, cathUrlBackupPath=dataPath)
+            self.assertTrue(ccu.testCache())
+            chainKeyL = [(getSyntheticPdbId(eI), chainId) for eI in range(540) for chainId in "ABCDEFGHIJK"]
+            #
+            startTime = time.time()
+            for pdbId, authAsymId in chainKeyL:
+                ccu.getCathIds(pdbId, authAsymId)
+                ccu.getCathDomainNames(pdbId, authAsymId)
+                ccu.getCathVersions(pdbId, authAsymId)
+                ccu.getCathResidueRanges(pdbId, authAsymId)
+            logger.info("Per-chain lookups (%d chains) in %.4f seconds", len(chainKeyL), time.time() - startTime)
+            startTime = time.time()
+            bD = ccu.getBatchAnnotations(chainKeyL)
+            logger.info("Batch lookups (%d chains) in %.4f seconds", len(chainKeyL), time.time() - startTime)
+            #
+            self.assertEqual(len(bD), len(chainKeyL))
+            for pdbId, authAsymId in chainKeyL:
+                aD = bD[(pdbId, authAsymId)]
+                self.assertEqual(sorted(aD["cathIds"]), sorted(ccu.getCathIds(pdbId, authAsymId)))
+                self.assertEqual(sorted(aD["domainNames"]), sorted(ccu.getCathDomainNames(pdbId, authAsymId)))
+                self.assertEqual(aD["versions"], ccu.getCathVersions(pdbId, authAsymId))
+                self.assertEqual(aD["residueRanges"], ccu.getCathResidueRanges(pdbId, authAsymId))
+            self.assertEqual(bD[("1000", "K")], {"cathIds": [], "domainNames": [], "versions": [], "residueRanges": []})
+            bD = ccu.getBatchAnnotations([("1000", "B"), ("xxxx", "A")], fields=["cathIds", "unknown"])
+            self.assertEqual(bD, {("1000", "B"): {"cathIds": ["1.10.1.80", "1.10.1.150"]}, ("xxxx", "A"): {"cathIds": []}})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testLookupStats(self):
+        """Test accessor call and hit counters and latency histograms of instrumented lookups"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic")
+            writeCathSourceFiles(dataPath, 8000)
+            kwD = {"cathTargetUrl": dataPath, "cathUrlBackupPath": dataPath}
+            ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-STATS"), useCache=False, **kwD)
+            self.assertTrue(ccu.testCache())
+            self.assertNotIn("getCathResidueRanges", vars(ccu))
+            self.assertEqual(ccu.getLookupStats(), {})
+            ccuS = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-STATS"), useCache=True, lookupStats=True)
+            self.assertIn("getCathResidueRanges", vars(ccuS))
+            #
+            for pdbTup in [("1000", "A"), ("1000", "B"), ("XXXX", "A")]:
+                ccuS.getCathResidueRanges(pdbTup[0], pdbTup[1])
+            ccuS.getCathName("1.10.1.10")
+            sD = ccuS.getLookupStats()
+            logger.info("Lookup stats %r", sD["getCathResidueRanges"])
+            self.assertEqual([sD["getCathResidueRanges"][ky] for ky in ["calls", "hits", "misses"]], [3, 2, 1])
+            self.assertEqual(sum([count for _, count in sD["getCathResidueRanges"]["histogram"]]), 3)
+            self.assertGreater(sD["getCathResidueRanges"]["p99Seconds"], 0.0)
+            self.assertGreaterEqual(sD["getCathResidueRanges"]["p99Seconds"], sD["getCathResidueRanges"]["p50Seconds"])
+            self.assertEqual((sD["getCathName"]["calls"], sD["getCathName"]["hits"]), (1, 1))
+            self.assertEqual(sD["getCathIds"]["calls"], 0)
+            ccuS.resetLookupStats()
+            self.assertEqual(ccuS.getLookupStats()["getCathResidueRanges"]["calls"], 0)
+            #
+            # Each accessor tests its own results for hits and internal calls are not counted
+            self.assertTrue(ccuS.getLowestCommonAncestor("1.10.1.10", "1.10.1.80")[0])
+            self.assertEqual(ccuS.getLowestCommonAncestor("1.10.1.10", "9.99.1.1"), (None, None))
+            ccuS.getResidueLabels("1000", "A", 1, 1000)
+            ccuS.getResidueLabels("XXXX", "A", 1, 1000)
+            self.assertEqual(ccuS.getNameLineage("9.99.1.1"), [None, None, None, None])
+            ccuS.getBatchAnnotations([("1000", "A"), ("XXXX", "A")])
+            ccuS.getBatchAnnotations([("XXXX", "A")])
+            sD = ccuS.getLookupStats()
+            for name in ["getLowestCommonAncestor", "getResidueLabels", "getBatchAnnotations"]:
+                self.assertEqual([sD[name][ky] for ky in ["calls", "hits", "misses"]], [2, 1, 1])
+            self.assertEqual([sD["getNameLineage"][ky] for ky in ["calls", "hits", "misses"]], [1, 0, 1])
+            self.assertEqual(sD["getCathName"]["calls"], 0)
+            for name in ["getLowestCommonAncestors", "getResidueLabelsBulk", "getTreeNodeBytes"]:
+                self.assertNotIn(name, sD)
+                self.assertNotIn(name, vars(ccuS))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testNodeMembers(self):
+        """Test node member queries and subtree roll-ups against the synthetic CATH assignments"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic")
+            writeCathSourceFiles(dataPath, 8000)
+            expectedD = readSyntheticCathMembers(dataPath)
+            ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-MEMBERS"), useCache=False, cathTargetUrl=dataPath, cathUrlBackupPath=dataPath)
+            #
+            startTime = time.time()
+            self.assertEqual(ccu.getNodeMembers("1.10.1.10"), sorted(expectedD["1.10.1.10"]))
+            logger.info("Member index build and first query (%.4f seconds)", time.time() - startTime)
+            self.assertEqual(ccu.getNodeMembers("1.10.1.10", subtree=True), ccu.getNodeMembers("1.10.1.10"))
+            self.assertEqual(ccu.getNodeMemberCount("1.10.1.10"), len(expectedD["1.10.1.10"]))
+            self.assertEqual(ccu.getNodeMembers("1.10"), [])
+            for nodeId in ["1.10.1", "1.10", "2", "4.30.5"]:
+                expectedS = set().union(*[mS for cathId, mS in expectedD.items() if cathId.startswith(nodeId + ".")])
+                self.assertEqual(set(ccu.getNodeMembers(nodeId, subtree=True)), expectedS)
+                self.assertEqual(ccu.getNodeMemberCount(nodeId, subtree=True), len(expectedS))
+            self.assertEqual(sum([ccu.getNodeMemberCount(str(cI), subtree=True) for cI in range(1, 5)]), sum([len(mS) for mS in expectedD.values()]))
+            self.assertEqual((ccu.getNodeMembers("9.9.9", subtree=True), ccu.getNodeMemberCount("9.9.9", subtree=True)), ([], 0))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testLowestCommonAncestors(self):
+        """Test lowest common ancestor queries against the CATH id lineages"""
+        try:
+            dataPath = os.path.join(self.__workPath, "cath-synthetic")
+            writeCathSourceFiles(dataPath, 8000)
+            cathId = "1.10.1.10"
+            ccu = CathClassificationProvider(cachePath=os.path.join(self.__workPath, "CACHE-LCA"), useCache=False, cathTargetUrl=dataPath, cathUrlBackupPath=dataPath)
+            nodeIdL = [dD["id"] for dD in ccu.iterTreeNodes()]
+            nodeIdS = set(nodeIdL)
+            pairL = [(nodeIdL[(ii * 7919) % len(nodeIdL)], nodeIdL[(ii * 104729 + 13) % len(nodeIdL)]) for ii in range(20000)]
+            pairL += [(cathId, cathId), (cathId, cathId.rsplit(".", 1)[0]), (cathId, "9.9.9.9")]
+            #
+            startTime = time.perf_counter()
+            expectedL = []
+            for cathId1, cathId2 in pairL:
+                lineageL = [cId1 for cId1, cId2 in zip(ccu.getIdLineage(cathId1), ccu.getIdLineage(cathId2) or []) if cId1 == cId2]
+                expectedL.append((lineageL[-1], CATH_LEVEL_NAMES[len(lineageL) - 1]) if lineageL and cathId2 in nodeIdS else (None, None))
+            lineageTime = time.perf_counter() - startTime
+            #
+            startTime = time.perf_counter()
+            self.assertEqual(ccu.getLowestCommonAncestor(cathId, cathId.rsplit(".", 2)[0]), (cathId.rsplit(".", 2)[0], "A"))
+            logger.info("Hierarchy index and sparse table build (%.4f seconds)", time.perf_counter() - startTime)
+            startTime = time.perf_counter()
+            lcaL = ccu.getLowestCommonAncestors(pairL)
+            lcaTime = time.perf_counter() - startTime
+            logger.info("Lowest common ancestors of %d pairs (%.4f seconds) lineage comparisons (%.4f seconds)", len(pairL), lcaTime, lineageTime)
+            self.assertEqual(lcaL, expectedL)
+            self.assertEqual(lcaL[-3:], [(cathId, "H"), (cathId.rsplit(".", 1)[0], "T"), (None, None)])
+            self.assertEqual([ccu.getLowestCommonAncestor(cathId1, cathId2) for cathId1, cathId2 in pairL[:100]], expectedL[:100])
+            self.assertIn((None, None), lcaL)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def readCathData():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(CathClassificationProviderTests("testGetCathData"))
     suiteSelect.addTest(CathClassificationProviderTests("testCathClassificationAccessMethods"))
+    suiteSelect.addTest(CathClassificationProviderTests("testStreamingBuild"))
+    suiteSelect.addTest(CathClassificationProviderTests("testResidueIntervalQueries"))
+    suiteSelect.addTest(CathClassificationProviderTests("testLineageTables"))
+    suiteSelect.addTest(CathClassificationProviderTests("testTreeNodeList"))
+    suiteSelect.addTest(CathClassificationProviderTests("testMappedCache"))
+    suiteSelect.addTest(CathClassificationProviderTests("testBuildStats"))
+    suiteSelect.addTest(CathClassificationProviderTests("testAssignmentBuildScaling"))
+    suiteSelect.addTest(CathClassificationProviderTests("testConcurrentFetch"))
+    suiteSelect.addTest(CathClassificationProviderTests("testIncrementalUpdate"))
+    suiteSelect.addTest(CathClassificationProviderTests("testBatchAnnotations"))
+    suiteSelect.addTest(CathClassificationProviderTests("testLookupStats"))
+    suiteSelect.addTest(CathClassificationProviderTests("testNodeMembers"))
+    suiteSelect.addTest(CathClassificationProviderTests("testLowestCommonAncestors"))
     return suiteSelect
 
 
@@ -0,0 +1,120 @@
+##
+# File:    testClassificationBenchmark.py
+# Date:    16-Oct-2026
+#
+# Updates:
+#  17-Oct-2026  Add build phase time assertions
+#  17-Oct-2026  Add lookup statistics overhead report
+#  17-Oct-2026  Add node member query throughput check
+#  17-Oct-2026  Add worst-case assignment build scaling report
+#
+##
+"""
+Test cases for the synthetic classification source generators and the offline provider benchmarks.
+"""
+
+import copy
+import logging
+import os
+import time
+import unittest
+
+from rcsb.utils.struct.ClassificationBenchmark import BENCHMARK_PROVIDER_NAMES
+from rcsb.utils.struct.ClassificationBenchmark import ClassificationBenchmark
+from rcsb.utils.struct.ClassificationBenchmark import WORST_CASE_PROVIDER_NAMES
+from rcsb.utils.struct.EcodClassificationProvider import EcodClassificationProvider
+from rcsb.utils.struct.SyntheticClassificationData import getSyntheticPdbId
+from rcsb.utils.struct.SyntheticClassificationData import writeEcodSourceFile
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+class ClassificationBenchmarkTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output", "benchmark")
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def testSyntheticSource(self):
+        """Test the synthetic ECOD source (chain key sample and provider assignments)"""
+        try:
+            self.assertEqual(len({getSyntheticPdbId(eI) for eI in range(0, 419904, 7)}), len(range(0, 419904, 7)))
+            dataPath = os.path.join(self.__workPath, "ecod", "ecod.latest.domains.txt")
+            keyL = writeEcodSourceFile(dataPath, 15000, maxKeys=500)
+            self.assertEqual(len(keyL), 500)
+            self.assertEqual(len(set(keyL)), 500)
+            ecodP = EcodClassificationProvider(os.path.join(self.__workPath, "CACHE"), False, ecodTargetUrl=dataPath, ecodUrlBackupPath=dataPath)
+            self.assertTrue(ecodP.testCache())
+            self.assertEqual([len(ecodP.getFamilyResidueRanges(pdbId, authAsymId)) for pdbId, authAsymId in keyL[:4]], [1, 2, 1, 2])
+            self.assertEqual([tup[3:] for tup in ecodP.getFamilyResidueRanges("1000", "B")], [(1, 100), (201, 260)])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testBenchmarkRun(self):
+        """Test a small benchmark run of all providers with results stored and compared against a baseline"""
+        try:
+            cB = ClassificationBenchmark(self.__workPath, numLookups=5000, maxKeys=1000)
+            rD = cB.run(numLinesL=[10000])
+            self.assertEqual([(tD["provider"], tD["numLines"]) for tD in rD["results"]], [(pN, 10000) for pN in BENCHMARK_PROVIDER_NAMES])
+            for tD in rD["results"]:
+                self.assertNotIn("error", tD)
+                self.assertGreater(tD["lookupsPerSecond"], 0)
+                self.assertEqual(tD["lookupHitFraction"], 1.0)
+                self.assertGreater(tD["treeNodeCount"], 1000)
+                self.assertGreater(tD["exportPhaseSeconds"], 0.0)
+                self.assertGreater(tD["lookupStatsOverheadRatio"], 0.0)
+                self.assertGreater(tD["memberQueriesPerSecond"], 0)
+                logger.info("%s lookup statistics overhead ratio %.2f", tD["provider"], tD["lookupStatsOverheadRatio"])
+                self.assertFalse(os.path.exists(os.path.join(self.__workPath, "%s-10000" % tD["provider"])))
+            #
+            resultPath = os.path.join(self.__workPath, "benchmark-results.json")
+            self.assertTrue(cB.writeResults(rD, resultPath))
+            baselineD = cB.readResults(resultPath)
+            self.assertEqual(cB.compareResults(rD, baselineD), [])
+            fastD = copy.deepcopy(baselineD)
+            fastD["results"][1]["buildSeconds"] /= 2.0
+            fastD["results"][2]["lookupsPerSecond"] *= 2.0
+            regL = cB.compareResults(rD, fastD, tolerance=0.5)
+            self.assertEqual([(regD["provider"], regD["metric"]) for regD in regL], [("ecod", "buildSeconds"), ("scope", "lookupsPerSecond")])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testAssignmentScaling(self):
+        """Test a small worst-case assignment build scaling run (the scaling exponent is reported, not checked)"""
+        try:
+            cB = ClassificationBenchmark(self.__workPath)
+            for providerName in WORST_CASE_PROVIDER_NAMES:
+                rL = cB.runAssignmentScaling(providerName, domainsPerChainL=[500, 2000])
+                self.assertEqual([(tD["provider"], tD["numLines"], tD["domainsPerChain"]) for tD in rL], [(providerName, 2000, 500), (providerName, 8000, 2000)])
+                for tD in rL:
+                    self.assertNotIn("error", tD)
+                    self.assertGreater(tD["buildSeconds"], 0.0)
+                    self.assertFalse(os.path.exists(os.path.join(self.__workPath, "%s-worst-%d" % (providerName, tD["domainsPerChain"]))))
+                self.assertNotIn("buildScalingExponent", rL[0])
+                logger.info("%s worst-case assignment build scaling exponent %.2f", providerName, rL[1]["buildScalingExponent"])
+            with self.assertRaises(ValueError):
+                cB.runAssignmentScaling("ecod")
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def benchmarkSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ClassificationBenchmarkTests("testSyntheticSource"))
+    suiteSelect.addTest(ClassificationBenchmarkTests("testBenchmarkRun"))
+    suiteSelect.addTest(ClassificationBenchmarkTests("testAssignmentScaling"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = benchmarkSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,128 @@
+##
+# File:    testClassificationCacheExec.py
+# Date:    17-Oct-2026
+#
+# Updates:
+#  17-Oct-2026  Add manifest-only verification test
+#
+##
+"""
+Test cases for the classification cache command-line entry point using synthetic sources.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import time
+import unittest
+
+from rcsb.utils.struct.ClassificationCacheExec import main
+from rcsb.utils.struct.SyntheticClassificationData import writeCathSourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeScopeSourceFiles
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+class ClassificationCacheExecTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output", "cli")
+        self.__cachePath = os.path.join(self.__workPath, "CACHE")
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def __runMain(self, argL):
+        with contextlib.redirect_stdout(io.StringIO()) as ofh:
+            ret = main(argL)
+        logger.info("%r exit status %r\n%s", argL[0], ret, ofh.getvalue())
+        return ret, ofh.getvalue()
+
+    def testBuildVerifyStats(self):
+        """Test the build, verify and stats commands and their exit status"""
+        try:
+            dataPath = os.path.join(self.__workPath, "source")
+            writeCathSourceFiles(os.path.join(dataPath, "cath"), 10000)
+            writeScopeSourceFiles(os.path.join(dataPath, "scope"), 10000, version="2.08-synthetic")
+            argsPath = os.path.join(self.__workPath, "provider-args.json")
+            with open(argsPath, "w", encoding="utf-8") as ofh:
+                json.dump(
+                    {
+                        "cath": {"cathTargetUrl": os.path.join(dataPath, "cath"), "cathUrlBackupPath": dataPath},
+                        "scope": {"scopTargetUrl": os.path.join(dataPath, "scope"), "scopVersion": "2.08-synthetic", "scopUrlBackupPath": dataPath},
+                    },
+                    ofh,
+                )
+            commonL = ["--cache_path", self.__cachePath, "--providers", "cath,scope", "--provider_args_path", argsPath]
+            ret, outS = self.__runMain(["build"] + commonL)
+            self.assertEqual(ret, 0)
+            self.assertEqual([line.split()[:2] for line in outS.splitlines()[1:]], [["cath", "primary"], ["scope", "primary"]])
+            #
+            ret, outS = self.__runMain(["verify"] + commonL)
+            self.assertEqual(ret, 0)
+            self.assertEqual([line.split()[:2] for line in outS.splitlines()[1:]], [["cath", "valid"], ["scope", "valid"]])
+            ret, outS = self.__runMain(["verify", "--manifest_only"] + commonL)
+            self.assertEqual(ret, 0)
+            self.assertEqual([line.split()[:2] for line in outS.splitlines()[1:]], [["cath", "valid"], ["scope", "valid"]])
+            #
+            reportPath = os.path.join(self.__workPath, "stats.json")
+            ret, outS = self.__runMain(["stats"] + commonL + ["--report_path", reportPath])
+            self.assertEqual(ret, 0)
+            with open(reportPath, "r", encoding="utf-8") as ifh:
+                resultL = json.load(ifh)
+            self.assertEqual([tD["provider"] for tD in resultL], ["cath", "scope"])
+            self.assertEqual([pD["phase"] for pD in resultL[0]["buildStats"]["phases"]], ["load"])
+            self.assertEqual(resultL[0]["cacheBytes"], sum(resultL[0]["files"].values()))
+            self.assertGreater(resultL[0]["treeNodeCount"], 1000)
+            #
+            # A timed out rebuild without the backup fallback fails
+            ret, outS = self.__runMain(["build", "--timeout", "0", "--no_backup"] + commonL[:2] + ["--providers", "cath", "--provider_args_path", argsPath])
+            self.assertEqual(ret, 1)
+            self.assertEqual(outS.splitlines()[1].split()[:2], ["cath", "failed"])
+            #
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit) as cm:
+                    main(["verify", "--cache_path", self.__cachePath, "--providers", "pfam"])
+            self.assertEqual(cm.exception.code, 2)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testBench(self):
+        """Test the bench command with a baseline comparison"""
+        try:
+            reportPath = os.path.join(self.__workPath, "bench.json")
+            argL = ["bench", "--work_path", os.path.join(self.__workPath, "bench"), "--providers", "ecod", "--num_lines", "10000", "--num_lookups", "1000"]
+            ret, outS = self.__runMain(argL + ["--report_path", reportPath])
+            self.assertEqual(ret, 0)
+            self.assertEqual(outS.split()[:2], ["ecod", "10000"])
+            with open(reportPath, "r", encoding="utf-8") as ifh:
+                baselineD = json.load(ifh)
+            baselineD["results"][0]["buildSeconds"] /= 100.0
+            baselinePath = os.path.join(self.__workPath, "baseline.json")
+            with open(baselinePath, "w", encoding="utf-8") as ofh:
+                json.dump(baselineD, ofh)
+            ret, outS = self.__runMain(argL + ["--baseline_path", baselinePath])
+            self.assertEqual(ret, 1)
+            self.assertIn("regression ecod 10000 buildSeconds", outS)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def cacheExecSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ClassificationCacheExecTests("testBuildVerifyStats"))
+    suiteSelect.addTest(ClassificationCacheExecTests("testBench"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = cacheExecSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
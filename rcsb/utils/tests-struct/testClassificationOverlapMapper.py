@@ -0,0 +1,152 @@
+##
+# File:    testClassificationOverlapMapper.py
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Test cases for the bulk residue overlap mapping between classification providers.
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+import unittest
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.struct.ClassificationOverlapMapper import OVERLAP_TABLE_COLUMNS
+from rcsb.utils.struct.ClassificationOverlapMapper import ClassificationOverlapMapper
+from rcsb.utils.struct.ClassificationOverlapMapper import sweepOverlaps
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import getClassificationProvider
+from rcsb.utils.struct.SyntheticClassificationData import writeCathSourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeEcodSourceFile
+from rcsb.utils.struct.SyntheticClassificationData import writeScopeSourceFiles
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+def getNestedLoopOverlaps(rangeL1, rangeL2):
+    """Return {((nodeId1, domainId1), (nodeId2, domainId2)): overlapResidues} by comparing all pairs of residue ranges."""
+    oD = {}
+    for item1, beg1, end1 in rangeL1:
+        for item2, beg2, end2 in rangeL2:
+            beg, end = max(beg1, beg2), min(end1, end2)
+            if beg > end:
+                continue
+            numRes = None if beg <= -sys.maxsize or end >= sys.maxsize else end - beg + 1
+            ky = (item1, item2)
+            if ky not in oD:
+                oD[ky] = numRes
+            elif oD[ky] is not None and numRes is not None:
+                oD[ky] += numRes
+            else:
+                oD[ky] = None
+    return oD
+
+
+def toBound(val, default):
+    return int(val) if val is not None else default
+
+
+class ClassificationOverlapMapperTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output", "overlap")
+        self.__cachePath = os.path.join(self.__workPath, "CACHE")
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def testSweepOverlaps(self):
+        """Test the interval sweep against pairwise comparisons of random intervals"""
+        try:
+            rng = random.Random(11)
+            for _ in range(200):
+                intervalL1 = sorted([(beg, beg + rng.randint(0, 60), ("a", ii)) for ii, beg in enumerate([rng.randint(1, 300) for _ in range(rng.randint(0, 8))])])
+                intervalL2 = sorted([(beg, beg + rng.randint(0, 60), ("b", ii)) for ii, beg in enumerate([rng.randint(1, 300) for _ in range(rng.randint(0, 8))])])
+                expectedS = {(it1, it2, max(b1, b2), min(e1, e2)) for b1, e1, it1 in intervalL1 for b2, e2, it2 in intervalL2 if max(b1, b2) <= min(e1, e2)}
+                oL = sweepOverlaps(intervalL1, intervalL2)
+                self.assertEqual(len(oL), len(expectedS))
+                self.assertEqual(set(oL), expectedS)
+            self.assertEqual(sweepOverlaps([(-sys.maxsize, sys.maxsize, "w")], [(5, 9, "b")]), [("w", "b", 5, 9)])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testOverlapTables(self):
+        """Test the overlap tables of synthetic CATH, ECOD and SCOPe assignments against nested loops over the residue ranges"""
+        try:
+            numLines = 20000
+            dataPath = os.path.join(self.__workPath, "source")
+            keyL = writeCathSourceFiles(os.path.join(dataPath, "cath"), numLines, maxKeys=200)
+            ecodPath = os.path.join(dataPath, "ecod", "ecod.latest.domains.txt")
+            writeEcodSourceFile(ecodPath, numLines)
+            writeScopeSourceFiles(os.path.join(dataPath, "scope"), numLines, version="2.08-synthetic")
+            cathP = getClassificationProvider("cath", self.__cachePath, useCache=False, cathTargetUrl=os.path.join(dataPath, "cath"), cathUrlBackupPath=os.path.join(dataPath, "cath"))
+            ecodP = getClassificationProvider("ecod", self.__cachePath, useCache=False, ecodTargetUrl=ecodPath, ecodUrlBackupPath=ecodPath)
+            scopP = getClassificationProvider(
+                "scope", self.__cachePath, useCache=False, scopTargetUrl=os.path.join(dataPath, "scope"), scopVersion="2.08-synthetic", scopUrlBackupPath=os.path.join(dataPath, "scope")
+            )
+            #
+            oM = ClassificationOverlapMapper({"cath": cathP, "ecod": ecodP, "scope": scopP})
+            startTime = time.time()
+            tableD = oM.getOverlapTables()
+            logger.info("Overlap tables %r (%.4f seconds)", {ky: len(rowL) for ky, rowL in tableD.items()}, time.time() - startTime)
+            self.assertEqual(list(tableD.keys()), [("cath", "ecod"), ("cath", "scope"), ("ecod", "scope")])
+            self.assertEqual(len(tableD[("cath", "ecod")]), numLines)
+            self.assertTrue(all([list(rowD.keys()) == OVERLAP_TABLE_COLUMNS for rowL in tableD.values() for rowD in rowL]))
+            #
+            rangeFuncD = {
+                "cath": lambda pdbId, authAsymId: [((tup[0], tup[1]), int(tup[3]), int(tup[4])) for tup in cathP.getCathResidueRanges(pdbId, authAsymId)],
+                "ecod": lambda pdbId, authAsymId: [((tup[1], tup[0]), int(tup[3]), int(tup[4])) for tup in ecodP.getFamilyResidueRanges(pdbId, authAsymId)],
+                "scope": lambda pdbId, authAsymId: [
+                    ((tup[0], tup[1]), toBound(tup[4], -sys.maxsize), toBound(tup[5], sys.maxsize)) for tup in scopP.getScopResidueRanges(pdbId, authAsymId)
+                ],
+            }
+            numRows = 0
+            for (sourceName1, sourceName2), rowL in tableD.items():
+                rowD = {}
+                for tD in rowL:
+                    rowD.setdefault((tD["pdbId"], tD["authAsymId"]), {})[((tD["nodeId1"], tD["domainId1"]), (tD["nodeId2"], tD["domainId2"]))] = tD["overlapResidues"]
+                for pdbId, authAsymId in keyL:
+                    expectedD = getNestedLoopOverlaps(rangeFuncD[sourceName1](pdbId, authAsymId), rangeFuncD[sourceName2](pdbId, authAsymId))
+                    self.assertEqual(rowD.get((pdbId.upper(), authAsymId), {}), expectedD)
+                    self.assertEqual(
+                        [(tD["overlapResidues"], tD["domainId1"]) for tD in oM.getChainOverlaps(sourceName1, sourceName2, pdbId, authAsymId)],
+                        [(tD["overlapResidues"], tD["domainId1"]) for tD in rowL if (tD["pdbId"], tD["authAsymId"]) == (pdbId.upper(), authAsymId)],
+                    )
+                    numRows += len(expectedD)
+            self.assertGreater(numRows, len(keyL))
+            # Whole chain SCOPe domains have undefined residue counts
+            self.assertIn(None, [tD["domainResidues2"] for tD in tableD[("cath", "scope")]])
+            rowL = oM.getOverlapTables(sourcePairL=[("cath", "ecod")], minOverlap=61)[("cath", "ecod")]
+            self.assertEqual(len(rowL), len([tD for tD in tableD[("cath", "ecod")] if tD["overlapResidues"] > 60]))
+            #
+            pathD = oM.writeOverlapTables(os.path.join(self.__workPath, "tables"), sourcePairL=[("cath", "ecod"), ("ecod", "cath")])
+            self.assertEqual(list(pathD.keys()), [("cath", "ecod"), ("ecod", "cath")])
+            mU = MarshalUtil()
+            rowL = mU.doImport(pathD[("cath", "ecod")], fmt="csv")
+            self.assertEqual(len(rowL), numLines)
+            self.assertEqual(list(rowL[0].keys()), OVERLAP_TABLE_COLUMNS)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def overlapMapperSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ClassificationOverlapMapperTests("testSweepOverlaps"))
+    suiteSelect.addTest(ClassificationOverlapMapperTests("testOverlapTables"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = overlapMapperSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
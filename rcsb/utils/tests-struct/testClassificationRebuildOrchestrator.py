@@ -0,0 +1,129 @@
+##
+# File:    testClassificationRebuildOrchestrator.py
+# Date:    17-Oct-2026
+#
+# Updates:
+#  17-Oct-2026  Add cache manifest assertions
+#  17-Oct-2026  Add timeout test for a running rebuild
+#
+##
+"""
+Test cases for the concurrent rebuilds of the classification provider caches from synthetic sources.
+"""
+
+import http.server
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+import unittest
+
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import ClassificationRebuildOrchestrator
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import getClassificationProvider
+from rcsb.utils.struct.SyntheticClassificationData import writeCathSourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeEcodSourceFile
+from rcsb.utils.struct.SyntheticClassificationData import writeScop2SourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeScopeSourceFiles
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+class StalledRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler that does not respond within the rebuild timeout (stand-in for a stalled remote source)."""
+
+    def do_GET(self):
+        time.sleep(20.0)
+        self.send_error(503)
+
+
+class ClassificationRebuildOrchestratorTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output", "rebuild")
+        self.__cachePath = os.path.join(self.__workPath, "CACHE")
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def __writeSources(self, numLines=10000):
+        dataPath = os.path.join(self.__workPath, "source")
+        backupPath = os.path.join(self.__workPath, "backup")
+        os.makedirs(backupPath, exist_ok=True)
+        writeCathSourceFiles(os.path.join(dataPath, "cath"), numLines)
+        ecodPath = os.path.join(dataPath, "ecod", "ecod.latest.domains.txt")
+        writeEcodSourceFile(ecodPath, numLines)
+        writeScopeSourceFiles(os.path.join(dataPath, "scope"), numLines, version="2.08-synthetic")
+        writeScop2SourceFiles(os.path.join(dataPath, "scop2"), numLines)
+        return backupPath, {
+            "cath": {"cathTargetUrl": os.path.join(dataPath, "cath"), "cathUrlBackupPath": backupPath},
+            "ecod": {"ecodTargetUrl": ecodPath, "ecodUrlBackupPath": ecodPath},
+            "scope": {"scopTargetUrl": os.path.join(dataPath, "scope"), "scopVersion": "2.08-synthetic", "scopUrlBackupPath": backupPath},
+            "scop2": {"urlTargetScop2": os.path.join(dataPath, "scop2"), "urlTargetSifts": os.path.join(dataPath, "scop2"), "urlFallbackTarget": backupPath},
+        }
+
+    def testConcurrentRebuild(self):
+        """Test concurrent rebuilds of all providers with timeout and failure fallback to the backup resources"""
+        try:
+            backupPath, providerKwargsD = self.__writeSources()
+            cRO = ClassificationRebuildOrchestrator(self.__cachePath, providerKwargsD=providerKwargsD)
+            rD = cRO.run()
+            statusD = {pN: tD["status"] for pN, tD in rD["results"].items()}
+            logger.info("Rebuild status %r wall time %.2f provider times %r", statusD, rD["wallSeconds"], {pN: tD["seconds"] for pN, tD in rD["results"].items()})
+            # The synthetic SCOP2 build is below the SCOP2 cache size limits and there is no SCOP2 backup
+            self.assertEqual(statusD, {"cath": "primary", "ecod": "primary", "scope": "primary", "scop2": "failed"})
+            self.assertEqual([tD["source"] for tD in rD["results"]["scop2"]["attempts"]], ["primary", "backup"])
+            self.assertEqual([pD["phase"] for pD in rD["results"]["ecod"]["buildStats"]["phases"]], ["fetch", "parse", "hierarchy", "export"])
+            for providerName in ["cath", "ecod", "scope"]:
+                prov = getClassificationProvider(providerName, self.__cachePath, useCache=True, **providerKwargsD[providerName])
+                self.assertTrue(prov.testCache())
+                self.assertTrue(prov.testCacheManifest())
+            #
+            # Timed out CATH rebuild with the cache loaded from the backup resource
+            shutil.copy(os.path.join(self.__cachePath, "cath", "cath_domains-py%s.pic" % str(sys.version_info[0])), backupPath)
+            cRO = ClassificationRebuildOrchestrator(self.__cachePath, providerKwargsD=providerKwargsD, timeoutD={"cath": 0.0})
+            rD = cRO.run(providerNameL=["cath"])
+            tD = rD["results"]["cath"]
+            self.assertEqual((tD["status"], tD["valid"]), ("backup", True))
+            self.assertTrue(tD["attempts"][0]["error"].startswith("timeout"))
+            self.assertEqual([pD["phase"] for pD in tD["buildStats"]["phases"]], ["load"])
+            prov = getClassificationProvider("cath", self.__cachePath, useCache=True)
+            self.assertEqual(len(prov.getCathResidueRanges("1000", "A")), 1)
+            self.assertTrue(prov.testCacheManifest(verifyChecksum=True))
+            self.assertEqual(prov.getCacheManifest()["counts"], {"names": 1276, "assignments": 6667})
+            #
+            # A running CATH rebuild waiting on a stalled source is terminated at the timeout
+            httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StalledRequestHandler)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                url = "http://127.0.0.1:%d" % httpd.server_address[1]
+                cRO = ClassificationRebuildOrchestrator(self.__cachePath, providerKwargsD={"cath": {"cathTargetUrl": url, "cathUrlBackupPath": backupPath}}, timeoutD={"cath": 5.0})
+                tD = cRO.run(providerNameL=["cath"])["results"]["cath"]
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+            self.assertEqual((tD["status"], tD["valid"]), ("backup", True))
+            self.assertTrue(tD["attempts"][0]["error"].startswith("timeout"))
+            self.assertLess(tD["attempts"][0]["seconds"], 15.0)
+            #
+            with self.assertRaises(ValueError):
+                cRO.run(providerNameL=["pfam"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def rebuildSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ClassificationRebuildOrchestratorTests("testConcurrentRebuild"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = rebuildSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,125 @@
+##
+# File:    testDomainIntervalIndex.py
+# Date:    16-Oct-2026
+#
+# Updates:
+#  16-Oct-2026  Add lazy mode test
+#  17-Oct-2026  Add long and whole-chain interval query cost test
+##
+"""
+Test cases for residue position and residue range queries on the per-chain domain interval index.
+"""
+
+import logging
+import random
+import sys
+import time
+import unittest
+
+from rcsb.utils.struct.DomainIntervalIndex import DomainIntervalIndex
+from rcsb.utils.struct.DomainIntervalIndex import toResidueNumber
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+class DomainIntervalIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def testResidueNumbers(self):
+        self.assertEqual(toResidueNumber(12), 12)
+        self.assertEqual(toResidueNumber("12"), 12)
+        self.assertEqual(toResidueNumber("12A"), 12)
+        self.assertEqual(toResidueNumber("-3"), -3)
+        self.assertEqual(toResidueNumber(None), None)
+        self.assertEqual(toResidueNumber(""), None)
+
+    def testQueries(self):
+        """Compare point and overlap queries with a brute-force scan of the ranges"""
+        rnd = random.Random(7)
+        aD = {}
+        for ii in range(200):
+            tL = []
+            for jj in range(rnd.randint(1, 40)):
+                beg = rnd.randint(-10, 800)
+                end = beg + rnd.randint(0, 300)
+                tL.append(("d%d_%d" % (ii, jj), "A", str(beg), "%d%s" % (end, rnd.choice(["", "A"]))))
+            aD[("1abc", "C%d" % ii)] = tL
+        aD[("1abc", "W")] = [("whole", "W", None, None)]
+        aD[("1abc", "X")] = [("bad", "X", "?", "12")]
+        #
+        dI = DomainIntervalIndex(aD, lambda t: (t[2], t[3], t[0]))
+        self.assertEqual(len(dI), 201)
+        self.assertNotIn(("1abc", "X"), dI)
+        self.assertEqual(dI.getAtResidue(("1abc", "W"), 10000), ["whole"])
+        self.assertEqual(dI.getAtResidue(("2xyz", "A"), 10), [])
+        for chainKey, tL in aD.items():
+            if chainKey[1] in ["W", "X"]:
+                continue
+            for _ in range(50):
+                pos = rnd.randint(-20, 1200)
+                expL = sorted([t[0] for t in tL if toResidueNumber(t[2]) <= pos <= toResidueNumber(t[3])])
+                self.assertEqual(sorted(dI.getAtResidue(chainKey, pos)), expL)
+                beg = rnd.randint(-20, 1200)
+                end = beg + rnd.randint(0, 50)
+                expL = sorted([t[0] for t in tL if toResidueNumber(t[2]) <= end and toResidueNumber(t[3]) >= beg])
+                self.assertEqual(sorted(dI.getOverlapping(chainKey, str(beg), end)), expL)
+        #
+        lI = DomainIntervalIndex(aD, lambda t: (t[2], t[3], t[0]), lazy=True)
+        self.assertEqual(lI.getIntervals(("1abc", "C7")), dI.getIntervals(("1abc", "C7")))
+        self.assertEqual(lI.getOverlapping(("1abc", "C9"), 100, 300), dI.getOverlapping(("1abc", "C9"), 100, 300))
+        self.assertNotIn(("1abc", "X"), lI)
+        self.assertEqual(lI.getAtResidue(("1abc", "W"), 10000), ["whole"])
+        self.assertEqual(len(lI), 201)
+        self.assertEqual(sorted(lI.getChainKeys()), sorted(dI.getChainKeys()))
+
+    def testQueryThroughput(self):
+        aD = {("1abc", "A"): [("d%d" % ii, ii * 10, ii * 10 + 14) for ii in range(100)]}
+        dI = DomainIntervalIndex(aD, lambda t: (t[1], t[2], t[0]))
+        numQueries = 200000
+        startTime = time.time()
+        for ii in range(numQueries):
+            dI.getAtResidue(("1abc", "A"), ii % 1000)
+        logger.info("Point queries (%d) in %.4f seconds", numQueries, time.time() - startTime)
+        self.assertEqual(dI.getAtResidue(("1abc", "A"), 142), ["d13", "d14"])
+
+    def testLongIntervalQueries(self):
+        """Test that long leading and whole-chain intervals do not force a scan of the intervals they contain"""
+        numDomains = 10000
+        tL = [("long", 1, numDomains * 10), ("whole", None, None)] + [("d%d" % ii, ii * 10, ii * 10 + 14) for ii in range(numDomains)]
+        tL += [("n%d" % ii, ii * 1000, ii * 1000 + 3) for ii in range(numDomains // 100)]
+        dI = DomainIntervalIndex({("1abc", "A"): tL}, lambda t: (t[1], t[2], t[0]))
+        self.assertEqual(dI.getAtResidue(("1abc", "A"), 50003), ["whole", "long", "d4999", "n50", "d5000"])
+        self.assertEqual(dI.getAtResidue(("1abc", "A"), -5), ["whole"])
+        self.assertEqual(dI.getOverlapping(("1abc", "A"), 99995, 200000), ["whole", "long", "d9999"])
+        #
+        # A query visits its results and at most one further interval in the top-level sublist and in the sublist of each result
+        ivL = sorted([(-sys.maxsize, sys.maxsize, t[0]) if t[1] is None else (t[1], t[2], t[0]) for t in tL])
+        rnd = random.Random(11)
+        for _ in range(500):
+            beg = rnd.randint(-20, numDomains * 10 + 20)
+            end = beg + rnd.randint(0, 40)
+            numVisited = dI.getNumVisited()
+            oL = dI.getOverlapping(("1abc", "A"), beg, end)
+            self.assertEqual(oL, [name for ivBeg, ivEnd, name in ivL if ivBeg <= end and ivEnd >= beg])
+            self.assertLessEqual(dI.getNumVisited() - numVisited, 2 * len(oL) + 1)
+        logger.info("Overlap queries visited intervals (%d) of %d", dI.getNumVisited(), len(tL))
+
+
+def intervalIndexSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(DomainIntervalIndexTests("testResidueNumbers"))
+    suiteSelect.addTest(DomainIntervalIndexTests("testQueries"))
+    suiteSelect.addTest(DomainIntervalIndexTests("testQueryThroughput"))
+    suiteSelect.addTest(DomainIntervalIndexTests("testLongIntervalQueries"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = intervalIndexSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
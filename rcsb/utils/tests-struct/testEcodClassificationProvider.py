@@ -3,19 +3,46 @@
 # Date:    23-Jun-2021  JDW
 #
 # Updates:
-#
+#  16-Oct-2026  Add synthetic ECOD domain file and multiprocess parsing test
+#  16-Oct-2026  Add streaming ingest test
+#  16-Oct-2026  Add batch chain annotation tests
+#  16-Oct-2026  Add lazy loading and startup time test
+#  16-Oct-2026  Add mapped cache tests
+#  16-Oct-2026  Add fork-friendly frozen provider test
+#  17-Oct-2026  Add build statistics assertions
+#  17-Oct-2026  Add cache manifest test
+#  17-Oct-2026  Add nested-set hierarchy query test
+#  17-Oct-2026  Add streaming tree node export test
+#  17-Oct-2026  Add failed tree node encoding and frozen provider tree node bytes checks
+#  17-Oct-2026  Add streaming ingest checks for remote domain files
 ##
 """
 Test cases for operations that read ECOD classification data from flat files -
 """
 
+import functools
+import gc
+import gzip
+import http.server
+import io
+import json
 import logging
 import os
+import shutil
+import threading
 import time
+import tracemalloc
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 from importlib.metadata import version as get_package_version
+from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.struct.EcodClassificationProvider import EcodClassificationProvider
+from rcsb.utils.struct.ForkedWorkerMemory import freezeGcForFork
+from rcsb.utils.struct.ForkedWorkerMemory import measureForkedWorkers
+from rcsb.utils.struct.SyntheticClassificationData import writeEcodSourceFile
+from rcsb.utils.struct.TreeNodeExport import readTreeNodes
 
 __version__ = get_package_version("rcsb.utils.struct")
 
@@ -84,11 +111,295 @@ class EcodClassificationProviderTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testParallelParse(self):
+        """Compare serial and multiprocess parsing of a synthetic ECOD domain file"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            keyL = writeEcodSourceFile(dataPath, 20000)
+            kwD = {"ecodTargetUrl": dataPath, "ecodUrlBackupPath": dataPath}
+            ecodS = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-SERIAL"), False, **kwD)
+            self.assertTrue(ecodS.testCache())
+            self.assertEqual(ecodS.getVersion(), "1.6")
+            self.assertEqual([(pD["phase"], pD["records"]) for pD in ecodS.getBuildStats()["phases"]], [("fetch", 20000), ("parse", 13334), ("hierarchy", 1820), ("export", 13334)])
+            ecodP = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-PARALLEL"), False, numProc=3, chunkSize=700, **kwD)
+            self.assertTrue(ecodP.testCache())
+            self.assertEqual(ecodP.getTreeNodeList(), ecodS.getTreeNodeList())
+            for pdbId, authAsymId in keyL[::7]:
+                fRanges = ecodS.getFamilyResidueRanges(pdbId, authAsymId)
+                self.assertTrue(fRanges)
+                self.assertEqual(ecodP.getFamilyResidueRanges(pdbId, authAsymId), fRanges)
+                self.assertEqual(ecodP.getNameLineage(fRanges[0][1]), ecodS.getNameLineage(fRanges[0][1]))
+            self.assertEqual(ecodS.getFamilyResidueRanges("2000", "A"), [("e2000A1", 500001, "A", 1, 100)])
+            self.assertEqual(ecodS.getNameLineage(500001), ["A: arch 0", "X: x 0.0", "H: h 0.0.0", "T: t 0.0.0.0", "F: f 0.0.0.0.0"])
+            #
+            bD = ecodS.getBatchAnnotations([("2000", "A"), ("2000", "K"), ("XXXX", "A")])
+            self.assertEqual(bD[("2000", "A")]["residueRanges"], [("e2000A1", 500001, "A", 1, 100)])
+            self.assertEqual(bD[("2000", "A")]["familyNames"], ecodS.getFamilyNames("2000", "A"))
+            self.assertEqual((bD[("2000", "A")]["familyIds"], bD[("2000", "A")]["domainIds"]), ([500001], ["e2000A1"]))
+            self.assertEqual(bD[("2000", "K")], {"familyIds": [], "domainIds": [], "familyNames": [], "residueRanges": []})
+            self.assertEqual(bD[("XXXX", "A")], bD[("2000", "K")])
+            self.assertEqual(ecodS.getBatchAnnotations([("2000", "A")], fields=["familyIds"]), {("2000", "A"): {"familyIds": [500001]}})
+            #
+            ecodM = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-SERIAL"), True, useMappedCache=True, **kwD)
+            self.assertTrue(ecodM.testCache())
+            for pdbId in ["1000", "2000", "9014", "1033", "XXXX"]:
+                self.assertEqual(ecodM.getFamilyResidueRanges(pdbId, "A"), ecodS.getFamilyResidueRanges(pdbId, "A"))
+                self.assertEqual(ecodM.getDomainsAtResidue(pdbId, "A", 60), ecodS.getDomainsAtResidue(pdbId, "A", 60))
+            self.assertEqual(ecodM.getBatchAnnotations([("2000", "A"), ("2000", "K"), ("XXXX", "A")]), bD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testStreamingIngest(self):
+        """Compare streaming and list-based ingest of a synthetic ECOD domain file (with fallback to a compressed backup)"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            writeEcodSourceFile(dataPath, 20000)
+            backupPath = dataPath + ".gz"
+            with open(dataPath, "rb") as ifh, gzip.open(backupPath, "wb") as ofh:
+                shutil.copyfileobj(ifh, ofh)
+            ecodL = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-LIST"), False, ecodTargetUrl=dataPath, ecodUrlBackupPath=dataPath)
+            for targetPath in [dataPath, os.path.join(HERE, "test-output", "ecod-missing", "ecod.latest.domains.txt")]:
+                ecodS = EcodClassificationProvider(
+                    os.path.join(HERE, "test-output", "CACHE-STREAM"), False, ecodStreamingIngest=True, ecodTargetUrl=targetPath, ecodUrlBackupPath=backupPath
+                )
+                self.assertTrue(ecodS.testCache())
+                self.assertEqual(ecodS.getVersion(), ecodL.getVersion())
+                self.assertEqual(ecodS.getTreeNodeList(), ecodL.getTreeNodeList())
+                for pdbId in ["1000", "2000", "9014", "1033"]:
+                    self.assertTrue(ecodL.getFamilyResidueRanges(pdbId, "A"))
+                    self.assertEqual(ecodS.getFamilyResidueRanges(pdbId, "A"), ecodL.getFamilyResidueRanges(pdbId, "A"))
+            #
+            # Remote files are streamed from the HTTP response (FileUtil.get() is only the fallback for failed connections)
+            httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(http.server.SimpleHTTPRequestHandler, directory=os.path.dirname(dataPath)))
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                url = "http://127.0.0.1:%d" % httpd.server_address[1]
+                for fn in ["ecod.latest.domains.txt", "ecod.latest.domains.txt.gz"]:
+                    with mock.patch("rcsb.utils.struct.EcodClassificationProvider.FileUtil.get", return_value=False) as getMock:
+                        ecodS = EcodClassificationProvider(
+                            os.path.join(HERE, "test-output", "CACHE-STREAM"), False, ecodStreamingIngest=True, ecodTargetUrl=url + "/" + fn, ecodUrlBackupPath=url + "/missing.txt"
+                        )
+                        self.assertFalse(getMock.called)
+                    self.assertTrue(ecodS.testCache())
+                    self.assertEqual(ecodS.getVersion(), ecodL.getVersion())
+                    self.assertEqual(ecodS.getFamilyResidueRanges("1033", "A"), ecodL.getFamilyResidueRanges("1033", "A"))
+                with mock.patch("rcsb.utils.struct.EcodClassificationProvider.urllib.request.urlopen", side_effect=OSError("connection refused")) as openMock:
+                    ecodS = EcodClassificationProvider(
+                        os.path.join(HERE, "test-output", "CACHE-STREAM"), False, ecodStreamingIngest=True, ecodTargetUrl=url + "/" + fn, ecodUrlBackupPath=url + "/missing.txt"
+                    )
+                    self.assertEqual(openMock.call_count, 3)
+                self.assertTrue(ecodS.testCache())
+                self.assertEqual(ecodS.getFamilyResidueRanges("1033", "A"), ecodL.getFamilyResidueRanges("1033", "A"))
+                self.assertFalse(os.path.exists(os.path.join(HERE, "test-output", "CACHE-STREAM", "ecod", "_stream_" + fn)))
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+            #
+            # An incomplete primary file is not used when the backup source fails
+            truncatedPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.truncated.domains.txt")
+            writeEcodSourceFile(truncatedPath, 50)
+            missingPath = os.path.join(HERE, "test-output", "ecod-missing", "ecod.latest.domains.txt.gz")
+            ecodS = EcodClassificationProvider(
+                os.path.join(HERE, "test-output", "CACHE-STREAM-INCOMPLETE"), False, ecodStreamingIngest=True, ecodTargetUrl=truncatedPath, ecodUrlBackupPath=missingPath
+            )
+            self.assertFalse(ecodS.testCache())
+            self.assertEqual(ecodS.getFamilyResidueRanges("1000", "A"), [])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testLazyLoad(self):
+        """Compare eager and lazy construction from a cached synthetic ECOD release (with concurrent first access)"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            keyL = writeEcodSourceFile(dataPath, 60000, maxKeys=60)
+            cachePath = os.path.join(HERE, "test-output", "CACHE-LAZY")
+            kwD = {"ecodTargetUrl": dataPath, "ecodUrlBackupPath": dataPath}
+            EcodClassificationProvider(cachePath, False, **kwD)
+            #
+            startTime = time.time()
+            ecodE = EcodClassificationProvider(cachePath, True, **kwD)
+            eagerTime = time.time() - startTime
+            with mock.patch.object(MarshalUtil, "doImport", autospec=True, side_effect=MarshalUtil.doImport) as mockImport:
+                startTime = time.time()
+                ecodL = EcodClassificationProvider(cachePath, True, lazyLoad=True, **kwD)
+                lazyTime = time.time() - startTime
+                logger.info("Startup time eager %.4f lazy %.4f seconds", eagerTime, lazyTime)
+                self.assertEqual(mockImport.call_count, 0)
+                self.assertLess(lazyTime, eagerTime)
+                #
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    rL = list(executor.map(lambda key: ecodL.getFamilyResidueRanges(*key), keyL))
+                self.assertEqual(mockImport.call_count, 1)
+            self.assertEqual(rL, [ecodE.getFamilyResidueRanges(*key) for key in keyL])
+            self.assertTrue(ecodL.testCache())
+            self.assertEqual(ecodL.getVersion(), ecodE.getVersion())
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testCacheManifest(self):
+        """Test the cache manifest version, counts and integrity checks without loading the cache"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            writeEcodSourceFile(dataPath, 60000)
+            cachePath = os.path.join(HERE, "test-output", "CACHE-MANIFEST")
+            ecodP = EcodClassificationProvider(cachePath, False, ecodTargetUrl=dataPath, ecodUrlBackupPath=dataPath)
+            self.assertTrue(ecodP.testCache())
+            #
+            with mock.patch.object(MarshalUtil, "doImport", autospec=True, side_effect=MarshalUtil.doImport) as mockImport:
+                startTime = time.time()
+                ecodL = EcodClassificationProvider(cachePath, True, lazyLoad=True)
+                mD = ecodL.getCacheManifest()
+                self.assertTrue(ecodL.testCacheManifest())
+                logger.info("Manifest read and check (%.4f seconds) %r", time.time() - startTime, mD)
+                self.assertEqual(mockImport.call_count, 2)
+                self.assertEqual([cL[0][1] for cL in mockImport.call_args_list], [os.path.join(cachePath, "ecod", "ecod_domains-py3-manifest.json")] * 2)
+            self.assertEqual((mD["name"], mD["version"], mD["dataFile"]), ("ECOD", ecodP.getVersion(), "ecod_domains-py3.pic"))
+            self.assertEqual(mD["counts"]["assignments"], 40000)
+            self.assertEqual(mD["dataBytes"], os.path.getsize(os.path.join(cachePath, "ecod", "ecod_domains-py3.pic")))
+            self.assertTrue(ecodL.testCacheManifest(verifyChecksum=True))
+            #
+            # Same size cache with modified content
+            cacheFilePath = os.path.join(cachePath, "ecod", "ecod_domains-py3.pic")
+            with open(cacheFilePath, "r+b") as ofh:
+                ofh.seek(-2, os.SEEK_END)
+                ofh.write(b"\x00")
+            self.assertTrue(ecodL.testCacheManifest())
+            self.assertFalse(ecodL.testCacheManifest(verifyChecksum=True))
+            with open(cacheFilePath, "ab") as ofh:
+                ofh.write(b"\x00")
+            self.assertFalse(ecodL.testCacheManifest())
+            self.assertEqual(EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-NONE"), True, lazyLoad=True).getCacheManifest(), {})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testFreezeForFork(self):
+        """Compare the unique memory of forked workers reading an ECOD provider before and after freezing"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            keyL = writeEcodSourceFile(dataPath, 60000, maxKeys=40000)
+            ecodP = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-FORK"), False, ecodTargetUrl=dataPath, ecodUrlBackupPath=dataPath)
+            expectedL = [ecodP.getFamilyResidueRanges(*key) for key in keyL[::997]]
+            treeNodeL = ecodP.getTreeNodeList()
+            nameLineageL = [ecodP.getNameLineage(int(dD["id"])) for dD in treeNodeL[::50]]
+            treeBytes = ecodP.getTreeNodeBytes()
+            subtreeSizeL = [ecodP.getSubtreeSize(int(dD["id"])) for dD in treeNodeL[::50]]
+
+            def readAll(prov):
+                for pdbId, authAsymId in keyL:
+                    prov.getFamilyResidueRanges(pdbId, authAsymId)
+                    prov.getDomainsAtResidue(pdbId, authAsymId, 60)
+                gc.collect()
+            #
+            try:
+                unfrozenL = measureForkedWorkers(readAll, numWorkers=2, args=(ecodP,))
+                self.assertTrue(ecodP.freezeForFork())
+                freezeGcForFork()
+                frozenL = measureForkedWorkers(readAll, numWorkers=2, args=(ecodP,))
+            finally:
+                gc.unfreeze()
+            self.assertEqual([ecodP.getFamilyResidueRanges(*key) for key in keyL[::997]], expectedL)
+            self.assertEqual(ecodP.getTreeNodeList(), treeNodeL)
+            self.assertEqual([ecodP.getNameLineage(int(dD["id"])) for dD in treeNodeL[::50]], nameLineageL)
+            # The encoded tree nodes and hierarchy index are rebuilt from the mapped tables
+            self.assertIsNot(ecodP.getTreeNodeBytes(), treeBytes)
+            self.assertEqual(ecodP.getTreeNodeBytes(), treeBytes)
+            self.assertEqual([ecodP.getSubtreeSize(int(dD["id"])) for dD in treeNodeL[::50]], subtreeSizeL)
+            self.assertEqual([dD["worker"] for dD in frozenL], [0, 1])
+            if frozenL[0].get("uss") and unfrozenL[0].get("uss"):
+                logger.info("Worker unique memory unfrozen %.1f MB frozen %.1f MB", unfrozenL[0]["uss"] / 2**20, frozenL[0]["uss"] / 2**20)
+                self.assertLess(max(dD["uss"] for dD in frozenL), min(dD["uss"] for dD in unfrozenL))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testHierarchyQueries(self):
+        """Test the nested-set descendant tests and subtree queries against the ECOD id lineages"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            writeEcodSourceFile(dataPath, 20000)
+            ecodP = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-HIERARCHY"), False, ecodTargetUrl=dataPath, ecodUrlBackupPath=dataPath)
+            rootIdL = [int(dD["id"]) for dD in ecodP.iterTreeNodes() if "parents" not in dD]
+            startTime = time.time()
+            self.assertGreater(ecodP.getSubtreeSize(rootIdL[0]), 1)
+            logger.info("Hierarchy index built (%.4f seconds)", time.time() - startTime)
+            for dD in ecodP.iterTreeNodes():
+                nodeId = int(dD["id"])
+                lineageL = ecodP.getIdLineage(nodeId)
+                self.assertEqual([ecodP.isDescendant(nodeId, ancId) for ancId in lineageL], [True] * (len(lineageL) - 1) + [False])
+                self.assertEqual([ecodP.isDescendant(ancId, nodeId) for ancId in lineageL[:-1]], [False] * (len(lineageL) - 1))
+                descL = ecodP.getDescendants(nodeId)
+                self.assertEqual(ecodP.getSubtreeSize(nodeId), len(descL) + 1)
+                self.assertTrue(all([nodeId in ecodP.getIdLineage(descId) for descId in descL]))
+            self.assertEqual(sum([ecodP.getSubtreeSize(rootId) for rootId in rootIdL]), len(ecodP.getTreeNodeList()))
+            self.assertEqual((ecodP.getSubtreeSize(-1), ecodP.getDescendants(-1), ecodP.isDescendant(-1, rootIdL[0])), (0, [], False))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testTreeNodeExport(self):
+        """Test streaming JSON-lines tree node export to files, file objects and reusable bytes"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "ecod-synthetic", "ecod.latest.domains.txt")
+            writeEcodSourceFile(dataPath, 100000)
+            ecodP = EcodClassificationProvider(os.path.join(HERE, "test-output", "CACHE-EXPORT"), False, ecodTargetUrl=dataPath, ecodUrlBackupPath=dataPath)
+            nL = ecodP.getTreeNodeList()
+            exportPath = os.path.join(HERE, "test-output", "ecod-tree-nodes.jsonl.gz")
+            #
+            tracemalloc.start()
+            try:
+                self.assertEqual(ecodP.exportTreeNodes(exportPath), len(nL))
+                _, exportPeak = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                with open(os.path.join(HERE, "test-output", "ecod-tree-nodes.json"), "w", encoding="utf-8") as ofh:
+                    ofh.write(json.dumps(ecodP.getTreeNodeList()))
+                _, listPeak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            logger.info("Tree nodes (%d) export peak memory %.2f MB list serialization peak memory %.2f MB", len(nL), exportPeak / 2**20, listPeak / 2**20)
+            self.assertLess(exportPeak, listPeak / 2)
+            with gzip.open(exportPath, "rb") as ifh:
+                self.assertEqual(len(ifh.read().splitlines()), len(nL))
+            self.assertEqual(list(readTreeNodes(exportPath)), nL)
+            #
+            bIo = io.BytesIO()
+            self.assertEqual(ecodP.exportTreeNodes(bIo), len(nL))
+            tIo = io.StringIO()
+            self.assertEqual(ecodP.exportTreeNodes(tIo), len(nL))
+            self.assertEqual(tIo.getvalue().encode("utf-8"), bIo.getvalue())
+            #
+            # Failed encodings are not reused
+            with mock.patch("rcsb.utils.struct.EcodClassificationProvider.encodeTreeNodes", return_value=None):
+                self.assertIsNone(ecodP.getTreeNodeBytes())
+            startTime = time.time()
+            treeBytes = ecodP.getTreeNodeBytes()
+            encodeTime = time.time() - startTime
+            startTime = time.time()
+            self.assertIs(ecodP.getTreeNodeBytes(), treeBytes)
+            logger.info("Tree node bytes (%d) encode (%.4f seconds) reuse (%.6f seconds)", len(treeBytes), encodeTime, time.time() - startTime)
+            self.assertEqual(treeBytes, bIo.getvalue())
+            self.assertEqual(gzip.decompress(ecodP.getTreeNodeBytes(compress=True)), treeBytes)
+            self.assertEqual(list(readTreeNodes(ecodP.getTreeNodeBytes(compress=True))), nL)
+            self.assertIsNone(ecodP.exportTreeNodes(os.path.join(HERE, "test-output", "no-such-dir", "tree.jsonl")))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def ecodProviderSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(EcodClassificationProviderTests("testAGetEcodData"))
     suiteSelect.addTest(EcodClassificationProviderTests("testEcodTreeMethods"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testParallelParse"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testStreamingIngest"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testLazyLoad"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testCacheManifest"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testFreezeForFork"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testHierarchyQueries"))
+    suiteSelect.addTest(EcodClassificationProviderTests("testTreeNodeExport"))
     return suiteSelect
 
 
@@ -4,7 +4,9 @@
 # Date:    22-Sep-2021
 #
 # Update:
-#
+#  16-Oct-2026  Add lazy loading test
+#  17-Oct-2026  Add accessor statistics test
+#  17-Oct-2026  Add cache manifest test
 #
 ##
 """
@@ -55,11 +57,44 @@ class EntryInfoProviderTests(unittest.TestCase):
         self.assertGreaterEqual(len(rL), 5)
         ok = eiP.testCache(minCount=minCount)
         self.assertTrue(ok)
+        #
+        eiL = EntryInfoProvider(cachePath=self.__cachePath, useCache=True, lazyLoad=True)
+        self.assertEqual(eiL.getEntryInfo("4en8"), riD)
+        self.assertEqual(eiL.getEntriesByPolymerEntityCount(count=2), rL)
+        self.assertEqual(eiL.getLookupStats(), {})
+        #
+        eiS = EntryInfoProvider(cachePath=self.__cachePath, useCache=True, lookupStats=True)
+        self.assertEqual(eiS.getEntryInfo("4en8"), riD)
+        self.assertFalse(eiS.getEntryInfo("xxxx"))
+        sD = eiS.getLookupStats()
+        logger.info("Lookup stats %r", sD)
+        self.assertEqual((sD["getEntryInfo"]["calls"], sD["getEntryInfo"]["hits"], sD["getEntryInfo"]["misses"]), (2, 1, 1))
+        self.assertEqual(sD["getEntriesByPolymerEntityCount"]["calls"], 0)
+        eiS.resetLookupStats()
+        self.assertEqual(eiS.getLookupStats()["getEntryInfo"]["calls"], 0)
+
+    def testCacheManifest(self):
+        try:
+            eiP = EntryInfoProvider(cachePath=self.__cachePath, useCache=True, lazyLoad=True)
+            fU = FileUtil()
+            fU.remove(os.path.join(self.__cachePath, "rcsb_entry_info", "entry_info_details-manifest.json"))
+            self.assertEqual(eiP.getCacheManifest(), {})
+            self.assertFalse(eiP.testCacheManifest())
+            self.assertTrue(eiP.writeCacheManifest())
+            mD = eiP.getCacheManifest()
+            logger.info("Manifest %r", mD)
+            self.assertEqual((mD["name"], mD["version"]), ("EntryInfo", "0.50"))
+            self.assertGreater(mD["counts"]["entries"], 12)
+            self.assertTrue(eiP.testCacheManifest(verifyChecksum=True))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
 
 
 def entryInfoSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(EntryInfoProviderTests("testGetEntryInfo"))
+    suiteSelect.addTest(EntryInfoProviderTests("testCacheManifest"))
     return suiteSelect
 
 
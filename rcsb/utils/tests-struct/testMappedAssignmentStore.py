@@ -0,0 +1,187 @@
+##
+# File:    testMappedAssignmentStore.py
+# Date:    16-Oct-2026
+#
+# Updates:
+#  17-Oct-2026  Add mapped node table and tree node list tests
+#
+##
+"""
+Test cases for the memory-mapped columnar assignment store and the mapped form of the provider caches.
+"""
+
+import logging
+import os
+import random
+import time
+import unittest
+
+from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.struct.MappedAssignmentStore import MappedAssignmentStore
+from rcsb.utils.struct.MappedAssignmentStore import MappedTable
+from rcsb.utils.struct.MappedAssignmentStore import MappedTreeNodeList
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedAssignments
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedCache
+from rcsb.utils.struct.MappedAssignmentStore import exportMappedTable
+from rcsb.utils.struct.MappedAssignmentStore import loadMappedCache
+from rcsb.utils.struct.TreeNodeExport import writeTreeNodes
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+def getSyntheticAssignments(numChains=5000, seed=11):
+    """Return a synthetic SCOPe style assignment dictionary aD[(pdbId, authAsymId)] = [(sunId, domainId, sccs, (authAsymId, resBeg, resEnd)), ...]"""
+    rnd = random.Random(seed)
+    aD = {}
+    for ii in range(numChains):
+        chainKey = ("%d%s" % (ii % 9 + 1, format(ii // 9, "03x")), rnd.choice(["A", "B", "AAA", "é"]))
+        tL = []
+        for jj in range(rnd.randint(1, 5)):
+            resBeg, resEnd = rnd.choice([(None, None), ("1", "100"), ("-3", "52A"), (str(jj * 10), str(jj * 10 + 9))])
+            tL.append((rnd.randint(1, 400000), "d%s%s%d" % (chainKey[0], chainKey[1], jj), "a.%d.1.1" % rnd.randint(1, 300), (chainKey[1], resBeg, resEnd)))
+        aD[chainKey] = tL
+    return aD
+
+
+class MappedAssignmentStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output", "mapped-store")
+        os.makedirs(self.__workPath, exist_ok=True)
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def testRoundTrip(self):
+        """Compare store lookups with the source assignment dictionary"""
+        aD = getSyntheticAssignments()
+        filePath = os.path.join(self.__workPath, "assignments.map")
+        self.assertTrue(exportMappedAssignments(filePath, aD, [0, 0, 0, 3]))
+        for valueCacheSize in [65536, 8]:
+            mS = MappedAssignmentStore(filePath, valueCacheSize=valueCacheSize)
+            self.assertEqual(len(mS), len(aD))
+            for chainKey, tL in aD.items():
+                self.assertIn(chainKey, mS)
+                self.assertEqual(mS[chainKey], tL)
+                self.assertEqual(mS.get(list(chainKey)), tL)
+            self.assertEqual(list(mS.keys()), list(aD.keys()))
+            self.assertEqual(dict(mS.items()), aD)
+            self.assertNotIn(("1xyz", "A"), mS)
+            self.assertIsNone(mS.get(("1xyz", "A")))
+            self.assertIsNone(mS.get(None))
+            self.assertRaises(KeyError, mS.__getitem__, ("1xyz", "A"))
+            mS.close()
+            mS.close()
+        #
+        self.assertTrue(exportMappedAssignments(filePath, {}, [0]))
+        mS = MappedAssignmentStore(filePath)
+        self.assertEqual((len(mS), mS.get(("1abc", "A")), list(mS.items())), (0, None, []))
+        mS.close()
+        self.assertFalse(exportMappedAssignments(filePath, {("1abc", "A"): [(1.5,)]}, [0]))
+        self.assertFalse(exportMappedAssignments(filePath, {("1abc", "A"): [(("A", "1"),)]}, [3]))
+
+    def testMappedTables(self):
+        """Compare mapped node table and tree node list lookups with the source tables"""
+        nD = {ii: "name %d é" % ii if ii % 7 else None for ii in range(1, 3000)}
+        lineageD = {ii: tuple(range(1, ii % 5 + 1)) + (ii,) for ii in range(1, 3000)}
+        lineageD[0] = ()
+        for tableD in [nD, lineageD, {"a.1": 0, "a.1.1": "a.1"}, {}]:
+            filePath = os.path.join(self.__workPath, "table.map")
+            self.assertTrue(exportMappedTable(filePath, tableD))
+            mT = MappedTable(filePath)
+            self.assertEqual(len(mT), len(tableD))
+            self.assertEqual(dict(mT.items()), tableD)
+            self.assertEqual(list(mT.keys()), list(tableD.keys()))
+            self.assertEqual(list(mT.values()), list(tableD.values()))
+            for key, val in tableD.items():
+                self.assertIn(key, mT)
+                self.assertEqual(mT[key], val)
+                self.assertEqual(mT.get(key), val)
+            self.assertNotIn("missing", mT)
+            self.assertEqual(mT.get("missing", "default"), "default")
+            self.assertRaises(KeyError, mT.__getitem__, "missing")
+            mT.close()
+        self.assertFalse(exportMappedTable(filePath, {1: (1, 2), 2: "b"}))
+        #
+        tnL = [{"id": 1, "name": "Class 1", "depth": 0}, {"id": 2, "name": "Fold é", "parents": [1], "depth": 1}]
+        for nodeL in [tnL, []]:
+            filePath = os.path.join(self.__workPath, "tree-nodes.jsonl")
+            self.assertEqual(writeTreeNodes(iter(nodeL), filePath, compress=False), len(nodeL))
+            mL = MappedTreeNodeList(filePath)
+            self.assertEqual(len(mL), len(nodeL))
+            self.assertEqual(list(mL), nodeL)
+            self.assertEqual(list(mL), nodeL)
+            mL.close()
+
+    def testMappedCache(self):
+        """Write and read the mapped form of a pickle cache (including stale mapped file detection)"""
+        mU = MarshalUtil(workPath=self.__workPath)
+        cacheFilePath = os.path.join(self.__workPath, "domains-py3.pic")
+        sD = {
+            "version": "1.0",
+            "names": {"1": "Class 1", "1.10": "Architecture 1.10"},
+            "idLineage": {"1": ("1",), "1.10": ("1", "1.10")},
+            "treeNodes": [{"id": "1", "name": "Class 1", "depth": 0}, {"id": "1.10", "name": "Architecture 1.10", "parents": ["1"], "depth": 1}],
+            "assignments": getSyntheticAssignments(numChains=500),
+            "digests": {"d1": 1},
+        }
+        tableKeyL = ["names", "idLineage", "treeNodes"]
+        self.assertTrue(mU.doExport(cacheFilePath, sD, fmt="pickle"))
+        self.assertIsNone(loadMappedCache(cacheFilePath, ["assignments"]))
+        # A mapped form holding the tables in the pickle is incomplete
+        self.assertTrue(exportMappedCache(cacheFilePath, sD, {"assignments": [0, 0, 0, 3]}, excludeKeyL=["digests"]))
+        self.assertIsNone(loadMappedCache(cacheFilePath, ["assignments"], tableKeyL=tableKeyL))
+        self.assertTrue(exportMappedCache(cacheFilePath, sD, {"assignments": [0, 0, 0, 3]}, excludeKeyL=["digests"], tableKeyL=tableKeyL))
+        self.assertEqual(sorted(mU.doImport(os.path.join(self.__workPath, "domains-py3-meta.pic"), fmt="pickle").keys()), ["cacheModified", "mappedTables", "version"])
+        mD = loadMappedCache(cacheFilePath, ["assignments"], tableKeyL=tableKeyL)
+        self.assertEqual(mD["version"], sD["version"])
+        self.assertNotIn("digests", mD)
+        self.assertIsInstance(mD["assignments"], MappedAssignmentStore)
+        self.assertEqual(dict(mD["assignments"].items()), sD["assignments"])
+        self.assertIsInstance(mD["names"], MappedTable)
+        self.assertEqual(dict(mD["names"].items()), sD["names"])
+        self.assertEqual(dict(mD["idLineage"].items()), sD["idLineage"])
+        self.assertIsInstance(mD["treeNodes"], MappedTreeNodeList)
+        self.assertEqual(list(mD["treeNodes"]), sD["treeNodes"])
+        for ky in ["assignments"] + tableKeyL:
+            mD[ky].close()
+        # A rewritten pickle cache invalidates the mapped form
+        time.sleep(0.01)
+        self.assertTrue(mU.doExport(cacheFilePath, sD, fmt="pickle"))
+        os.utime(cacheFilePath, (time.time() + 5, time.time() + 5))
+        self.assertIsNone(loadMappedCache(cacheFilePath, ["assignments"]))
+
+    def testLookupThroughput(self):
+        aD = getSyntheticAssignments(numChains=50000)
+        filePath = os.path.join(self.__workPath, "assignments-large.map")
+        startTime = time.time()
+        self.assertTrue(exportMappedAssignments(filePath, aD, [0, 0, 0, 3]))
+        logger.info("Mapped file for %d chains written in %.4f seconds (%d bytes)", len(aD), time.time() - startTime, os.path.getsize(filePath))
+        startTime = time.time()
+        mS = MappedAssignmentStore(filePath)
+        logger.info("Mapped file opened in %.6f seconds", time.time() - startTime)
+        chainKeyL = list(aD.keys())
+        startTime = time.time()
+        for chainKey in chainKeyL:
+            mS.get(chainKey)
+        logger.info("Mapped lookups (%d) in %.4f seconds", len(chainKeyL), time.time() - startTime)
+        self.assertEqual(mS.get(chainKeyL[-1]), aD[chainKeyL[-1]])
+        mS.close()
+
+
+def mappedStoreSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(MappedAssignmentStoreTests("testRoundTrip"))
+    suiteSelect.addTest(MappedAssignmentStoreTests("testMappedTables"))
+    suiteSelect.addTest(MappedAssignmentStoreTests("testMappedCache"))
+    suiteSelect.addTest(MappedAssignmentStoreTests("testLookupThroughput"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = mappedStoreSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
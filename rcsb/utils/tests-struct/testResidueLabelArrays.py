@@ -0,0 +1,137 @@
+##
+# File:    testResidueLabelArrays.py
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Test cases for the dense per-residue domain label arrays of the classification providers.
+"""
+
+import logging
+import os
+import sys
+import time
+import unittest
+
+from rcsb.utils.struct.ClassificationRebuildOrchestrator import getClassificationProvider
+from rcsb.utils.struct.ResidueLabelArrays import ResidueLabelEncoder
+from rcsb.utils.struct.ResidueLabelArrays import ResidueLabelVocabulary
+from rcsb.utils.struct.ResidueLabelArrays import encodeResidueLabels
+from rcsb.utils.struct.SyntheticClassificationData import writeCathSourceFiles
+from rcsb.utils.struct.SyntheticClassificationData import writeEcodSourceFile
+from rcsb.utils.struct.SyntheticClassificationData import writeScopeSourceFiles
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+def getPerResidueLabels(rangeL, begResNum, endResNum):
+    """Return the per-residue labels of the input [(label, resBeg, resEnd), ...] ranges by a residue loop (last range wins)."""
+    labelL = [None] * (endResNum - begResNum + 1)
+    for label, resBeg, resEnd in sorted(rangeL, key=lambda t: (t[1], t[2])):
+        for resNum in range(max(resBeg, begResNum), min(resEnd, endResNum) + 1):
+            labelL[resNum - begResNum] = label
+    return labelL
+
+
+class ResidueLabelArraysTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(HERE, "test-output", "residue-labels")
+        self.__cachePath = os.path.join(self.__workPath, "CACHE")
+        self.__startTime = time.time()
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.debug("Completed %s (%.4f seconds)", self.id(), endTime - self.__startTime)
+
+    def testEncodeResidueLabels(self):
+        """Test label encoding of overlapping, clipped and unbounded intervals"""
+        try:
+            vocab = ResidueLabelVocabulary(["x"])
+            intervalL = [(-sys.maxsize, sys.maxsize, ("w", "dw")), (3, 6, ("a", "d1")), (5, 12, ("b", "d2")), (20, 30, ("c", "d3"))]
+            labelA, offsetL, vocab = encodeResidueLabels([(intervalL, 1, 10), ([], 1, 3), (intervalL[1:], "8A", 11)], vocabulary=vocab)
+            self.assertEqual(offsetL, [0, 10, 13, 17])
+            self.assertEqual(vocab.getLabels(), [None, "x", "w", "a", "b"])
+            self.assertEqual(list(labelA), [2, 2, 3, 3, 4, 4, 4, 4, 4, 4] + [0, 0, 0] + [4, 4, 4, 4])
+            self.assertEqual([vocab.getLabel(code) for code in labelA[10:]], [None] * 3 + ["b"] * 4)
+            labelA, _, dVocab = encodeResidueLabels([(intervalL, 1, 4)], labelType="domain")
+            self.assertEqual([dVocab.getLabel(code) for code in labelA], ["dw", "dw", "d1", "d1"])
+            self.assertEqual((len(dVocab), "d1" in dVocab, dVocab.getLabel(0), dVocab.getLabel(99)), (3, True, None, None))
+            with self.assertRaises(ValueError):
+                encodeResidueLabels([(intervalL, 1, 4)], labelType="family")
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testProviderResidueLabels(self):
+        """Test bulk label arrays of synthetic CATH, ECOD and SCOPe assignments against per-residue loops over the residue ranges"""
+        try:
+            numLines = 20000
+            dataPath = os.path.join(self.__workPath, "source")
+            keyL = writeCathSourceFiles(os.path.join(dataPath, "cath"), numLines, maxKeys=2000)
+            ecodPath = os.path.join(dataPath, "ecod", "ecod.latest.domains.txt")
+            writeEcodSourceFile(ecodPath, numLines)
+            writeScopeSourceFiles(os.path.join(dataPath, "scope"), numLines, version="2.08-synthetic")
+            cathP = getClassificationProvider("cath", self.__cachePath, useCache=False, cathTargetUrl=os.path.join(dataPath, "cath"), cathUrlBackupPath=os.path.join(dataPath, "cath"))
+            ecodP = getClassificationProvider("ecod", self.__cachePath, useCache=False, ecodTargetUrl=ecodPath, ecodUrlBackupPath=ecodPath)
+            scopP = getClassificationProvider(
+                "scope", self.__cachePath, useCache=False, scopTargetUrl=os.path.join(dataPath, "scope"), scopVersion="2.08-synthetic", scopUrlBackupPath=os.path.join(dataPath, "scope")
+            )
+            chainSpanL = [(pdbId, authAsymId, -5, 280) for pdbId, authAsymId in keyL] + [("0xxx", "A", 1, 50)]
+            #
+            rangeFuncD = {
+                "cath": lambda pdbId, authAsymId: [(tup[0], int(tup[3]), int(tup[4])) for tup in cathP.getCathResidueRanges(pdbId, authAsymId)],
+                "ecod": lambda pdbId, authAsymId: [(tup[1], int(tup[3]), int(tup[4])) for tup in ecodP.getFamilyResidueRanges(pdbId, authAsymId)],
+                "scope": lambda pdbId, authAsymId: [
+                    (tup[0], int(tup[4]) if tup[4] is not None else -sys.maxsize, int(tup[5]) if tup[5] is not None else sys.maxsize)
+                    for tup in scopP.getScopResidueRanges(pdbId, authAsymId)
+                ],
+            }
+            startTime = time.time()
+            expectedD = {}
+            for sourceName, rangeFunc in rangeFuncD.items():
+                expectedD[sourceName] = [getPerResidueLabels(rangeFunc(pdbId, authAsymId), beg, end) for pdbId, authAsymId, beg, end in chainSpanL]
+            loopTime = time.time() - startTime
+            #
+            rlE = ResidueLabelEncoder({"cath": cathP, "ecod": ecodP, "scope": scopP})
+            startTime = time.time()
+            labelD = rlE.encode(chainSpanL)
+            bulkTime = time.time() - startTime
+            logger.info("Label arrays for %d chains bulk (%.4f seconds) per-residue loops (%.4f seconds)", len(chainSpanL), bulkTime, loopTime)
+            for sourceName, (labelA, offsetL) in labelD.items():
+                vocab = rlE.getVocabulary(sourceName)
+                self.assertEqual(labelA.itemsize, 4)
+                self.assertEqual(offsetL[-1], len(labelA))
+                self.assertEqual(offsetL[-1], 286 * len(keyL) + 50)
+                for ii, expectedL in enumerate(expectedD[sourceName]):
+                    self.assertEqual([vocab.getLabel(code) for code in labelA[offsetL[ii] : offsetL[ii + 1]]], expectedL)
+                self.assertEqual(set(labelA[offsetL[-2] :]), {0})
+            #
+            # Codes are stable across batches sharing a vocabulary
+            cathVocab = rlE.getVocabulary("cath")
+            numLabels = len(cathVocab)
+            labelA, vocab = cathP.getResidueLabels(keyL[1][0], keyL[1][1], -5, 280, vocabulary=cathVocab)
+            self.assertEqual(list(labelA), list(labelD["cath"][0][offsetL[1] : offsetL[2]]))
+            self.assertEqual(len(vocab), numLabels)
+            labelA, vocab = ecodP.getResidueLabels(keyL[0][0].upper(), keyL[0][1], 1, 10, labelType="domain")
+            self.assertEqual(vocab.getLabels()[1:], [tup[0] for tup in ecodP.getFamilyResidueRanges(keyL[0][0], keyL[0][1])][:1])
+            self.assertEqual(list(labelA), [1] * 10)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def residueLabelSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ResidueLabelArraysTests("testEncodeResidueLabels"))
+    suiteSelect.addTest(ResidueLabelArraysTests("testProviderResidueLabels"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = residueLabelSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
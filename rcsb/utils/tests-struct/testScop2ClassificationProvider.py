@@ -3,7 +3,12 @@
 # Date:    23-Jun-2021  JDW
 #
 # Updates:
-#
+#  16-Oct-2026  Add assignment build scaling benchmark using synthetic SCOP2 release files
+#  16-Oct-2026  Add lineage table tests
+#  16-Oct-2026  Add tree node export tests
+#  16-Oct-2026  Add batch chain annotation tests
+#  16-Oct-2026  Add mapped cache tests
+#  17-Oct-2026  Add build statistics assertions
 ##
 """
 Test cases for operations that read SCOP2 term and class data from flat files -
@@ -17,6 +22,7 @@ import unittest
 from importlib.metadata import version as get_package_version
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.struct.Scop2ClassificationProvider import Scop2ClassificationProvider
+from rcsb.utils.struct.SyntheticClassificationData import writeScop2SourceFiles
 
 __version__ = get_package_version("rcsb.utils.struct")
 
@@ -163,6 +169,48 @@ class Scop2ClassificationProviderTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testAssignmentBuildScaling(self):
+        """Test the SCOP2 assignment build on synthetic worst-case chains (many domains per chain, the build time scaling
+        is reported by ClassificationBenchmark.runAssignmentScaling())"""
+        try:
+            dataPath = os.path.join(HERE, "test-output", "scop2-synthetic-worst")
+            numDomains = 2000
+            writeScop2SourceFiles(dataPath, 4 * numDomains, domainsPerChain=numDomains, duplicateEvery=10)
+            scp = Scop2ClassificationProvider(cachePath=os.path.join(HERE, "test-output", "CACHE-WORST"), useCache=False, urlTargetScop2=dataPath, urlTargetSifts=dataPath)
+            self.assertEqual(scp.getVersion(), "2024-01-01")
+            self.assertEqual([pD["phase"] for pD in scp.getBuildStats()["phases"]], ["fetch", "parse", "assignments", "hierarchy", "export"])
+            fRanges = scp.getFamilyResidueRanges("1000", "A")
+            sfRanges = scp.getSuperFamilyResidueRanges("1000", "A")
+            self.assertEqual(len(fRanges), numDomains)
+            self.assertEqual(len(fRanges), len(set(fRanges)))
+            self.assertEqual(len(sfRanges), numDomains)
+            self.assertEqual(len(sfRanges), len(set(sfRanges)))
+            self.assertTrue(scp.getSuperFamilyIds2B("1000", "K"))
+            bD = scp.getBatchAnnotations([("1000", "A"), ("1000", "K")])
+            self.assertEqual(bD[("1000", "A")]["familyResidueRanges"], fRanges)
+            self.assertEqual(sorted(bD[("1000", "A")]["superFamilyNames"]), sorted(scp.getSuperFamilyNames("1000", "A")))
+            self.assertEqual(sorted(bD[("1000", "K")]["superFamilyIds2B"]), sorted(scp.getSuperFamilyIds2B("1000", "K")))
+            self.assertEqual(bD[("1000", "K")]["familyIds"], [])
+            scpM = Scop2ClassificationProvider(cachePath=os.path.join(HERE, "test-output", "CACHE-WORST"), useCache=True, useMappedCache=True)
+            self.assertEqual(scpM.getFamilyResidueRanges("1000", "A"), fRanges)
+            self.assertEqual(scpM.getSuperFamilyResidueRanges("1000", "A"), sfRanges)
+            self.assertEqual(scpM.getBatchAnnotations([("1000", "A"), ("1000", "K")]), bD)
+            self.assertEqual(scpM.getDomainsAtResidue("1000", "A", 55, assignmentType="superfamily"), scp.getDomainsAtResidue("1000", "A", 55, assignmentType="superfamily"))
+            #
+            self.assertEqual(scp.getIdLineage("4000007"), ["1", "1000001", "2000001", "3000003", "4000007"])
+            self.assertEqual(scp.getNameLineage("4000007"), ["Globular proteins", "Class 0", "Fold 2000001", "Superfamily 3000003", "Family 4000007"])
+            self.assertEqual(scp.getIdLineage("8000001"), ["1", "1000001", "2000001", "3000003", "4000007", "8000001"])
+            self.assertEqual(scp.getNameLineage("8000001")[-1], "Unnamed")
+            self.assertEqual(scp.getIdLineage("1000001"), ["1000001"])
+            self.assertEqual(scp.getIdLineage("99"), ["99"])
+            #
+            tnL = scp.getTreeNodeList()
+            self.assertEqual(list(scp.iterTreeNodes()), tnL)
+            self.assertEqual(tnL[0], {"id": "1", "name": "Globular proteins", "depth": 0})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def scop2ProviderSuite():
     suiteSelect = unittest.TestSuite()
@@ -170,6 +218,7 @@ def scop2ProviderSuite():
     suiteSelect.addTest(Scop2ClassificationProviderTests("testGetScop2BData"))
     suiteSelect.addTest(Scop2ClassificationProviderTests("testGetScop2FallbackData"))
     suiteSelect.addTest(Scop2ClassificationProviderTests("testScop2TreeMethods"))
+    suiteSelect.addTest(Scop2ClassificationProviderTests("testAssignmentBuildScaling"))
     return suiteSelect
 
 
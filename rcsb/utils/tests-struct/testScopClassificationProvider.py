@@ -3,7 +3,7 @@
 # Date:    3-Apr-2019  JDW
 #
 # Updates:
-#
+#  16-Oct-2026  Add batch chain annotation tests
 ##
 """
 Test cases for operations that read SCOP term and class data from flat files -
@@ -62,6 +62,11 @@ class ScopClassificationProviderTests(unittest.TestCase):
                 domains = scu.getScopDomainNames(pdbTup[0], pdbTup[1])
                 ranges = scu.getScopResidueRanges(pdbTup[0], pdbTup[1])
                 logger.debug("pdbId %r authAsymId %r sunids %r domains %r ranges %r", pdbTup[0], pdbTup[1], sunids, domains, ranges)
+            #
+            bD = scu.getBatchAnnotations(pdbIdL)
+            for pdbTup in pdbIdL:
+                self.assertEqual(sorted(bD[pdbTup]["sunIds"]), sorted(scu.getScopSunIds(pdbTup[0], pdbTup[1])))
+                self.assertEqual(bD[pdbTup]["residueRanges"], scu.getScopResidueRanges(pdbTup[0], pdbTup[1]))
 
         except Exception as e:
             logger.exception("Failing with %s", str(e))